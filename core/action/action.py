@@ -28,6 +28,10 @@ class Action:
         platforms: List[str] = ["windows", "linux", "darwin"],
         platform_overrides: dict[str, dict] = {},
         requirements: Optional[List[str]] = None,
+        dependencies: Optional[List[str]] = None,
+        cacheable: bool = False,
+        timeout: Optional[float] = None,
+        limits: Optional[Dict[str, Optional[int]]] = None,
     ):
         """
         Initialize a new :class:`Action` definition.
@@ -62,6 +66,15 @@ class Action:
                 supported operating systems.
             platform_overrides: Platform-specific overrides for code and schemas,
                 keyed by lowercase platform name.
+            dependencies: Names of sibling sub-actions that must succeed
+                before this one runs when it is part of a divisible action.
+                ``None`` infers them from the siblings' schemas.
+            cacheable: Whether results may be served from the action result
+                cache while inputs and referenced files/URLs are unchanged.
+            timeout: Fixed timeout in seconds. ``None`` derives one from the
+                action's past run durations.
+            limits: ``cpu_seconds`` / ``memory_mb`` caps for subprocess-backed
+                runs of the action.
         """
         self.name = name
         self.description = description
@@ -84,6 +97,10 @@ class Action:
         self.mode = mode
         self.execution_mode = execution_mode
         self.requirements: List[str] = requirements or []
+        self.dependencies: Optional[List[str]] = dependencies
+        self.cacheable = cacheable
+        self.timeout = timeout
+        self.limits = limits
 
     def to_dict(self):
         """Convert Action to a dictionary format (for database storage)."""
@@ -103,7 +120,11 @@ class Action:
             "default": self.default,
             "platforms": self.platforms,
             "platform_overrides": self.platform_overrides,
-            "execution_mode": self.execution_mode
+            "execution_mode": self.execution_mode,
+            "dependencies": self.dependencies,
+            "cacheable": self.cacheable,
+            "timeout": self.timeout,
+            "limits": self.limits,
         }
 
     @classmethod
@@ -132,6 +153,10 @@ class Action:
             platform_overrides=data.get("platform_overrides", {}),
             execution_mode=data.get("execution_mode", "sandboxed"),
             requirements=data.get("requirements", []),
+            dependencies=data.get("dependencies"),
+            cacheable=data.get("cacheable", False),
+            timeout=data.get("timeout"),
+            limits=data.get("limits"),
         )
 
         return data_to_return
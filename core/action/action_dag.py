@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""core.action.action_dag
+
+Dependency-aware scheduling of the sub-actions of a divisible action.
+
+A sub-action may list the names of the sibling sub-actions it depends on in
+:attr:`Action.dependencies`. When it does not (``None``), dependencies are
+inferred from data flow: a sub-action depends on every earlier sibling whose
+``output_schema`` provides one of its ``input_schema`` fields. An explicit
+empty list declares the sub-action independent.
+
+:func:`run_dag` starts every sub-action as soon as all of its dependencies
+have succeeded, with at most ``max_concurrency`` running at once. A failed
+sub-action is never retried; its dependents, direct or transitive, are
+skipped with a ``dependency_failed`` error instead of being run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Sequence, Set
+
+SUBACTION_CONCURRENCY_ENV = "AGENT_SUBACTION_CONCURRENCY"
+DEFAULT_SUBACTION_CONCURRENCY = 4
+
+
+def plan_dependencies(sub_actions: Sequence[Any]) -> List[Set[int]]:
+    """
+    Resolve each sub-action's dependencies to sibling indices.
+
+    Raises:
+        ValueError: A dependency names no sibling, or the graph has a cycle.
+    """
+    indices_by_name: Dict[str, List[int]] = {}
+    for index, sub in enumerate(sub_actions):
+        indices_by_name.setdefault(sub.name, []).append(index)
+
+    deps: List[Set[int]] = []
+    for index, sub in enumerate(sub_actions):
+        declared = getattr(sub, "dependencies", None)
+        if declared is None:
+            wanted = set(sub.input_schema or {})
+            inferred = {
+                earlier
+                for earlier in range(index)
+                if wanted & set(sub_actions[earlier].output_schema or {})
+            }
+            deps.append(inferred)
+            continue
+        resolved: Set[int] = set()
+        for name in declared:
+            if name not in indices_by_name:
+                raise ValueError(f"Sub-action '{sub.name}' depends on unknown sub-action '{name}'")
+            resolved.update(i for i in indices_by_name[name] if i != index)
+        deps.append(resolved)
+
+    _check_acyclic(deps, sub_actions)
+    return deps
+
+
+def _check_acyclic(deps: List[Set[int]], sub_actions: Sequence[Any]) -> None:
+    state = [0] * len(deps)  # 0 = unvisited, 1 = on stack, 2 = done
+
+    def visit(node: int) -> None:
+        state[node] = 1
+        for dep in deps[node]:
+            if state[dep] == 1:
+                raise ValueError(
+                    f"Sub-actions '{sub_actions[dep].name}' and '{sub_actions[node].name}' depend on each other"
+                )
+            if state[dep] == 0:
+                visit(dep)
+        state[node] = 2
+
+    for node in range(len(deps)):
+        if state[node] == 0:
+            visit(node)
+
+
+def is_failure(output: Any) -> bool:
+    """Whether a sub-action's output reports an error."""
+    if not isinstance(output, dict):
+        return False
+    return "error" in output or output.get("status") == "error"
+
+
+async def run_dag(
+    sub_actions: Sequence[Any],
+    run_node: Callable[[int, List[Any]], Awaitable[Any]],
+    *,
+    max_concurrency: int = DEFAULT_SUBACTION_CONCURRENCY,
+) -> List[Any]:
+    """
+    Execute ``sub_actions`` as a dependency graph.
+
+    Args:
+        sub_actions: The divisible action's sub-actions, in declared order.
+        run_node: ``run_node(index, dependency_outputs)`` runs one
+            sub-action and returns its output.
+        max_concurrency: Sub-actions allowed to run at the same time.
+
+    Returns:
+        One output per sub-action, in declared order.
+    """
+    deps = plan_dependencies(sub_actions)
+    outputs: List[Any] = [None] * len(sub_actions)
+    done: List[asyncio.Event] = [asyncio.Event() for _ in sub_actions]
+    failed: List[bool] = [False] * len(sub_actions)
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def node(index: int) -> None:
+        try:
+            for dep in deps[index]:
+                await done[dep].wait()
+            broken = [sub_actions[dep].name for dep in sorted(deps[index]) if failed[dep]]
+            if broken:
+                failed[index] = True
+                outputs[index] = {
+                    "error": f"Skipped because dependency {', '.join(repr(n) for n in broken)} failed",
+                    "error_code": "dependency_failed",
+                }
+                return
+            async with semaphore:
+                try:
+                    outputs[index] = await run_node(index, [outputs[dep] for dep in sorted(deps[index])])
+                except Exception as e:
+                    outputs[index] = {"error": str(e)}
+            failed[index] = is_failure(outputs[index])
+        finally:
+            done[index].set()
+
+    await asyncio.gather(*(node(index) for index in range(len(sub_actions))))
+    return outputs
@@ -1,17 +1,62 @@
 import asyncio
-import importlib
+import atexit
+import functools
+import hashlib
+import inspect
 import json
+import threading
 import os
 import subprocess
 import sys
 import tempfile
-import venv
+import time
 import uuid
+from collections import OrderedDict
 from pathlib import Path
 from concurrent.futures import ProcessPoolExecutor
-from typing import Any, List
+from types import CodeType
+from typing import Any, List, Optional, Tuple
 from core.logger import logger
 from core.gui.handler import GUIHandler
+from core.action.action_framework.registry import registry_instance
+from core.action.requirements import get_resolver, normalize_requirements
+from core.action.sandbox_envs import (
+    DEFAULT_ENV_QUOTA_MB,
+    SANDBOX_ENV_DIR_ENV,
+    SANDBOX_ENV_QUOTA_ENV,
+    RequirementsEnvCache,
+    build_requirements_env,
+)
+from core.action.action_dag import is_failure
+from core.action.execution_limits import ExecutionLimits
+from core.action.output_spool import read_last_line
+from core.action.timeouts import ACTION_TIMEOUTS, DEFAULT_TIMEOUT_CEILING
+from core.action.resource_usage import (
+    USAGE_RESULT_KEY,
+    ThreadMeter,
+    current_usage,
+    publish_usage,
+    run_process,
+)
+from core.action.internal_runner import (
+    DEFAULT_INTERNAL_ACTION_THREADS,
+    INTERNAL_ACTION_THREADS_ENV,
+    InternalActionRunner,
+)
+from core.action.sandbox_workers import (
+    DEFAULT_MAX_JOBS,
+    SANDBOX_WORKER_MAX_JOBS_ENV,
+    SANDBOX_WORKERS_ENV,
+    SandboxWorkerPool,
+)
+from core.action.sandbox_pool import (
+    DEFAULT_POOL_SIZE,
+    SANDBOX_POOL_SIZE_ENV,
+    PooledVenv,
+    VenvPool,
+    create_venv,
+    venv_python,
+)
 
 # ============================================
 # Global process pool (shared safely)
@@ -88,6 +133,10 @@ def _ensure_requirements(requirements: List[str], python_bin: str | None = None)
     contain hyphens) are attempted.  The rest are silently skipped —
     they are likely class/symbol names listed for documentation only.
 
+    What is already installed is resolved once per interpreter through
+    :mod:`core.action.requirements` and cached until the next install, and
+    everything missing is installed with a single pip call.
+
     Packages are always installed into the *system* Python's
     site-packages.  When running from a frozen exe, the action code
     itself will also run via the system Python (subprocess), so the
@@ -108,58 +157,10 @@ def _ensure_requirements(requirements: List[str], python_bin: str | None = None)
         logger.warning("[REQUIREMENTS] No Python interpreter found on PATH; cannot install packages.")
         return
 
-    installed_any = False
-    for pkg in requirements:
-        pkg = pkg.strip()
-        if not pkg:
-            continue
-
-        # Heuristic: skip entries that look like class names
-        # (e.g. "DDGS", "ClientSession", "build") rather than pip
-        # packages.  Pip packages are lowercase and may contain
-        # hyphens/underscores/dots.
-        if not pkg[0].islower() and "-" not in pkg:
-            continue
-
-        # Derive the importable module name for the quick check.
-        # Only useful when NOT frozen (in-process imports work).
-        import_name = pkg.replace("-", "_").split("[")[0]
-
-        if not getattr(sys, "frozen", False):
-            try:
-                importlib.import_module(import_name)
-                continue  # already installed
-            except ImportError:
-                pass
-        else:
-            # When frozen, we can't reliably import-check packages
-            # destined for the system Python.  Use pip to check instead.
-            try:
-                subprocess.check_call(
-                    [str(pip_python), "-m", "pip", "show", "--quiet", pkg],
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                    timeout=15,
-                )
-                continue  # already installed in system Python
-            except Exception:
-                pass
-
-        try:
-            subprocess.check_call(
-                [str(pip_python), "-m", "pip", "install", "--quiet", pkg],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                timeout=120,
-            )
-            installed_any = True
-            logger.info(f"[REQUIREMENTS] Installed '{pkg}'")
-        except Exception as e:
-            logger.warning(f"[REQUIREMENTS] Failed to install '{pkg}': {e}")
-
-    # Refresh import caches so in-process exec() can find new packages.
-    if installed_any:
-        importlib.invalidate_caches()
+    try:
+        get_resolver(pip_python).ensure(requirements)
+    except Exception as e:
+        logger.warning(f"[REQUIREMENTS] Failed to install {normalize_requirements(requirements)}: {e}")
 
 
 def _suppress_worker_stdio():
@@ -192,16 +193,103 @@ def _restore_worker_stdio(saved_stdout, saved_stderr):
     os.close(saved_stderr)
 
 
+def _build_venv_quietly(venv_dir: str) -> None:
+    """
+    Creates a sandbox venv with worker stdio suppressed.
+    Runs in a SEPARATE PROCESS via ProcessPoolExecutor.
+    """
+    saved_stdout, saved_stderr = _suppress_worker_stdio()
+    try:
+        create_venv(Path(venv_dir))
+    finally:
+        _restore_worker_stdio(saved_stdout, saved_stderr)
+
+
+_SANDBOX_POOL: VenvPool | None = None
+_SANDBOX_POOL_LOCK = threading.Lock()
+
+
+def get_sandbox_pool() -> VenvPool | None:
+    """
+    Returns the process-wide warm venv pool, starting it on first use.
+
+    The pool size comes from ``AGENT_SANDBOX_POOL_SIZE`` (default 2);
+    ``0`` disables pooling and every sandboxed call builds its own venv.
+    """
+    global _SANDBOX_POOL
+    with _SANDBOX_POOL_LOCK:
+        if _SANDBOX_POOL is None:
+            try:
+                size = int(os.getenv(SANDBOX_POOL_SIZE_ENV, DEFAULT_POOL_SIZE))
+            except ValueError:
+                size = DEFAULT_POOL_SIZE
+            if size <= 0:
+                return None
+            _SANDBOX_POOL = VenvPool(
+                Path(tempfile.gettempdir()) / f"action_venv_pool_{os.getpid()}",
+                size=size,
+                builder=lambda path: PROCESS_POOL.submit(_build_venv_quietly, str(path)).result(),
+            )
+        return _SANDBOX_POOL
+
+
+def _build_requirements_env_quietly(venv_dir: str, requirements: List[str], system_site_packages: bool) -> None:
+    """
+    Builds a requirements environment with worker stdio suppressed.
+    Runs in a SEPARATE PROCESS via ProcessPoolExecutor.
+    """
+    saved_stdout, saved_stderr = _suppress_worker_stdio()
+    try:
+        build_requirements_env(Path(venv_dir), requirements, system_site_packages)
+    finally:
+        _restore_worker_stdio(saved_stdout, saved_stderr)
+
+
+_REQUIREMENTS_ENVS: RequirementsEnvCache | None = None
+
+
+def get_requirements_env_cache() -> RequirementsEnvCache:
+    """
+    Returns the process-wide cache of requirements-keyed sandbox venvs.
+
+    Environments live in ``AGENT_SANDBOX_ENV_DIR`` (default
+    ``~/.cache/agent_sandbox_envs``) and are evicted LRU once they exceed
+    ``AGENT_SANDBOX_ENV_QUOTA_MB`` (default 4096).
+    """
+    global _REQUIREMENTS_ENVS
+    with _SANDBOX_POOL_LOCK:
+        if _REQUIREMENTS_ENVS is None:
+            try:
+                quota_mb = int(os.getenv(SANDBOX_ENV_QUOTA_ENV, DEFAULT_ENV_QUOTA_MB))
+            except ValueError:
+                quota_mb = DEFAULT_ENV_QUOTA_MB
+            root = os.getenv(SANDBOX_ENV_DIR_ENV) or Path.home() / ".cache" / "agent_sandbox_envs"
+            _REQUIREMENTS_ENVS = RequirementsEnvCache(
+                Path(root),
+                quota_bytes=quota_mb * 1024 * 1024,
+                builder=lambda path, reqs, system_site: PROCESS_POOL.submit(
+                    _build_requirements_env_quietly, str(path), reqs, system_site
+                ).result(),
+            )
+        return _REQUIREMENTS_ENVS
+
+
 def _atomic_action_venv_process(
     action_code: str,
     input_data: dict,
-    timeout: int,
+    timeout: float,
     mode: str,
+    python_bin: str | None = None,
+    limits: ExecutionLimits | None = None,
 ) -> dict:
     """
-    Executes an action inside an ephemeral virtual environment.
+    Executes an action inside a virtual environment.
     Runs in a SEPARATE PROCESS via ProcessPoolExecutor.
 
+    ``python_bin`` points at a pre-built pooled venv; when omitted an
+    ephemeral venv is created for this call only. The action's interpreter
+    is capped by ``limits``.
+
     stdout/stderr are suppressed at the OS level so that venv creation
     and other subprocess calls do not corrupt the parent's TUI.
     """
@@ -217,15 +305,11 @@ def _atomic_action_venv_process(
         with tempfile.TemporaryDirectory(prefix="action_venv_") as tmpdir:
             tmp = Path(tmpdir)
 
-            # ─── Create virtual environment ───
-            venv_dir = tmp / "venv"
-            venv.EnvBuilder(with_pip=True).create(venv_dir)
-
-            python_bin = (
-                venv_dir / "Scripts" / "python.exe"
-                if os.name == "nt"
-                else venv_dir / "bin" / "python"
-            )
+            # ─── Create virtual environment (unless a pooled one was given) ───
+            if python_bin is None:
+                venv_dir = tmp / "venv"
+                create_venv(venv_dir)
+                python_bin = venv_python(venv_dir)
 
             # ─── Write action script ───
             # We inject input_data as a global so the action code can access it
@@ -271,17 +355,19 @@ except Exception as e:
                 encoding="utf-8",
             )
 
-            proc = subprocess.run(
+            returncode, stdout, stderr, usage = run_process(
                 [str(python_bin), str(action_file)],
-                capture_output=True,
-                text=True,
                 timeout=timeout,
+                limits=limits,
             )
 
             return {
-                "stdout": proc.stdout.strip(),
-                "stderr": proc.stderr.strip(),
-                "returncode": proc.returncode,
+                "stdout": stdout.text().strip(),
+                "stderr": stderr.text().strip(),
+                "returncode": returncode,
+                **stdout.handle(),
+                **stderr.handle(),
+                USAGE_RESULT_KEY: usage.as_dict(),
             }
 
     except subprocess.TimeoutExpired:
@@ -291,11 +377,127 @@ except Exception as e:
     finally:
         _restore_worker_stdio(saved_stdout, saved_stderr)
 
+def _internal_subprocess_result(
+    returncode: int, stdout: str, stderr: str, handles: dict | None = None
+) -> dict:
+    """
+    Turns the output of an out-of-process internal action into its result dict.
+
+    ``handles`` holds ``stdout_file`` / ``stdout_bytes`` when stdout outgrew
+    its preview; the JSON result is then read back from the spill file's
+    last line, and a non-JSON output is returned as the preview plus the
+    handles.
+    """
+    if returncode != 0:
+        err = stderr.strip() or f"Action exited with code {returncode}"
+        return {"status": "error", "message": err}
+
+    stdout = stdout.strip()
+    if not stdout:
+        return {"status": "success", "output": ""}
+
+    spilled = (handles or {}).get("stdout_file")
+    if spilled:
+        try:
+            return json.loads(read_last_line(spilled))
+        except (OSError, json.JSONDecodeError):
+            return {
+                "status": "success",
+                "output": stdout,
+                "stdout_file": spilled,
+                "stdout_bytes": handles.get("stdout_bytes"),
+            }
+
+    try:
+        return json.loads(stdout)
+    except json.JSONDecodeError:
+        return {"status": "success", "output": stdout}
+
+
+_SANDBOX_WORKERS: SandboxWorkerPool | None = None
+_SANDBOX_WORKERS_DISABLED = False
+
+
+def get_sandbox_workers() -> SandboxWorkerPool | None:
+    """
+    Returns the process-wide pool of persistent sandbox worker interpreters.
+
+    Disabled with ``AGENT_SANDBOX_WORKERS=0``, in which case every
+    sandboxed or frozen-mode action spawns its own interpreter. Workers are
+    recycled after ``AGENT_SANDBOX_WORKER_MAX_JOBS`` jobs (default 100).
+    """
+    global _SANDBOX_WORKERS, _SANDBOX_WORKERS_DISABLED
+    with _SANDBOX_POOL_LOCK:
+        if _SANDBOX_WORKERS is None and not _SANDBOX_WORKERS_DISABLED:
+            if os.getenv(SANDBOX_WORKERS_ENV, "1").strip().lower() in ("0", "false", "no"):
+                _SANDBOX_WORKERS_DISABLED = True
+                return None
+            try:
+                max_jobs = int(os.getenv(SANDBOX_WORKER_MAX_JOBS_ENV, DEFAULT_MAX_JOBS))
+            except ValueError:
+                max_jobs = DEFAULT_MAX_JOBS
+            _SANDBOX_WORKERS = SandboxWorkerPool(max_jobs=max_jobs)
+            atexit.register(_SANDBOX_WORKERS.close)
+        return _SANDBOX_WORKERS
+
+
+_INTERNAL_RUNNER: InternalActionRunner | None = None
+
+
+def get_internal_runner() -> InternalActionRunner:
+    """
+    Returns the process-wide thread pool for in-process actions.
+
+    Its size is read from ``AGENT_INTERNAL_ACTION_THREADS`` (default 8).
+    """
+    global _INTERNAL_RUNNER
+    with _SANDBOX_POOL_LOCK:
+        if _INTERNAL_RUNNER is None:
+            try:
+                threads = int(os.getenv(INTERNAL_ACTION_THREADS_ENV, DEFAULT_INTERNAL_ACTION_THREADS))
+            except ValueError:
+                threads = DEFAULT_INTERNAL_ACTION_THREADS
+            _INTERNAL_RUNNER = InternalActionRunner(max_workers=threads)
+            atexit.register(_INTERNAL_RUNNER.close)
+        return _INTERNAL_RUNNER
+
+
+def _sandboxed_worker_job(
+    workers: SandboxWorkerPool,
+    pool: VenvPool | None,
+    env_cache: RequirementsEnvCache | None,
+    pip_requirements: List[str],
+    action_code: str,
+    input_data: dict,
+    timeout: int,
+) -> dict:
+    """Runs a sandboxed action on a persistent worker bound to its environment."""
+    if env_cache is not None:
+        return workers.run(
+            ("requirements", tuple(pip_requirements)),
+            lambda: env_cache.acquire(pip_requirements),
+            lambda env, reusable: env_cache.release(env),
+            action_code,
+            input_data,
+            timeout,
+        )
+    return workers.run(
+        "default",
+        pool.acquire,
+        lambda env, reusable: pool.release(env, reusable=reusable),
+        action_code,
+        input_data,
+        timeout,
+        env_is_clean=pool.is_healthy,
+    )
+
+
 def _atomic_action_internal_subprocess(
     action_code: str,
     input_data: dict,
     python_bin: str,
-    timeout: int = 300,
+    timeout: float = 300,
+    limits: ExecutionLimits | None = None,
 ) -> dict:
     """
     Run an 'internal' action via the system Python as a subprocess.
@@ -350,25 +552,13 @@ except Exception as e:
         )
 
         try:
-            proc = subprocess.run(
-                [python_bin, str(action_file)],
-                capture_output=True,
-                text=True,
-                timeout=timeout,
+            returncode, stdout, stderr, usage = run_process(
+                [python_bin, str(action_file)], timeout=timeout, limits=limits,
             )
 
-            if proc.returncode != 0:
-                err = proc.stderr.strip() or f"Action exited with code {proc.returncode}"
-                return {"status": "error", "message": err}
-
-            stdout = proc.stdout.strip()
-            if not stdout:
-                return {"status": "success", "output": ""}
-
-            try:
-                return json.loads(stdout)
-            except json.JSONDecodeError:
-                return {"status": "success", "output": stdout}
+            result = _internal_subprocess_result(returncode, stdout.text(), stderr.text(), stdout.handle())
+            result[USAGE_RESULT_KEY] = usage.as_dict()
+            return result
 
         except subprocess.TimeoutExpired:
             return {"status": "error", "message": "Execution timed out"}
@@ -376,14 +566,101 @@ except Exception as e:
             return {"status": "error", "message": str(e)}
 
 
+# ============================================
+# Compiled code cache for in-process actions
+# ============================================
+
+class CompiledActionCache:
+    """
+    LRU cache of compiled action code objects keyed by hash(action name, code).
+
+    Internal actions run the same source over and over; caching the code
+    object skips parsing and compiling on every call. Each call still execs
+    the cached code into a fresh namespace, so runs stay isolated.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, CodeType]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(action_name: str, action_code: str) -> str:
+        return hashlib.sha256(f"{action_name}\0{action_code}".encode("utf-8")).hexdigest()
+
+    def get(self, action_name: str, action_code: str) -> CodeType:
+        """Return the compiled code for ``action_code``, compiling it on a miss."""
+        key = self._key(action_name, action_code)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        code = compile(action_code, f"<action {action_name}>", "exec")
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (action_name, code)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return code
+
+    def invalidate(self, action_name: Optional[str] = None) -> None:
+        """Drop cached code for ``action_name``, or everything when omitted."""
+        with self._lock:
+            if action_name is None:
+                self._entries.clear()
+                return
+            for key in [k for k, (name, _) in self._entries.items() if name == action_name]:
+                del self._entries[key]
+
+
+COMPILED_ACTION_CACHE = CompiledActionCache()
+registry_instance.add_registration_listener(COMPILED_ACTION_CACHE.invalidate)
+
+
+def prepare_action(action: Any) -> None:
+    """
+    Warm what running ``action`` will need: its compiled code and installed
+    requirements, or its requirements environment.
+
+    Blocking. The action router calls it in a thread as soon as a streamed
+    decision names the action, so this work overlaps the rest of the
+    model's reply. Failures are left for the run itself to report.
+    """
+    execution_mode = getattr(action, "execution_mode", "sandboxed")
+    mode = getattr(action, "mode", "CLI")
+    requirements = getattr(action, "requirements", []) or []
+    try:
+        if execution_mode == "internal":
+            if requirements:
+                _ensure_requirements(requirements)
+            if mode != "GUI":
+                COMPILED_ACTION_CACHE.get(action.name, action.code)
+        elif execution_mode == "sandboxed" and mode != "GUI":
+            pip_requirements = normalize_requirements(requirements)
+            if pip_requirements:
+                get_requirements_env_cache().get(pip_requirements)
+    except Exception as e:
+        logger.debug(f"[PREPARE] Could not prepare {action.name}: {e}")
+
+
 def _atomic_action_internal(
     action_name: str,
     action_code: str,
     input_data: dict,
     mode: str,
+    cancel_event: Optional[threading.Event] = None,
 ) -> dict:
     """
     Executes an internal action in-process.
+
+    ``cancel_event`` is exposed to the action code under the same name so
+    long-running actions can stop early once their run is cancelled.
     """
     try:
         # Execute the function definition
@@ -391,17 +668,15 @@ def _atomic_action_internal(
             result = GUIHandler.execute_action(GUIHandler.TARGET_CONTAINER, action_code, input_data, mode)
             return result
         else:
-            import json
-            import inspect
-
             local_ns = {
                 "input_data": input_data,
                 "json": json,
                 "asyncio": asyncio,
+                "cancel_event": cancel_event or threading.Event(),
             }
             pre_exec_keys = set(local_ns.keys())
 
-            exec(action_code, local_ns, local_ns)
+            exec(COMPILED_ACTION_CACHE.get(action_name, action_code), local_ns, local_ns)
 
             function_to_call = None
             for key, value in local_ns.items():
@@ -427,13 +702,15 @@ def _atomic_action_internal(
 class ActionExecutor:
     def __init__(self):
         self._inflight = {}
+        # Start warming sandbox venvs in the background right away
+        get_sandbox_pool()
 
     async def execute_atomic_action(
         self,
         action: Any, # Usually 'Action'
         input_data: dict,
         *,
-        timeout: int = 1800,
+        timeout: float = DEFAULT_TIMEOUT_CEILING,
     ) -> dict:
         execution_mode = getattr(action, "execution_mode", "sandboxed")
         mode = getattr(action, "mode", "CLI")
@@ -441,6 +718,12 @@ class ActionExecutor:
         logger.debug(f"[EXECTION CODE] {action.code}")
 
         frozen = getattr(sys, "frozen", False)
+        # In-process measurement; reports from where the action ran win.
+        measured = None
+        current_usage.set(None)
+        # Persistent workers are shared between actions and cannot be capped
+        # per run; capped actions get an interpreter of their own.
+        limits = ExecutionLimits.for_action(action)
 
         # Pre-install declared pip requirements
         if requirements and execution_mode == "internal":
@@ -456,18 +739,80 @@ class ActionExecutor:
                 # Frozen exe: C-extension packages can't load in the
                 # bundled runtime.  Run via the system Python instead.
                 system_python = _find_system_python()
-                if system_python:
+                workers = get_sandbox_workers() if not limits else None
+                if system_python and workers is not None:
+                    system_env = PooledVenv(
+                        path=Path(system_python).parent, python_bin=Path(system_python), baseline=frozenset()
+                    )
+                    raw = await asyncio.get_running_loop().run_in_executor(
+                        None,
+                        functools.partial(
+                            workers.run,
+                            ("system", system_python),
+                            lambda: system_env,
+                            lambda env, reusable: None,
+                            action.code,
+                            input_data,
+                            timeout,
+                        ),
+                    )
+                    result = _internal_subprocess_result(raw["returncode"], raw["stdout"], raw["stderr"], raw)
+                    result[USAGE_RESULT_KEY] = raw.get(USAGE_RESULT_KEY)
+                elif system_python:
                     result = _atomic_action_internal_subprocess(
-                        action.code, input_data, system_python, timeout,
+                        action.code, input_data, system_python, timeout, limits,
                     )
                 else:
                     result = {"status": "error", "message": "No system Python found; cannot run internal action from frozen exe."}
+            elif needs_framework:
+                # Framework actions drive loop-bound state (task manager,
+                # TUI) through nest_asyncio and stay on the loop thread.
+                with ThreadMeter() as meter:
+                    result = _atomic_action_internal(action.name, action.code, input_data, mode)
+                measured = meter.usage
             else:
-                result = _atomic_action_internal(action.name, action.code, input_data, mode)
+                result = await get_internal_runner().run(
+                    functools.partial(_atomic_action_internal, action.name, action.code, input_data, mode),
+                    timeout=timeout,
+                    label=action.name,
+                )
 
         elif execution_mode == "sandboxed":
             loop = asyncio.get_running_loop()
+            pip_requirements = normalize_requirements(requirements) if mode != "GUI" else []
+            # Actions with requirements get their persistent environment;
+            # the rest share the warm pool of plain venvs.
+            pool = get_sandbox_pool() if mode != "GUI" and not pip_requirements else None
+            env_cache = get_requirements_env_cache() if pip_requirements else None
+            workers = get_sandbox_workers() if mode != "GUI" and not limits else None
+            if workers is not None and (env_cache is not None or pool is not None):
+                try:
+                    result = await asyncio.wait_for(
+                        loop.run_in_executor(
+                            None,
+                            _sandboxed_worker_job,
+                            workers,
+                            pool,
+                            env_cache,
+                            pip_requirements,
+                            action.code,
+                            input_data,
+                            timeout,
+                        ),
+                        timeout=timeout + 5,
+                    )
+                except asyncio.TimeoutError:
+                    return {"status": "error", "message": f"Execution timed out after {timeout}s while running sandboxed action."}
+                publish_usage(result)
+                return result
+
+            sandbox: PooledVenv | None = None
+            reusable = False
             try:
+                if env_cache is not None:
+                    sandbox = await loop.run_in_executor(None, env_cache.acquire, pip_requirements)
+                elif pool is not None:
+                    sandbox = await loop.run_in_executor(None, pool.acquire)
                 result = await asyncio.wait_for(
                     loop.run_in_executor(
                         PROCESS_POOL,
@@ -476,14 +821,24 @@ class ActionExecutor:
                         input_data,
                         timeout,
                         mode,
+                        str(sandbox.python_bin) if sandbox else None,
+                        limits,
                     ),
                     timeout=timeout + 5,
                 )
+                reusable = True
             except asyncio.TimeoutError:
                 return {"status": "error", "message": f"Execution timed out after {timeout}s while running sandboxed action."}
+            finally:
+                # A timed-out action may still be running inside the venv.
+                if sandbox is not None and env_cache is not None:
+                    env_cache.release(sandbox)
+                elif sandbox is not None:
+                    pool.release(sandbox, reusable=reusable)
         else:
             raise ValueError(f"Unknown execution_mode: {execution_mode}")
 
+        publish_usage(result, measured)
         return result
 
     async def execute_action(
@@ -498,7 +853,17 @@ class ActionExecutor:
             if getattr(action, "action_type", "atomic") != "atomic":
                 raise ValueError("Only atomic actions supported")
 
-            return await self.execute_atomic_action(action, input_data)
+            timeout = ACTION_TIMEOUTS.timeout_for(action)
+            started = time.perf_counter()
+            result = await self.execute_atomic_action(action, input_data, timeout=timeout)
+            elapsed = time.perf_counter() - started
+
+            if elapsed >= timeout:
+                logger.warning(f"[ACTION TIMEOUT] {action.name} was stopped after {timeout:.0f}s")
+                ACTION_TIMEOUTS.record_timeout(action.name)
+            elif not is_failure(result) and (not isinstance(result, dict) or result.get("returncode", 0) == 0):
+                ACTION_TIMEOUTS.record(action.name, elapsed)
+            return result
 
         finally:
             self._inflight.pop(run_id, None)
\ No newline at end of file
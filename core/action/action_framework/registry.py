@@ -1,7 +1,8 @@
 # core/action/action_framework/registry.py
+import copy
 import functools
 import platform as platform_lib
-from typing import List, Dict, Any, Optional, Callable, Union
+from typing import List, Dict, Any, Optional, Callable, Tuple, Union
 from dataclasses import dataclass, field
 import logging
 import inspect
@@ -59,6 +60,13 @@ def _strip_decorator(source_code: str) -> str:
         logger.warning(f"Could not strip decorator: {e}")
         return source_code
 
+def _extract_source(handler: Callable) -> str:
+    """Returns the dedented source of ``handler`` without its decorators."""
+    # getsource returns the raw code, including indentation
+    raw_code = inspect.getsource(handler)
+    # dedent removes leading common whitespace to make it clean
+    return _strip_decorator(textwrap.dedent(raw_code))
+
 @dataclass
 class ActionMetadata:
     """Holds configuration data defining the action contract."""
@@ -74,12 +82,20 @@ class ActionMetadata:
     output_schema: Dict[str, Any] = field(default_factory=dict)
     requirements: List[str] = field(default_factory=list)
     test_payload: Optional[Dict[str, Any]] = None
+    # Read-only action whose result may be memoised by inputs and referenced file/URL state.
+    cacheable: bool = False
+    # Fixed timeout in seconds; None derives it from past run durations.
+    timeout: Optional[float] = None
+    # "cpu_seconds" / "memory_mb" caps for subprocess-backed runs.
+    limits: Optional[Dict[str, Optional[int]]] = None
 
 @dataclass
 class RegisteredAction:
     """Combines the actual Python callable with its metadata."""
     handler: Callable[..., Dict[str, Any]]
     metadata: ActionMetadata
+    # Source of the handler without decorators, extracted once at registration.
+    code: Optional[str] = None
 
 class ActionRegistry:
     """Singleton registry to hold all discovered actions."""
@@ -95,6 +111,17 @@ class ActionRegistry:
     # }
     _registry: Dict[str, Dict[str, RegisteredAction]] = {}
 
+    # JSON form of each logical action per target platform:
+    # { ("logical_action_name", "linux"): {...} }
+    # Entries of an action are rebuilt whenever one of its implementations is registered.
+    _json_cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    # Bumped on every registration so callers can invalidate derived caches.
+    version: int = 0
+
+    # Callbacks invoked with the action name whenever an implementation is registered.
+    _listeners: List[Callable[[str], None]] = []
+
     def __new__(cls):
         # Ensure singleton pattern
         if cls._instance is None:
@@ -107,6 +134,13 @@ class ActionRegistry:
         
         if name not in self._registry:
             self._registry[name] = {}
+
+        if action_def.code is None:
+            try:
+                action_def.code = _extract_source(action_def.handler)
+            except Exception as e:
+                logger.error(f"Could not extract source for action '{name}': {e}")
+                action_def.code = f"# Error extracting source code: {e}"
             
         for platform in action_def.metadata.platforms:
             platform_key = platform.lower()
@@ -117,6 +151,23 @@ class ActionRegistry:
             self._registry[name][platform_key] = action_def
             logger.debug(f"Registered '{name}' for platform: '{platform_key}'")
 
+        # Drop stale serialized forms and rebuild the one for this OS up front
+        for key in [key for key in self._json_cache if key[0] == name]:
+            del self._json_cache[key]
+        ActionRegistry.version += 1
+        self._cached_action_json(name, platform_lib.system().lower())
+
+        for listener in list(self._listeners):
+            try:
+                listener(name)
+            except Exception as e:
+                logger.warning(f"Registration listener failed for '{name}': {e}")
+
+    def add_registration_listener(self, listener: Callable[[str], None]) -> None:
+        """Calls ``listener(action_name)`` whenever an action (re-)registers, e.g. to drop caches."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
     def get_action_implementation(self, name: str, target_platform: Optional[str] = None) -> Optional[RegisteredAction]:
         """
         Retrieves the best fit action implementation.
@@ -185,44 +236,37 @@ class ActionRegistry:
         It extracts the actual source code of the functions using the 'inspect' module.
         """
         current_os = platform_lib.system().lower()
-        json_actions_list = []
-        
-        for logical_name, platform_impls in self._registry.items():
-            action_json = self._get_action_as_json(platform_impls=platform_impls)
-            json_actions_list.append(action_json)
-            
-        return json_actions_list
+        return [copy.deepcopy(self._cached_action_json(name, current_os)) for name in self._registry]
 
     def find_action_by_name(self, action_name: str) -> Dict[str, Any]:
         if action_name not in self._registry:
             return None
         
         current_os = platform_lib.system().lower()
-        platform_impls = self._registry[action_name]
+        return copy.deepcopy(self._cached_action_json(action_name, current_os))
 
-        return self._get_action_as_json(platform_impls=platform_impls)
+    def _cached_action_json(self, action_name: str, target_platform: str) -> Dict[str, Any]:
+        """Returns the shared serialized form of an action, building it on first use; callers get a deep copy."""
+        key = (action_name, target_platform)
+        action_json = self._json_cache.get(key)
+        if action_json is None:
+            action_json = self._get_action_as_json(self._registry[action_name], target_platform)
+            self._json_cache[key] = action_json
+        return action_json
 
-    def _get_action_as_json(self, platform_impls) -> Dict[str, Any]:
-        main_impl = platform_impls.get(platform_lib.system().lower())
+    def _get_action_as_json(self, platform_impls, target_platform: Optional[str] = None) -> Dict[str, Any]:
+        if target_platform is None:
+            target_platform = platform_lib.system().lower()
+        main_impl = platform_impls.get(target_platform)
         if not main_impl:
             main_impl = platform_impls.get(PLATFORM_ALL)
         if not main_impl:
             main_impl = next(iter(platform_impls.values()))
 
         meta = main_impl.metadata
-        logical_name = meta.name
 
-        # 1. Extract source code for the main implementation
-        try:
-            # getsource returns the raw code, including indentation
-            raw_code = inspect.getsource(main_impl.handler)
-            # dedent removes leading common whitespace to make it clean
-            dedented_code = textwrap.dedent(raw_code)
-            # Strip decorator from the code
-            main_code_str = _strip_decorator(dedented_code)
-        except Exception as e:
-            logger.error(f"Could not extract source for action '{logical_name}': {e}")
-            main_code_str = f"# Error extracting source code: {e}"
+        # 1. Source code for the main implementation (extracted at registration)
+        main_code_str = main_impl.code
 
 
         # 2. Build the base JSON structure with required hardcoded fields
@@ -241,6 +285,9 @@ class ActionRegistry:
             "input_schema": meta.input_schema,
             "output_schema": meta.output_schema,
             "requirements": meta.requirements,
+            "cacheable": meta.cacheable,
+            "timeout": meta.timeout,
+            "limits": meta.limits,
             # The extracted source code string
             "code": main_code_str,
             "platform_overrides": {}
@@ -252,17 +299,9 @@ class ActionRegistry:
             if impl == main_impl:
                 continue
             
-            try:
-                override_raw = inspect.getsource(impl.handler)
-                override_dedented = textwrap.dedent(override_raw)
-                # Strip decorator from the override code
-                override_code_str = _strip_decorator(override_dedented)
-                
-                action_json["platform_overrides"][platform_key] = {
-                    "code": override_code_str
-                }
-            except Exception as e:
-                    logger.warning(f"Could not extract override source for {logical_name} on {platform_key}: {e}")
+            action_json["platform_overrides"][platform_key] = {
+                "code": impl.code
+            }
 
         # Clean up empty overrides dict if unused
         if not action_json["platform_overrides"]:
@@ -286,11 +325,26 @@ def action(
     input_schema: Optional[Dict[str, Any]] = None,
     output_schema: Optional[Dict[str, Any]] = None,
     requirement: Optional[List[str]] = None,
-    test_payload: Optional[Dict[str, Any]] = None
+    test_payload: Optional[Dict[str, Any]] = None,
+    cacheable: bool = False,
+    timeout: Optional[float] = None,
+    max_cpu_seconds: Optional[int] = None,
+    max_memory_mb: Optional[int] = None,
 ):
     """
     Decorator used by developers to register functions as actions.
     This runs at import time, populating the registry.
+
+    Set ``cacheable=True`` only for read-only actions: repeated calls with the
+    same inputs are then served from the result cache for as long as the
+    files and URLs the inputs reference are unchanged. An input the action
+    falls back to when it is omitted (e.g. a default directory) must be
+    declared with a ``default`` in ``input_schema`` so the cache sees it.
+
+    ``timeout`` pins the action's timeout in seconds; by default it is derived
+    from the action's past run durations. ``max_cpu_seconds`` and
+    ``max_memory_mb`` cap runs that execute in their own interpreter
+    (sandboxed, or internal in a frozen build); in-process runs are not capped.
     """
     # Normalize platforms input to a list of lowercase strings
     if platforms is None:
@@ -313,7 +367,14 @@ def action(
             input_schema=input_schema or {},
             output_schema=output_schema or {},
             requirements=requirement or [],
-            test_payload=test_payload
+            test_payload=test_payload,
+            cacheable=cacheable,
+            timeout=timeout,
+            limits=(
+                {"cpu_seconds": max_cpu_seconds, "memory_mb": max_memory_mb}
+                if max_cpu_seconds is not None or max_memory_mb is not None
+                else None
+            ),
         )
         
         # 2. Create the full registration object
@@ -9,10 +9,11 @@ Author: zfoong
 
 import datetime
 import json
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from core.database_interface import DatabaseInterface
 from core.action.action import Action
+from core.action.action_framework.registry import registry_instance
 from core.logger import logger
 
 class ActionLibrary:
@@ -31,6 +32,21 @@ class ActionLibrary:
         self.llm_interface = llm_interface
         self.db_interface = db_interface
 
+        # Hydrated actions, valid for one registry version
+        self._action_cache: Dict[str, Optional[Action]] = {}
+        self._default_actions: Optional[List[Action]] = None
+        self._cache_version = registry_instance.version
+
+    def _check_cache(self) -> None:
+        if self._cache_version != registry_instance.version:
+            self.invalidate_cache()
+
+    def invalidate_cache(self) -> None:
+        """Forget hydrated actions; called when the action catalog changes."""
+        self._action_cache.clear()
+        self._default_actions = None
+        self._cache_version = registry_instance.version
+
     def store_action(self, action: Action):
         """
         Persist an action definition and stamp its update time.
@@ -41,6 +57,7 @@ class ActionLibrary:
         action_dict = action.to_dict()
         action_dict["updatedAt"] = datetime.datetime.utcnow().isoformat()
         self.db_interface.store_action(action_dict)
+        self.invalidate_cache()
 
     def retrieve_action(self, action_name: str) -> Optional[Action]:
         """
@@ -52,10 +69,11 @@ class ActionLibrary:
         Returns:
             Optional[Action]: Hydrated action instance if found, otherwise ``None``.
         """
-        action_data = self.db_interface.get_action(action_name)
-        if action_data:
-            return Action.from_dict(action_data)
-        return None
+        self._check_cache()
+        if action_name not in self._action_cache:
+            action_data = self.db_interface.get_action(action_name)
+            self._action_cache[action_name] = Action.from_dict(action_data) if action_data else None
+        return self._action_cache[action_name]
 
     def retrieve_default_action(self) -> List[Action]:
         """
@@ -65,8 +83,11 @@ class ActionLibrary:
         Returns:
             List[Action]: All default actions stored in the database.
         """
-        docs = self.db_interface.list_actions(default=True)
-        return [Action.from_dict(doc) for doc in docs]
+        self._check_cache()
+        if self._default_actions is None:
+            docs = self.db_interface.list_actions(default=True)
+            self._default_actions = [Action.from_dict(doc) for doc in docs]
+        return list(self._default_actions)
 
     def get_default_action_names(self) -> set[str]:
         return {
@@ -90,3 +111,4 @@ class ActionLibrary:
     def delete_action(self, action_name: str):
         """Deletes an action from both MongoDB and ChromaDB."""
         self.db_interface.delete_action(action_name)
+        self.invalidate_cache()
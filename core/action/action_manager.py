@@ -6,6 +6,7 @@ Created on Thu Mar 27 21:27:43 2025
 """
 
 from datetime import datetime
+import os
 import platform
 import time
 import json
@@ -14,7 +15,12 @@ import nest_asyncio
 from typing import Optional, List, Dict, Any
 from core.action.action_library import ActionLibrary
 from core.action.action import Action
+from core.action.action_dag import DEFAULT_SUBACTION_CONCURRENCY, SUBACTION_CONCURRENCY_ENV, is_failure, run_dag
 from core.action.action_executor import ActionExecutor
+from core.action.output_spool import cap_outputs, preview, read_last_line
+from core.action.resource_usage import ResourceUsage, current_usage
+from core.action.timeouts import ACTION_TIMEOUTS
+from core.action.result_cache import ACTION_RESULT_CACHE, Uncacheable, result_cache_key, with_input_defaults
 import io
 import sys
 import re
@@ -72,6 +78,8 @@ class ActionManager:
         self._inflight: dict[str, dict] = {}
         self.state_manager = state_manager
         self.executor = ActionExecutor()
+        # Adaptive timeouts start from the durations already in history.
+        ACTION_TIMEOUTS.attach_history(db_interface.recent_action_durations)
 
     # ------------------------------------------------------------------
     # Public helpers
@@ -88,6 +96,7 @@ class ActionManager:
         is_gui_task: bool = False,
         *,
         input_data: Optional[dict] = None,
+        log_events: bool = True,
     ) -> dict: 
         """
         Execute an action and persist the full run lifecycle.
@@ -107,6 +116,8 @@ class ActionManager:
                 active task workflow (controls logging behavior).
             input_data: Pre-resolved action inputs. If omitted, inputs are
                 gathered by prompting the LLM.
+            log_events: Log start and end events to the event stream. Batches
+                disable this and log one consolidated event instead.
 
         Returns:
             dict: Final output payload of the action execution, including
@@ -155,7 +166,7 @@ class ActionManager:
 
         logger.info(f"Action {action.name} marked as in-flight.")
         
-        if is_running_task:
+        if is_running_task and log_events:
             self._log_event_stream(
                 is_gui_task=is_gui_task,
                 event_type="action_start",
@@ -172,20 +183,35 @@ class ActionManager:
             # ────────────────────────────────────────────────────────────
                     
             status = ""
+            cache_status = None
+            current_usage.set(None)
+            exec_started = time.perf_counter()
 
             logger.debug(f"Action type: {action.action_type}")
             
             if action.action_type == "atomic":
-                try:
-                    outputs = await self.execute_atomic_action(action, input_data)
-                except Exception as e:
-                    logger.error(f"[ERROR] Failed to execute atomic action {action.name}: {e}", exc_info=True)
-                    raise e
+                cache_key = None
+                cached = None
+                if getattr(action, "cacheable", False):
+                    # The key must see the values the action will actually use.
+                    input_data = with_input_defaults(action.input_schema, input_data)
+                    cache_key, cached = await self._lookup_cached_result(action, input_data)
+                    cache_status = "hit" if cached is not None else ("miss" if cache_key else "bypass")
+
+                if cached is not None:
+                    logger.debug(f"[ACTION CACHE] Serving {action.name} from the result cache")
+                    outputs = cached
+                else:
+                    try:
+                        outputs = await self.execute_atomic_action(action, input_data)
+                    except Exception as e:
+                        logger.error(f"[ERROR] Failed to execute atomic action {action.name}: {e}", exc_info=True)
+                        raise e
 
-                logger.debug(f"[OUTPUT DATA] Completed execute_atomic_action: {outputs}")
+                logger.debug(f"[OUTPUT DATA] Completed execute_atomic_action: {preview(outputs)}")
 
                 # ────────────── Observation step ──────────────
-                if action.observer:
+                if cached is None and action.observer:
                     obs_result = await self.run_observe_step(action, outputs)
                     if not obs_result["success"]:
                         status = "error"
@@ -198,6 +224,9 @@ class ActionManager:
                             "success": True,
                             "message": obs_result.get("message")
                         }
+
+                if cache_key and cached is None and status != "error" and not is_failure(outputs):
+                    ACTION_RESULT_CACHE.put(cache_key, outputs)
     
             else:
                 logger.debug(f"Executing divisible action: {action.name}")
@@ -209,7 +238,7 @@ class ActionManager:
                     logger.error(f"[ERROR] Failed to execute divisible action {action.name}: {e}", exc_info=True)
                     raise e
 
-            logger.debug(f"[OUTPUT DATA] Final outputs for action {action.name}: {outputs}")
+            logger.debug(f"[OUTPUT DATA] Final outputs for action {action.name}: {preview(outputs)}")
 
             if status != "error":  # Only mark as success if no errors raised and observation passed
                 status = "success"
@@ -227,6 +256,10 @@ class ActionManager:
             pass
 
         ended_at = datetime.utcnow().isoformat()
+        resources = self._resource_usage(action, cache_status, exec_started)
+        # History and events get a bounded preview; long strings are spilled
+        # to files referenced by ``<field>_file``. Callers get the outputs whole.
+        recorded = cap_outputs(outputs, action.name)
 
         # ────────────────────────────────────────────────────────────────
         # 3. Persist final state (success or error)
@@ -234,12 +267,12 @@ class ActionManager:
 
         logger.debug(f"Action {action.name} completed with status: {status}.")
         
-        if is_running_task:
+        if is_running_task and log_events:
             display_status = "failed" if status == "error" else "completed"
             self._log_event_stream(
                 is_gui_task=is_gui_task,
                 event_type="action_end",
-                event=f"Action {action.name} completed with output: {outputs}.",
+                event=f"Action {action.name} completed with output: {recorded}.",
                 display_message=f"{action.name} → {display_status}",
                 action_name=action.name,
             )
@@ -255,7 +288,7 @@ class ActionManager:
             #     )
             #     logger.debug(f"[ActionManager] Step {current_step.step_name} queued ({session_id})")
                 
-        else:
+        elif log_events:
             logger.warning(f"Action {action.name} completed with status: {status}. But no event stream manager to log to.")
         
         logger.debug(f"Persisting final state for action {action.name}...")
@@ -265,12 +298,14 @@ class ActionManager:
             run_id=run_id,
             action=action,
             inputs=input_data,
-            outputs=outputs,
+            outputs=recorded,
             status=status,
             started_at=started_at,
             ended_at=ended_at,
             parent_id=parent_id,
             session_id=session_id,
+            cache=cache_status,
+            resources=resources,
         )
         logger.debug(f"Final state for action {action.name} persisted.")
         # remove from in-flight after final persistence
@@ -280,6 +315,85 @@ class ActionManager:
 
         return outputs
 
+    async def execute_action_batch(
+        self,
+        batch: List[tuple[Action, dict]],
+        context: str,
+        event_stream: str,
+        parent_id: str | None = None,
+        session_id: str | None = None,
+        is_running_task: bool | None = False,
+        is_gui_task: bool = False,
+    ) -> dict:
+        """
+        Run independent actions selected in the same reasoning turn concurrently.
+
+        Every action is executed and persisted through :meth:`execute_action`,
+        but the event stream receives one consolidated start and end event for
+        the whole batch.
+
+        Args:
+            batch: ``(action, input_data)`` pairs in the order the model
+                selected them.
+            context: Textual context for the current conversation or task.
+            event_stream: Serialized event stream for the prompt passed to the LLM.
+            parent_id: Optional run identifier of the parent action.
+            session_id: Session identifier used for logging and persistence.
+            is_running_task: Whether the batch belongs to an active task.
+            is_gui_task: Whether events go to the GUI event stream.
+
+        Returns:
+            dict: ``{"actions": [{"action_name", "status", "output"}, ...]}``
+            in batch order.
+        """
+        names = [action.name for action, _ in batch]
+        if is_running_task:
+            described = "; ".join(f"{action.name} with input: {inputs}" for action, inputs in batch)
+            self._log_event_stream(
+                is_gui_task=is_gui_task,
+                event_type="action_start",
+                event=f"Running {len(batch)} actions concurrently: {described}.",
+                display_message=f"Running {', '.join(names)}",
+                action_name=", ".join(names),
+            )
+
+        outputs = await asyncio.gather(
+            *(
+                self.execute_action(
+                    action=action,
+                    context=context,
+                    event_stream=event_stream,
+                    parent_id=parent_id,
+                    session_id=session_id,
+                    is_running_task=is_running_task,
+                    is_gui_task=is_gui_task,
+                    input_data=inputs,
+                    log_events=False,
+                )
+                for action, inputs in batch
+            )
+        )
+
+        results = []
+        for name, output in zip(names, outputs):
+            results.append({"action_name": name, "status": "error" if is_failure(output) else "success", "output": output})
+
+        if is_running_task:
+            failures = sum(1 for r in results if r["status"] == "error")
+            summary = "; ".join(
+                f"{r['action_name']} completed with output: {cap_outputs(r['output'], r['action_name'])}"
+                for r in results
+            )
+            self._log_event_stream(
+                is_gui_task=is_gui_task,
+                event_type="action_end",
+                event=f"Batch of {len(batch)} actions finished. {summary}.",
+                display_message=f"{len(batch) - failures}/{len(batch)} actions completed",
+                action_name=", ".join(names),
+            )
+
+        return {"actions": results}
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
@@ -296,6 +410,8 @@ class ActionManager:
         ended_at: str | None,
         parent_id: str | None,
         session_id: str | None,
+        cache: str | None = None,
+        resources: dict | None = None,
     ) -> None:
         """Upsert a single history document keyed by *runId*."""
         self.db_interface.upsert_action_history(
@@ -309,8 +425,45 @@ class ActionManager:
             outputs=outputs,
             started_at=started_at,
             ended_at=ended_at,
+            cache=cache,
+            resources=resources,
         )
 
+    @staticmethod
+    def _resource_usage(action: Action, cache_status: str | None, started: float) -> dict:
+        """
+        Resource usage of the run that just finished, as stored in history.
+
+        Atomic runs are measured by the executor; cache hits and divisible
+        actions (whose sub-actions have their own records) only get wall time.
+        """
+        usage = current_usage.get()
+        if usage is None or cache_status == "hit":
+            if cache_status == "hit":
+                source = "cache"
+            elif action.action_type != "atomic":
+                source = "divisible"
+            else:
+                source = "unmeasured"
+            usage = ResourceUsage(wall_ms=(time.perf_counter() - started) * 1000, source=source)
+        return usage.as_dict()
+
+    async def _lookup_cached_result(self, action: Action, input_data: dict | None) -> tuple[str | None, dict | None]:
+        """
+        Fingerprint a cacheable call off the loop and look it up.
+
+        Returns:
+            ``(key, output)``; ``key`` is ``None`` when the inputs reference
+            something that cannot be fingerprinted, ``output`` is ``None`` on
+            a miss.
+        """
+        try:
+            key = await asyncio.to_thread(result_cache_key, action.name, action.code, input_data)
+        except Uncacheable as e:
+            logger.debug(f"[ACTION CACHE] Not caching {action.name}: {e}")
+            return None, None
+        return key, ACTION_RESULT_CACHE.get(key)
+
     def _log_event_stream(self, is_gui_task: bool, event_type: str, event: str, display_message: str, action_name: str) -> None:
         if is_gui_task:
             GUIHandler.gui_module.set_gui_event_stream(event)
@@ -331,7 +484,7 @@ class ActionManager:
         try:
             output = await self.executor.execute_action(action, input_data)
 
-            logger.debug(f"The action output is:\n{output}")
+            logger.debug(f"The action output is:\n{preview(output)}")
 
             # If there was an error, return it directly
             if "error" in output:
@@ -356,7 +509,14 @@ class ActionManager:
                     }
 
                 # Try to extract the JSON result printed by the action
-                # wrapper (it's the last JSON object in stdout).
+                # wrapper (it's the last JSON object in stdout). Spilled
+                # stdout only has a preview; read the last line back.
+                if output.get("stdout_file"):
+                    try:
+                        stdout_raw = read_last_line(output["stdout_file"])
+                    except OSError as e:
+                        logger.warning(f"[ACTION] Could not read spilled stdout: {e}")
+                        return output
                 if stdout_raw:
                     try:
                         parsed = self._parse_action_output(stdout_raw)
@@ -365,7 +525,7 @@ class ActionManager:
                     except Exception:
                         logger.debug("Could not parse JSON from sandboxed stdout; returning raw output.")
 
-            logger.debug(f"[ACTION] Parsed action output: {output}")
+            logger.debug(f"[ACTION] Parsed action output: {preview(output)}")
             return output
 
         except Exception as e:
@@ -415,17 +575,47 @@ class ActionManager:
             return parsed
 
     async def execute_divisible_action(self, action, input_data, parent_id):
-        results = {}
-        for sub in action.sub_actions:
-            results[sub.name] = await self.execute_action(
+        """
+        Run the sub-actions of ``action`` as a dependency graph.
+
+        Independent sub-actions run concurrently, up to
+        ``AGENT_SUBACTION_CONCURRENCY`` at a time (default 4). Input fields a
+        sub-action expects but ``input_data`` lacks are filled from the
+        outputs of its dependencies. Results are keyed by sub-action name in
+        declared order.
+        """
+        base_input = input_data if isinstance(input_data, dict) else None
+        sub_actions = action.sub_actions
+
+        async def run_sub(index: int, dependency_outputs: List[Any]) -> Any:
+            sub = sub_actions[index]
+            sub_input = base_input
+            if dependency_outputs:
+                sub_input = dict(base_input or {})
+                for output in dependency_outputs:
+                    if isinstance(output, dict):
+                        for key in sub.input_schema:
+                            if key in output and key not in sub_input:
+                                sub_input[key] = output[key]
+            return await self.execute_action(
                 sub,
                 context=str(input_data),
                 event_stream="",
                 parent_id=parent_id,
-                input_data=input_data if isinstance(input_data, dict) else None,
+                input_data=sub_input,
             )
+
+        try:
+            concurrency = int(os.getenv(SUBACTION_CONCURRENCY_ENV, DEFAULT_SUBACTION_CONCURRENCY))
+        except ValueError:
+            concurrency = DEFAULT_SUBACTION_CONCURRENCY
+        outputs = await run_dag(sub_actions, run_sub, max_concurrency=concurrency)
+
+        results = {}
+        for sub, output in zip(sub_actions, outputs):
+            results[sub.name] = output
         return results
-    
+
     async def run_observe_step(self, action: Action, action_output: dict) -> Dict[str, Any]:
         """
         Executes the observation code with retries, to confirm action outcome.
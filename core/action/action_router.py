@@ -9,13 +9,18 @@ Agent uses this module to select actions based on the plan
 
 import json
 import ast
+import asyncio
 from typing import Optional, List, Dict, Any, Tuple
+from core.action.action_executor import prepare_action
 from core.action.action_library import ActionLibrary
 from core.context_engine import ContextEngine
 
 from core.logger import logger
 from core.prompt import SELECT_ACTION_IN_TASK_PROMPT, SELECT_ACTION_PROMPT, SELECT_ACTION_IN_GUI_PROMPT
 
+# Upper bound on independent actions the model may select in one turn.
+MAX_BATCH_ACTIONS = 5
+
 
 def _is_visible_in_mode(action, GUI_mode: bool) -> bool:
     """
@@ -57,6 +62,8 @@ class ActionRouter:
         self.llm_interface = llm_interface
         self.vlm_interface = vlm_interface
         self.context_engine = context_engine
+        # Actions being prefetched while a decision streams, by name.
+        self._prefetching: Dict[str, asyncio.Future] = {}
 
     async def select_action(
         self,
@@ -138,7 +145,9 @@ class ActionRouter:
         Returns:
             Dict[str, Any]: Decision payload with ``action_name`` and
             normalized ``parameters`` for execution, or an empty ``action_name``
-            when a new action should be created.
+            when a new action should be created. ``actions`` lists every
+            selected ``{action_name, parameters}`` pair; it holds more than
+            one entry when the model batched independent actions.
         """
         action_candidates = []
         action_name_candidates = []
@@ -190,23 +199,19 @@ class ActionRouter:
             reasoning=self._format_reasoning(reasoning),
             action_candidates=self._format_candidates(action_candidates),
             action_name_candidates=self._format_action_names(action_name_candidates),
+            max_batch_actions=MAX_BATCH_ACTIONS,
         )
 
         max_retries = 3
         for attempt in range(max_retries):
             decision = await self._prompt_for_decision(prompt, is_task=True)
 
-            selected_action_name = decision.get("action_name", "")
-            if selected_action_name == "":
-                return decision
-
-            selected_action = self.action_library.retrieve_action(selected_action_name)
-            if selected_action is not None and _is_visible_in_mode(selected_action, GUI_mode):
-                decision["parameters"] = self._ensure_parameters(decision.get("parameters"))
-                return decision
+            batch = self._normalize_batch(decision, GUI_mode)
+            if batch is not None:
+                return batch
 
             logger.warning(
-                f"Received invalid action name '{selected_action_name}' during selection attempt {attempt + 1}"
+                f"Received invalid action selection {decision} during selection attempt {attempt + 1}"
             )
 
         # 3. If we fail to find a valid action name after the retries, raise an error
@@ -310,7 +315,7 @@ class ActionRouter:
                 user_flags={"query": False, "expected_output": False},
                 system_flags={"agent_info": not is_task, "conversation_history": True, "event_stream": True, "task_state": not is_task, "policy": False},
             )
-            raw_response = await self.llm_interface.generate_response_async(system_prompt, current_prompt)
+            raw_response = await self._generate_decision(system_prompt, current_prompt)
             decision, parse_error = self._parse_action_decision(raw_response)
             if decision is not None:
                 decision.setdefault("parameters", {})
@@ -344,7 +349,7 @@ class ActionRouter:
                     user_prompt=prompt,
                 ) 
             else:
-                raw_response = await self.llm_interface.generate_response_async(system_prompt, prompt)
+                raw_response = await self._generate_decision(system_prompt, prompt)
             decision, parse_error = self._parse_action_decision(raw_response)
             if decision is not None:
                 decision.setdefault("parameters", {})
@@ -363,6 +368,41 @@ class ActionRouter:
             raise last_error
         raise ValueError("Unable to parse LLM decision")
 
+    async def _generate_decision(self, system_prompt: str, prompt: str) -> str:
+        """
+        Ask the LLM for a decision, streaming it so that every action it
+        names is prefetched before the reply is complete. Interfaces
+        without ``generate_json_streaming`` are asked for the whole reply.
+        """
+        generate_streaming = getattr(self.llm_interface, "generate_json_streaming", None)
+        if generate_streaming is None:
+            return await self.llm_interface.generate_response_async(system_prompt, prompt)
+
+        def on_value(path: tuple, value: Any) -> None:
+            if path and path[-1] == "action_name" and isinstance(value, str) and value:
+                self._prefetch(value)
+
+        return await generate_streaming(system_prompt, prompt, on_value=on_value)
+
+    def _prefetch(self, action_name: str) -> None:
+        """Look up ``action_name`` and warm it for execution in the background."""
+        if action_name in self._prefetching:
+            return
+        logger.debug(f"[ROUTER] Prefetching action '{action_name}' from the streamed decision")
+        future = asyncio.ensure_future(asyncio.to_thread(self._warm_action, action_name))
+        self._prefetching[action_name] = future
+        future.add_done_callback(lambda f: self._prefetched(action_name, f))
+
+    def _warm_action(self, action_name: str) -> None:
+        action = self.action_library.retrieve_action(action_name)
+        if action is not None:
+            prepare_action(action)
+
+    def _prefetched(self, action_name: str, future: asyncio.Future) -> None:
+        self._prefetching.pop(action_name, None)
+        if not future.cancelled() and future.exception() is not None:
+            logger.debug(f"[ROUTER] Prefetch of '{action_name}' failed: {future.exception()}")
+
     def _parse_action_decision(self, raw: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         try:
             parsed = json.loads(raw)
@@ -379,6 +419,56 @@ class ActionRouter:
 
         return parsed, None
 
+    def _normalize_batch(self, decision: Dict[str, Any], GUI_mode: bool) -> Optional[Dict[str, Any]]:
+        """
+        Validate a single or batched decision and fill in ``actions``.
+
+        Only actions that run outside the agent framework can share a turn:
+        framework actions (messaging, step and task control, mode switches)
+        change agent state and must run alone, and GUI mode performs one UI
+        interaction at a time.
+
+        Returns:
+            The normalized decision, or ``None`` if it names an unknown or
+            hidden action.
+        """
+        raw_items = decision.get("actions")
+        if not isinstance(raw_items, list) or not raw_items:
+            raw_items = [{"action_name": decision.get("action_name", ""), "parameters": decision.get("parameters")}]
+
+        items: List[Dict[str, Any]] = []
+        for raw in raw_items:
+            if not isinstance(raw, dict):
+                return None
+            name = raw.get("action_name", "")
+            if name == "":
+                # The model asks for a new action; the outer loop creates it.
+                decision.update({"action_name": "", "parameters": {}, "actions": []})
+                return decision
+            action = self.action_library.retrieve_action(name)
+            if action is None or not _is_visible_in_mode(action, GUI_mode):
+                return None
+            items.append(
+                {
+                    "action_name": name,
+                    "parameters": self._ensure_parameters(raw.get("parameters")),
+                    "framework": "core." in (action.code or ""),
+                }
+            )
+
+        if GUI_mode or items[0]["framework"]:
+            selected = items[:1]
+        else:
+            selected = [item for item in items if not item["framework"]][:MAX_BATCH_ACTIONS]
+        if len(selected) < len(items):
+            dropped = [item["action_name"] for item in items if item not in selected]
+            logger.warning(f"[ROUTER] Deferred actions that cannot run in this batch: {dropped}")
+
+        actions = [{"action_name": i["action_name"], "parameters": i["parameters"]} for i in selected]
+        decision.update(actions[0])
+        decision["actions"] = actions
+        return decision
+
     def _augment_prompt_with_feedback(
         self,
         base_prompt: str,
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""core.action.execution_limits
+
+CPU and memory caps for subprocess-backed actions.
+
+Sandboxed actions and frozen-mode internal actions run in their own
+interpreter. :class:`ExecutionLimits` caps that interpreter with POSIX
+resource limits: ``RLIMIT_CPU`` for CPU seconds (the kernel sends
+``SIGXCPU`` and then ``SIGKILL``) and ``RLIMIT_AS`` for address space, so
+allocations beyond the cap fail with ``MemoryError`` instead of pushing
+the host into swap. Limits are inherited by everything the action spawns.
+
+Limits are applied to the running child with ``prlimit`` right after it
+starts. Nothing runs in the forked child before ``exec``, so launching
+stays safe in a heavily threaded process. ``prlimit`` is Linux-only;
+elsewhere limits are logged and not enforced.
+
+Actions are started in their own session (process group on Windows), so
+:func:`kill_process_group` takes down the action together with any
+processes it left behind.
+"""
+
+from __future__ import annotations
+
+import os
+import signal
+import subprocess
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from core.logger import logger
+
+ACTION_MAX_CPU_SECONDS_ENV = "AGENT_ACTION_MAX_CPU_SECONDS"
+ACTION_MAX_MEMORY_MB_ENV = "AGENT_ACTION_MAX_MEMORY_MB"
+
+
+@dataclass(frozen=True)
+class ExecutionLimits:
+    """Caps for one subprocess-backed action run. ``None`` means uncapped."""
+
+    cpu_seconds: Optional[int] = None
+    memory_mb: Optional[int] = None
+
+    def __bool__(self) -> bool:
+        return self.cpu_seconds is not None or self.memory_mb is not None
+
+    def as_dict(self) -> Dict[str, Optional[int]]:
+        return {"cpu_seconds": self.cpu_seconds, "memory_mb": self.memory_mb}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "ExecutionLimits":
+        data = data or {}
+        return cls(cpu_seconds=data.get("cpu_seconds"), memory_mb=data.get("memory_mb"))
+
+    @classmethod
+    def for_action(cls, action: Any) -> "ExecutionLimits":
+        """The action's declared limits, with unset caps taken from the environment."""
+        declared = cls.from_dict(getattr(action, "limits", None))
+        return cls(
+            cpu_seconds=declared.cpu_seconds if declared.cpu_seconds is not None else _env_int(ACTION_MAX_CPU_SECONDS_ENV),
+            memory_mb=declared.memory_mb if declared.memory_mb is not None else _env_int(ACTION_MAX_MEMORY_MB_ENV),
+        )
+
+
+def _env_int(name: str) -> Optional[int]:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        logger.warning(f"[LIMITS] Ignoring invalid {name}={raw!r}")
+        return None
+
+
+def new_session_kwargs() -> Dict[str, Any]:
+    """``Popen`` arguments that start the child in its own process group."""
+    if os.name == "nt":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def apply_limits(pid: int, limits: Optional[ExecutionLimits]) -> bool:
+    """
+    Impose ``limits`` on the running process ``pid``.
+
+    Returns:
+        Whether the limits are enforced.
+    """
+    if not limits:
+        return True
+    try:
+        import resource
+
+        prlimit = resource.prlimit
+    except (ImportError, AttributeError):
+        logger.debug(f"[LIMITS] prlimit is unavailable; not enforcing {limits.as_dict()}")
+        return False
+    try:
+        if limits.cpu_seconds is not None:
+            # One second of grace between SIGXCPU and SIGKILL.
+            prlimit(pid, resource.RLIMIT_CPU, (limits.cpu_seconds, limits.cpu_seconds + 1))
+        if limits.memory_mb is not None:
+            cap = limits.memory_mb * 1024 * 1024
+            prlimit(pid, resource.RLIMIT_AS, (cap, cap))
+    except (OSError, ValueError) as e:
+        # The child may already have exited, or the cap exceeds the hard limit.
+        logger.debug(f"[LIMITS] Could not limit pid {pid}: {e}")
+        return False
+    return True
+
+
+def kill_process_group(proc: subprocess.Popen) -> None:
+    """Kill ``proc`` and every process in its group; falls back to ``proc`` alone."""
+    try:
+        if os.name == "nt":
+            proc.kill()
+        else:
+            os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError, OSError):
+        try:
+            proc.kill()
+        except OSError:
+            pass
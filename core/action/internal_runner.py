@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""core.action.internal_runner
+
+Runs in-process (``internal``) actions off the asyncio event loop.
+
+Internal action code is synchronous: it reads files, calls blocking LLM
+helpers or spins up its own ``asyncio.run``. Executed on the loop thread it
+freezes trigger handling and the TUI for as long as it runs. The
+:class:`InternalActionRunner` executes it on a bounded thread pool instead.
+Every run gets a private, ``nest_asyncio``-patched event loop on its thread,
+so ``asyncio.run`` inside action code keeps working there.
+
+Cancellation is cooperative: each run gets a :class:`threading.Event` that
+the action may poll (it is exposed to action code as ``cancel_event``).
+When the timeout expires, or the awaiting coroutine is cancelled, the event
+is set and :class:`ActionCancelled` is raised asynchronously inside the
+thread, which interrupts pure-Python code at its next bytecode boundary.
+
+``print`` output of an action is captured per run. ``sys.stdout`` and
+``sys.stderr`` are wrapped once in a :class:`TaskLocalStream` that routes
+writes from a pool thread to that thread's current buffer and everything
+else to the original stream, so concurrent actions never swap the global
+streams under each other.
+
+A finished run's result carries the thread's resource usage under
+:data:`~core.action.resource_usage.USAGE_RESULT_KEY`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ctypes
+import io
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from core.action.resource_usage import USAGE_RESULT_KEY, ThreadMeter
+from core.logger import logger
+
+INTERNAL_ACTION_THREADS_ENV = "AGENT_INTERNAL_ACTION_THREADS"
+DEFAULT_INTERNAL_ACTION_THREADS = 8
+
+
+class ActionCancelled(Exception):
+    """Raised inside an internal action whose run was cancelled or timed out."""
+
+
+# ----------------------------------------------------------------------
+# Per-thread output capture
+# ----------------------------------------------------------------------
+_capture = threading.local()
+
+
+class TaskLocalStream:
+    """Routes writes to the calling thread's capture buffer, if it has one."""
+
+    def __init__(self, name: str, fallback: Any) -> None:
+        self._name = name
+        self._fallback = fallback
+
+    def _target(self) -> Any:
+        buffer = getattr(_capture, self._name, None)
+        return buffer if buffer is not None else self._fallback
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def writelines(self, lines) -> None:
+        self._target().writelines(lines)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._fallback, name)
+
+
+def install_task_streams() -> None:
+    """Wrap ``sys.stdout`` / ``sys.stderr`` unless they are already wrapped."""
+    for name in ("stdout", "stderr"):
+        stream = getattr(sys, name)
+        if stream is not None and not isinstance(stream, TaskLocalStream):
+            setattr(sys, name, TaskLocalStream(name, stream))
+
+
+# ----------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------
+@dataclass
+class _RunState:
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+    thread_id: Optional[int] = None
+    finished: bool = False
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def _new_action_loop() -> asyncio.AbstractEventLoop:
+    loop = asyncio.new_event_loop()
+    try:
+        import nest_asyncio
+
+        nest_asyncio.apply(loop)
+    except ImportError:
+        pass
+    return loop
+
+
+class InternalActionRunner:
+    """Bounded thread pool for internal actions with timeouts and cancellation."""
+
+    def __init__(self, max_workers: int = DEFAULT_INTERNAL_ACTION_THREADS) -> None:
+        """
+        Args:
+            max_workers: Internal actions that may run at the same time;
+                further runs queue until a thread is free.
+        """
+        self.max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="internal-action",
+        )
+        self.timeouts = 0
+
+    def _invoke(
+        self,
+        state: _RunState,
+        fn: Callable[[threading.Event], Dict[str, Any]],
+        label: str,
+    ) -> Dict[str, Any]:
+        with state.lock:
+            if state.cancel_event.is_set():
+                return {"status": "error", "message": "Action was cancelled before it started."}
+            state.thread_id = threading.get_ident()
+
+        loop = _new_action_loop()
+        asyncio.set_event_loop(loop)
+        out, err = io.StringIO(), io.StringIO()
+        _capture.stdout, _capture.stderr = out, err
+        try:
+            with ThreadMeter() as meter:
+                result = fn(state.cancel_event)
+            if isinstance(result, dict) and not result.get(USAGE_RESULT_KEY):
+                # A report from a GUI container describes the action itself.
+                result[USAGE_RESULT_KEY] = meter.usage.as_dict()
+            return result
+        except ActionCancelled:
+            return {"status": "error", "message": "Action was cancelled."}
+        finally:
+            with state.lock:
+                state.finished = True
+            _capture.stdout = _capture.stderr = None
+            asyncio.set_event_loop(None)
+            loop.close()
+            if out.getvalue():
+                logger.debug(f"[ACTION STDOUT] {label}: {out.getvalue().rstrip()}")
+            if err.getvalue():
+                logger.debug(f"[ACTION STDERR] {label}: {err.getvalue().rstrip()}")
+
+    def _interrupt(self, state: _RunState) -> None:
+        state.cancel_event.set()
+        with state.lock:
+            if state.thread_id is None or state.finished:
+                return
+            ctypes.pythonapi.PyThreadState_SetAsyncExc(
+                ctypes.c_ulong(state.thread_id), ctypes.py_object(ActionCancelled)
+            )
+
+    async def run(
+        self,
+        fn: Callable[[threading.Event], Dict[str, Any]],
+        *,
+        timeout: float,
+        label: str = "",
+    ) -> Dict[str, Any]:
+        """
+        Run ``fn(cancel_event)`` on a pool thread and await its result.
+
+        Returns:
+            ``fn``'s result, or an error dict if it timed out.
+
+        Raises:
+            asyncio.CancelledError: The awaiting task was cancelled; the
+                action is signalled to stop as well.
+        """
+        install_task_streams()
+        state = _RunState()
+        future = asyncio.get_running_loop().run_in_executor(self._executor, self._invoke, state, fn, label)
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self._interrupt(state)
+            logger.warning(f"[INTERNAL ACTION] '{label}' timed out after {timeout}s and was cancelled")
+            return {"status": "error", "message": f"Execution timed out after {timeout}s while running internal action."}
+        except asyncio.CancelledError:
+            self._interrupt(state)
+            raise
+
+    def close(self) -> None:
+        """Stop accepting runs; running actions are signalled to stop."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
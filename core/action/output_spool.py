@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""core.action.output_spool
+
+Bounded capture of large action output.
+
+An action that prints hundreds of megabytes used to hold all of it in
+memory. That output was then parsed, copied into ``outputs``, written to the
+action history and pushed into the event stream. :class:`OutputSpool`
+captures a stream in constant memory instead. It keeps the first and last
+``preview_bytes / 2`` bytes in memory and, once the stream outgrows the
+preview, writes the whole stream to a spill file under
+``AGENT_ACTION_SPOOL_DIR``.
+
+:func:`cap_outputs` applies the same limit to an action's final outputs. Any
+top-level string longer than the preview is replaced by its head and tail,
+and the full text goes to a spill file. The path is exposed next to the
+field as ``<field>_file``, where the agent can read it with ``stream read``
+or ``grep``. The file's size is exposed as ``<field>_bytes``.
+
+Spill files are deleted oldest first once their total size exceeds
+``AGENT_ACTION_SPOOL_MB``.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from core.logger import logger
+
+SPOOL_DIR_ENV = "AGENT_ACTION_SPOOL_DIR"
+SPOOL_QUOTA_MB_ENV = "AGENT_ACTION_SPOOL_MB"
+PREVIEW_BYTES_ENV = "AGENT_ACTION_OUTPUT_PREVIEW_BYTES"
+DEFAULT_SPOOL_QUOTA_MB = 1024
+DEFAULT_PREVIEW_BYTES = 16 * 1024
+
+_QUOTA_LOCK = threading.Lock()
+
+
+def spool_dir() -> Path:
+    """Directory spill files are written to."""
+    return Path(os.getenv(SPOOL_DIR_ENV) or Path(tempfile.gettempdir()) / "agent_action_output")
+
+
+def preview_bytes() -> int:
+    try:
+        return max(256, int(os.getenv(PREVIEW_BYTES_ENV, DEFAULT_PREVIEW_BYTES)))
+    except ValueError:
+        return DEFAULT_PREVIEW_BYTES
+
+
+def truncation_marker(omitted: int, path: Optional[str]) -> str:
+    where = f"; full output in {path}" if path else ""
+    return f"\n... [{omitted} bytes omitted{where}] ...\n"
+
+
+def _spill_path(name: str) -> Path:
+    directory = spool_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9._-]", "_", name).strip("._-") or "output"
+    return directory / f"{time.strftime('%Y%m%d_%H%M%S')}_{slug}_{uuid.uuid4().hex[:8]}.txt"
+
+
+def enforce_spool_quota() -> None:
+    """Delete the oldest spill files until the directory fits its quota."""
+    try:
+        quota = int(float(os.getenv(SPOOL_QUOTA_MB_ENV, DEFAULT_SPOOL_QUOTA_MB)) * 1024 * 1024)
+    except ValueError:
+        quota = DEFAULT_SPOOL_QUOTA_MB * 1024 * 1024
+    with _QUOTA_LOCK:
+        try:
+            entries = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in os.scandir(spool_dir()) if e.is_file()]
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= quota:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+
+
+# ----------------------------------------------------------------------
+# Streams
+# ----------------------------------------------------------------------
+class OutputSpool:
+    """
+    Write-only byte sink that keeps a head/tail preview in memory and the
+    full stream on disk once it outgrows the preview.
+
+    Not thread-safe; give every stream its own spool.
+    """
+
+    def __init__(self, name: str, limit: Optional[int] = None, *, label: str = "") -> None:
+        """
+        Args:
+            name: Field the stream belongs to, e.g. ``"stdout"``; names the
+                keys of :meth:`handle`.
+            limit: Preview size in bytes; defaults to
+                ``AGENT_ACTION_OUTPUT_PREVIEW_BYTES`` (16 KiB).
+            label: Prefix for the spill file name, e.g. the action name.
+        """
+        self.name = name
+        self.label = label
+        self.limit = limit or preview_bytes()
+        self.total_bytes = 0
+        self.path: Optional[str] = None
+        self._head = bytearray()
+        self._tail = bytearray()
+        self._file = None
+
+    @property
+    def truncated(self) -> bool:
+        return self.total_bytes > self.limit
+
+    def write(self, data: bytes) -> None:
+        if not data:
+            return
+        self.total_bytes += len(data)
+        if self._file is None and self.total_bytes > self.limit:
+            self._spill()
+        if self._file is not None:
+            self._write_file(data)
+        half = self.limit // 2
+        room = half - len(self._head)
+        if room > 0:
+            self._head += data[:room]
+            data = data[room:]
+        if data:
+            self._tail += data
+            del self._tail[: max(0, len(self._tail) - half)]
+
+    def _spill(self) -> None:
+        try:
+            path = _spill_path(f"{self.label}_{self.name}" if self.label else self.name)
+            self._file = open(path, "wb")
+            self.path = str(path)
+            # Everything so far is still in memory: head, then tail.
+            self._write_file(bytes(self._head) + bytes(self._tail))
+        except OSError as e:
+            logger.warning(f"[OUTPUT SPOOL] Could not spill {self.name}: {e}")
+            self._file, self.path = None, None
+
+    def _write_file(self, data: bytes) -> None:
+        try:
+            self._file.write(data)
+        except OSError as e:
+            logger.warning(f"[OUTPUT SPOOL] Spill of {self.name} stopped: {e}")
+            self._file.close()
+            self._file = None
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            enforce_spool_quota()
+
+    def text(self) -> str:
+        """The whole stream, or its head and tail around a truncation marker."""
+        head = self._head.decode("utf-8", errors="replace")
+        tail = self._tail.decode("utf-8", errors="replace")
+        if not self.truncated:
+            return head + tail
+        omitted = self.total_bytes - len(self._head) - len(self._tail)
+        return head + truncation_marker(omitted, self.path) + tail
+
+    def handle(self) -> Dict[str, Any]:
+        """``{"<name>_file", "<name>_bytes"}`` when truncated, else ``{}``."""
+        if not self.truncated:
+            return {}
+        return {f"{self.name}_file": self.path, f"{self.name}_bytes": self.total_bytes}
+
+
+def read_last_line(path: str, max_bytes: int = 256 * 1024 * 1024) -> str:
+    """
+    Last non-empty line of a spill file, read backwards from its end.
+
+    Action wrappers print their JSON result as the final line of stdout,
+    which may not fit in a preview's tail.
+    """
+    block = 64 * 1024
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        pos, buf = end, b""
+        while pos > 0 and end - pos < max_bytes:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+            stripped = buf.rstrip()
+            if b"\n" in stripped:
+                return stripped.rsplit(b"\n", 1)[1].decode("utf-8", errors="replace")
+        return buf.strip().decode("utf-8", errors="replace")
+
+
+# ----------------------------------------------------------------------
+# Final outputs
+# ----------------------------------------------------------------------
+def cap_text(text: str, name: str, limit: Optional[int] = None, *, label: str = "") -> tuple[str, Dict[str, Any]]:
+    """``text`` bounded to ``limit`` bytes, plus its spill handle if it was cut."""
+    limit = limit or preview_bytes()
+    if len(text) * 4 <= limit:  # no character takes more than 4 bytes
+        return text, {}
+    spool = OutputSpool(name, limit, label=label)
+    spool.write(text.encode("utf-8", errors="replace"))
+    spool.close()
+    return spool.text(), spool.handle()
+
+
+def preview(value: Any, limit: Optional[int] = None) -> str:
+    """``str(value)`` cut to its head and tail for log lines; nothing is spilled."""
+    text = str(value)
+    limit = limit or preview_bytes()
+    if len(text) <= limit:
+        return text
+    half = limit // 2
+    return text[:half] + truncation_marker(len(text) - 2 * half, None) + text[-half:]
+
+
+def cap_outputs(outputs: Any, action_name: str = "", limit: Optional[int] = None) -> Any:
+    """
+    Bound every top-level string of ``outputs`` for history and events.
+
+    Returns ``outputs`` itself when nothing is over the limit, otherwise a
+    copy with long strings previewed and their spill handles added.
+    """
+    if not isinstance(outputs, dict):
+        return outputs
+    capped = None
+    for key, value in outputs.items():
+        if not isinstance(value, str):
+            continue
+        preview, handle = cap_text(value, key, limit, label=action_name)
+        if not handle:
+            continue
+        if capped is None:
+            capped = dict(outputs)
+        capped[key] = preview
+        capped.update(handle)
+    return outputs if capped is None else capped
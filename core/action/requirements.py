@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""core.action.requirements
+
+Shared resolution and installation of an action's pip requirements.
+
+A :class:`RequirementResolver` inspects the installed distributions of one
+interpreter once, via ``importlib.metadata`` (in-process for the running
+interpreter, one subprocess for any other), and remembers which requirement
+specifiers are satisfied. The answer stays valid until the resolver itself
+installs something, so repeated calls with the same requirements do not
+spawn pip at all. Missing requirements are installed with a single pip
+invocation.
+
+Set ``AGENT_PIP_WHEELHOUSE`` to a directory of wheels to install from it,
+and ``AGENT_PIP_OFFLINE=1`` to install from that directory only, for
+offline and repeatable installs.
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.metadata
+import importlib.util
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from core.logger import logger
+
+WHEELHOUSE_ENV = "AGENT_PIP_WHEELHOUSE"
+PIP_OFFLINE_ENV = "AGENT_PIP_OFFLINE"
+
+_STDLIB_MODULES = frozenset(getattr(sys, "stdlib_module_names", ()))
+
+_INSPECT_SCRIPT = (
+    "import json, importlib.metadata as m\n"
+    "print(json.dumps({d.metadata['Name']: d.version for d in m.distributions() if d.metadata['Name']}))"
+)
+
+
+def canonical_name(name: str) -> str:
+    """PEP 503 normalised project name."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def is_pip_requirement(entry: str) -> bool:
+    """
+    Heuristic used for an action's ``requirement`` list: pip packages are
+    lowercase and may contain hyphens; entries like ``"DDGS"`` or
+    ``"ClientSession"`` are symbol names listed for documentation only, and
+    standard-library modules never need installing.
+    """
+    entry = entry.strip()
+    if not entry or not (entry[0].islower() or "-" in entry):
+        return False
+    return split_requirement(entry)[0].replace("-", "_") not in _STDLIB_MODULES
+
+
+def split_requirement(requirement: str) -> Tuple[str, str]:
+    """``"Foo[bar]>=1.0; python_version>'3'"`` -> ``("foo", ">=1.0")``."""
+    requirement = requirement.split(";", 1)[0].strip()
+    match = re.match(r"^([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*(.*)$", requirement)
+    if not match:
+        return canonical_name(requirement), ""
+    return canonical_name(match.group(1)), match.group(2).replace(" ", "")
+
+
+def normalize_requirements(requirements: Iterable[str]) -> List[str]:
+    """Sorted, de-duplicated pip requirements with PEP 503 normalised names."""
+    normalized = set()
+    for entry in requirements or []:
+        entry = entry.strip()
+        if not is_pip_requirement(entry):
+            continue
+        match = re.match(r"^([A-Za-z0-9][A-Za-z0-9._-]*)(.*)$", entry)
+        if match:
+            name, rest = match.groups()
+            entry = canonical_name(name) + rest.replace(" ", "")
+        normalized.add(entry)
+    return sorted(normalized)
+
+
+def _satisfies(version: str, specifier: str) -> bool:
+    if not specifier:
+        return True
+    try:
+        from packaging.specifiers import SpecifierSet
+        from packaging.version import Version
+    except ImportError:
+        # Without packaging only presence can be checked.
+        return True
+    try:
+        return Version(version) in SpecifierSet(specifier)
+    except Exception:
+        return False
+
+
+def pip_install_command(python_bin: str, requirements: List[str]) -> List[str]:
+    """``pip install`` command line honouring the wheelhouse settings."""
+    cmd = [str(python_bin), "-m", "pip", "install", "--quiet", "--disable-pip-version-check"]
+    wheelhouse = os.getenv(WHEELHOUSE_ENV)
+    if wheelhouse:
+        cmd += ["--find-links", wheelhouse]
+        if os.getenv(PIP_OFFLINE_ENV, "").lower() in ("1", "true", "yes"):
+            cmd.append("--no-index")
+    return cmd + list(requirements)
+
+
+class RequirementResolver:
+    """Cached view of what is installed in one interpreter."""
+
+    def __init__(self, python_bin: Optional[str] = None) -> None:
+        """
+        Args:
+            python_bin: Interpreter to resolve against. ``None`` means the
+                running interpreter, which is inspected in-process.
+        """
+        self.python_bin = python_bin
+        self._lock = threading.RLock()
+        self._installed: Optional[Dict[str, str]] = None
+        self._satisfied: Set[str] = set()
+        # Requirements pip failed on; not retried for the resolver's lifetime.
+        self._failed: Set[str] = set()
+
+    @property
+    def in_process(self) -> bool:
+        return self.python_bin is None
+
+    def installed(self) -> Dict[str, str]:
+        """Canonical project name -> version, inspected once per resolver."""
+        with self._lock:
+            if self._installed is None:
+                if self.in_process:
+                    found = {
+                        dist.metadata["Name"]: dist.version
+                        for dist in importlib.metadata.distributions()
+                        if dist.metadata["Name"]
+                    }
+                else:
+                    out = subprocess.run(
+                        [self.python_bin, "-c", _INSPECT_SCRIPT],
+                        capture_output=True,
+                        text=True,
+                        timeout=60,
+                        check=True,
+                    ).stdout
+                    found = json.loads(out or "{}")
+                self._installed = {canonical_name(name): version for name, version in found.items()}
+            return self._installed
+
+    def missing(self, requirements: Iterable[str]) -> List[str]:
+        """Requirements from ``requirements`` that are not satisfied yet."""
+        missing: List[str] = []
+        with self._lock:
+            for requirement in normalize_requirements(requirements):
+                if requirement in self._satisfied:
+                    continue
+                name, specifier = split_requirement(requirement)
+                version = self.installed().get(name)
+                if version is not None and _satisfies(version, specifier):
+                    self._satisfied.add(requirement)
+                elif version is None and not specifier and self._importable(name):
+                    # Module names such as "docx" are listed next to projects.
+                    self._satisfied.add(requirement)
+                else:
+                    missing.append(requirement)
+        return missing
+
+    def _importable(self, name: str) -> bool:
+        if not self.in_process:
+            return False
+        try:
+            return importlib.util.find_spec(name.replace("-", "_")) is not None
+        except (ImportError, ValueError):
+            return False
+
+    def invalidate(self) -> None:
+        """Forget the inspected state, e.g. after something was installed."""
+        with self._lock:
+            self._installed = None
+            self._satisfied.clear()
+
+    def ensure(self, requirements: Iterable[str], *, timeout: int = 600) -> List[str]:
+        """
+        Install whatever is missing from ``requirements`` in one pip call.
+
+        Returns:
+            The requirements that were installed.
+
+        Raises:
+            subprocess.CalledProcessError: pip failed.
+            subprocess.TimeoutExpired: pip did not finish within ``timeout``.
+        """
+        with self._lock:
+            missing = [r for r in self.missing(requirements) if r not in self._failed]
+            if not missing:
+                return []
+            try:
+                subprocess.check_call(
+                    pip_install_command(self.python_bin or sys.executable, missing),
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    timeout=timeout,
+                )
+            except Exception:
+                self._failed.update(missing)
+                raise
+            finally:
+                self.invalidate()
+                if self.in_process:
+                    # Let in-process exec() find the new packages.
+                    importlib.invalidate_caches()
+            logger.info(f"[REQUIREMENTS] Installed {missing}")
+            return missing
+
+
+_RESOLVERS: Dict[Optional[str], RequirementResolver] = {}
+_RESOLVERS_LOCK = threading.Lock()
+
+
+def get_resolver(python_bin: Optional[str] = None) -> RequirementResolver:
+    """Process-wide resolver for ``python_bin`` (``None``: this interpreter)."""
+    if python_bin is not None and not getattr(sys, "frozen", False):
+        # abspath, not realpath: a venv interpreter is a symlink to its base.
+        if os.path.abspath(python_bin) == os.path.abspath(sys.executable):
+            python_bin = None
+    with _RESOLVERS_LOCK:
+        resolver = _RESOLVERS.get(python_bin)
+        if resolver is None:
+            resolver = _RESOLVERS[python_bin] = RequirementResolver(python_bin)
+        return resolver
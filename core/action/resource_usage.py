@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""core.action.resource_usage
+
+Resource accounting for individual action runs.
+
+Every run is measured where it actually executes:
+
+* in-process actions by a :class:`ThreadMeter` around the executing thread
+  (thread CPU time and, on Linux, the thread's own I/O counters);
+* one-shot subprocesses by :func:`run_process`, which reaps the child with
+  ``os.wait4`` to obtain that child's own rusage;
+* persistent workers and docker containers by the interpreter running the
+  action, which reports its usage back through :data:`USAGE_MARKER`.
+
+The executor publishes the measurement of the current run in
+:data:`current_usage` so :class:`~core.action.action_manager.ActionManager`
+can store it in action history next to status and outputs.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.action.execution_limits import ExecutionLimits, apply_limits, kill_process_group, new_session_kwargs
+from core.action.output_spool import OutputSpool
+
+# Line prefix an out-of-process runner writes to stderr, followed by JSON.
+USAGE_MARKER = "__ACTION_USAGE__"
+
+# Key under which raw executor results carry a usage report until the
+# executor publishes it.
+USAGE_RESULT_KEY = "_resource_usage"
+
+# Stdlib-only snippet for generated runner scripts: prints this process's
+# usage (plus its reaped children) as a marker line on stderr.
+USAGE_REPORT_SNIPPET = r'''
+def _report_usage(_started):
+    import json as _json, sys as _sys, time as _time
+    try:
+        import resource as _resource
+        _self = _resource.getrusage(_resource.RUSAGE_SELF)
+        _kids = _resource.getrusage(_resource.RUSAGE_CHILDREN)
+        _scale = 1 if _sys.platform == "darwin" else 1024
+        _peak = max(_self.ru_maxrss, _kids.ru_maxrss) * _scale
+        try:
+            # ru_maxrss on Linux also counts the image from before exec.
+            with open("/proc/self/status") as _f:
+                _peak = max([int(l.split()[1]) * 1024 for l in _f if l.startswith("VmHWM:")]
+                            + [_kids.ru_maxrss * _scale])
+        except OSError:
+            pass
+        _usage = {
+            "cpu_ms": (_self.ru_utime + _self.ru_stime + _kids.ru_utime + _kids.ru_stime) * 1000,
+            "peak_rss_bytes": _peak,
+            "read_bytes": (_self.ru_inblock + _kids.ru_inblock) * 512,
+            "write_bytes": (_self.ru_oublock + _kids.ru_oublock) * 512,
+        }
+    except Exception:
+        _usage = {}
+    _usage["wall_ms"] = (_time.time() - _started) * 1000
+    _sys.stderr.write("\n__ACTION_USAGE__" + _json.dumps(_usage) + "\n")
+    _sys.stderr.flush()
+'''
+
+
+@dataclass
+class ResourceUsage:
+    """What one action run consumed. Unknown values are ``None``."""
+
+    wall_ms: float
+    cpu_ms: Optional[float] = None
+    peak_rss_bytes: Optional[int] = None
+    read_bytes: Optional[int] = None
+    write_bytes: Optional[int] = None
+    # Where it was measured: "thread", "subprocess", "worker" or "container".
+    source: str = "thread"
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        for key in ("wall_ms", "cpu_ms"):
+            if data[key] is not None:
+                data[key] = round(data[key], 3)
+        return data
+
+    @classmethod
+    def from_report(cls, report: Dict[str, Any], source: str, wall_ms: Optional[float] = None) -> "ResourceUsage":
+        """Build from a runner's marker report; ``wall_ms`` overrides the runner's own."""
+        return cls(
+            wall_ms=wall_ms if wall_ms is not None else float(report.get("wall_ms", 0.0)),
+            cpu_ms=report.get("cpu_ms"),
+            peak_rss_bytes=report.get("peak_rss_bytes"),
+            read_bytes=report.get("read_bytes"),
+            write_bytes=report.get("write_bytes"),
+            source=source,
+        )
+
+
+current_usage: contextvars.ContextVar[Optional[ResourceUsage]] = contextvars.ContextVar(
+    "action_resource_usage", default=None
+)
+
+
+def publish_usage(result: Any, measured: Optional[ResourceUsage] = None, source: str = "container") -> None:
+    """
+    Set :data:`current_usage` for the run that produced ``result``.
+
+    A report carried in ``result`` under :data:`USAGE_RESULT_KEY` is removed
+    from it and preferred, because it was taken where the action ran;
+    ``measured`` is the fallback.
+    """
+    report = result.pop(USAGE_RESULT_KEY, None) if isinstance(result, dict) else None
+    if report:
+        measured = ResourceUsage.from_report(report, report.get("source", source))
+    current_usage.set(measured)
+
+
+def split_usage_report(stderr: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """Remove the marker line from ``stderr`` and return it parsed."""
+    if USAGE_MARKER not in stderr:
+        return stderr, None
+    head, _, tail = stderr.rpartition(USAGE_MARKER)
+    line, _, rest = tail.partition("\n")
+    try:
+        report = json.loads(line)
+    except ValueError:
+        return stderr, None
+    return (head.rstrip("\n") + rest).strip(), report
+
+
+# ----------------------------------------------------------------------
+# In-process measurement
+# ----------------------------------------------------------------------
+def _peak_rss_self() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _thread_io() -> Optional[Tuple[int, int]]:
+    try:
+        with open(f"/proc/self/task/{threading.get_native_id()}/io", encoding="ascii") as f:
+            fields = dict(line.split(": ", 1) for line in f.read().splitlines())
+        return int(fields["rchar"]), int(fields["wchar"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+class ThreadMeter:
+    """
+    Measures the calling thread between ``with`` entry and exit.
+
+    Peak RSS cannot be attributed to a thread; the process-wide high-water
+    mark is reported instead.
+    """
+
+    def __enter__(self) -> "ThreadMeter":
+        self.usage: Optional[ResourceUsage] = None
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+        self._io = _thread_io()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        io_after = _thread_io() if self._io is not None else None
+        self.usage = ResourceUsage(
+            wall_ms=(time.perf_counter() - self._wall) * 1000,
+            cpu_ms=(time.thread_time() - self._cpu) * 1000,
+            peak_rss_bytes=_peak_rss_self(),
+            read_bytes=io_after[0] - self._io[0] if io_after else None,
+            write_bytes=io_after[1] - self._io[1] if io_after else None,
+            source="thread",
+        )
+
+
+# ----------------------------------------------------------------------
+# Subprocess measurement
+# ----------------------------------------------------------------------
+# Interval at which run_process samples the child's resident-set high-water mark.
+RSS_SAMPLE_INTERVAL = 0.01
+
+
+def _vm_hwm(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _drain(stream, spool: OutputSpool) -> None:
+    for chunk in iter(lambda: stream.read(65536), b""):
+        spool.write(chunk)
+    stream.close()
+    spool.close()
+
+
+def run_process(
+    cmd: List[str],
+    *,
+    timeout: float,
+    input: Optional[bytes] = None,
+    limits: Optional[ExecutionLimits] = None,
+    label: str = "",
+    **popen_kwargs: Any,
+) -> Tuple[int, OutputSpool, OutputSpool, ResourceUsage]:
+    """
+    ``subprocess.run(cmd, capture_output=True)`` that also measures the child.
+
+    stdout and stderr are captured into :class:`OutputSpool` s, so a child
+    printing gigabytes costs a bounded preview in memory and a spill file
+    (named after ``label``) on disk.
+
+    The child runs in its own process group, capped by ``limits``. On
+    timeout the whole group is killed, including anything the child spawned.
+
+    On POSIX the child is reaped with ``os.wait4`` so CPU time and block I/O
+    are the child's own (including its reaped descendants). Linux folds the
+    parent's image from before ``exec`` into the child's ``ru_maxrss``, so
+    there peak RSS is sampled from ``/proc/<pid>/status`` while the child
+    runs instead. Elsewhere only wall time is known.
+
+    Raises:
+        subprocess.TimeoutExpired: The child ran longer than ``timeout``; it
+            has been killed.
+    """
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        **new_session_kwargs(),
+        **popen_kwargs,
+    )
+    apply_limits(proc.pid, limits)
+    out = OutputSpool("stdout", label=label)
+    err = OutputSpool("stderr", label=label)
+    readers = [
+        threading.Thread(target=_drain, args=(proc.stdout, out), daemon=True),
+        threading.Thread(target=_drain, args=(proc.stderr, err), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+    if input is not None:
+        try:
+            proc.stdin.write(input)
+        except BrokenPipeError:
+            pass
+        finally:
+            proc.stdin.close()
+
+    deadline = started + timeout
+    sampled = _vm_hwm(proc.pid)
+    while True:
+        alive = [reader for reader in readers if reader.is_alive()]
+        if not alive:
+            break
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            kill_process_group(proc)
+            proc.wait()
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        alive[0].join(min(RSS_SAMPLE_INTERVAL, remaining))
+        hwm = _vm_hwm(proc.pid)
+        if hwm is not None:
+            sampled = max(sampled or 0, hwm)
+
+    if not hasattr(os, "wait4"):
+        proc.wait()
+        return proc.returncode, out, err, ResourceUsage(
+            wall_ms=(time.perf_counter() - started) * 1000, source="subprocess"
+        )
+
+    _, status, rusage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    scale = 1 if sys.platform == "darwin" else 1024
+    if sys.platform.startswith("linux"):
+        peak_rss = sampled
+    else:
+        peak_rss = rusage.ru_maxrss * scale
+    usage = ResourceUsage(
+        wall_ms=(time.perf_counter() - started) * 1000,
+        cpu_ms=(rusage.ru_utime + rusage.ru_stime) * 1000,
+        peak_rss_bytes=peak_rss,
+        read_bytes=rusage.ru_inblock * 512,
+        write_bytes=rusage.ru_oublock * 512,
+        source="subprocess",
+    )
+    return proc.returncode, out, err, usage
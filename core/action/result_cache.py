@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""core.action.result_cache
+
+Memoised outputs of read-only actions.
+
+Actions registered with ``@action(..., cacheable=True)`` promise that their
+output depends only on their inputs and on the files or web pages those
+inputs reference. :func:`result_cache_key` derives a key from the action's
+name and code, its normalised inputs and a fingerprint of every referenced
+resource:
+
+* an existing file contributes its size and mtime,
+* an existing directory contributes the names, sizes and mtimes of the
+  entries below it (bounded; larger trees are not cached, and a filesystem
+  root, the home directory or one of its ancestors is refused without
+  walking it),
+* an ``http(s)`` URL contributes the ``ETag`` / ``Last-Modified`` validators
+  of a ``HEAD`` request (pages without validators are not cached).
+
+An input the action falls back to when it is left out must be declared as
+a schema ``default``; :func:`with_input_defaults` fills it in before the key
+is built, so the fallback is fingerprinted too.
+
+When any referenced resource changes, the key changes and the action runs
+again. :class:`ActionResultCache` is a bounded LRU over serialised outputs;
+entries also expire after a time-to-live, which bounds staleness for state
+the fingerprint cannot see.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.logger import logger
+
+ACTION_CACHE_ENTRIES_ENV = "AGENT_ACTION_CACHE_ENTRIES"
+ACTION_CACHE_MB_ENV = "AGENT_ACTION_CACHE_MB"
+ACTION_CACHE_TTL_ENV = "AGENT_ACTION_CACHE_TTL"
+DEFAULT_CACHE_ENTRIES = 256
+DEFAULT_CACHE_MB = 64
+DEFAULT_CACHE_TTL = 600.0
+
+# Directory trees with more entries than this are not fingerprinted.
+MAX_DIR_ENTRIES = 5000
+
+
+class Uncacheable(Exception):
+    """The inputs reference a resource whose state cannot be fingerprinted."""
+
+
+# ----------------------------------------------------------------------
+# Fingerprints
+# ----------------------------------------------------------------------
+def _dir_fingerprint(path: str) -> List[Any]:
+    entries: List[Any] = []
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if len(entries) >= MAX_DIR_ENTRIES:
+                        raise Uncacheable(f"{path} has more than {MAX_DIR_ENTRIES} entries")
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    entries.append((entry.path, st.st_size, st.st_mtime_ns))
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+        except OSError:
+            continue
+    return sorted(entries)
+
+
+def _unbounded_dir(path: str) -> bool:
+    """Whether ``path`` is a filesystem root, the home directory or an ancestor of it."""
+    if os.path.dirname(path) == path:
+        return True
+    home = os.path.abspath(os.path.expanduser("~"))
+    return path == home or home.startswith(path.rstrip(os.sep) + os.sep)
+
+
+def _url_fingerprint(url: str) -> List[str]:
+    import requests
+
+    try:
+        response = requests.head(url, timeout=5, allow_redirects=True)
+    except requests.RequestException as e:
+        raise Uncacheable(f"HEAD {url} failed: {e}") from e
+    validators = [response.headers.get("ETag", ""), response.headers.get("Last-Modified", "")]
+    if response.status_code >= 400 or not any(validators):
+        raise Uncacheable(f"{url} has no cache validators")
+    return [response.url] + validators
+
+
+def _resource_fingerprint(value: str) -> Optional[Tuple[str, Any]]:
+    if value.startswith(("http://", "https://")):
+        return value, _url_fingerprint(value)
+    if len(value) > 4096 or "\n" in value:
+        return None
+    path = os.path.abspath(os.path.expanduser(value))
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    if os.path.isdir(path):
+        if _unbounded_dir(path):
+            # Would only hit MAX_DIR_ENTRIES after thousands of stat calls.
+            raise Uncacheable(f"{path} is too large to fingerprint")
+        return path, [st.st_mtime_ns, _dir_fingerprint(path)]
+    return path, [st.st_size, st.st_mtime_ns]
+
+
+def _strings(value: Any) -> List[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        return [s for v in value.values() for s in _strings(v)]
+    if isinstance(value, (list, tuple)):
+        return [s for v in value for s in _strings(v)]
+    return []
+
+
+def with_input_defaults(input_schema: Optional[Dict[str, Any]], input_data: Optional[dict]) -> dict:
+    """
+    ``input_data`` with every absent or empty input that declares a
+    ``default`` in ``input_schema`` set to it.
+
+    A cacheable action that falls back to an implicit value (a directory,
+    say) must declare it, or the key cannot fingerprint what it reads.
+    """
+    filled = dict(input_data or {})
+    for name, spec in (input_schema or {}).items():
+        if isinstance(spec, dict) and "default" in spec and filled.get(name) in (None, ""):
+            filled[name] = spec["default"]
+    return filled
+
+
+def result_cache_key(action_name: str, action_code: str, input_data: Optional[dict]) -> str:
+    """
+    Key for one cacheable action call. Does blocking I/O.
+
+    Raises:
+        Uncacheable: A referenced resource cannot be fingerprinted.
+    """
+    fingerprints = {}
+    for value in _strings(input_data or {}):
+        found = _resource_fingerprint(value)
+        if found is not None:
+            fingerprints[found[0]] = found[1]
+    material = json.dumps(
+        [action_name, action_code or "", input_data or {}, fingerprints],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+# ----------------------------------------------------------------------
+# Store
+# ----------------------------------------------------------------------
+class ActionResultCache:
+    """LRU of serialised action outputs, bounded by count, size and age."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_CACHE_ENTRIES,
+        max_bytes: int = DEFAULT_CACHE_MB * 1024 * 1024,
+        ttl: float = DEFAULT_CACHE_TTL,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """A fresh copy of the cached output, or ``None``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl:
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            payload = entry[1]
+        return json.loads(payload)
+
+    def put(self, key: str, output: Dict[str, Any]) -> bool:
+        """Store ``output``; returns ``False`` if it is not JSON or too large."""
+        try:
+            payload = json.dumps(output, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return False
+        size = len(payload)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return False
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic(), payload)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+        return True
+
+    def _drop(self, key: str) -> None:
+        _, payload = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        logger.warning(f"[ACTION CACHE] Ignoring invalid {name}={os.getenv(name)!r}")
+        return default
+
+
+ACTION_RESULT_CACHE = ActionResultCache(
+    max_entries=int(_env_number(ACTION_CACHE_ENTRIES_ENV, DEFAULT_CACHE_ENTRIES)),
+    max_bytes=int(_env_number(ACTION_CACHE_MB_ENV, DEFAULT_CACHE_MB) * 1024 * 1024),
+    ttl=_env_number(ACTION_CACHE_TTL_ENV, DEFAULT_CACHE_TTL),
+)
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""core.action.sandbox_envs
+
+Persistent, requirements-keyed virtual environments for sandboxed actions.
+
+An action that declares pip requirements runs in an environment identified
+by the hash of its normalised, sorted requirement set. The environment is
+built once, with ``--system-site-packages`` by default so that anything the
+base interpreter already provides is not installed again, and is reused by
+every later call with the same requirements, across agent restarts.
+
+Environments live under one root directory and are evicted least recently
+used first once their total size exceeds the disk quota. Builds happen in a
+temporary directory that is renamed into place, so a half-built environment
+is never used, even when several agent processes share the root.
+
+An environment leased with :meth:`RequirementsEnvCache.acquire` is never
+evicted. Within a process the lease is counted; across processes it holds a
+shared ``flock`` on ``.<key>.lock`` in the root, and eviction skips any
+environment whose lock it cannot take exclusively. Where ``fcntl`` is
+unavailable (Windows) only the leases of the current process are seen, so
+agent processes there should not share a root.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+import venv
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List
+
+from core.action.requirements import normalize_requirements, pip_install_command
+from core.action.sandbox_pool import PooledVenv, site_packages_snapshot, venv_python
+from core.logger import logger
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+SANDBOX_ENV_DIR_ENV = "AGENT_SANDBOX_ENV_DIR"
+SANDBOX_ENV_QUOTA_ENV = "AGENT_SANDBOX_ENV_QUOTA_MB"
+DEFAULT_ENV_QUOTA_MB = 4096
+
+_READY_MARKER = ".ready"
+_META_FILE = "env_meta.json"
+
+EnvBuilderFn = Callable[[Path, List[str], bool], None]
+
+
+def requirements_key(requirements: List[str]) -> str:
+    """Content address of a normalised requirement set."""
+    return hashlib.sha256("\n".join(requirements).encode("utf-8")).hexdigest()[:20]
+
+
+def build_requirements_env(venv_dir: Path, requirements: List[str], system_site_packages: bool) -> None:
+    """Default builder: venv with pip plus one ``pip install`` for all requirements."""
+    import subprocess
+
+    venv.EnvBuilder(with_pip=True, system_site_packages=system_site_packages).create(venv_dir)
+    if requirements:
+        subprocess.check_call(
+            pip_install_command(str(venv_python(venv_dir)), requirements),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=1800,
+        )
+
+
+def _lock_file(path: Path, exclusive: bool) -> int | None:
+    """
+    Open ``path`` and ``flock`` it, shared or exclusive.
+
+    Returns:
+        The descriptor holding the lock, or ``None`` when an exclusive lock
+        is held elsewhere. Shared locks wait for exclusive ones.
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    if fcntl is None:
+        return fd
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB if exclusive else fcntl.LOCK_SH)
+    except BlockingIOError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _dir_size(path: Path) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+class RequirementsEnvCache:
+    """Builds and hands out one persistent venv per requirement set."""
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        quota_bytes: int = DEFAULT_ENV_QUOTA_MB * 1024 * 1024,
+        system_site_packages: bool = True,
+        builder: EnvBuilderFn = build_requirements_env,
+    ) -> None:
+        """
+        Args:
+            root: Directory holding one sub-directory per requirement set.
+            quota_bytes: Total size the environments may use before the
+                least recently used ones are deleted.
+            system_site_packages: Layer environments on the base
+                interpreter's packages instead of fully isolating them.
+            builder: Creates the venv and installs the requirements.
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.quota_bytes = quota_bytes
+        self.system_site_packages = system_site_packages
+        self._builder = builder
+
+        self._lock = threading.Lock()
+        self._evicted = threading.Condition(self._lock)
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._in_use: Dict[str, int] = {}
+        # Descriptors holding the shared lock of each leased environment.
+        self._lease_fds: Dict[str, int] = {}
+        self._evicting: set[str] = set()
+
+        self.hits = 0
+        self.builds = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------------
+    # Lookup / build
+    # ------------------------------------------------------------------
+    def _env_dir(self, key: str) -> Path:
+        return self.root / key
+
+    def _lock_path(self, key: str) -> Path:
+        return self.root / f".{key}.lock"
+
+    def _is_ready(self, env_dir: Path) -> bool:
+        return (env_dir / _READY_MARKER).exists() and venv_python(env_dir).exists()
+
+    def _build(self, key: str, requirements: List[str]) -> None:
+        env_dir = self._env_dir(key)
+        staging = self.root / f".{key}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            self._builder(staging, requirements, self.system_site_packages)
+            meta = {
+                "requirements": requirements,
+                "system_site_packages": self.system_site_packages,
+                "created_at": time.time(),
+                "size_bytes": _dir_size(staging),
+            }
+            (staging / _META_FILE).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+            (staging / _READY_MARKER).touch()
+            if env_dir.exists() and not self._is_ready(env_dir):
+                shutil.rmtree(env_dir, ignore_errors=True)
+            try:
+                os.replace(staging, env_dir)
+            except OSError:
+                # Another process finished the same environment first.
+                if not self._is_ready(env_dir):
+                    raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        self.builds += 1
+        logger.info(f"[SANDBOX ENV] Built environment {key} for {requirements}")
+
+    def get(self, requirements: Iterable[str]) -> PooledVenv:
+        """Return the environment for ``requirements``, building it on first use."""
+        normalized = normalize_requirements(requirements)
+        key = requirements_key(normalized)
+        env_dir = self._env_dir(key)
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if self._is_ready(env_dir):
+                self.hits += 1
+            else:
+                self._build(key, normalized)
+            # The marker's mtime doubles as the LRU timestamp.
+            os.utime(env_dir / _READY_MARKER)
+
+        return PooledVenv(path=env_dir, python_bin=venv_python(env_dir), baseline=site_packages_snapshot(env_dir))
+
+    def acquire(self, requirements: Iterable[str]) -> PooledVenv:
+        """Like :meth:`get`, but protects the environment from eviction until released."""
+        key = requirements_key(normalize_requirements(requirements))
+        with self._lock:
+            while key in self._evicting:
+                self._evicted.wait()
+            self._in_use[key] = self._in_use.get(key, 0) + 1
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                if key not in self._lease_fds:
+                    # Waits while another process is deleting the environment.
+                    self._lease_fds[key] = _lock_file(self._lock_path(key), exclusive=False)
+            return self.get(requirements)
+        except BaseException:
+            self.release(PooledVenv(path=self._env_dir(key), python_bin=Path(), baseline=frozenset()))
+            raise
+
+    def release(self, env: PooledVenv) -> None:
+        """Mark ``env`` idle again and apply the disk quota."""
+        key = env.path.name
+        with self._lock:
+            self._in_use[key] = self._in_use.get(key, 1) - 1
+            if self._in_use[key] <= 0:
+                del self._in_use[key]
+                fd = self._lease_fds.pop(key, None)
+                if fd is not None:
+                    os.close(fd)
+        self.enforce_quota()
+
+    @contextmanager
+    def lease(self, requirements: Iterable[str]) -> Iterator[PooledVenv]:
+        env = self.acquire(requirements)
+        try:
+            yield env
+        finally:
+            self.release(env)
+
+    # ------------------------------------------------------------------
+    # Disk quota
+    # ------------------------------------------------------------------
+    def _inventory(self) -> List[tuple[float, int, Path]]:
+        envs = []
+        for env_dir in self.root.iterdir():
+            if env_dir.name.startswith(".") or not env_dir.is_dir():
+                continue
+            try:
+                last_used = (env_dir / _READY_MARKER).stat().st_mtime
+                size = json.loads((env_dir / _META_FILE).read_text(encoding="utf-8"))["size_bytes"]
+            except (OSError, ValueError, KeyError):
+                last_used, size = 0.0, _dir_size(env_dir)
+            envs.append((last_used, size, env_dir))
+        return envs
+
+    def enforce_quota(self) -> int:
+        """Delete least recently used idle environments until under quota."""
+        envs = sorted(self._inventory())
+        total = sum(size for _, size, _ in envs)
+        removed = 0
+        for _, size, env_dir in envs:
+            if total <= self.quota_bytes:
+                break
+            key = env_dir.name
+            with self._lock:
+                if key in self._in_use or key in self._evicting:
+                    continue
+                self._evicting.add(key)
+            try:
+                fd = _lock_file(self._lock_path(key), exclusive=True)
+                if fd is None:
+                    # Leased by another agent process.
+                    continue
+                try:
+                    shutil.rmtree(env_dir, ignore_errors=True)
+                finally:
+                    os.close(fd)
+            finally:
+                with self._lock:
+                    self._evicting.discard(key)
+                    self._evicted.notify_all()
+            total -= size
+            removed += 1
+            self.evictions += 1
+            logger.info(f"[SANDBOX ENV] Evicted environment {env_dir.name} ({size // (1024 * 1024)} MB)")
+        return removed
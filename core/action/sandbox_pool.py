@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""core.action.sandbox_pool
+
+Pool of pre-built virtual environments for sandboxed actions.
+
+Creating a venv with pip takes seconds, far longer than most sandboxed
+actions run. The pool keeps ``size`` environments ready and a background
+thread builds replacements as they are handed out. An environment goes back
+into the pool on return only if it passes a health check: its interpreter
+is still there and its ``site-packages`` match the state right after
+creation. An action that installed or removed packages therefore never
+leaks them into the next run, because its environment is rebuilt instead.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import shutil
+import threading
+import uuid
+import venv
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Deque, FrozenSet, Iterator, Optional
+
+from core.logger import logger
+
+SANDBOX_POOL_SIZE_ENV = "AGENT_SANDBOX_POOL_SIZE"
+DEFAULT_POOL_SIZE = 2
+
+
+def venv_python(venv_dir: Path) -> Path:
+    """Path of the interpreter inside ``venv_dir``."""
+    if os.name == "nt":
+        return venv_dir / "Scripts" / "python.exe"
+    return venv_dir / "bin" / "python"
+
+
+def create_venv(venv_dir: Path) -> None:
+    """Default builder: a plain venv with pip."""
+    venv.EnvBuilder(with_pip=True).create(venv_dir)
+
+
+def site_packages_snapshot(venv_dir: Path) -> FrozenSet[str]:
+    """Names of everything installed into the venv's ``site-packages``."""
+    entries = set()
+    for site_dir in list(venv_dir.glob("lib/python*/site-packages")) + list(venv_dir.glob("Lib/site-packages")):
+        try:
+            entries.update(entry.name for entry in os.scandir(site_dir))
+        except OSError:
+            continue
+    return frozenset(entries)
+
+
+@dataclass
+class PooledVenv:
+    """A ready-to-use sandbox environment."""
+
+    path: Path
+    python_bin: Path
+    baseline: FrozenSet[str]
+
+
+class VenvPool:
+    """Keeps ``size`` healthy virtual environments ready for sandboxed actions."""
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        size: int = DEFAULT_POOL_SIZE,
+        builder: Callable[[Path], None] = create_venv,
+    ) -> None:
+        """
+        Args:
+            root: Directory the pooled environments are created in. It is
+                removed again by :meth:`close`.
+            size: Number of environments kept ready.
+            builder: Creates a venv at the given path. Runs on the pool's
+                background thread, or on the caller when the pool is empty.
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.size = max(0, size)
+        self._builder = builder
+
+        self._ready: Deque[PooledVenv] = deque()
+        self._building = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        self.warm_hits = 0
+        self.cold_builds = 0
+        self.discarded = 0
+
+        self._thread = threading.Thread(target=self._replenish, name="sandbox-venv-pool", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # Building & health
+    # ------------------------------------------------------------------
+    def _build(self) -> PooledVenv:
+        venv_dir = self.root / f"venv_{uuid.uuid4().hex[:12]}"
+        try:
+            self._builder(venv_dir)
+        except Exception:
+            shutil.rmtree(venv_dir, ignore_errors=True)
+            raise
+        return PooledVenv(path=venv_dir, python_bin=venv_python(venv_dir), baseline=site_packages_snapshot(venv_dir))
+
+    def is_healthy(self, sandbox: PooledVenv) -> bool:
+        """Interpreter present and ``site-packages`` unchanged since creation."""
+        if not sandbox.python_bin.exists() or not (sandbox.path / "pyvenv.cfg").exists():
+            return False
+        return site_packages_snapshot(sandbox.path) == sandbox.baseline
+
+    def _destroy(self, sandbox: PooledVenv) -> None:
+        shutil.rmtree(sandbox.path, ignore_errors=True)
+
+    def _replenish(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed and len(self._ready) + self._building >= self.size:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                self._building += 1
+
+            try:
+                sandbox = self._build()
+            except Exception:
+                logger.error("[SANDBOX POOL] Failed to build a virtual environment", exc_info=True)
+                sandbox = None
+
+            with self._cond:
+                self._building -= 1
+                if sandbox is not None and not self._closed:
+                    self._ready.append(sandbox)
+                    self._cond.notify_all()
+                    sandbox = None
+                elif sandbox is None:
+                    # Back off instead of spinning on a broken builder.
+                    self._cond.wait(5.0)
+            if sandbox is not None:
+                self._destroy(sandbox)
+
+    # ------------------------------------------------------------------
+    # Lease API
+    # ------------------------------------------------------------------
+    def acquire(self) -> PooledVenv:
+        """Take a ready environment, building one inline if the pool is empty."""
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("Sandbox pool is closed")
+                sandbox = self._ready.popleft() if self._ready else None
+                self._cond.notify_all()
+            if sandbox is None:
+                break
+            if self.is_healthy(sandbox):
+                self.warm_hits += 1
+                return sandbox
+            self.discarded += 1
+            self._destroy(sandbox)
+
+        self.cold_builds += 1
+        return self._build()
+
+    def release(self, sandbox: PooledVenv, *, reusable: bool = True) -> None:
+        """Return ``sandbox``; it is reused only if still healthy and needed."""
+        with self._cond:
+            keep = (
+                reusable
+                and not self._closed
+                and len(self._ready) < self.size
+                and self.is_healthy(sandbox)
+            )
+            if keep:
+                self._ready.append(sandbox)
+            self._cond.notify_all()
+        if not keep:
+            self.discarded += 1
+            self._destroy(sandbox)
+
+    @contextmanager
+    def lease(self) -> Iterator[PooledVenv]:
+        sandbox = self.acquire()
+        try:
+            yield sandbox
+        except BaseException:
+            self.release(sandbox, reusable=False)
+            raise
+        self.release(sandbox)
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until the pool holds ``size`` environments."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._closed or len(self._ready) >= self.size, timeout)
+
+    def close(self) -> None:
+        """Stop replenishing and delete every pooled environment."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._ready.clear()
+            self._cond.notify_all()
+        self._thread.join(timeout=1.0)
+        shutil.rmtree(self.root, ignore_errors=True)
@@ -0,0 +1,414 @@
+# -*- coding: utf-8 -*-
+"""core.action.sandbox_workers
+
+Long-lived interpreter processes for sandboxed and frozen-mode actions.
+
+Spawning a fresh interpreter for every action costs interpreter start-up and
+re-imports every library the action uses. A :class:`SandboxWorker` is a
+Python process inside one environment that executes action code sent to it
+as JSON lines over its stdin and answers with one JSON line per job on its
+stdout, using the same ``stdout`` / ``stderr`` / ``returncode`` result shape
+as a one-shot run plus the job's resource ``usage``. Library imports stay
+warm in ``sys.modules``, while every job still gets a fresh namespace and
+the working directory and environment variables are restored afterwards.
+
+:class:`SandboxWorkerPool` keeps idle workers per environment. A worker is
+retired after ``max_jobs`` jobs, when its resident memory exceeds
+``max_rss_mb``, when its environment stops being clean, or when a job
+exceeds its timeout, in which case its whole process group is killed.
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import subprocess
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from core.action.execution_limits import kill_process_group, new_session_kwargs
+from core.action.output_spool import enforce_spool_quota, preview_bytes, spool_dir
+from core.action.resource_usage import USAGE_RESULT_KEY
+from core.action.sandbox_pool import PooledVenv
+from core.logger import logger
+
+SANDBOX_WORKERS_ENV = "AGENT_SANDBOX_WORKERS"
+SANDBOX_WORKER_MAX_JOBS_ENV = "AGENT_SANDBOX_WORKER_MAX_JOBS"
+DEFAULT_MAX_JOBS = 100
+DEFAULT_MAX_RSS_MB = 1024
+
+# Runs inside the worker interpreter; must only use the standard library.
+WORKER_SOURCE = r'''
+import contextlib, io, json, os, sys, time, traceback
+
+def _rss():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        try:
+            import resource
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return peak if sys.platform == "darwin" else peak * 1024
+        except Exception:
+            return 0
+
+def _peak_rss():
+    # ru_maxrss on Linux also counts the parent's image from before exec.
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except Exception:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except Exception:
+        return 0
+
+def _snapshot():
+    snap = {"wall": time.perf_counter(), "cpu": 0.0, "peak": _peak_rss(), "io": None}
+    try:
+        import resource
+        me, kids = resource.getrusage(resource.RUSAGE_SELF), resource.getrusage(resource.RUSAGE_CHILDREN)
+        snap["cpu"] = me.ru_utime + me.ru_stime + kids.ru_utime + kids.ru_stime
+    except Exception:
+        pass
+    try:
+        with open("/proc/self/io") as f:
+            fields = dict(line.split(": ", 1) for line in f.read().splitlines())
+        snap["io"] = (int(fields["rchar"]), int(fields["wchar"]))
+    except Exception:
+        pass
+    return snap
+
+def _usage(before):
+    after = _snapshot()
+    io = before["io"] and after["io"]
+    return {
+        "wall_ms": (after["wall"] - before["wall"]) * 1000,
+        "cpu_ms": (after["cpu"] - before["cpu"]) * 1000,
+        "peak_rss_bytes": after["peak"] or None,
+        "read_bytes": after["io"][0] - before["io"][0] if io else None,
+        "write_bytes": after["io"][1] - before["io"][1] if io else None,
+        "source": "worker",
+    }
+
+class _Spool(io.TextIOBase):
+    # Head/tail preview in memory, the whole stream in a file once it
+    # outgrows the preview; mirrors core.action.output_spool.OutputSpool.
+    def __init__(self, name, directory, limit):
+        self.name, self.directory, self.limit = name, directory, limit
+        self.total, self.head, self.tail, self.file, self.path = 0, bytearray(), bytearray(), None, None
+
+    def writable(self):
+        return True
+
+    def write(self, s):
+        data = s.encode("utf-8", errors="replace")
+        self.total += len(data)
+        if self.file is None and self.path is None and self.total > self.limit and self.directory:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                self.path = os.path.join(self.directory, "%s_worker_%s_%d_%s.txt" % (
+                    time.strftime("%Y%m%d_%H%M%S"), self.name, os.getpid(), os.urandom(4).hex()))
+                self.file = open(self.path, "wb")
+                self.file.write(bytes(self.head) + bytes(self.tail))
+            except OSError:
+                self.file, self.path = None, None
+        if self.file is not None:
+            self.file.write(data)
+        room = self.limit // 2 - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if data:
+            self.tail += data
+            del self.tail[: max(0, len(self.tail) - self.limit // 2)]
+        return len(s)
+
+    def result(self, reply):
+        if self.file is not None:
+            self.file.close()
+        head, tail = self.head.decode("utf-8", "replace"), self.tail.decode("utf-8", "replace")
+        if self.total <= self.limit:
+            reply[self.name] = (head + tail).strip()
+            return
+        omitted = self.total - len(self.head) - len(self.tail)
+        where = "; full output in %s" % self.path if self.path else ""
+        reply[self.name] = (head + "\n... [%d bytes omitted%s] ...\n" % (omitted, where) + tail).strip()
+        reply[self.name + "_file"] = self.path
+        reply[self.name + "_bytes"] = self.total
+
+def _run(code, input_data, spool):
+    ns = {"__name__": "__main__", "json": json, "sys": sys, "input_data": input_data}
+    out = _Spool("stdout", spool.get("dir"), spool.get("limit", 16384))
+    err = _Spool("stderr", spool.get("dir"), spool.get("limit", 16384))
+    returncode = 0
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            exec(compile(code, "action.py", "exec"), ns)
+            func = None
+            for name, obj in list(ns.items()):
+                if callable(obj) and not name.startswith("_") and name not in ("input_data", "json", "sys"):
+                    func = obj
+                    break
+            if func is None:
+                if "output" in ns:
+                    print(ns["output"])
+                else:
+                    returncode = 1
+            else:
+                result = func(input_data)
+                print(json.dumps(result, ensure_ascii=False) if isinstance(result, dict) else str(result))
+        except SystemExit as e:
+            returncode = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except BaseException as e:
+            print("Execution failed: " + str(e) + "\n" + traceback.format_exc(), file=sys.stderr)
+            returncode = 1
+    reply = {"returncode": returncode}
+    out.result(reply)
+    err.result(reply)
+    return reply
+
+def main():
+    # Keep the real stdout for replies; anything else written to fd 1
+    # (e.g. by child processes) goes to stderr, which is discarded.
+    proto = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    os.dup2(2, 1)
+    sys.stdin.reconfigure(encoding="utf-8")
+    for line in sys.stdin:
+        request = json.loads(line)
+        cwd, environ = os.getcwd(), dict(os.environ)
+        before = _snapshot()
+        reply = _run(request["code"], request["input"], request.get("spool", {}))
+        reply["usage"] = _usage(before)
+        try:
+            os.chdir(cwd)
+        except OSError:
+            pass
+        os.environ.clear()
+        os.environ.update(environ)
+        reply["rss"] = _rss()
+        proto.write(json.dumps(reply) + "\n")
+        proto.flush()
+
+main()
+'''
+
+
+class WorkerTimeout(Exception):
+    """A job did not finish within its timeout; the worker was killed."""
+
+
+class SandboxWorker:
+    """One persistent interpreter bound to one environment."""
+
+    def __init__(self, python_bin: str, env: Optional[PooledVenv] = None) -> None:
+        """
+        Args:
+            python_bin: Interpreter to run the worker with.
+            env: Environment the worker owns while alive, handed back to
+                its owner when the worker is retired.
+        """
+        self.python_bin = python_bin
+        self.env = env
+        self.jobs = 0
+        self.rss = 0
+
+        self.proc = subprocess.Popen(
+            [python_bin, "-u", "-c", WORKER_SOURCE],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            **new_session_kwargs(),
+        )
+        self._replies: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._reader = threading.Thread(target=self._read_replies, name="sandbox-worker-reader", daemon=True)
+        self._reader.start()
+
+    def _read_replies(self) -> None:
+        for line in self.proc.stdout:
+            self._replies.put(line)
+        self._replies.put(None)
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def run(self, action_code: str, input_data: dict, timeout: float) -> Dict[str, Any]:
+        """
+        Execute one action and return ``{"stdout", "stderr", "returncode"}``
+        plus its resource usage report under ``USAGE_RESULT_KEY``. Output
+        beyond the preview size is spilled to a file by the worker and
+        referenced by ``stdout_file`` / ``stderr_file``.
+
+        Raises:
+            WorkerTimeout: The job exceeded ``timeout``; the worker is dead.
+            RuntimeError: The worker died or answered garbage.
+        """
+        try:
+            spool = {"dir": str(spool_dir()), "limit": preview_bytes()}
+            self.proc.stdin.write(json.dumps({"code": action_code, "input": input_data, "spool": spool}) + "\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            self.kill()
+            raise RuntimeError(f"Sandbox worker is gone: {e}") from e
+
+        try:
+            line = self._replies.get(timeout=timeout)
+        except queue.Empty:
+            self.kill()
+            raise WorkerTimeout(f"Sandbox worker job exceeded {timeout}s")
+        if line is None:
+            self.kill()
+            raise RuntimeError(f"Sandbox worker exited with code {self.proc.poll()}")
+
+        reply = json.loads(line)
+        self.jobs += 1
+        self.rss = reply.pop("rss", 0)
+        reply[USAGE_RESULT_KEY] = reply.pop("usage", None)
+        if "stdout_file" in reply or "stderr_file" in reply:
+            enforce_spool_quota()
+        return reply
+
+    def kill(self) -> None:
+        """Terminate the worker and everything it spawned."""
+        if self.proc.poll() is None:
+            kill_process_group(self.proc)
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+        for stream in (self.proc.stdin, self.proc.stdout):
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+
+class SandboxWorkerPool:
+    """Idle :class:`SandboxWorker` instances grouped by environment key."""
+
+    def __init__(
+        self,
+        *,
+        max_jobs: int = DEFAULT_MAX_JOBS,
+        max_rss_mb: int = DEFAULT_MAX_RSS_MB,
+        max_idle_per_env: int = 2,
+    ) -> None:
+        """
+        Args:
+            max_jobs: Jobs a worker runs before it is recycled.
+            max_rss_mb: Resident memory after a job above which the worker
+                is recycled.
+            max_idle_per_env: Idle workers kept per environment key.
+        """
+        self.max_jobs = max(1, max_jobs)
+        self.max_rss = max_rss_mb * 1024 * 1024
+        self.max_idle_per_env = max_idle_per_env
+        self._idle: Dict[Hashable, List[SandboxWorker]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+        self.spawned = 0
+        self.reused = 0
+        self.recycled = 0
+
+    def run(
+        self,
+        env_key: Hashable,
+        acquire_env: Callable[[], PooledVenv],
+        release_env: Callable[[PooledVenv, bool], None],
+        action_code: str,
+        input_data: dict,
+        timeout: float,
+        *,
+        env_is_clean: Optional[Callable[[PooledVenv], bool]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run an action on a worker for ``env_key``, spawning one if none is idle.
+
+        Args:
+            env_key: Identifies the environment; workers are only reused
+                for the same key.
+            acquire_env: Provides the environment for a new worker.
+            release_env: Receives ``(env, reusable)`` when a worker retires.
+            action_code: Source of the action.
+            input_data: JSON-serialisable action input.
+            timeout: Seconds before the worker is killed.
+            env_is_clean: Optional check after each job; a worker whose
+                environment fails it is retired and the environment
+                released as not reusable.
+        """
+        worker = self._take(env_key)
+        if worker is None:
+            env = acquire_env()
+            try:
+                worker = SandboxWorker(str(env.python_bin), env)
+            except Exception:
+                release_env(env, False)
+                raise
+            self.spawned += 1
+        else:
+            self.reused += 1
+
+        try:
+            result = worker.run(action_code, input_data, timeout)
+        except WorkerTimeout:
+            self._retire(worker, release_env, reusable=False)
+            return {"stdout": "", "stderr": "Execution timed out", "returncode": -1}
+        except Exception as e:
+            self._retire(worker, release_env, reusable=False)
+            return {"stdout": "", "stderr": f"Execution failed: {e}", "returncode": -1}
+
+        clean = env_is_clean is None or env_is_clean(worker.env)
+        if not clean or worker.jobs >= self.max_jobs or worker.rss > self.max_rss or not worker.alive:
+            self.recycled += 1
+            self._retire(worker, release_env, reusable=clean)
+        elif not self._give_back(env_key, worker):
+            self._retire(worker, release_env, reusable=True)
+        return result
+
+    def _take(self, env_key: Hashable) -> Optional[SandboxWorker]:
+        with self._lock:
+            idle = self._idle.get(env_key)
+            while idle:
+                worker = idle.pop()
+                if worker.alive:
+                    return worker
+        return None
+
+    def _give_back(self, env_key: Hashable, worker: SandboxWorker) -> bool:
+        with self._lock:
+            if len(self._idle[env_key]) >= self.max_idle_per_env:
+                return False
+            self._idle[env_key].append(worker)
+            return True
+
+    def _retire(
+        self,
+        worker: SandboxWorker,
+        release_env: Callable[[PooledVenv, bool], None],
+        *,
+        reusable: bool,
+    ) -> None:
+        worker.kill()
+        if worker.env is not None:
+            try:
+                release_env(worker.env, reusable)
+            except Exception:
+                logger.warning("[SANDBOX WORKER] Failed to release worker environment", exc_info=True)
+
+    def close(self) -> None:
+        """Kill every idle worker. Their environments are not released."""
+        with self._lock:
+            workers = [w for idle in self._idle.values() for w in idle]
+            self._idle.clear()
+        for worker in workers:
+            worker.kill()
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""core.action.timeouts
+
+Per-action timeouts derived from how long each action has taken before.
+
+A fixed timeout has to fit the slowest action, so a hung quick action
+blocks the agent loop for as long as a legitimately slow one may run.
+:class:`ActionTimeoutPolicy` keeps the recent durations of every action's
+completed runs and gives it ``p99 × factor``, clamped to ``[floor,
+ceiling]``. Until an action has ``min_samples`` runs it gets the ceiling.
+
+An action that declares ``timeout`` in ``@action(...)`` always gets exactly
+that. When a run times out, the next run of that action gets twice the
+budget (up to the ceiling), so an action whose workload has grown is not
+timed out forever on the strength of its history; a completed run resets
+this.
+
+Durations are recorded by the executor as runs finish and seeded lazily
+from action history the first time a timeout is needed.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, Iterable, Optional
+
+from core.logger import logger
+
+ACTION_TIMEOUT_FACTOR_ENV = "AGENT_ACTION_TIMEOUT_FACTOR"
+ACTION_TIMEOUT_FLOOR_ENV = "AGENT_ACTION_TIMEOUT_FLOOR"
+ACTION_TIMEOUT_CEILING_ENV = "AGENT_ACTION_TIMEOUT_CEILING"
+DEFAULT_TIMEOUT_FACTOR = 3.0
+DEFAULT_TIMEOUT_FLOOR = 30.0
+DEFAULT_TIMEOUT_CEILING = 1800.0
+
+# Completed runs needed before history replaces the ceiling.
+MIN_SAMPLES = 5
+# Most recent durations kept per action.
+HISTORY_WINDOW = 200
+
+
+def percentile(samples: Iterable[float], q: float) -> float:
+    """Nearest-rank ``q``-th percentile (0 < q <= 100) of non-empty ``samples``."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class ActionTimeoutPolicy:
+    """Timeout per action name from its recent run durations (seconds)."""
+
+    def __init__(
+        self,
+        *,
+        factor: float = DEFAULT_TIMEOUT_FACTOR,
+        floor: float = DEFAULT_TIMEOUT_FLOOR,
+        ceiling: float = DEFAULT_TIMEOUT_CEILING,
+        min_samples: int = MIN_SAMPLES,
+        window: int = HISTORY_WINDOW,
+    ) -> None:
+        self.factor = factor
+        self.floor = floor
+        self.ceiling = max(ceiling, floor)
+        self.min_samples = min_samples
+        self._durations: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._timeouts: Dict[str, int] = defaultdict(int)
+        self._history_loader: Optional[Callable[[], Dict[str, Iterable[float]]]] = None
+        self._lock = threading.Lock()
+
+    def attach_history(self, loader: Callable[[], Dict[str, Iterable[float]]]) -> None:
+        """Seed from ``loader()`` (name -> durations in seconds, oldest first) on first use."""
+        with self._lock:
+            self._history_loader = loader
+
+    def _load_history(self) -> None:
+        loader, self._history_loader = self._history_loader, None
+        if loader is None:
+            return
+        try:
+            history = loader()
+        except Exception as e:
+            logger.warning(f"[ACTION TIMEOUT] Could not load duration history: {e}")
+            return
+        for name, durations in history.items():
+            seeded = self._durations[name]
+            recorded = list(seeded)
+            seeded.clear()
+            seeded.extend(durations)
+            seeded.extend(recorded)
+
+    def record(self, action_name: str, seconds: float) -> None:
+        """Record a run that completed within its timeout."""
+        with self._lock:
+            self._durations[action_name].append(seconds)
+            self._timeouts.pop(action_name, None)
+
+    def record_timeout(self, action_name: str) -> None:
+        """Record a run that was stopped by its timeout."""
+        with self._lock:
+            self._timeouts[action_name] += 1
+
+    def p99(self, action_name: str) -> Optional[float]:
+        """The action's p99 duration, or ``None`` below ``min_samples`` runs."""
+        with self._lock:
+            self._load_history()
+            samples = list(self._durations.get(action_name, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return percentile(samples, 99)
+
+    def timeout_for(self, action: Any) -> float:
+        """Seconds ``action`` may run before it is cancelled."""
+        declared = getattr(action, "timeout", None)
+        if declared:
+            return float(declared)
+        p99 = self.p99(action.name)
+        if p99 is None:
+            return self.ceiling
+        budget = min(max(p99 * self.factor, self.floor), self.ceiling)
+        with self._lock:
+            misses = self._timeouts.get(action.name, 0)
+        return min(budget * 2 ** min(misses, 16), self.ceiling)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        logger.warning(f"[ACTION TIMEOUT] Ignoring invalid {name}={os.getenv(name)!r}")
+        return default
+
+
+ACTION_TIMEOUTS = ActionTimeoutPolicy(
+    factor=_env_float(ACTION_TIMEOUT_FACTOR_ENV, DEFAULT_TIMEOUT_FACTOR),
+    floor=_env_float(ACTION_TIMEOUT_FLOOR_ENV, DEFAULT_TIMEOUT_FLOOR),
+    ceiling=_env_float(ACTION_TIMEOUT_CEILING_ENV, DEFAULT_TIMEOUT_CEILING),
+)
@@ -258,13 +258,18 @@ class AgentBase:
 
             # Select and execute action (standard path)
             action_decision, reasoning = await self._select_action(trigger_data)
-            action, action_params, parent_id = await self._retrieve_and_prepare_action(
-                action_decision, trigger_data.parent_id
-            )
-            
-            action_output = await self._execute_action(
-                action, action_params, trigger_data, reasoning, parent_id, session_id
-            )
+            if len(action_decision.get("actions") or []) > 1:
+                action_output = await self._execute_action_batch(
+                    action_decision["actions"], trigger_data, reasoning, session_id
+                )
+            else:
+                action, action_params, parent_id = await self._retrieve_and_prepare_action(
+                    action_decision, trigger_data.parent_id
+                )
+
+                action_output = await self._execute_action(
+                    action, action_params, trigger_data, reasoning, parent_id, session_id
+                )
             
             # Post-action handling
             new_session_id = action_output.get("task_id") or session_id
@@ -382,6 +387,16 @@ class AgentBase:
         Returns:
             Tuple of (action, action_params, parent_id)
         """
+        action, action_params = self._retrieve_action(action_decision)
+        return action, action_params, self._resolve_parent_id(initial_parent_id)
+
+    def _retrieve_action(self, action_decision: dict) -> tuple[Action, dict]:
+        """
+        Retrieve the action a routing decision names.
+
+        Returns:
+            Tuple of (action, action_params)
+        """
         action_name = action_decision.get("action_name")
         action_params = action_decision.get("parameters", {})
         
@@ -394,15 +409,17 @@ class AgentBase:
                 f"Action '{action_name}' not found in the library. "
                 "Check DB connectivity or ensure the action is registered."
             )
-        
-        # Determine parent action ID
+        return action, action_params
+
+    def _resolve_parent_id(self, initial_parent_id: str | None) -> str | None:
+        """The trigger's parent action ID, else the running task step's action ID."""
         parent_id = initial_parent_id
         if not parent_id and self.state_manager.is_running_task():
             current_step = self.state_manager.get_current_step()
             if current_step and current_step.action_id:
                 parent_id = current_step.action_id
         
-        return action, action_params, parent_id or None
+        return parent_id or None
 
     async def _execute_action(
         self,
@@ -429,6 +446,28 @@ class AgentBase:
             input_data=action_params,
         )
 
+    async def _execute_action_batch(
+        self,
+        decisions: list[dict],
+        trigger_data: TriggerData,
+        reasoning: str,
+        session_id: str,
+    ) -> dict:
+        """Execute independent actions selected in one turn concurrently."""
+        batch = [self._retrieve_action(decision) for decision in decisions]
+        parent_id = self._resolve_parent_id(trigger_data.parent_id)
+
+        logger.info(f"[ACTION] Ready to run batch {[action.name for action, _ in batch]}")
+
+        return await self.action_manager.execute_action_batch(
+            batch,
+            context=reasoning if reasoning else trigger_data.query,
+            event_stream=STATE.event_stream,
+            parent_id=parent_id,
+            session_id=session_id,
+            is_running_task=self.state_manager.is_running_task(),
+        )
+
     async def _finalize_action_execution(
         self, new_session_id: str, action_output: dict, session_id: str
     ) -> None:
@@ -562,13 +601,22 @@ class AgentBase:
         # Track the last parsing/validation error for meaningful failure reporting
         last_error: Exception | None = None
 
+        def show_reasoning(path: tuple, text: str) -> None:
+            # Stream the reasoning into the TUI status bar as it is written
+            if path == ("reasoning",):
+                STATE.update_reasoning_preview(text)
+
         # Attempt the LLM call and parsing up to (retries + 1) times
         for attempt in range(retries + 1):
-            # Await the asynchronous LLM call (non-blocking)
-            response = await self.llm.generate_response_async(
-                system_prompt=system_prompt,
-                user_prompt=prompt,
-            )
+            # Stream the LLM call, aborting replies that are not JSON early
+            try:
+                response = await self.llm.generate_json_streaming(
+                    system_prompt=system_prompt,
+                    user_prompt=prompt,
+                    on_partial=show_reasoning,
+                )
+            finally:
+                STATE.update_reasoning_preview("")
 
             try:
                 # Parse and validate the structured JSON response
@@ -808,4 +856,7 @@ class AgentBase:
             default_provider=provider or self.llm.provider,
             default_api_key=api_key,
         )
-        await cli.start()
\ No newline at end of file
+        try:
+            await cli.start()
+        finally:
+            self.db_interface.close()
\ No newline at end of file
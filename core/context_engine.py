@@ -10,9 +10,11 @@ from core.prompt import (
     AGENT_ROLE_PROMPT,
     AGENT_INFO_PROMPT,
     AGENT_STATE_PROMPT,
+    CURRENT_TIME_PROMPT,
     ENVIRONMENTAL_CONTEXT_PROMPT,
     POLICY_PROMPT,
 )
+from core.prompt_layout import LayeredPrompt
 from core.state.state_manager import StateManager
 from core.state.agent_state import STATE
 from typing import Optional, Dict, Any
@@ -152,15 +154,11 @@ class ContextEngine:
 
     def create_system_environmental_context(self):
         """
-        Create a system message block with environmental & temporal context
+        Create a system message block with environmental context.
         """
         import platform
         local_timezone = get_localzone()
-        now = datetime.now(local_timezone)
-        current_time = datetime.utcnow().replace(tzinfo=timezone.utc).isoformat().replace("+00:00","Z")
         prompt = ENVIRONMENTAL_CONTEXT_PROMPT.format(
-            current_time=current_time, 
-            timezone=now.strftime('%Z'),
             user_location=local_timezone, # TODO Not accurate! 
             working_directory=AGENT_WORKSPACE_ROOT,
             operating_system=platform.system(),
@@ -172,6 +170,15 @@ class ContextEngine:
             vm_resolution="1064 x 1064"
             )
         return prompt
+
+    def create_system_current_time(self):
+        """
+        Create a system message block with temporal context. It changes on
+        every call, so it is kept out of the environment block.
+        """
+        now = datetime.now(get_localzone())
+        current_time = datetime.utcnow().replace(tzinfo=timezone.utc).isoformat().replace("+00:00","Z")
+        return CURRENT_TIME_PROMPT.format(current_time=current_time, timezone=now.strftime('%Z'))
     
     def create_system_base_instruction(self):
         """
@@ -207,10 +214,18 @@ class ContextEngine:
         """
         Assembles the system and user messages for the LLM with configurable sections.
 
+        The system message puts the sections that are fixed for a session
+        (role, agent info, policy, environment, base instruction) before
+        the ones that change between calls (agent state, conversation,
+        event streams, task state, current time) and is returned as a
+        :class:`~core.prompt_layout.LayeredPrompt`, so providers can cache
+        the stable prefix.
+
         :param system_flags: Optional dict of booleans to enable/disable system sections.
             Supported keys: ``agent_info``, ``role_info``, ``conversation_history``,
-            ``event_stream``, ``task_state``, ``policy``, ``environment`` and
-            ``base_instruction``. Defaults to all enabled except ``policy``.
+            ``event_stream``, ``task_state``, ``policy``, ``environment`` (which
+            also covers the current time) and ``base_instruction``. Defaults
+            to all enabled except ``policy``.
         :param user_flags: Optional dict of booleans to enable/disable user sections.
             Supported keys: ``query`` and ``expected_output``. Defaults to ``query``
             enabled and ``expected_output`` disabled.
@@ -236,27 +251,32 @@ class ContextEngine:
         system_flags = {**system_default_flags, **(system_flags or {})}
         user_flags = {**user_default_flags, **(user_flags or {})}
 
-        system_sections = [
+        stable_sections = [
             ("role_info", self.create_system_role_info),
             ("agent_info", self.create_system_agent_info),
+            ("policy", self.create_system_policy),
+            ("environment", self.create_system_environmental_context),
+            ("base_instruction", self.create_system_base_instruction),
+        ]
+        volatile_sections = [
             ("agent_state", self.create_system_agent_state),
             ("conversation_history", self.create_system_conversation_history),
             ("event_stream", self.create_system_event_stream_state),
             ("gui_event_stream", self.create_system_gui_event_stream_state),
             ("task_state", self.create_system_task_state),
-            ("policy", self.create_system_policy),
-            ("environment", self.create_system_environmental_context),
-            ("base_instruction", self.create_system_base_instruction),
+            ("environment", self.create_system_current_time),
         ]
 
-        system_content_list = []
-        for key, section_fn in system_sections:
-            if system_flags.get(key):
-                section_content = section_fn()
-                if section_content:
-                    system_content_list.append(section_content)
+        def render(sections):
+            content_list = []
+            for key, section_fn in sections:
+                if system_flags.get(key):
+                    section_content = section_fn()
+                    if section_content:
+                        content_list.append(section_content)
+            return content_list
 
-        system_message_content = "\n".join(system_content_list).strip()
+        system_message_content = LayeredPrompt.from_sections(render(stable_sections), render(volatile_sections))
 
         user_sections = [
             ("query", lambda: self.create_user_query(query)),
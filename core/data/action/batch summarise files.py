@@ -5,6 +5,7 @@ from core.action.action_framework.registry import action
     description="Summarizes all .txt, .md, and .docx files inside a directory using improved summarization logic with chunking and centroid-based clustering.",
     mode="CLI",
     platforms=["linux", "darwin"],
+    requirement=["numpy", "scikit-learn", "sentence-transformers", "aiofiles", "python-docx"],
     input_schema={
         "directory_path": {
             "type": "string",
@@ -57,7 +58,7 @@ from core.action.action_framework.registry import action
     }
 )
 def batch_summarize_files_linux(input_data: dict) -> dict:
-    import os, json, re, sys, importlib, subprocess, asyncio, concurrent.futures
+    import os, json, re, asyncio, concurrent.futures
     
     simulated_mode = input_data.get('simulated_mode', False)
     
@@ -82,12 +83,6 @@ def batch_summarize_files_linux(input_data: dict) -> dict:
 
         os.makedirs(out_dir, exist_ok=True)
 
-        for pkg in ['scikit-learn', 'sentence-transformers', 'aiofiles', 'python-docx']:
-            try:
-                importlib.import_module(pkg.replace('-', '_'))
-            except:
-                subprocess.check_call([sys.executable, '-m', 'pip', 'install', pkg, '--quiet'])
-
         from docx import Document
 
         def load_file(path):
@@ -187,6 +182,7 @@ def batch_summarize_files_linux(input_data: dict) -> dict:
     description="Summarizes all .txt, .md, and .docx files inside a directory using improved summarization logic with chunking and centroid-based clustering.",
     mode="CLI",
     platforms=["windows"],
+    requirement=["numpy", "scikit-learn", "sentence-transformers", "aiofiles"],
     input_schema={
         "directory_path": {
             "type": "string",
@@ -239,7 +235,7 @@ def batch_summarize_files_linux(input_data: dict) -> dict:
     }
 )
 def batch_summarize_files_windows(input_data: dict) -> dict:
-    import os, json, re, sys, importlib, subprocess, asyncio, concurrent.futures
+    import os, re, asyncio, concurrent.futures
     import numpy as np
     from sklearn.cluster import KMeans
     from sentence_transformers import SentenceTransformer
@@ -257,12 +253,6 @@ def batch_summarize_files_windows(input_data: dict) -> dict:
 
         os.makedirs(out_dir, exist_ok=True)
 
-        for pkg in ['scikit-learn', 'sentence-transformers', 'aiofiles']:
-            try:
-                importlib.import_module(pkg.replace('-', '_'))
-            except:
-                subprocess.check_call([sys.executable, '-m', 'pip', 'install', pkg, '--quiet'])
-
         def load_file(path):
             with open(path, 'r', encoding='utf-8', errors='ignore') as f:
                 return f.read()
@@ -4,6 +4,7 @@ from core.action.action_framework.registry import action
     name="combine text documents",
     description="Scans a directory for .txt, .md, and .docx files, extracts their content, and combines them into a single draft Markdown file at the specified output path.",
     mode="CLI",
+    requirement=["python-docx"],
     input_schema={
         "directory_path": {
             "type": "string",
@@ -33,19 +34,11 @@ from core.action.action_framework.registry import action
     }
 )
 def combine_text_documents(input_data: dict) -> dict:
-    import os, sys, json, importlib, subprocess
+    import os
     from typing import List
 
     # Ensure dependencies
 
-    def _ensure(pkg):
-        try:
-            importlib.import_module(pkg)
-        except ImportError:
-            subprocess.check_call([sys.executable, '-m', 'pip', 'install', pkg, '--quiet'])
-
-    _ensure('python-docx')
-
     from docx import Document
 
     # ───────────────────────────────────────────────
@@ -23,7 +23,7 @@ from core.action.action_framework.registry import action
             "description": "Path to the generated Markdown file."
         }
     },
-    requirement=["Document", "docx"],
+    requirement=["Document", "python-docx"],
     test_payload={
         "input_file": "/path/to/input.txt",
         "output_md": "/path/to/output.md",
@@ -31,14 +31,7 @@ from core.action.action_framework.registry import action
     }
 )
 def clean_to_md(input_data: dict) -> dict:
-    import os, sys, json, subprocess, importlib, re
-
-    # Ensure required libraries
-    for pkg in ['python-docx']:
-        try:
-            importlib.import_module(pkg.replace('-', '_'))
-        except ImportError:
-            subprocess.check_call([sys.executable, '-m', 'pip', 'install', pkg, '--quiet'])
+    import os, re
 
     from docx import Document
 
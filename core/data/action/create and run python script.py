@@ -42,13 +42,13 @@ from core.action.action_framework.registry import action
     }
 )
 def create_and_run_python_script(input_data: dict) -> dict:
-    import json
     import sys
     import subprocess
     import io
     import traceback
     import re
     import importlib
+    import importlib.util
 
     code_snippet = input_data.get("code", "")
     
@@ -80,10 +80,10 @@ def create_and_run_python_script(input_data: dict) -> dict:
     stdout_capture = io.StringIO()
     stderr_capture = io.StringIO()
 
-    def _install_package(pkg_name: str) -> bool:
+    def _install_packages(*pkg_names: str) -> bool:
         try:
             subprocess.check_call(
-                [sys.executable, '-m', 'pip', 'install', '--quiet', pkg_name],
+                [sys.executable, '-m', 'pip', 'install', '--quiet', *pkg_names],
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
                 timeout=60
@@ -121,12 +121,11 @@ def create_and_run_python_script(input_data: dict) -> dict:
 
         # Pre-install packages detected from imports (optional optimization)
         # This helps but we'll also handle ImportError at runtime
+        # Missing ones are installed together in a single pip call.
         detected_imports = _extract_imports(code_snippet)
-        for pkg in detected_imports:
-            try:
-                importlib.import_module(pkg)
-            except ImportError:
-                _install_package(pkg)
+        missing_imports = sorted(pkg for pkg in detected_imports if importlib.util.find_spec(pkg) is None)
+        if missing_imports:
+            _install_packages(*missing_imports)
 
         exec_globals = {}
         max_retries = 3
@@ -143,7 +142,7 @@ def create_and_run_python_script(input_data: dict) -> dict:
                     missing_module = module_match.group(1).split('.')[0]  # Get top-level module
                     if retry_count < max_retries - 1:
                         # Try to install the missing module
-                        if _install_package(missing_module):
+                        if _install_packages(missing_module):
                             retry_count += 1
                             continue  # Retry execution
                 # If we can't install or max retries reached, raise the original error
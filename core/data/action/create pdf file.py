@@ -41,13 +41,6 @@ from core.action.action_framework.registry import action
     }
 )
 def create_pdf_file(input_data: dict) -> dict:
-    import json,sys,subprocess,importlib,os
-    def _ensure(pkg):
-        try:
-            importlib.import_module(pkg)
-        except ImportError:
-            subprocess.check_call([sys.executable,"-m","pip","install",pkg,"--quiet"])
-    [_ensure(p) for p in ("markdown2","fpdf2")]
     import markdown2
     from fpdf import FPDF,HTMLMixin
     class PDF(FPDF,HTMLMixin):
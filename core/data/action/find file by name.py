@@ -2,6 +2,7 @@ from core.action.action_framework.registry import action
 
 @action(
     name="find file by name",
+    cacheable=True,
     description="Finds files by name or pattern across the system. Supports wildcards, relative paths, and recursive search.",
     mode="CLI",
     platforms=["linux", "darwin"],
@@ -19,7 +20,8 @@ from core.action.action_framework.registry import action
         "base_directory": {
             "type": "string",
             "example": "~/Documents",
-            "description": "The base directory to start searching from. If not provided, defaults to the agent's workspace directory."
+            "default": "~",
+            "description": "The base directory to start searching from. If not provided, defaults to the user's home directory."
         }
     },
     output_schema={
@@ -109,6 +111,7 @@ def find_file_by_name(input_data: dict) -> dict:
 
 @action(
     name="find file by name",
+    cacheable=True,
     description="Finds files by name or pattern across the system. Supports wildcards, relative paths, and recursive search.",
     mode="CLI",
     platforms=["windows"],
@@ -126,7 +129,8 @@ def find_file_by_name(input_data: dict) -> dict:
         "base_directory": {
             "type": "string",
             "example": r"~\\Documents",
-            "description": "The base directory to start searching from. If not provided, defaults to the agent's workspace directory."
+            "default": "~",
+            "description": "The base directory to start searching from. If not provided, defaults to the user's home directory."
         }
     },
     output_schema={
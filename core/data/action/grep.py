@@ -2,6 +2,7 @@ from core.action.action_framework.registry import action
 
 @action(
     name="grep",
+    cacheable=True,
     description="Searches a text file for keywords and returns matching chunks with pagination.",
     mode="CLI",
     platforms=["linux"],
@@ -219,6 +220,7 @@ def grep_linux(input_data: dict) -> dict:
 
 @action(
     name="grep",
+    cacheable=True,
     description="Searches a text file for keywords and returns matching chunks with pagination.",
     mode="CLI",
     platforms=["windows"],
@@ -426,6 +428,7 @@ def grep_windows(input_data: dict) -> dict:
 
 @action(
     name="grep",
+    cacheable=True,
     description="Searches a text file for keywords and returns matching chunks with pagination.",
     mode="CLI",
     platforms=["darwin"],
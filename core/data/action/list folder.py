@@ -2,6 +2,7 @@ from core.action.action_framework.registry import action
 
 @action(
         name="list folder",
+        cacheable=True,
         description="Lists the contents of a specified folder/directory.",
         mode="CLI",
         input_schema={
@@ -2,6 +2,7 @@ from core.action.action_framework.registry import action
 
 @action(
     name="read pdf file",
+    cacheable=True,
     description="Securely reads a PDF with Docling and returns compact, layout-aware JSON including page sizes, bboxes, text, and form-field candidates. Implements a robust fallback using pypdfium2 and pdfminer.six if Docling cannot determine page sizes or extract text.",
     mode="CLI",
     platforms=["windows", "linux", "darwin"],
@@ -62,7 +63,7 @@ from core.action.action_framework.registry import action
             "description": "Only set if status = error."
         }
     },
-    requirement=["Any", "DocumentConverter", "pypdfium2", "extract_text", "docling", "pdfminer"],
+    requirement=["Any", "DocumentConverter", "pypdfium2", "docling", "pdfminer.six", "pillow"],
     test_payload={
         "file_path": "C:/path/to/form.pdf",
         "simulated_mode": True
@@ -70,21 +71,9 @@ from core.action.action_framework.registry import action
 )
 def read_pdf_file(input_data: dict) -> dict:
     #!/usr/bin/env python3
-    import json, sys, os, re, importlib, subprocess
+    import os, re
     from typing import Any, Dict, List
 
-    # -------------------
-    # Safe dependency install
-    # -------------------
-    def _ensure(pkg: str) -> None:
-        try:
-            importlib.import_module(pkg)
-        except ImportError:
-            subprocess.check_call([sys.executable, '-m', 'pip', 'install', pkg, '--quiet'])
-
-    for _pkg in ('docling','pypdfium2','pdfminer.six','Pillow'):
-        _ensure(_pkg)
-
     from docling.document_converter import DocumentConverter
     import pypdfium2
     from pdfminer.high_level import extract_text
@@ -2,6 +2,7 @@ from core.action.action_framework.registry import action
 
 @action(
     name="read web page from URL",
+    cacheable=True,
     description="Downloads a web page by URL and returns a clean, markdown-friendly text summary and title (no JavaScript execution).",
     mode="CLI",
     input_schema={
@@ -63,7 +64,7 @@ from core.action.action_framework.registry import action
             "description": "Optional error or diagnostic message."
         }
     },
-    requirement=["BeautifulSoup", "trafilatura", "bs4"],
+    requirement=["BeautifulSoup", "requests", "trafilatura", "beautifulsoup4", "lxml"],
     test_payload={
         "url": "https://example.com/article",
         "timeout": 20,
@@ -74,16 +75,7 @@ from core.action.action_framework.registry import action
     }
 )
 def read_web_page_from_url(input_data: dict) -> dict:
-    import json, re, sys, os, subprocess, importlib, requests
-
-    def _ensure(p):
-        try:
-            importlib.import_module(p)
-        except ImportError:
-            subprocess.check_call([sys.executable, '-m', 'pip', 'install', p, '--quiet'])
-
-    for _p in ('requests', 'trafilatura', 'beautifulsoup4', 'lxml'):
-        _ensure(_p)
+    import re, requests
 
     from bs4 import BeautifulSoup
     import trafilatura
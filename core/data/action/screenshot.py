@@ -31,7 +31,7 @@ from core.action.action_framework.registry import action
             "example": "Unable to capture screen."
         }
     },
-    requirement=["mss", "Pillow"],
+    requirement=["mss", "pillow"],
     test_payload={
         "output_path": "C:\\\\Users\\\\user\\\\Pictures\\\\screenshot.png",
         "format": "png",
@@ -39,7 +39,7 @@ from core.action.action_framework.registry import action
     }
 )
 def screenshot(input_data: dict) -> dict:
-    import json, os, sys, subprocess, importlib, time
+    import os, sys, subprocess, time
     from datetime import datetime
 
     simulated_mode = input_data.get('simulated_mode', False)
@@ -51,15 +51,6 @@ def screenshot(input_data: dict) -> dict:
             output_path = '/tmp/screenshot_test.png'
         return {'status': 'success', 'file_path': output_path, 'message': ''}
 
-    # Install required packages
-    def _ensure(pkg):
-        try:
-            importlib.import_module(pkg)
-        except ImportError:
-            subprocess.check_call([sys.executable, '-m', 'pip', 'install', pkg, '--quiet'])
-
-    for pkg in ("mss", "Pillow"):
-        _ensure(pkg)
 
     import mss
     from PIL import Image
@@ -197,16 +188,12 @@ def screenshot(input_data: dict) -> dict:
             "example": "Unable to capture screen."
         }
     },
-    requirement=["mss", "Pillow"],
+    requirement=["mss", "pillow"],
 )
 def screenshot_windows(input_data: dict) -> dict:
-    import json, os, sys, subprocess, importlib
+    import os
     from datetime import datetime
 
-    def _ensure(pkg):
-        try: importlib.import_module(pkg)
-        except ImportError: subprocess.check_call([sys.executable, '-m', 'pip', 'install', pkg, '--quiet'])
-    for pkg in ('mss','Pillow'): _ensure(pkg)
 
     import mss
     from PIL import Image
@@ -261,17 +248,12 @@ def screenshot_windows(input_data: dict) -> dict:
             "example": "Unable to capture screen."
         }
     },
-    requirement=["mss", "Pillow"],
+    requirement=["mss", "pillow"],
 )
 def screenshot_darwin(input_data: dict) -> dict:
-    import json, os, sys, subprocess, importlib
+    import os, sys, subprocess
     from datetime import datetime
 
-    def _ensure(pkg):
-        try: importlib.import_module(pkg)
-        except ImportError: subprocess.check_call([sys.executable,'-m','pip','install',pkg,'--quiet'])
-    for pkg in ('mss','Pillow'): _ensure(pkg)
-
     import mss
     from PIL import Image
 
@@ -2,8 +2,8 @@ from core.action.action_framework.registry import action
 
 @action(
         name="shell exec",
-        description="Executes a shell command using the appropriate OS shell, capturing stdout, stderr, and exit code. Stdin is closed (EOF) by default and no input can be provided by the agent when prompted by shell.",
-        platforms=["linux"],
+        description="Executes a shell command using the appropriate OS shell, capturing stdout, stderr, and exit code. Long output is previewed (head and tail) and saved in full to the file given by stdout_file / stderr_file. Stdin is closed (EOF) by default and no input can be provided by the agent when prompted by shell.",
+        platforms=["linux", "windows", "darwin"],
         input_schema={
                 "command": {
                         "type": "string",
@@ -56,6 +56,26 @@ from core.action.action_framework.registry import action
                 "message": {
                         "type": "string",
                         "example": "Timed out after 30s."
+                },
+                "stdout_file": {
+                        "type": "string",
+                        "example": "/tmp/agent_action_output/20250101_120000_shell_exec_stdout_1a2b3c4d.txt",
+                        "description": "Present when stdout exceeded the preview: file holding the full stdout; 'stdout' then only has its head and tail."
+                },
+                "stdout_bytes": {
+                        "type": "integer",
+                        "example": 73400320,
+                        "description": "Full size of stdout in bytes, present together with stdout_file."
+                },
+                "stderr_file": {
+                        "type": "string",
+                        "example": "/tmp/agent_action_output/20250101_120000_shell_exec_stderr_1a2b3c4d.txt",
+                        "description": "Present when stderr exceeded the preview: file holding the full stderr."
+                },
+                "stderr_bytes": {
+                        "type": "integer",
+                        "example": 2048000,
+                        "description": "Full size of stderr in bytes, present together with stderr_file."
                 }
         },
         test_payload={
@@ -70,7 +90,7 @@ from core.action.action_framework.registry import action
         }
 )
 def shell_exec(input_data: dict) -> dict:
-    import os, json, subprocess
+    import os, signal, subprocess, sys, tempfile, threading, time, uuid
 
     simulated_mode = input_data.get('simulated_mode', False)
     
@@ -102,279 +122,143 @@ def shell_exec(input_data: dict) -> dict:
     for k, v in env_input.items():
         env[str(k)] = str(v)
 
-    run_kwargs = {
-        'capture_output': True,
-        'text': True,
-        'errors': 'replace',
+    popen_kwargs = {
+        'stdout': subprocess.PIPE,
+        'stderr': subprocess.PIPE,
         'cwd': cwd if cwd else None,
         'env': env,
-        'timeout': timeout_seconds,
         'stdin': subprocess.DEVNULL,
-        'shell': True,
     }
 
-    try:
-        # Default: use system shell (sh)
-        result = subprocess.run(
-            command,
-            **run_kwargs
-        )
-        return {
-            'status': 'success' if result.returncode == 0 else 'error',
-            'stdout': result.stdout.strip(),
-            'stderr': result.stderr.strip(),
-            'return_code': result.returncode,
-            'message': ''
-        }
-    except subprocess.TimeoutExpired as e:
-        return {'status': 'error', 'stdout': (e.stdout or '').strip(), 'stderr': (e.stderr or '').strip(), 'return_code': -1, 'message': f'Timed out after {timeout_seconds}s.'}
-    except Exception as e:
-        return {'status': 'error', 'stdout': '', 'stderr': str(e), 'return_code': -1, 'message': str(e)}
-
-@action(
-        name="shell exec",
-        description="Executes a shell command using the appropriate OS shell, capturing stdout, stderr, and exit code. Stdin is closed (EOF) by default and no input can be provided by the agent when prompted by shell.",
-        platforms=["windows"],
-        input_schema={
-                "command": {
-                        "type": "string",
-                        "example": "dir C:\\\\Windows\\\\System32",
-                        "description": "The shell command to execute."
-                },
-                "shell": {
-                        "type": "string",
-                        "example": "auto",
-                        "description": "Shell to use. Default is platform's native shell (cmd, bash, or zsh)."
-                },
-                "timeout": {
-                        "type": "integer",
-                        "example": 60,
-                        "description": "Optional timeout (seconds). If exceeded, the process is terminated."
-                },
-                "cwd": {
-                        "type": "string",
-                        "example": "/home/user",
-                        "description": "Optional working directory for the command."
-                },
-                "env": {
-                        "type": "object",
-                        "additionalProperties": {
-                                "type": "string"
-                        },
-                        "example": {
-                                "MY_VAR": "123"
-                        },
-                        "description": "Optional environment variable overrides."
-                }
-        },
-        output_schema={
-                "status": {
-                        "type": "string",
-                        "example": "success"
-                },
-                "stdout": {
-                        "type": "string",
-                        "example": "Command output text"
-                },
-                "stderr": {
-                        "type": "string",
-                        "example": ""
-                },
-                "return_code": {
-                        "type": "integer",
-                        "example": 0
-                },
-                "message": {
-                        "type": "string",
-                        "example": "Timed out after 30s."
-                }
-        },
-        test_payload={
-                "command": "dir C:\\\\Windows\\\\System32",
-                "shell": "auto",
-                "timeout": 60,
-                "cwd": "/home/user",
-                "env": {
-                        "MY_VAR": "123"
-                },
-                "simulated_mode": True
-        }
-)
-def shell_exec_windows(input_data: dict) -> dict:
-    import os, json, subprocess
-
-    command = str(input_data.get('command', '')).strip()
-    shell_choice = str(input_data.get('shell', 'cmd')).strip().lower()
-    if shell_choice == 'auto':
-        shell_choice = 'cmd'
-    shell_choice = shell_choice if shell_choice in ('cmd', 'powershell', 'pwsh') else 'cmd'
-    timeout_val = input_data.get('timeout')
-    cwd = input_data.get('cwd')
-    env_input = input_data.get('env') or {}
-
-    timeout_seconds = float(timeout_val) if timeout_val is not None else 30.0
-
-    if not command:
-        return {'status': 'error', 'stdout': '', 'stderr': '', 'return_code': -1, 'message': 'command is required.'}
-
-    if cwd and not os.path.isdir(cwd):
-        return {'status': 'error', 'stdout': '', 'stderr': '', 'return_code': -1, 'message': 'Working directory does not exist.'}
-
-    env = os.environ.copy()
-    for k, v in env_input.items():
-        env[str(k)] = str(v)
-
-    if shell_choice == 'powershell':
-        args = ['powershell.exe', '-NoLogo', '-NonInteractive', '-NoProfile', '-ExecutionPolicy', 'Bypass', '-Command', command]
-    elif shell_choice == 'pwsh':
-        args = ['pwsh.exe', '-NoLogo', '-NonInteractive', '-NoProfile', '-Command', command]
+    if os.name == 'nt':
+        if shell_choice == 'powershell':
+            args = ['powershell.exe', '-NoLogo', '-NonInteractive', '-NoProfile', '-ExecutionPolicy', 'Bypass', '-Command', command]
+        elif shell_choice == 'pwsh':
+            args = ['pwsh.exe', '-NoLogo', '-NonInteractive', '-NoProfile', '-Command', command]
+        else:
+            # Use /d and /s to ensure quoted commands (e.g., paths with spaces) are handled consistently.
+            args = ['cmd.exe', '/d', '/s', '/c', command]
+        popen_kwargs['creationflags'] = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
     else:
-        # Use /d and /s to ensure quoted commands (e.g., paths with spaces) are handled consistently.
-        args = ['cmd.exe', '/d', '/s', '/c', command]
-
-    run_kwargs = {
-        'capture_output': True,
-        'text': True,
-        'errors': 'replace',
-        'cwd': cwd if cwd else None,
-        'env': env,
-        'timeout': timeout_seconds,
-        'creationflags': getattr(subprocess, 'CREATE_NO_WINDOW', 0),
-        'stdin': subprocess.DEVNULL,
-    }
+        if sys.platform == 'darwin':
+            args = ['/bin/zsh', '-c', command] if shell_choice == 'zsh' else ['/bin/bash', '-c', command]
+        else:
+            args = command
+            popen_kwargs['shell'] = True
+        # The shell leads its own process group so a timeout can kill
+        # everything it started.
+        popen_kwargs['start_new_session'] = True
 
     try:
-        result = subprocess.run(
-            args,
-            **run_kwargs
-        )
-        return {
-            'status': 'success' if result.returncode == 0 else 'error',
-            'stdout': result.stdout.strip(),
-            'stderr': result.stderr.strip(),
-            'return_code': result.returncode,
-            'message': ''
-        }
-    except subprocess.TimeoutExpired as e:
-        return {'status': 'error', 'stdout': (e.stdout or '').strip(), 'stderr': (e.stderr or '').strip(), 'return_code': -1, 'message': f'Timed out after {timeout_seconds}s.'}
-    except Exception as e:
-        return {'status': 'error', 'stdout': '', 'stderr': str(e), 'return_code': -1, 'message': str(e)}
-
-@action(
-        name="shell exec",
-        description="Executes a shell command using the appropriate OS shell, capturing stdout, stderr, and exit code. Stdin is closed (EOF) by default and no input can be provided by the agent when prompted by shell.",
-        platforms=["darwin"],
-        input_schema={
-                "command": {
-                        "type": "string",
-                        "example": "dir C:\\\\Windows\\\\System32",
-                        "description": "The shell command to execute."
-                },
-                "shell": {
-                        "type": "string",
-                        "example": "auto",
-                        "description": "Shell to use. Default is platform's native shell (cmd, bash, or zsh)."
-                },
-                "timeout": {
-                        "type": "integer",
-                        "example": 60,
-                        "description": "Optional timeout (seconds). If exceeded, the process is terminated."
-                },
-                "cwd": {
-                        "type": "string",
-                        "example": "/home/user",
-                        "description": "Optional working directory for the command."
-                },
-                "env": {
-                        "type": "object",
-                        "additionalProperties": {
-                                "type": "string"
-                        },
-                        "example": {
-                                "MY_VAR": "123"
-                        },
-                        "description": "Optional environment variable overrides."
-                }
-        },
-        output_schema={
-                "status": {
-                        "type": "string",
-                        "example": "success"
-                },
-                "stdout": {
-                        "type": "string",
-                        "example": "Command output text"
-                },
-                "stderr": {
-                        "type": "string",
-                        "example": ""
-                },
-                "return_code": {
-                        "type": "integer",
-                        "example": 0
-                },
-                "message": {
-                        "type": "string",
-                        "example": "Timed out after 30s."
-                }
-        },
-        test_payload={
-                "command": "dir C:\\\\Windows\\\\System32",
-                "shell": "auto",
-                "timeout": 60,
-                "cwd": "/home/user",
-                "env": {
-                        "MY_VAR": "123"
-                },
-                "simulated_mode": True
-        }
-)
-def shell_exec_darwin(input_data: dict) -> dict:
-    import os, json, subprocess
-
-    command = str(input_data.get('command', '')).strip()
-    shell_choice = str(input_data.get('shell', 'bash')).strip().lower()
-    timeout_val = input_data.get('timeout')
-    cwd = input_data.get('cwd')
-    env_input = input_data.get('env') or {}
-
-    timeout_seconds = float(timeout_val) if timeout_val is not None else 30.0
-
-    if not command:
-        return {'status': 'error', 'stdout': '', 'stderr': '', 'return_code': -1, 'message': 'command is required.'}
-
-    if cwd and not os.path.isdir(cwd):
-        return {'status': 'error', 'stdout': '', 'stderr': '', 'return_code': -1, 'message': 'Working directory does not exist.'}
-
-    env = os.environ.copy()
-    for k, v in env_input.items():
-        env[str(k)] = str(v)
-
-    args = ['/bin/zsh', '-c', command] if shell_choice == 'zsh' else ['/bin/bash', '-c', command]
+        limit = max(256, int(os.getenv('AGENT_ACTION_OUTPUT_PREVIEW_BYTES', 16384)))
+    except ValueError:
+        limit = 16384
+    try:
+        quota = int(float(os.getenv('AGENT_ACTION_SPOOL_MB', 1024)) * 1024 * 1024)
+    except ValueError:
+        quota = 1024 * 1024 * 1024
+    spool_dir = os.getenv('AGENT_ACTION_SPOOL_DIR') or os.path.join(tempfile.gettempdir(), 'agent_action_output')
+    captured = {}
 
-    run_kwargs = {
-        'capture_output': True,
-        'text': True,
-        'errors': 'replace',
-        'cwd': cwd if cwd else None,
-        'env': env,
-        'timeout': timeout_seconds,
-        'stdin': subprocess.DEVNULL,
-    }
+    # drain() is OutputSpool plus enforce_spool_quota from
+    # core/action/output_spool.py, inlined: an action whose code mentions
+    # the framework package at all is run on the agent's event-loop thread,
+    # which a long-running command would block.
+    def drain(stream, name):
+        # Keep a head/tail preview in memory; once the stream outgrows it,
+        # write the whole stream to a spill file returned as <name>_file.
+        head, tail, total, spill = bytearray(), bytearray(), 0, None
+        for data in iter(lambda: stream.read(65536), b''):
+            total += len(data)
+            if spill is None and total > limit:
+                try:
+                    os.makedirs(spool_dir, exist_ok=True)
+                    path = os.path.join(spool_dir, f"{time.strftime('%Y%m%d_%H%M%S')}_shell_exec_{name}_{uuid.uuid4().hex[:8]}.txt")
+                    spill = open(path, 'wb')
+                    spill.write(bytes(head) + bytes(tail))
+                    captured[name + '_file'] = path
+                except OSError:
+                    spill = False
+            if spill:
+                spill.write(data)
+            room = limit // 2 - len(head)
+            if room > 0:
+                head += data[:room]
+                data = data[room:]
+            if data:
+                tail += data
+                del tail[:max(0, len(tail) - limit // 2)]
+        stream.close()
+        if spill:
+            spill.close()
+            # Delete the oldest spill files once AGENT_ACTION_SPOOL_MB is exceeded.
+            try:
+                entries = sorted((e.stat().st_mtime, e.stat().st_size, e.path) for e in os.scandir(spool_dir) if e.is_file())
+            except OSError:
+                entries = []
+            used = sum(size for _, size, _ in entries)
+            for _, size, old in entries:
+                if used <= quota:
+                    break
+                try:
+                    os.remove(old)
+                    used -= size
+                except OSError:
+                    continue
+        text = head.decode('utf-8', errors='replace')
+        if total > limit:
+            captured[name + '_bytes'] = total
+            where = f"; full output in {captured[name + '_file']}" if name + '_file' in captured else ''
+            text += f"\n... [{total - len(head) - len(tail)} bytes omitted{where}] ...\n"
+        captured[name] = (text + tail.decode('utf-8', errors='replace')).strip()
 
     try:
-        result = subprocess.run(
+        proc = subprocess.Popen(
             args,
-            **run_kwargs
+            **popen_kwargs
         )
+        readers = [threading.Thread(target=drain, args=(proc.stdout, 'stdout'), daemon=True),
+                   threading.Thread(target=drain, args=(proc.stderr, 'stderr'), daemon=True)]
+        for reader in readers:
+            reader.start()
+        deadline = time.monotonic() + timeout_seconds
+        for reader in readers:
+            reader.join(max(0.0, deadline - time.monotonic()))
+        timed_out = any(reader.is_alive() for reader in readers)
+        if timed_out:
+            # Kill the shell's whole process group: killing the shell alone
+            # leaves the commands it started running and holding the pipes.
+            try:
+                if os.name == 'nt':
+                    proc.kill()
+                else:
+                    os.killpg(proc.pid, signal.SIGKILL)
+            except OSError:
+                proc.kill()
+            for reader in readers:
+                reader.join(5)
+            # A killed command's spill files are cut off mid-stream; delete
+            # them rather than hand them back as the full output.
+            for name in ('stdout', 'stderr'):
+                path = captured.pop(name + '_file', None)
+                captured.pop(name + '_bytes', None)
+                if path:
+                    captured[name] = captured.get(name, '').replace(f"; full output in {path}", '')
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+        returncode = proc.wait()
+        handles = {k: v for k, v in captured.items() if k.endswith(('_file', '_bytes'))}
+        if timed_out:
+            return {'status': 'error', 'stdout': captured.get('stdout', ''), 'stderr': captured.get('stderr', ''), 'return_code': -1, 'message': f'Timed out after {timeout_seconds}s.', **handles}
         return {
-            'status': 'success' if result.returncode == 0 else 'error',
-            'stdout': result.stdout.strip(),
-            'stderr': result.stderr.strip(),
-            'return_code': result.returncode,
-            'message': ''
+            'status': 'success' if returncode == 0 else 'error',
+            'stdout': captured.get('stdout', ''),
+            'stderr': captured.get('stderr', ''),
+            'return_code': returncode,
+            'message': '',
+            **handles
         }
-    except subprocess.TimeoutExpired as e:
-        return {'status': 'error', 'stdout': (e.stdout or '').strip(), 'stderr': (e.stderr or '').strip(), 'return_code': -1, 'message': f'Timed out after {timeout_seconds}s.'}
     except Exception as e:
-        return {'status': 'error', 'stdout': '', 'stderr': str(e), 'return_code': -1, 'message': str(e)}
\ No newline at end of file
+        return {'status': 'error', 'stdout': '', 'stderr': str(e), 'return_code': -1, 'message': str(e)}
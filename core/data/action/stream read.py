@@ -2,6 +2,7 @@ from core.action.action_framework.registry import action
 
 @action(
     name="stream read",
+    cacheable=True,
     description="Reads a text file and returns a paginated slice of lines and segments, similar to `sed -n 'start,endp'` but safe for very long lines.",
     mode="CLI",
     platforms=["linux"],
@@ -232,6 +233,7 @@ def stream_read_linux(input_data: dict) -> dict:
 
 @action(
     name="stream read",
+    cacheable=True,
     description="Reads a text file and returns a paginated slice of lines and segments, similar to `sed -n 'start,endp'` but safe for very long lines.",
     mode="CLI",
     platforms=["windows"],
@@ -450,6 +452,7 @@ def stream_read_windows(input_data: dict) -> dict:
 
 @action(
     name="stream read",
+    cacheable=True,
     description="Reads a text file and returns a paginated slice of lines and segments, similar to `sed -n 'start,endp'` but safe for very long lines.",
     mode="CLI",
     platforms=["darwin"],
@@ -5,6 +5,7 @@ from core.action.action_framework.registry import action
     description="Reads a text file and write the summary to a new text file.",
     mode="CLI",
     platforms=["linux"],
+    requirement=["numpy", "scikit-learn", "sentence-transformers", "aiofiles"],
     input_schema={
         "input_file": {
             "type": "string",
@@ -59,7 +60,7 @@ from core.action.action_framework.registry import action
     }
 )
 def summarize_file_content_linux(input_data: dict) -> dict:
-    import os, json, re, sys, importlib, subprocess, asyncio, concurrent.futures
+    import os, re, asyncio, concurrent.futures
 
     simulated_mode = input_data.get('simulated_mode', False)
     
@@ -82,12 +83,6 @@ def summarize_file_content_linux(input_data: dict) -> dict:
         top_k = int(input_data.get('top_k', 5))
         threshold = float(input_data.get('threshold', 0.55))
 
-        for pkg in ['scikit-learn', 'sentence-transformers', 'aiofiles']:
-            try:
-                importlib.import_module(pkg.replace('-', '_'))
-            except:
-                subprocess.check_call([sys.executable, '-m', 'pip', 'install', pkg, '--quiet'])
-
         import aiofiles
 
         async with aiofiles.open(input_file, 'r', encoding='utf-8') as f:
@@ -222,6 +217,7 @@ def summarize_file_content_linux(input_data: dict) -> dict:
     description="Reads a text file and write the summary to a new text file.",
     mode="CLI",
     platforms=["windows"],
+    requirement=["numpy", "scikit-learn", "sentence-transformers", "aiofiles"],
     input_schema={
         "input_file": {
             "type": "string",
@@ -276,7 +272,7 @@ def summarize_file_content_linux(input_data: dict) -> dict:
     }
 )
 def summarize_file_content_windows(input_data: dict) -> dict:
-    import os, json, re, sys, importlib, subprocess, asyncio, concurrent.futures
+    import os, re, asyncio, concurrent.futures
 
     async def main():
         input_file = input_data.get('input_file')
@@ -292,12 +288,6 @@ def summarize_file_content_windows(input_data: dict) -> dict:
         top_k = int(input_data.get('top_k', 5))
         threshold = float(input_data.get('threshold', 0.55))
 
-        for pkg in ['scikit-learn', 'sentence-transformers', 'aiofiles']:
-            try:
-                importlib.import_module(pkg.replace('-', '_'))
-            except:
-                subprocess.check_call([sys.executable, '-m', 'pip', 'install', pkg, '--quiet'])
-
         import aiofiles
 
         async with aiofiles.open(input_file, 'r', encoding='utf-8') as f:
@@ -432,6 +422,7 @@ def summarize_file_content_windows(input_data: dict) -> dict:
     description="Reads a text file and write the summary to a new text file.",
     mode="CLI",
     platforms=["darwin"],
+    requirement=["numpy", "scikit-learn", "sentence-transformers", "aiofiles"],
     input_schema={
         "input_file": {
             "type": "string",
@@ -486,7 +477,7 @@ def summarize_file_content_windows(input_data: dict) -> dict:
     }
 )
 def summarize_file_content_darwin(input_data: dict) -> dict:
-    import os, json, re, sys, importlib, subprocess, asyncio, concurrent.futures
+    import os, re, asyncio, concurrent.futures
 
     async def main():
         input_file = input_data.get('input_file')
@@ -502,12 +493,6 @@ def summarize_file_content_darwin(input_data: dict) -> dict:
         top_k = int(input_data.get('top_k', 5))
         threshold = float(input_data.get('threshold', 0.55))
 
-        for pkg in ['scikit-learn', 'sentence-transformers', 'aiofiles']:
-            try:
-                importlib.import_module(pkg.replace('-', '_'))
-            except:
-                subprocess.check_call([sys.executable, '-m', 'pip', 'install', pkg, '--quiet'])
-
         import aiofiles
 
         async with aiofiles.open(input_file, 'r', encoding='utf-8') as f:
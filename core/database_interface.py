@@ -2,7 +2,8 @@
 """core.database_interface
 
 A filesystem backed storage layer (plus ChromaDB) so the rest of the
-codebase never talks to persistence details directly.
+codebase never talks to persistence details directly. Prompt, action and
+task logs are delegated to a pluggable :mod:`core.storage` backend.
 """
 
 from __future__ import annotations
@@ -18,6 +19,10 @@ from typing import Any, Dict, Iterable, List, Optional
 import chromadb
 
 from core.logger import logger
+from core.storage.chroma_sync import content_hash, load_manifest, sync_collection
+from core.storage.factory import create_log_backend
+from core.storage.prompt_blobs import PromptBlobStore
+from core.storage.write_behind import WriteBehindLogWriter
 from core.task.task import Task
 
 from core.action.action_framework.registry import registry_instance
@@ -33,6 +38,11 @@ class DatabaseInterface:
         data_dir: str = "core/data",
         chroma_path: str = "./chroma_db",
         log_file: Optional[str] = None,
+        log_backend: Optional[str] = None,
+        action_history_compact_every: int = 1000,
+        prompt_log_write_behind: bool = True,
+        prompt_log_options: Optional[Dict[str, Any]] = None,
+        prompt_log_dedup: bool = True,
     ) -> None:
         """
         Initialize storage directories and vector stores for agent data.
@@ -47,12 +57,26 @@ class DatabaseInterface:
             chroma_path: Root path for ChromaDB persistence; distinct suffixes
                 are used for actions and task documents.
             log_file: Optional explicit log file path; defaults to
-                ``<data_dir>/agent_logs.txt`` when omitted.
+                ``<data_dir>/agent_logs.txt`` (or ``agent_logs.db`` for the
+                SQLite backend) when omitted.
+            log_backend: Log storage backend, ``"jsonl"`` or ``"sqlite"``.
+                Falls back to the ``AGENT_LOG_BACKEND`` environment variable
+                and then to ``"jsonl"``.
+            action_history_compact_every: Number of superseded action history
+                records tolerated in the JSON-lines log before it is compacted.
+            prompt_log_write_behind: When ``True`` prompt logs are queued and
+                written in groups by a background thread instead of inline.
+            prompt_log_options: Extra keyword arguments for
+                :class:`~core.storage.write_behind.WriteBehindLogWriter`
+                (``max_queue``, ``batch_size``, ``flush_interval_ms``,
+                ``overflow``, ``block_timeout``).
+            prompt_log_dedup: When ``True`` prompt text is stored once per
+                segment in ``<data_dir>/prompt_blobs.jsonl`` and prompt logs
+                only reference segment hashes.
         """
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
-        self.log_file_path = Path(log_file) if log_file else self.data_dir / "agent_logs.txt"
         self.actions_dir = self.data_dir / "action"
         self.task_docs_dir = self.data_dir / "task_document"
         self.agent_info_path = self.data_dir / "agent_info.json"
@@ -60,24 +84,42 @@ class DatabaseInterface:
 
         self.actions_dir.mkdir(parents=True, exist_ok=True)
         self.task_docs_dir.mkdir(parents=True, exist_ok=True)
-        self.log_file_path.touch(exist_ok=True)
         if not self.agent_info_path.exists():
             self.agent_info_path.write_text("{}", encoding="utf-8")
 
+        self.log_backend = create_log_backend(
+            log_backend,
+            data_dir=self.data_dir,
+            log_file=log_file,
+            action_history_compact_every=action_history_compact_every,
+        )
+        self.log_file_path = self.log_backend.path
+        self.prompt_blobs: Optional[PromptBlobStore] = (
+            PromptBlobStore(self.data_dir / "prompt_blobs.jsonl") if prompt_log_dedup else None
+        )
+        self.prompt_log_writer: Optional[WriteBehindLogWriter] = None
+        if prompt_log_write_behind:
+            self.prompt_log_writer = WriteBehindLogWriter(
+                self._persist_prompt_logs, **(prompt_log_options or {})
+            )
 
         # ChromaDB (for vector search on actions and task documents)
         self.chroma = chromadb.PersistentClient(path=f"{chroma_path}_actions")
         self.chroma_actions = self.chroma.get_or_create_collection("agent_actions")
+        self.chroma_actions_manifest_path = Path(f"{chroma_path}_actions") / "action_manifest.json"
 
         # separate ChromaDB client/collection for task documents
         self.chroma_taskdocs = chromadb.PersistentClient(path=f"{chroma_path}_taskdocs")
         self.chroma_taskdocs_coll = self.chroma_taskdocs.get_or_create_collection("task_documents")
+        self.chroma_taskdocs_manifest_path = Path(f"{chroma_path}_taskdocs") / "task_document_manifest.json"
+        # task_id -> (mtime_ns, size, parsed document); validated by stat on lookup
+        self._task_doc_cache: Dict[str, tuple[int, int, Dict[str, Any]]] = {}
 
         # Ensure Chroma stays in sync with the filesystem sources on startup
         self.sync_actions_to_chroma(paths_to_scan=[self.actions_dir])
 
-        # Retrieve everything currently in the collection
-        stored_data = self.chroma_actions.get()
+        # Retrieve the ids currently in the collection (no documents/embeddings)
+        stored_data = self.chroma_actions.get(include=[])
         stored_ids = stored_data.get("ids", [])
         count = len(stored_ids)
         
@@ -90,34 +132,6 @@ class DatabaseInterface:
 
         self.sync_task_documents_to_chroma()
 
-    # ------------------------------------------------------------------
-    # Log helpers
-    # ------------------------------------------------------------------
-    def _load_log_entries(self) -> List[Dict[str, Any]]:
-        entries: List[Dict[str, Any]] = []
-        try:
-            with self.log_file_path.open("r", encoding="utf-8") as handle:
-                for line in handle:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        entries.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        logger.warning(f"[LOG PARSE] Skipping malformed line in {self.log_file_path}")
-        except FileNotFoundError:
-            pass
-        return entries
-
-    def _write_log_entries(self, entries: Iterable[Dict[str, Any]]) -> None:
-        with self.log_file_path.open("w", encoding="utf-8") as handle:
-            for entry in entries:
-                handle.write(json.dumps(entry, default=str) + "\n")
-
-    def _append_log_entry(self, entry: Dict[str, Any]) -> None:
-        with self.log_file_path.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(entry, default=str) + "\n")
-
     # ------------------------------------------------------------------
     # Prompt logging & token usage helpers
     # ------------------------------------------------------------------
@@ -132,12 +146,16 @@ class DatabaseInterface:
         status: str,
         token_count_input: Optional[int] = None,
         token_count_output: Optional[int] = None,
+        token_count_cached: Optional[int] = None,
+        cache: str | None = None,
     ) -> None:
         """
         Store a single prompt interaction with metadata and token counts.
 
-        Each call appends a structured record to the log file so usage metrics
-        and model behavior can be inspected later.
+        Each call appends a structured record to the log backend so usage
+        metrics and model behavior can be inspected later. With write-behind
+        enabled the record is only enqueued here and persisted by the
+        background writer.
 
         Args:
             input_data: Serialized prompt inputs sent to the model provider.
@@ -149,6 +167,10 @@ class DatabaseInterface:
                 ``"error"``).
             token_count_input: Optional token count for the prompt payload.
             token_count_output: Optional token count for the model response.
+            token_count_cached: Optional part of ``token_count_input`` the
+                provider read from its prompt cache.
+            cache: Response cache outcome for cacheable calls: ``"hit"``
+                (answered from the cache, no tokens spent) or ``"miss"``.
         """
         entry = {
             "entry_type": "prompt_log",
@@ -162,12 +184,53 @@ class DatabaseInterface:
             "token_count_input": token_count_input,
             "token_count_output": token_count_output,
         }
-        self._append_log_entry(entry)
+        if token_count_cached:
+            entry["token_count_cached"] = token_count_cached
+        if cache is not None:
+            entry["cache"] = cache
+        if self.prompt_log_writer is not None:
+            self.prompt_log_writer.submit(entry)
+        else:
+            self._persist_prompt_logs([entry])
+
+    def _persist_prompt_logs(self, entries: List[Dict[str, Any]]) -> None:
+        if self.prompt_blobs is not None:
+            for entry in entries:
+                if isinstance(entry.get("input"), dict):
+                    entry["input"] = self.prompt_blobs.deflate_input(entry["input"])
+        self.log_backend.log_prompts(entries)
+
+    def rehydrate_prompt_log(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return ``entry`` with its full prompt text restored.
 
-    def _iter_prompt_logs(self) -> Iterable[Dict[str, Any]]:
-        for entry in self._load_log_entries():
-            if entry.get("entry_type") == "prompt_log":
-                yield entry
+        Prompt logs written with deduplication only hold segment hashes under
+        ``system_prompt_segments`` / ``user_prompt_segments``; this resolves
+        them back into ``system_prompt`` / ``user_prompt``. Entries written
+        without deduplication are returned unchanged.
+
+        Args:
+            entry: A ``prompt_log`` record as stored by the log backend.
+
+        Returns:
+            A copy of ``entry`` with plain-text prompt fields.
+        """
+        if self.prompt_blobs is None or not isinstance(entry.get("input"), dict):
+            return entry
+        return {**entry, "input": self.prompt_blobs.inflate_input(entry["input"])}
+
+    def iter_prompt_logs(self, *, rehydrate: bool = True) -> Iterable[Dict[str, Any]]:
+        """
+        Yield stored prompt logs in insertion order.
+
+        Args:
+            rehydrate: Resolve deduplicated prompt segments back into text.
+                Pass ``False`` to read the compact records as stored.
+        """
+        if self.prompt_log_writer is not None:
+            self.prompt_log_writer.flush()
+        for entry in self.log_backend.iter_prompt_logs():
+            yield self.rehydrate_prompt_log(entry) if rehydrate else entry
 
     # ------------------------------------------------------------------
     # Action history logging
@@ -185,12 +248,16 @@ class DatabaseInterface:
         outputs: Dict[str, Any] | None,
         started_at: str | None,
         ended_at: str | None,
+        cache: str | None = None,
+        resources: Dict[str, Any] | None = None,
     ) -> None:
         """
         Insert or update an action execution history entry.
 
         The log is keyed by ``run_id``; repeated writes merge new details while
-        preserving the initial ``startedAt`` value when absent.
+        preserving the initial ``startedAt`` value when absent. Neither backend
+        rewrites existing history: the JSON-lines log appends delta records and
+        SQLite updates the run's row in place.
 
         Args:
             run_id: Unique identifier for the action execution instance.
@@ -204,8 +271,13 @@ class DatabaseInterface:
             outputs: Serialized action outputs, if available.
             started_at: ISO timestamp for when execution began.
             ended_at: ISO timestamp for when execution completed.
+            cache: Result cache outcome for cacheable actions: ``"hit"``,
+                ``"miss"`` or ``"bypass"`` when the inputs could not be
+                fingerprinted.
+            resources: Resource usage of the finished run (``wall_ms``,
+                ``cpu_ms``, ``peak_rss_bytes``, ``read_bytes``,
+                ``write_bytes`` and the measuring ``source``).
         """
-        entries = self._load_log_entries()
         payload = {
             "entry_type": "action_history",
             "runId": run_id,
@@ -220,29 +292,15 @@ class DatabaseInterface:
             "startedAt": started_at,
             "endedAt": ended_at,
         }
+        if cache is not None:
+            payload["cache"] = cache
+        if resources is not None:
+            payload["resources"] = resources
 
-        found = False
-        for entry in entries:
-            if entry.get("entry_type") == "action_history" and entry.get("runId") == run_id:
-                entry["action_type"] = payload["action_type"]
-                entry["type"] = payload["type"]
-                entry.update({k: v for k, v in payload.items() if v is not None or k in {"inputs", "outputs"}})
-                if entry.get("startedAt") is None:
-                    entry["startedAt"] = started_at
-                found = True
-                break
-
-        if not found:
-            if payload["startedAt"] is None:
-                payload["startedAt"] = datetime.datetime.utcnow().isoformat()
-            entries.append(payload)
-
-        self._write_log_entries(entries)
+        self.log_backend.upsert_action_history(payload)
 
     def _iter_action_history(self) -> Iterable[Dict[str, Any]]:
-        for entry in self._load_log_entries():
-            if entry.get("entry_type") == "action_history":
-                yield entry
+        return self.log_backend.iter_action_history()
 
     def find_actions_by_status(self, status: str) -> List[Dict[str, Any]]:
         """
@@ -254,7 +312,7 @@ class DatabaseInterface:
         Returns:
             List of action history dictionaries where ``status`` matches.
         """
-        return [entry for entry in self._iter_action_history() if entry.get("status") == status]
+        return self.log_backend.find_actions_by_status(status)
 
     def get_action_history(self, limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -267,12 +325,72 @@ class DatabaseInterface:
             A list of action history dictionaries truncated to ``limit``
             entries.
         """
-        history = list(self._iter_action_history())
-        history.sort(
-            key=lambda e: datetime.datetime.fromisoformat(e.get("startedAt") or datetime.datetime.min.isoformat()),
-            reverse=True,
-        )
-        return history[:limit]
+        return self.log_backend.get_action_history(limit)
+
+    def recent_action_durations(self, window: int = 200) -> Dict[str, List[float]]:
+        """
+        Wall times in seconds of the latest successful runs of every action.
+
+        Only runs that completed without an error and carry measured
+        ``resources`` count; cache hits and divisible actions are skipped.
+
+        Args:
+            window: Maximum number of durations kept per action.
+
+        Returns:
+            Mapping of action name to durations, oldest first.
+        """
+        runs: Dict[str, List[tuple]] = {}
+        for entry in self._iter_action_history():
+            resources = entry.get("resources") or {}
+            outputs = entry.get("outputs")
+            if (
+                entry.get("status") != "success"
+                or resources.get("wall_ms") is None
+                or resources.get("source") in ("cache", "divisible")
+                or (isinstance(outputs, dict) and ("error" in outputs or outputs.get("status") == "error"))
+            ):
+                continue
+            runs.setdefault(entry.get("name"), []).append((entry.get("startedAt") or "", resources["wall_ms"] / 1000))
+        return {
+            name: [seconds for _, seconds in sorted(samples)[-window:]]
+            for name, samples in runs.items()
+        }
+
+    def slowest_actions(self, session_id: str | None = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Action runs with the longest wall time, slowest first.
+
+        Args:
+            session_id: Restrict to runs of this session; all sessions when ``None``.
+            limit: Maximum number of runs to return.
+
+        Returns:
+            Action history entries that carry ``resources``.
+        """
+        return self.log_backend.top_action_runs("wall_ms", session_id=session_id, limit=limit)
+
+    def heaviest_actions(
+        self,
+        session_id: str | None = None,
+        limit: int = 10,
+        metric: str = "peak_rss_bytes",
+    ) -> List[Dict[str, Any]]:
+        """
+        Action runs that used the most of a resource, heaviest first.
+
+        Args:
+            session_id: Restrict to runs of this session; all sessions when ``None``.
+            limit: Maximum number of runs to return.
+            metric: One of :data:`core.storage.base.ACTION_RESOURCE_METRICS`.
+
+        Returns:
+            Action history entries that carry ``resources``.
+
+        Raises:
+            ValueError: ``metric`` is not a known resource metric.
+        """
+        return self.log_backend.top_action_runs(metric, session_id=session_id, limit=limit)
 
     # ------------------------------------------------------------------
     # Task logging helpers
@@ -299,21 +417,10 @@ class DatabaseInterface:
             "results": task.results,
             "updated_at": datetime.datetime.utcnow().isoformat(),
         }
-
-        entries = self._load_log_entries()
-        for entry in entries:
-            if entry.get("entry_type") == "task_log" and entry.get("task_id") == task.id:
-                entry.update(doc)
-                break
-        else:
-            entries.append(doc)
-
-        self._write_log_entries(entries)
+        self.log_backend.log_task(doc)
 
     def _iter_task_logs(self) -> Iterable[Dict[str, Any]]:
-        for entry in self._load_log_entries():
-            if entry.get("entry_type") == "task_log":
-                yield entry
+        return self.log_backend.iter_task_logs()
 
     # ------------------------------------------------------------------
     # Action definitions (filesystem + Chroma)
@@ -428,37 +535,42 @@ class DatabaseInterface:
 
     def sync_actions_to_chroma(self, paths_to_scan: List[str] = None) -> int:
         """
-        Build the Chroma action collection from JSON files on disk.
+        Bring the Chroma action collection in line with the action registry.
+
+        Each action is hashed over its name, description and input/output
+        schema and compared with the manifest stored next to the collection,
+        so only new or changed actions are re-embedded and actions that no
+        longer exist are deleted.
 
         Returns:
             Number of action definitions indexed in Chroma.
-        """        
+        """
         load_actions_from_directories(paths_to_scan=paths_to_scan)
 
         actions: List[Dict[str, Any]] = registry_instance.list_all_actions_as_json()
 
-        try:
-            existing = self.chroma_actions.get()
-            ids = existing.get("ids", []) if existing else []
-            if ids:
-                self.chroma_actions.delete(ids=list(ids))
-        except Exception:
-            pass
-
-        ids: List[str] = []
-        documents: List[str] = []
+        desired: Dict[str, Dict[str, Any]] = {}
         for action in actions:
             name = action.get("name")
             if not name:
                 continue
-            ids.append(name)
-            documents.append(name)
-
-        if not ids:
-            return 0
-
-        self.chroma_actions.add(ids=ids, documents=documents)
-        return len(ids)
+            desired[name] = {
+                "hash": content_hash(
+                    name,
+                    action.get("description"),
+                    action.get("input_schema"),
+                    action.get("output_schema"),
+                )
+            }
+
+        stats = sync_collection(
+            self.chroma_actions,
+            self.chroma_actions_manifest_path,
+            desired,
+            lambda name: (name, None),
+        )
+        logger.debug(f"[CHROMA SYNC] Actions: {stats.as_dict()}")
+        return len(desired)
 
     # ------------------------------------------------------------------
     # Agent configuration
@@ -519,56 +631,114 @@ class DatabaseInterface:
             description = first_para[:400]
         return name, description
     
-    def _load_task_documents_from_disk(self) -> List[Dict[str, Any]]:
-        docs: List[Dict[str, Any]] = []
-        for path in sorted(self.task_docs_dir.glob("*.txt")):
+    def _parse_task_document(self, path: Path, raw_text: str) -> Dict[str, Any]:
+        name, description = self._extract_task_document_metadata(raw_text, path.stem)
+        return {
+            "task_id": path.stem,
+            "name": name,
+            "description": description,
+            "raw_text": raw_text,
+            "source_path": str(path),
+        }
+
+    def ingest_task_documents_from_folder(self, folder: str | Path | None = None) -> Dict[str, int]:
+        """
+        Incrementally index the task documents in ``folder`` into Chroma.
+
+        Files whose mtime and size match the manifest are not read at all;
+        the others are hashed and only re-embedded when their content
+        changed. Documents whose file disappeared are removed from the
+        collection.
+
+        Args:
+            folder: Directory holding ``*.txt`` task documents. Defaults to
+                ``<data_dir>/task_document``.
+
+        Returns:
+            Counts of ``added``, ``updated``, ``removed`` and ``unchanged``
+            documents.
+        """
+        folder = Path(folder) if folder is not None else self.task_docs_dir
+        manifest = load_manifest(self.chroma_taskdocs_manifest_path)
+
+        desired: Dict[str, Dict[str, Any]] = {}
+        parsed: Dict[str, Dict[str, Any]] = {}
+        for path in sorted(folder.glob("*.txt")):
+            try:
+                stat = path.stat()
+            except OSError as exc:
+                logger.warning(f"[TASKDOC LOAD] Failed to stat {path}: {exc}")
+                continue
+
+            record = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "source_path": str(path)}
+            previous = manifest.get(path.stem)
+            if previous and all(previous.get(key) == value for key, value in record.items()):
+                desired[path.stem] = previous
+                continue
+
             try:
                 raw_text = path.read_text(encoding="utf-8")
             except Exception as exc:
                 logger.warning(f"[TASKDOC LOAD] Failed to read {path}: {exc}")
                 continue
-    
-            name, description = self._extract_task_document_metadata(raw_text, path.stem)
-            docs.append(
-                {
-                    "task_id": path.stem,
-                    "name": name,
-                    "description": description,
-                    "raw_text": raw_text,
-                    "source_path": str(path),
-                }
-            )
-        return docs
+            parsed[path.stem] = self._parse_task_document(path, raw_text)
+            desired[path.stem] = {**record, "hash": content_hash(raw_text)}
+            self._task_doc_cache[path.stem] = (stat.st_mtime_ns, stat.st_size, parsed[path.stem])
+
+        def build_document(task_id: str) -> tuple[str, Dict[str, Any]]:
+            doc = parsed.get(task_id)
+            if doc is None:
+                # Manifest said unchanged but the collection lost the entry.
+                path = Path(desired[task_id]["source_path"])
+                doc = self._parse_task_document(path, path.read_text(encoding="utf-8"))
+            return f"{doc['name']}\n\n{doc['description']}", {"name": doc["name"]}
+
+        stats = sync_collection(
+            self.chroma_taskdocs_coll,
+            self.chroma_taskdocs_manifest_path,
+            desired,
+            build_document,
+        )
+        for task_id in set(self._task_doc_cache) - set(desired):
+            self._task_doc_cache.pop(task_id, None)
+        return stats.as_dict()
 
-    def sync_task_documents_to_chroma(self) -> int:
+    def _get_task_document(self, task_id: str) -> Optional[Dict[str, Any]]:
         """
-        Rebuild the Chroma collection from task document text files.
+        Return the parsed task document for ``task_id`` from the in-memory cache.
 
-        Returns:
-            Number of task documents indexed in Chroma after the sync.
-        """        
-        docs = self._load_task_documents_from_disk()
+        The cached entry is reused while the file's mtime and size are
+        unchanged; otherwise the file is re-read and the cache refreshed.
+        """
+        cached = self._task_doc_cache.get(task_id)
+        path = Path(cached[2]["source_path"]) if cached else self.task_docs_dir / f"{task_id}.txt"
         try:
-            existing = self.chroma_taskdocs_coll.get()
-            ids = existing.get("ids", []) if existing else []
-            if ids:
-                self.chroma_taskdocs_coll.delete(ids=list(ids))
-        except Exception:
-            pass
+            stat = path.stat()
+        except OSError:
+            self._task_doc_cache.pop(task_id, None)
+            return None
 
-        if not docs:
-            return 0
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
 
-        ids: List[str] = []
-        documents: List[str] = []
-        metadatas: List[Dict[str, Any]] = []
-        for doc in docs:
-            ids.append(doc["task_id"])
-            documents.append(f"{doc['name']}\n\n{doc['description']}")
-            metadatas.append({"name": doc["name"]})
+        try:
+            raw_text = path.read_text(encoding="utf-8")
+        except Exception as exc:
+            logger.warning(f"[TASKDOC LOAD] Failed to read {path}: {exc}")
+            return None
+        doc = self._parse_task_document(path, raw_text)
+        self._task_doc_cache[task_id] = (stat.st_mtime_ns, stat.st_size, doc)
+        return doc
 
-        self.chroma_taskdocs_coll.add(ids=ids, documents=documents, metadatas=metadatas)
-        return len(ids)
+    def sync_task_documents_to_chroma(self) -> int:
+        """
+        Bring the Chroma collection in line with the task document text files.
+
+        Returns:
+            Number of task documents indexed in Chroma after the sync.
+        """
+        stats = self.ingest_task_documents_from_folder(self.task_docs_dir)
+        return stats["added"] + stats["updated"] + stats["unchanged"]
 
     def retrieve_similar_task_documents(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
         """
@@ -595,15 +765,11 @@ class DatabaseInterface:
         if not ids:
             return []
 
-        docs_by_id = {doc["task_id"]: doc for doc in self._load_task_documents_from_disk()}
         docs: List[Dict[str, Any]] = []
         for doc_id in ids:
-            doc = docs_by_id.get(doc_id)
+            doc = self._get_task_document(doc_id)
             if doc:
                 docs.append(doc)
-
-        order = {tid: i for i, tid in enumerate(ids)}
-        docs.sort(key=lambda d: order.get(d.get("task_id", ""), 10**9))
         return docs
 
     def get_task_document_texts(self, query: str, top_k: int = 3) -> List[str]:
@@ -633,13 +799,7 @@ class DatabaseInterface:
             A list of dictionaries pairing ``task_id`` with the active step
             metadata.
         """        
-        results: List[Dict[str, Any]] = []
-        for entry in self._iter_task_logs():
-            task_id = entry.get("task_id")
-            for step in entry.get("steps", []):
-                if step.get("status") == "current":
-                    results.append({"task_id": task_id, "step": step})
-        return results
+        return self.log_backend.find_current_task_steps()
 
     def update_step_status(
         self,
@@ -657,21 +817,15 @@ class DatabaseInterface:
             status: New status string to assign to the step.
             failure_message: Optional failure detail to attach when updating.
         """        
-        entries = self._load_log_entries()
-        updated = False
-        for entry in entries:
-            if entry.get("entry_type") != "task_log" or entry.get("task_id") != task_id:
-                continue
-            for step in entry.get("steps", []):
-                if step.get("action_id") == action_id:
-                    step["status"] = status
-                    if failure_message is not None:
-                        step["failure_message"] = failure_message
-                    updated = True
-                    break
-            if updated:
-                entry["updated_at"] = datetime.datetime.utcnow().isoformat()
-                break
-        if updated:
-            self._write_log_entries(entries)
+        self.log_backend.update_step_status(task_id, action_id, status, failure_message)
 
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        """Flush queued prompt logs and release the log backend."""
+        if self.prompt_log_writer is not None:
+            self.prompt_log_writer.close()
+        if self.prompt_blobs is not None:
+            self.prompt_blobs.close()
+        self.log_backend.close()
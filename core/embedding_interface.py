@@ -15,8 +15,6 @@ Environment variables:
 import os
 from typing import List, Optional
 
-import requests
-
 from core.models.factory import ModelFactory
 from core.models.types import InterfaceType
 from core.logger import logger
@@ -28,6 +26,7 @@ except ImportError:
     OpenAI = None
 
 from core.google_gemini_client import GeminiAPIError, GeminiClient
+from core.http_clients import http_session
 
 
 class EmbeddingInterface:
@@ -127,7 +126,7 @@ class EmbeddingInterface:
                 "Content-Type": "application/json",
                 "Authorization": f"Bearer {self.api_key}",
             }
-            response = requests.post(url, json=payload, headers=headers, timeout=120)
+            response = http_session(url).post(url, json=payload, headers=headers, timeout=120)
             response.raise_for_status()
             result = response.json()
             data = result.get("data")
@@ -145,7 +144,7 @@ class EmbeddingInterface:
                 "prompt": text,  # Ollama accepts "prompt" for /api/embeddings
             }
             url: str = f"{self.remote_url.rstrip('/')}/embeddings"
-            response = requests.post(url, json=payload, timeout=120)
+            response = http_session(url).post(url, json=payload, timeout=120)
             response.raise_for_status()
             result = response.json()
             # Ollama returns {"embedding": [floats]}
@@ -10,9 +10,10 @@ from __future__ import annotations
 
 import base64
 import os
-from typing import Any, Dict, Iterable, List, Optional
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
 
-import requests
+from core.http_clients import http_session, post_json, sse_data, stream_lines
 
 DEFAULT_API_BASE = "https://generativelanguage.googleapis.com"
 DEFAULT_API_VERSION = "v1beta"
@@ -63,6 +64,109 @@ class GeminiClient:
         max_output_tokens: Optional[int] = None,
     ) -> Dict[str, Any]:
         """Generate text for a purely textual prompt."""
+        path, payload = self._text_request(model, prompt, system_prompt, temperature, max_output_tokens)
+        return self._result(self._post_json(path, payload))
+
+    async def generate_text_async(
+        self,
+        model: str,
+        *,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_output_tokens: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Async :meth:`generate_text`; cancelling the caller aborts the request."""
+        path, payload = self._text_request(model, prompt, system_prompt, temperature, max_output_tokens)
+        return self._result(await self._post_json_async(path, payload))
+
+    async def stream_text_async(
+        self,
+        model: str,
+        *,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_output_tokens: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Stream :meth:`generate_text` as ``(text, usage_metadata)`` pieces.
+
+        ``usage_metadata`` is the running ``usageMetadata`` Gemini reports
+        with each piece (``totalTokenCount``, ``cachedContentTokenCount``),
+        or ``{}`` until it reports one.
+        """
+        path, payload = self._text_request(model, prompt, system_prompt, temperature, max_output_tokens)
+        path = path.replace(":generateContent", ":streamGenerateContent")
+        lines = stream_lines(
+            self._endpoint(path),
+            payload,
+            params={"key": self._api_key, "alt": "sse"},
+            timeout=self._timeout,
+        )
+        async with aclosing(lines):
+            async for line in lines:
+                chunk = sse_data(line)
+                if chunk is None:
+                    continue
+                yield self._extract_text(chunk, strip=False), chunk.get("usageMetadata", {})
+
+    def generate_multimodal(
+        self,
+        model: str,
+        *,
+        text: str,
+        image_bytes: bytes,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+    ) -> str:
+        """Generate text from a prompt that also contains an inline image."""
+        path, payload = self._multimodal_request(model, text, image_bytes, system_prompt, temperature)
+        return self._result(self._post_json(path, payload))
+
+    async def generate_multimodal_async(
+        self,
+        model: str,
+        *,
+        text: str,
+        image_bytes: bytes,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Async :meth:`generate_multimodal`."""
+        path, payload = self._multimodal_request(model, text, image_bytes, system_prompt, temperature)
+        return self._result(await self._post_json_async(path, payload))
+
+    def embed_text(self, model: str, *, text: str) -> List[float]:
+        """Fetch an embedding vector for the supplied text."""
+        payload = {
+            "content": {
+                "parts": [{"text": text}],
+            }
+        }
+        response = self._post_json(
+            f"{_normalise_model_name(model)}:embedContent", payload
+        )
+
+        embedding = response.get("embedding")
+        if isinstance(embedding, dict) and "values" in embedding:
+            return list(map(float, embedding.get("values", [])))
+        if isinstance(embedding, list):
+            return [float(x) for x in embedding]
+
+        raise GeminiAPIError("Gemini embedContent response did not contain embeddings.")
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _text_request(
+        model: str,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: Optional[float],
+        max_output_tokens: Optional[int],
+    ) -> Tuple[str, Dict[str, Any]]:
         contents = [
             {
                 "role": "user",
@@ -83,28 +187,16 @@ class GeminiClient:
             }
         if generation_config:
             payload["generationConfig"] = generation_config
+        return f"{_normalise_model_name(model)}:generateContent", payload
 
-        response = self._post_json(
-            f"{_normalise_model_name(model)}:generateContent", payload
-        )
-        total_tokens = response.get("usageMetadata", {}).get("totalTokenCount", 0)
-        content = self._extract_text(response)
-
-        return {
-            "tokens_used": total_tokens,
-            "content": content
-        }
-
-    def generate_multimodal(
-        self,
+    @staticmethod
+    def _multimodal_request(
         model: str,
-        *,
         text: str,
         image_bytes: bytes,
-        system_prompt: Optional[str] = None,
-        temperature: Optional[float] = None,
-    ) -> str:
-        """Generate text from a prompt that also contains an inline image."""
+        system_prompt: Optional[str],
+        temperature: Optional[float],
+    ) -> Tuple[str, Dict[str, Any]]:
         inline_data = {
             "mimeType": "image/png",
             "data": base64.b64encode(image_bytes).decode("utf-8"),
@@ -120,45 +212,26 @@ class GeminiClient:
             }
         if temperature is not None:
             payload["generationConfig"] = {"temperature": temperature}
+        return f"{_normalise_model_name(model)}:generateContent", payload
 
-        response = self._post_json(
-            f"{_normalise_model_name(model)}:generateContent", payload
-        )
-        total_tokens = response.get("usageMetadata", {}).get("totalTokenCount", 0)
+    def _result(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        usage = response.get("usageMetadata", {})
         content = self._extract_text(response)
         return {
-            "tokens_used": total_tokens,
-            "content": content
+            "tokens_used": usage.get("totalTokenCount", 0),
+            "content": content,
+            "token_count_input": usage.get("promptTokenCount", 0),
+            "token_count_output": usage.get("candidatesTokenCount", 0),
+            "cached_tokens": usage.get("cachedContentTokenCount", 0),
         }
 
-    def embed_text(self, model: str, *, text: str) -> List[float]:
-        """Fetch an embedding vector for the supplied text."""
-        payload = {
-            "content": {
-                "parts": [{"text": text}],
-            }
-        }
-        response = self._post_json(
-            f"{_normalise_model_name(model)}:embedContent", payload
-        )
-
-        embedding = response.get("embedding")
-        if isinstance(embedding, dict) and "values" in embedding:
-            return list(map(float, embedding.get("values", [])))
-        if isinstance(embedding, list):
-            return [float(x) for x in embedding]
-
-        raise GeminiAPIError("Gemini embedContent response did not contain embeddings.")
-
-    # ------------------------------------------------------------------
-    # Internal helpers
-    # ------------------------------------------------------------------
     def _endpoint(self, path: str) -> str:
         return f"{self._api_base}/{self._api_version}/{path.lstrip('/')}"
 
     def _post_json(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        response = requests.post(
-            self._endpoint(path),
+        url = self._endpoint(path)
+        response = http_session(url).post(
+            url,
             params={"key": self._api_key},
             json=payload,
             timeout=self._timeout,
@@ -166,8 +239,16 @@ class GeminiClient:
         response.raise_for_status()
         return response.json()
 
+    async def _post_json_async(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return await post_json(
+            self._endpoint(path),
+            payload,
+            params={"key": self._api_key},
+            timeout=self._timeout,
+        )
+
     @staticmethod
-    def _extract_text(response: Dict[str, Any]) -> str:
+    def _extract_text(response: Dict[str, Any], strip: bool = True) -> str:
         feedback = response.get("promptFeedback")
         if isinstance(feedback, dict):
             reason = feedback.get("blockReason")
@@ -182,7 +263,9 @@ class GeminiClient:
             content = candidate.get("content") or {}
             parts: Iterable[Dict[str, Any]] = content.get("parts", []) or []
             texts = [part.get("text", "") for part in parts if isinstance(part, dict)]
-            text = "".join(texts).strip()
+            text = "".join(texts)
+            if strip:
+                text = text.strip()
             if text:
                 return text
 
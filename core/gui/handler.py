@@ -8,6 +8,7 @@ if TYPE_CHECKING:
     from core.gui.gui_module import GUIModule
     
 from core.state.agent_state import STATE
+from core.action.resource_usage import USAGE_REPORT_SNIPPET, USAGE_RESULT_KEY, split_usage_report
 
 # Adjust import path as needed for your project structure
 try:
@@ -244,6 +245,11 @@ import inspect
 import sys
 import os
 import traceback
+import atexit
+import time
+{USAGE_REPORT_SNIPPET}
+# Reported on every exit path, including sys.exit() below.
+atexit.register(_report_usage, time.time())
 
 # --- 0. Ensure X11 env is set for pyautogui / Xlib ---
 if "DISPLAY" not in os.environ:
@@ -325,7 +331,7 @@ except Exception as e:
     def _validate_action_output(cls, stdout: bytes, stderr: bytes, code: int) -> Dict[str, Any]:
         """Validator specifically for JSON action output."""
         stdout_str = stdout.decode(errors='replace').strip()
-        stderr_str = stderr.decode(errors='replace').strip()
+        stderr_str, usage_report = split_usage_report(stderr.decode(errors='replace').strip())
 
         # 1. Attempt to parse stdout as JSON
         try:
@@ -353,6 +359,8 @@ except Exception as e:
 
         # 3. Ensure returncode is included in the final result
         result_dict["returncode"] = code
+        if usage_report is not None:
+            result_dict[USAGE_RESULT_KEY] = {**usage_report, "source": "container"}
         return result_dict
 
 
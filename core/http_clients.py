@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""core.http_clients
+
+Shared HTTP connection pools for model providers.
+
+LLM and VLM calls used to be blocking ``requests``/SDK calls pushed into
+``asyncio.to_thread``. That capped concurrent calls at the default thread
+pool size, and a cancelled call kept its thread and HTTP request running
+until the provider answered. :func:`async_http_client` returns one
+``httpx.AsyncClient`` per running event loop, sized by
+``AGENT_LLM_MAX_CONNECTIONS``. Raw HTTP providers (Ollama, Gemini,
+BytePlus) use it directly, through :func:`post_json` or, for streamed
+replies, :func:`stream_lines`. :func:`async_openai_client` and
+:func:`async_anthropic_client` build the async SDK client matching a sync
+one on top of the same pool.
+
+An ``httpx.AsyncClient`` is tied to the event loop it first ran on. The
+agent runs several loops: the main loop plus the per-run loops of
+internal action threads. Clients are therefore kept per loop and released
+with it.
+
+Blocking calls go through :func:`http_session`, a process-wide
+``requests.Session`` per origin whose keep-alive pool holds up to
+``AGENT_LLM_MAX_CONNECTIONS`` connections. Bare ``requests.post`` opened a
+new TCP (and TLS) connection for every call. A scalar ``timeout`` passed
+to these sessions bounds the read; connecting is bounded separately by
+``CONNECT_TIMEOUT``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import weakref
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from anthropic import Anthropic, AsyncAnthropic
+from openai import AsyncOpenAI, OpenAI
+
+from core.logger import logger
+
+LLM_MAX_CONNECTIONS_ENV = "AGENT_LLM_MAX_CONNECTIONS"
+DEFAULT_LLM_MAX_CONNECTIONS = 256
+DEFAULT_HTTP_TIMEOUT = 120.0
+CONNECT_TIMEOUT = 10.0
+
+_LOOP_LOCAL_LOCK = threading.RLock()
+_LOOP_LOCAL: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, Any]]" = weakref.WeakKeyDictionary()
+
+_SESSIONS_LOCK = threading.Lock()
+_SESSIONS: Dict[str, requests.Session] = {}
+_SESSIONS_PID: Optional[int] = None
+
+
+def max_connections() -> int:
+    try:
+        return max(1, int(os.getenv(LLM_MAX_CONNECTIONS_ENV, DEFAULT_LLM_MAX_CONNECTIONS)))
+    except ValueError:
+        logger.warning(f"[HTTP] Ignoring invalid {LLM_MAX_CONNECTIONS_ENV}={os.getenv(LLM_MAX_CONNECTIONS_ENV)!r}")
+        return DEFAULT_LLM_MAX_CONNECTIONS
+
+
+# ----------------------------------------------------------------------
+# Blocking sessions
+# ----------------------------------------------------------------------
+class _PooledAdapter(HTTPAdapter):
+    """Keep-alive adapter that splits a scalar timeout into connect and read."""
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, timeout: Any = None, **kwargs: Any):
+        if timeout is None:
+            timeout = (CONNECT_TIMEOUT, DEFAULT_HTTP_TIMEOUT)
+        elif isinstance(timeout, (int, float)):
+            timeout = (min(CONNECT_TIMEOUT, timeout), timeout)
+        return super().send(request, stream=stream, timeout=timeout, **kwargs)
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def http_session(url: str) -> requests.Session:
+    """
+    The process-wide keep-alive session for ``url``'s origin.
+
+    Sessions are shared across threads; after a fork the child starts
+    with fresh ones rather than inheriting the parent's sockets.
+    """
+    global _SESSIONS_PID
+    origin = _origin(url)
+    with _SESSIONS_LOCK:
+        if _SESSIONS_PID != os.getpid():
+            _SESSIONS.clear()
+            _SESSIONS_PID = os.getpid()
+        session = _SESSIONS.get(origin)
+        if session is None:
+            limit = max_connections()
+            adapter = _PooledAdapter(pool_connections=1, pool_maxsize=limit)
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _SESSIONS[origin] = session
+        return session
+
+
+def close_http_sessions() -> None:
+    """Close every pooled session and its idle connections."""
+    with _SESSIONS_LOCK:
+        for session in _SESSIONS.values():
+            session.close()
+        _SESSIONS.clear()
+
+
+# ----------------------------------------------------------------------
+# Per-loop async clients
+# ----------------------------------------------------------------------
+def loop_local(key: Hashable, factory: Callable[[], Any]) -> Any:
+    """
+    The object stored under ``key`` for the running event loop, created
+    with ``factory()`` on first use in that loop.
+
+    Raises:
+        RuntimeError: No event loop is running.
+    """
+    loop = asyncio.get_running_loop()
+    with _LOOP_LOCAL_LOCK:
+        objects = _LOOP_LOCAL.setdefault(loop, {})
+        if key not in objects:
+            objects[key] = factory()
+        return objects[key]
+
+
+def async_http_client() -> httpx.AsyncClient:
+    """The running loop's pooled ``httpx.AsyncClient``."""
+
+    def build() -> httpx.AsyncClient:
+        limit = max_connections()
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(DEFAULT_HTTP_TIMEOUT, connect=CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=limit, max_keepalive_connections=limit),
+        )
+
+    return loop_local("httpx", build)
+
+
+async def post_json(url: str, payload: Dict[str, Any], *, timeout: float = DEFAULT_HTTP_TIMEOUT, **kwargs: Any) -> Any:
+    """POST ``payload`` as JSON and return the decoded JSON reply."""
+    response = await async_http_client().post(url, json=payload, timeout=timeout, **kwargs)
+    response.raise_for_status()
+    return response.json()
+
+
+async def stream_lines(
+    url: str, payload: Dict[str, Any], *, timeout: float = DEFAULT_HTTP_TIMEOUT, **kwargs: Any
+) -> AsyncIterator[str]:
+    """
+    POST ``payload`` as JSON and yield the non-empty lines of the streamed
+    reply (server-sent events or NDJSON) as they arrive.
+
+    Closing the generator closes the response and its connection.
+    """
+    async with async_http_client().stream("POST", url, json=payload, timeout=timeout, **kwargs) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if line:
+                yield line
+
+
+def sse_data(line: str) -> Optional[Any]:
+    """Decoded JSON of a ``data:`` event line; ``None`` for anything else."""
+    if not line.startswith("data:"):
+        return None
+    data = line[5:].strip()
+    if not data or data == "[DONE]":
+        return None
+    return json.loads(data)
+
+
+def async_openai_client(client: OpenAI) -> AsyncOpenAI:
+    """``AsyncOpenAI`` twin of ``client`` on the running loop's connection pool."""
+    api_key, base_url = client.api_key, str(client.base_url)
+    return loop_local(
+        ("openai", api_key, base_url),
+        lambda: AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=async_http_client()),
+    )
+
+
+def async_anthropic_client(client: Anthropic) -> AsyncAnthropic:
+    """
+    ``AsyncAnthropic`` twin of ``client`` on the running loop's connection
+    pool, or on a pool of its own for SDK releases that ship their own HTTP
+    stack and reject ``httpx`` clients.
+    """
+    api_key, base_url = client.api_key, str(client.base_url)
+
+    def build() -> AsyncAnthropic:
+        try:
+            return AsyncAnthropic(api_key=api_key, base_url=base_url, http_client=async_http_client())
+        except TypeError:
+            return AsyncAnthropic(api_key=api_key, base_url=base_url)
+
+    return loop_local(("anthropic", api_key, base_url), build)
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""core.llm_cache
+
+Opt-in cache of deterministic LLM replies.
+
+Identical calls recur often: trigger-merge checks, conversation-mode action
+selection, routing retries after a parse error, and diagnostic reruns. At
+``temperature=0`` such a call is expected to get the same reply, so with
+``AGENT_LLM_CACHE=1`` :class:`LLMInterface <core.llm_interface.LLMInterface>`
+answers it from :data:`LLM_RESPONSE_CACHE` instead of the provider. The key
+is a hash of the provider, model, temperature, output-token limit and both
+prompts. Calls at a non-zero temperature are never cached.
+
+The cache has two tiers:
+
+* memory - an LRU bounded by ``AGENT_LLM_CACHE_ENTRIES`` replies and
+  ``AGENT_LLM_CACHE_MB`` megabytes;
+* disk - a SQLite file under ``AGENT_LLM_CACHE_DIR`` (default
+  ``~/.cache/agent_llm_cache``), shared by every agent process and kept
+  across restarts. Once it outgrows ``AGENT_LLM_CACHE_DISK_MB``, the least
+  recently used replies are evicted.
+
+Entries in both tiers expire after ``AGENT_LLM_CACHE_TTL`` seconds (default
+one day). A disk hit is promoted into memory. Only successful, non-empty
+replies are stored.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from core.action.result_cache import ActionResultCache
+from core.logger import logger
+
+LLM_CACHE_ENV = "AGENT_LLM_CACHE"
+LLM_CACHE_DIR_ENV = "AGENT_LLM_CACHE_DIR"
+LLM_CACHE_ENTRIES_ENV = "AGENT_LLM_CACHE_ENTRIES"
+LLM_CACHE_MB_ENV = "AGENT_LLM_CACHE_MB"
+LLM_CACHE_DISK_MB_ENV = "AGENT_LLM_CACHE_DISK_MB"
+LLM_CACHE_TTL_ENV = "AGENT_LLM_CACHE_TTL"
+DEFAULT_CACHE_ENTRIES = 512
+DEFAULT_CACHE_MB = 32
+DEFAULT_CACHE_DISK_MB = 256
+DEFAULT_CACHE_TTL = 24 * 3600.0
+
+# Disk usage is checked against the quota every this many stores.
+_EVICT_EVERY = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key TEXT PRIMARY KEY,
+    created REAL NOT NULL,
+    used REAL NOT NULL,
+    size INTEGER NOT NULL,
+    provider TEXT,
+    model TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_responses_used ON llm_responses(used);
+"""
+_SELECT = "SELECT created, payload FROM llm_responses WHERE key = ?"
+_TOUCH = "UPDATE llm_responses SET used = ? WHERE key = ?"
+_UPSERT = "INSERT OR REPLACE INTO llm_responses (key, created, used, size, provider, model, payload) VALUES (?, ?, ?, ?, ?, ?, ?)"
+_DELETE = "DELETE FROM llm_responses WHERE key = ?"
+_EXPIRE = "DELETE FROM llm_responses WHERE created < ?"
+_TOTAL = "SELECT COALESCE(SUM(size), 0) FROM llm_responses"
+_OLDEST = "SELECT key, size FROM llm_responses ORDER BY used LIMIT ?"
+
+
+def cache_enabled() -> bool:
+    """Whether deterministic replies are cached (``AGENT_LLM_CACHE``, off by default)."""
+    return os.getenv(LLM_CACHE_ENV, "0").strip().lower() in ("1", "true", "yes", "on")
+
+
+def response_cache_key(
+    provider: str,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    system_prompt: Optional[str],
+    user_prompt: str,
+) -> str:
+    material = json.dumps([provider, model, temperature, max_tokens, system_prompt, user_prompt], ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedResponse:
+    """A stored reply and the tokens the original call spent on it."""
+
+    content: str
+    tokens_used: int = 0
+    tier: str = "memory"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"content": self.content, "tokens_used": self.tokens_used}
+
+
+# ----------------------------------------------------------------------
+# Disk tier
+# ----------------------------------------------------------------------
+class _DiskTier:
+    """SQLite store of replies, in WAL mode so agent processes can share it."""
+
+    def __init__(self, db_path: Path, max_bytes: int, ttl: float) -> None:
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._stores = 0
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(_SELECT, (key,)).fetchone()
+            if row is None:
+                return None
+            created, payload = row
+            if now - created > self.ttl:
+                self._conn.execute(_DELETE, (key,))
+                return None
+            self._conn.execute(_TOUCH, (now, key))
+        return json.loads(payload)
+
+    def put(self, key: str, provider: str, model: str, entry: Dict[str, Any]) -> None:
+        payload = json.dumps(entry, ensure_ascii=False)
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(_UPSERT, (key, now, now, size, provider, model, payload))
+            self._stores += 1
+            if self._stores % _EVICT_EVERY == 1:
+                self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute(_EXPIRE, (now - self.ttl,))
+        total = self._conn.execute(_TOTAL).fetchone()[0]
+        while total > self.max_bytes:
+            rows = self._conn.execute(_OLDEST, (_EVICT_EVERY,)).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._conn.execute(_DELETE, (key,))
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+
+
+# ----------------------------------------------------------------------
+# Cache
+# ----------------------------------------------------------------------
+class LLMResponseCache:
+    """Memory LRU in front of the shared SQLite store."""
+
+    def __init__(
+        self,
+        *,
+        directory: Optional[Path] = None,
+        max_entries: int = DEFAULT_CACHE_ENTRIES,
+        max_bytes: int = DEFAULT_CACHE_MB * 1024 * 1024,
+        max_disk_bytes: int = DEFAULT_CACHE_DISK_MB * 1024 * 1024,
+        ttl: float = DEFAULT_CACHE_TTL,
+    ) -> None:
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl = ttl
+        self._memory = ActionResultCache(max_entries=max_entries, max_bytes=max_bytes, ttl=ttl)
+        self._disk: Optional[_DiskTier] = None
+        self._disk_failed = False
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def _disk_tier(self) -> Optional[_DiskTier]:
+        """The disk tier, opened on first use; ``None`` if it cannot be."""
+        if self._disk is None and not self._disk_failed and self.max_disk_bytes > 0:
+            with self._lock:
+                if self._disk is None and not self._disk_failed:
+                    directory = self.directory or Path(
+                        os.getenv(LLM_CACHE_DIR_ENV) or Path.home() / ".cache" / "agent_llm_cache"
+                    )
+                    try:
+                        self._disk = _DiskTier(directory / "responses.sqlite", self.max_disk_bytes, self.ttl)
+                    except (OSError, sqlite3.Error) as e:
+                        logger.warning(f"[LLM CACHE] Disk tier unavailable, caching in memory only: {e}")
+                        self._disk_failed = True
+        return self._disk
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._memory.get(key)
+        tier = "memory"
+        if entry is None:
+            disk = self._disk_tier()
+            try:
+                entry = disk.get(key) if disk is not None else None
+            except sqlite3.Error as e:
+                logger.warning(f"[LLM CACHE] Disk lookup failed: {e}")
+                entry = None
+            if entry is not None:
+                self._memory.put(key, entry)
+                tier = "disk"
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return CachedResponse(tier=tier, **entry)
+
+    def put(self, key: str, provider: str, model: str, response: CachedResponse) -> None:
+        if not response.content:
+            return
+        entry = response.to_dict()
+        self._memory.put(key, entry)
+        disk = self._disk_tier()
+        if disk is None:
+            return
+        try:
+            disk.put(key, provider, model, entry)
+        except sqlite3.Error as e:
+            logger.warning(f"[LLM CACHE] Disk store failed: {e}")
+
+    def clear(self) -> None:
+        self._memory.clear()
+        disk = self._disk_tier()
+        if disk is not None:
+            disk.clear()
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        logger.warning(f"[LLM CACHE] Ignoring invalid {name}={os.getenv(name)!r}")
+        return default
+
+
+LLM_RESPONSE_CACHE = LLMResponseCache(
+    max_entries=int(_env_number(LLM_CACHE_ENTRIES_ENV, DEFAULT_CACHE_ENTRIES)),
+    max_bytes=int(_env_number(LLM_CACHE_MB_ENV, DEFAULT_CACHE_MB) * 1024 * 1024),
+    max_disk_bytes=int(_env_number(LLM_CACHE_DISK_MB_ENV, DEFAULT_CACHE_DISK_MB) * 1024 * 1024),
+    ttl=_env_number(LLM_CACHE_TTL_ENV, DEFAULT_CACHE_TTL),
+)
@@ -8,19 +8,31 @@ Currently support llm call to open ai api, google gemini, and remote call to Oll
 
 from __future__ import annotations
 
-import asyncio
+import json
 import logging
 import os
 import re
-import requests
-from typing import Any, Dict, List, Optional
+from contextlib import aclosing
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
 from openai import OpenAI
 
 from core.models.factory import ModelFactory
 from core.models.types import InterfaceType
 from core.google_gemini_client import GeminiAPIError, GeminiClient
+from core.http_clients import (
+    async_anthropic_client,
+    async_openai_client,
+    http_session,
+    post_json,
+    sse_data,
+    stream_lines,
+)
+from core.llm_cache import LLM_RESPONSE_CACHE, CachedResponse, cache_enabled, response_cache_key
+from core.prompt_layout import prompt_cache_enabled, split_prompt
 from core.state.agent_state import STATE
+from core.streaming_json import IncrementalJSONParser, Path
 from decorators import profiler, profile, log_events
 
 # Logging setup — fall back to a basic logger if the project‑level logger
@@ -31,6 +43,25 @@ except Exception:  # pragma: no cover
     logger = logging.getLogger(__name__)
     logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
+STREAMING_ENV = "AGENT_LLM_STREAMING"
+STREAM_MAX_CHARS_ENV = "AGENT_LLM_STREAM_MAX_CHARS"
+DEFAULT_STREAM_MAX_CHARS = 200_000
+
+# Response cache outcome of the call in progress, recorded in its prompt log.
+_CACHE_OUTCOME: ContextVar[Optional[str]] = ContextVar("llm_cache_outcome", default=None)
+
+
+def streaming_enabled() -> bool:
+    """Whether structured replies are streamed (``AGENT_LLM_STREAMING``, on by default)."""
+    return os.getenv(STREAMING_ENV, "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def stream_max_chars() -> int:
+    try:
+        return max(1, int(os.getenv(STREAM_MAX_CHARS_ENV, DEFAULT_STREAM_MAX_CHARS)))
+    except ValueError:
+        return DEFAULT_STREAM_MAX_CHARS
+
 
 class LLMInterface:
     """Simple wrapper to interact with multiple Large-Language-Model back-ends.
@@ -137,29 +168,103 @@ class LLMInterface:
         user_prompt: Optional[str] = None,
         log_response: bool = True,
     ) -> str:
-        """Synchronous implementation shared by sync/async entry points."""
+        """Synchronous implementation behind :meth:`generate_response`."""
         if user_prompt is None:
             raise ValueError("`user_prompt` cannot be None.")
 
         if log_response:
             logger.info(f"[LLM SEND] system={system_prompt} | user={user_prompt}")
 
+        key = self._cache_key(system_prompt, user_prompt)
+        response = self._cached_response(key, system_prompt, user_prompt)
+        if response is None:
+            outcome = _CACHE_OUTCOME.set("miss" if key else None)
+            try:
+                response = self._call_provider(system_prompt, user_prompt)
+            finally:
+                _CACHE_OUTCOME.reset(outcome)
+            self._store_response(key, response)
+
+        return self._finish_response(response, log_response)
+
+    def _call_provider(self, system_prompt: str | None, user_prompt: str) -> Dict[str, Any]:
         if self.provider == "openai":
-            response = self._generate_openai(system_prompt, user_prompt)
-        elif self.provider == "remote":
-            response = self._generate_ollama(system_prompt, user_prompt)
-        elif self.provider == "gemini":
-            response = self._generate_gemini(system_prompt, user_prompt)
-        elif self.provider == "byteplus":
-            response = self._generate_byteplus(system_prompt, user_prompt)
-        elif self.provider == "anthropic":
-            response = self._generate_anthropic(system_prompt, user_prompt)
-        else:  # pragma: no cover
-            raise RuntimeError(f"Unknown provider {self.provider!r}")
+            return self._generate_openai(system_prompt, user_prompt)
+        if self.provider == "remote":
+            return self._generate_ollama(system_prompt, user_prompt)
+        if self.provider == "gemini":
+            return self._generate_gemini(system_prompt, user_prompt)
+        if self.provider == "byteplus":
+            return self._generate_byteplus(system_prompt, user_prompt)
+        if self.provider == "anthropic":
+            return self._generate_anthropic(system_prompt, user_prompt)
+        raise RuntimeError(f"Unknown provider {self.provider!r}")  # pragma: no cover
+
+    async def _call_provider_async(self, system_prompt: str | None, user_prompt: str) -> Dict[str, Any]:
+        if self.provider == "openai":
+            return await self._generate_openai_async(system_prompt, user_prompt)
+        if self.provider == "remote":
+            return await self._generate_ollama_async(system_prompt, user_prompt)
+        if self.provider == "gemini":
+            return await self._generate_gemini_async(system_prompt, user_prompt)
+        if self.provider == "byteplus":
+            return await self._generate_byteplus_async(system_prompt, user_prompt)
+        if self.provider == "anthropic":
+            return await self._generate_anthropic_async(system_prompt, user_prompt)
+        raise RuntimeError(f"Unknown provider {self.provider!r}")  # pragma: no cover
+
+    # ─────────────────────────────  Response cache  ─────────────────────────────
+    def _cache_key(self, system_prompt: str | None, user_prompt: str) -> Optional[str]:
+        """Response cache key of the call, or ``None`` when it is not cached.
+
+        Only calls at temperature 0 are cached, and only with
+        ``AGENT_LLM_CACHE`` on (see :mod:`core.llm_cache`).
+        """
+        if self.temperature != 0 or not cache_enabled():
+            return None
+        return response_cache_key(
+            self.provider, self.model, self.temperature, self.max_tokens, system_prompt, user_prompt
+        )
 
+    def _cached_response(
+        self, key: Optional[str], system_prompt: str | None, user_prompt: str
+    ) -> Optional[Dict[str, Any]]:
+        """Answer the call from the response cache and count the hit or miss.
+
+        A hit is logged like a provider call with ``cache="hit"`` and no
+        tokens; the tokens the original call spent are added to the
+        ``llm_tokens_saved`` agent property instead of ``token_count``.
+        """
+        if key is None:
+            return None
+        cached = LLM_RESPONSE_CACHE.get(key)
+        if cached is None:
+            STATE.set_agent_property("llm_cache_misses", STATE.get_agent_property("llm_cache_misses", 0) + 1)
+            return None
+        STATE.set_agent_property("llm_cache_hits", STATE.get_agent_property("llm_cache_hits", 0) + 1)
+        STATE.set_agent_property(
+            "llm_tokens_saved", STATE.get_agent_property("llm_tokens_saved", 0) + cached.tokens_used
+        )
+        logger.debug(f"[LLM CACHE] {cached.tier} hit for {self.provider}/{self.model}")
+        self._log_to_db(system_prompt, user_prompt, cached.content, "success", 0, 0, cache="hit")
+        return {"tokens_used": 0, "content": cached.content}
+
+    def _store_response(self, key: Optional[str], response: Dict[str, Any]) -> None:
+        if key is not None and response.get("content"):
+            LLM_RESPONSE_CACHE.put(
+                key, self.provider, self.model, CachedResponse(response["content"], response.get("tokens_used", 0))
+            )
+
+    def _finish_response(self, response: Dict[str, Any], log_response: bool) -> str:
+        """Strip code fences, count tokens and log the reply."""
         cleaned = re.sub(self._CODE_BLOCK_RE, "", response.get("content", "").strip())
 
         STATE.set_agent_property("token_count", STATE.get_agent_property("token_count", 0) + response.get("tokens_used", 0))
+        if response.get("cached_tokens"):
+            STATE.set_agent_property(
+                "llm_cached_input_tokens",
+                STATE.get_agent_property("llm_cached_input_tokens", 0) + response["cached_tokens"],
+            )
         if log_response:
             logger.info(f"[LLM RECV] {cleaned}")
         return cleaned
@@ -181,107 +286,427 @@ class LLMInterface:
         user_prompt: Optional[str] = None,
         log_response: bool = True,
     ) -> str:
-        """Async wrapper that defers the blocking call to a worker thread."""
-        return await asyncio.to_thread(
-            self._generate_response_sync,
+        """Generate a single response on the event loop.
+
+        Every provider has a native async client, so concurrent calls are not
+        bounded by a thread pool, and cancelling the awaiting task aborts the
+        HTTP request.
+        """
+        if user_prompt is None:
+            raise ValueError("`user_prompt` cannot be None.")
+
+        if log_response:
+            logger.info(f"[LLM SEND] system={system_prompt} | user={user_prompt}")
+
+        key = self._cache_key(system_prompt, user_prompt)
+        response = self._cached_response(key, system_prompt, user_prompt)
+        if response is None:
+            outcome = _CACHE_OUTCOME.set("miss" if key else None)
+            try:
+                response = await self._call_provider_async(system_prompt, user_prompt)
+            finally:
+                _CACHE_OUTCOME.reset(outcome)
+            self._store_response(key, response)
+
+        return self._finish_response(response, log_response)
+
+    async def stream_response_async(
+        self,
+        system_prompt: Optional[str] = None,
+        user_prompt: Optional[str] = None,
+        log_response: bool = True,
+    ) -> AsyncIterator[str]:
+        """Yield the reply as the provider generates it.
+
+        The call is logged and its tokens are counted when the generator
+        finishes or is closed, like :meth:`generate_response_async`. Close
+        it (``contextlib.aclosing``) to abort the request early; an aborted
+        call is logged as ``aborted`` and, when the provider never reported
+        usage, its tokens are estimated from the text at four characters a
+        token.
+        """
+        if user_prompt is None:
+            raise ValueError("`user_prompt` cannot be None.")
+
+        if log_response:
+            logger.info(f"[LLM SEND] system={system_prompt} | user={user_prompt}")
+
+        key = self._cache_key(system_prompt, user_prompt)
+        cached = self._cached_response(key, system_prompt, user_prompt)
+        if cached is not None:
+            try:
+                yield cached["content"]
+            finally:
+                self._finish_response(cached, log_response)
+            return
+
+        if self.provider == "openai":
+            stream = self._stream_openai
+        elif self.provider == "remote":
+            stream = self._stream_ollama
+        elif self.provider == "gemini":
+            stream = self._stream_gemini
+        elif self.provider == "byteplus":
+            stream = self._stream_byteplus
+        elif self.provider == "anthropic":
+            stream = self._stream_anthropic
+        else:  # pragma: no cover
+            raise RuntimeError(f"Unknown provider {self.provider!r}")
+
+        usage = {"input": 0, "output": 0, "total": 0, "cached": 0}
+        parts: List[str] = []
+        status = "aborted"
+        exc_obj: Optional[Exception] = None
+        pieces = stream(system_prompt, user_prompt, usage)
+        try:
+            async with aclosing(pieces):
+                async for piece in pieces:
+                    parts.append(piece)
+                    yield piece
+            status = "success"
+        except Exception as exc:
+            status, exc_obj = "failed", exc
+            logger.error(f"Error streaming from {self.provider}: {exc}")
+        finally:
+            content = "".join(parts)
+            if not usage["total"]:
+                usage["input"] = usage["input"] or (len(system_prompt or "") + len(user_prompt)) // 4
+                usage["output"] = usage["output"] or len(content) // 4
+                usage["total"] = usage["input"] + usage["output"]
+            response = self._complete_call(
+                system_prompt,
+                user_prompt,
+                content if content or exc_obj is None else None,
+                exc_obj,
+                status,
+                usage["input"],
+                usage["output"],
+                usage["total"],
+                cache="miss" if key else None,
+                cached_tokens=usage["cached"],
+            )
+            if status == "success":
+                self._store_response(key, response)
+            self._finish_response(response, log_response)
+
+    async def generate_json_streaming(
+        self,
+        system_prompt: Optional[str] = None,
+        user_prompt: Optional[str] = None,
+        *,
+        on_value: Optional[Callable[[Path, Any], None]] = None,
+        on_partial: Optional[Callable[[Path, str], None]] = None,
+        log_response: bool = True,
+    ) -> str:
+        """Generate a reply that should be one JSON object, parsing it as it streams.
+
+        ``on_value(path, value)`` is called for every scalar as soon as it
+        is complete and ``on_partial(path, text)`` with the string value
+        still being written. The request is aborted when the reply cannot
+        be a JSON object or grows past ``AGENT_LLM_STREAM_MAX_CHARS``; the
+        text received so far is returned and fails to parse as usual.
+
+        Returns the reply like :meth:`generate_response_async`. Falls back
+        to it when ``AGENT_LLM_STREAMING`` is off.
+        """
+        if not streaming_enabled():
+            return await self.generate_response_async(system_prompt, user_prompt, log_response)
+
+        parser = IncrementalJSONParser()
+        limit = stream_max_chars()
+        parts: List[str] = []
+        pieces = self.stream_response_async(system_prompt, user_prompt, log_response)
+        async with aclosing(pieces):
+            async for piece in pieces:
+                parts.append(piece)
+                for path, value in parser.feed(piece):
+                    if on_value is not None:
+                        on_value(path, value)
+                if on_partial is not None:
+                    partial = parser.partial
+                    if partial is not None:
+                        on_partial(*partial)
+                if parser.failed and not parser.started:
+                    logger.warning(f"[LLM STREAM] Aborted a reply that is not a JSON object: {parser.error}")
+                    break
+                if parser.chars > limit:
+                    logger.warning(f"[LLM STREAM] Aborted a reply longer than {limit} characters")
+                    break
+        return re.sub(self._CODE_BLOCK_RE, "", "".join(parts).strip())
+
+    # ───────────────────── Provider‑specific private helpers ─────────────────────
+    @staticmethod
+    def _chat_messages(system_prompt: str | None, user_prompt: str) -> List[Dict[str, str]]:
+        messages: List[Dict[str, str]] = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": user_prompt})
+        return messages
+
+    def _openai_request(self, system_prompt: str | None, user_prompt: str) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": self._chat_messages(system_prompt, user_prompt),
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+        }
+
+    @staticmethod
+    def _parse_openai(response: Any) -> Tuple[str, int, int]:
+        content = response.choices[0].message.content.strip()
+        return content, response.usage.prompt_tokens, response.usage.completion_tokens
+
+    @staticmethod
+    def _cached_tokens(usage: Any) -> int:
+        """Prompt tokens the provider read from its prompt cache, from any provider's usage block."""
+        if not usage:
+            return 0
+        if not isinstance(usage, dict):
+            usage = usage.model_dump() if hasattr(usage, "model_dump") else vars(usage)
+        details = usage.get("prompt_tokens_details") or {}
+        return int(
+            details.get("cached_tokens")
+            or usage.get("cache_read_input_tokens")
+            or usage.get("cachedContentTokenCount")
+            or 0
+        )
+
+    def _ollama_request(self, system_prompt: str | None, user_prompt: str) -> Tuple[str, Dict[str, Any]]:
+        payload = {
+            "model": self.model,
+            "system": system_prompt,
+            "prompt": user_prompt,
+            "stream": False,
+            "options": {
+                "temperature": self.temperature,
+            }
+        }
+        return f"{self.remote_url.rstrip('/')}/generate", payload
+
+    @staticmethod
+    def _parse_ollama(result: Dict[str, Any]) -> Tuple[str, int, int, int]:
+        content = result.get("response", "").strip()
+        total_tokens = result.get("usage", {}).get("total_tokens", 0)
+        return content, result.get("prompt_eval_count", 0), result.get("eval_count", 0), total_tokens
+
+    def _byteplus_request(self, system_prompt: str | None, user_prompt: str) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+        # Build OpenAI-compatible messages array
+        url = f"{self.byteplus_base_url.rstrip('/')}/chat/completions"
+        payload = {
+            "model": self.model,
+            "messages": self._chat_messages(system_prompt, user_prompt),
+            # Wire through sampling + output control
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            # "stream": False,  # default is non-streaming
+        }
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}",
+        }
+        return url, payload, headers
+
+    @staticmethod
+    def _parse_byteplus(result: Dict[str, Any]) -> Tuple[Optional[str], int, int, int]:
+        logger.info(f"BUTTPLUG RESPONSE: {result}")
+
+        # Non-streaming content location (OpenAI-compatible)
+        content: Optional[str] = None
+        choices = result.get("choices", [])
+        if choices:
+            # choices[0].message.content is the OpenAI-compatible field
+            content = (
+                choices[0].get("message", {}).get("content")
+                or choices[0].get("delta", {}).get("content", "")
+                or ""
+            ).strip()
+
+        total_tokens = int(result.get("usage", {}).get("total_tokens", 0))
+
+        # Token usage (prompt/completion/total)
+        usage = result.get("usage") or {}
+        return content, int(usage.get("prompt_tokens", 0)), int(usage.get("completion_tokens", 0)), total_tokens
+
+    def _anthropic_request(self, system_prompt: str | None, user_prompt: str) -> Dict[str, Any]:
+        # Build the message with optional system prompt
+        message_kwargs = {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "messages": [{"role": "user", "content": user_prompt}],
+        }
+
+        if system_prompt:
+            message_kwargs["system"] = self._anthropic_system(system_prompt)
+
+        # Always pass temperature for Anthropic (their default is 1.0, not 0.0)
+        message_kwargs["temperature"] = self.temperature
+        return message_kwargs
+
+    @staticmethod
+    def _anthropic_system(system_prompt: str) -> str | List[Dict[str, Any]]:
+        """System prompt with a cache breakpoint after its stable prefix.
+
+        Anthropic caches the prompt up to a ``cache_control`` block. Only a
+        :class:`~core.prompt_layout.LayeredPrompt` has a known stable
+        prefix; any other prompt is sent as a plain string.
+        """
+        stable, volatile = split_prompt(system_prompt)
+        if not stable or not prompt_cache_enabled():
+            return system_prompt
+        blocks: List[Dict[str, Any]] = [{"type": "text", "text": stable, "cache_control": {"type": "ephemeral"}}]
+        if volatile:
+            blocks.append({"type": "text", "text": volatile})
+        return blocks
+
+    @staticmethod
+    def _anthropic_input_tokens(usage: Any) -> int:
+        # ``input_tokens`` leaves out the tokens read from or written to the cache.
+        return (
+            usage.input_tokens
+            + (getattr(usage, "cache_read_input_tokens", 0) or 0)
+            + (getattr(usage, "cache_creation_input_tokens", 0) or 0)
+        )
+
+    @classmethod
+    def _parse_anthropic(cls, response: Any) -> Tuple[str, int, int]:
+        # Extract content from the response
+        content = ""
+        for block in response.content:
+            if block.type == "text":
+                content += block.text
+
+        # Token usage from Anthropic response
+        return content.strip(), cls._anthropic_input_tokens(response.usage), response.usage.output_tokens
+
+    def _complete_call(
+        self,
+        system_prompt: str | None,
+        user_prompt: str,
+        content: Optional[str],
+        exc_obj: Optional[Exception],
+        status: str,
+        token_count_input: int,
+        token_count_output: int,
+        total_tokens: int,
+        cache: Optional[str] = None,
+        cached_tokens: int = 0,
+    ) -> Dict[str, Any]:
+        """Log a provider call to the DB and build its response dict.
+
+        ``cached_tokens`` is the part of ``token_count_input`` the provider
+        read from its prompt cache.
+        """
+        self._log_to_db(
             system_prompt,
             user_prompt,
-            log_response,
+            content if content is not None else str(exc_obj),
+            status,
+            token_count_input,
+            token_count_output,
+            cache=cache,
+            token_count_cached=cached_tokens,
         )
+        return {
+            "tokens_used": total_tokens or 0,
+            "content": content or "",
+            "cached_tokens": cached_tokens,
+        }
 
-    # ───────────────────── Provider‑specific private helpers ─────────────────────
     @log_events(name="_generate_ollama")
     @profile("llm_openai_call")
     def _generate_openai(self, system_prompt: str | None, user_prompt: str) -> str:
-        token_count_input = token_count_output = 0
+        token_count_input = token_count_output = cached_tokens = 0
         status = "failed"
         content: Optional[str] = None
         exc_obj: Optional[Exception] = None
         
         try:
-            messages: List[Dict[str, str]] = []
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            messages.append({"role": "user", "content": user_prompt})
-
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-            )
-            content = response.choices[0].message.content.strip()
-            token_count_input = response.usage.prompt_tokens
-            token_count_output = response.usage.completion_tokens
+            response = self.client.chat.completions.create(**self._openai_request(system_prompt, user_prompt))
+            content, token_count_input, token_count_output = self._parse_openai(response)
+            cached_tokens = self._cached_tokens(response.usage)
             status = "success"
         except Exception as exc: 
             exc_obj = exc
             logger.error(f"Error calling OpenAI API: {exc}")
 
         total_tokens = token_count_input + token_count_output
+        return self._complete_call(
+            system_prompt, user_prompt, content, exc_obj, status, token_count_input, token_count_output, total_tokens,
+            cached_tokens=cached_tokens,
+        )
 
-        self._log_to_db(
-            system_prompt,
-            user_prompt,
-            content if content is not None else str(exc_obj),
-            status,
-            token_count_input,
-            token_count_output,
+    @log_events(name="_generate_openai_async")
+    @profile("llm_openai_call")
+    async def _generate_openai_async(self, system_prompt: str | None, user_prompt: str) -> Dict[str, Any]:
+        token_count_input = token_count_output = cached_tokens = 0
+        status = "failed"
+        content: Optional[str] = None
+        exc_obj: Optional[Exception] = None
+
+        try:
+            response = await async_openai_client(self.client).chat.completions.create(
+                **self._openai_request(system_prompt, user_prompt)
+            )
+            content, token_count_input, token_count_output = self._parse_openai(response)
+            cached_tokens = self._cached_tokens(response.usage)
+            status = "success"
+        except Exception as exc:
+            exc_obj = exc
+            logger.error(f"Error calling OpenAI API: {exc}")
+
+        total_tokens = token_count_input + token_count_output
+        return self._complete_call(
+            system_prompt, user_prompt, content, exc_obj, status, token_count_input, token_count_output, total_tokens,
+            cached_tokens=cached_tokens,
         )
-        return {
-            "tokens_used": total_tokens or 0,
-            "content": content or ""
-        }
 
     @log_events(name="_generate_ollama")
     @profile("llm_ollama_call")
     def _generate_ollama(self, system_prompt: str | None, user_prompt: str) -> str:
-        token_count_input = token_count_output = 0
+        token_count_input = token_count_output = total_tokens = 0
         status = "failed"
         content: Optional[str] = None
         exc_obj: Optional[Exception] = None
 
         try:
-            payload = {
-                "model": self.model,
-                "system": system_prompt,
-                "prompt": user_prompt,
-                "stream": False,
-                "options": {
-                    "temperature": self.temperature,
-                }
-            }
-            url: str = f"{self.remote_url.rstrip('/')}/generate"
-            response = requests.post(url, json=payload, timeout=120)
+            url, payload = self._ollama_request(system_prompt, user_prompt)
+            response = http_session(url).post(url, json=payload, timeout=120)
             response.raise_for_status()
-            result = response.json()
-
-            content = result.get("response", "").strip()
-            total_tokens = result.get("usage", {}).get("total_tokens", 0)
-            token_count_input = result.get("prompt_eval_count", 0)
-            token_count_output = result.get("eval_count", 0)
+            content, token_count_input, token_count_output, total_tokens = self._parse_ollama(response.json())
             status = "success"
         except Exception as exc:  
             exc_obj = exc
             logger.error(f"Error calling Ollama API: {exc}")
 
-        self._log_to_db(
-            system_prompt,
-            user_prompt,
-            content if content is not None else str(exc_obj),
-            status,
-            token_count_input,
-            token_count_output,
+        return self._complete_call(
+            system_prompt, user_prompt, content, exc_obj, status, token_count_input, token_count_output, total_tokens
+        )
+
+    @log_events(name="_generate_ollama_async")
+    @profile("llm_ollama_call")
+    async def _generate_ollama_async(self, system_prompt: str | None, user_prompt: str) -> Dict[str, Any]:
+        token_count_input = token_count_output = total_tokens = 0
+        status = "failed"
+        content: Optional[str] = None
+        exc_obj: Optional[Exception] = None
+
+        try:
+            url, payload = self._ollama_request(system_prompt, user_prompt)
+            result = await post_json(url, payload, timeout=120)
+            content, token_count_input, token_count_output, total_tokens = self._parse_ollama(result)
+            status = "success"
+        except Exception as exc:
+            exc_obj = exc
+            logger.error(f"Error calling Ollama API: {exc}")
+
+        return self._complete_call(
+            system_prompt, user_prompt, content, exc_obj, status, token_count_input, token_count_output, total_tokens
         )
-        return {
-            "tokens_used": total_tokens or 0,
-            "content": content or ""
-        }
 
     @log_events(name="_generate_gemini")
     @profile("llm_gemini_call")
     def _generate_gemini(self, system_prompt: str | None, user_prompt: str) -> str:
-        token_count_input = token_count_output = 0  # Not returned by the Gemini SDK
+        token_count_input = token_count_output = 0
         status = "failed"
         content: Optional[str] = None
         exc_obj: Optional[Exception] = None
@@ -310,8 +735,50 @@ class LLMInterface:
             user_prompt,
             content if content is not None else str(exc_obj),
             status,
-            token_count_input,
-            token_count_output,
+            (content or {}).get("token_count_input", token_count_input),
+            (content or {}).get("token_count_output", token_count_output),
+            token_count_cached=(content or {}).get("cached_tokens", 0),
+        )
+        return content or {
+            "tokens_used": 0,
+            "content": ""
+        }
+
+    @log_events(name="_generate_gemini_async")
+    @profile("llm_gemini_call")
+    async def _generate_gemini_async(self, system_prompt: str | None, user_prompt: str) -> Dict[str, Any]:
+        token_count_input = token_count_output = 0
+        status = "failed"
+        content: Optional[Dict[str, Any]] = None
+        exc_obj: Optional[Exception] = None
+
+        try:
+            if not self._gemini_client:
+                raise RuntimeError("Gemini client was not initialised.")
+
+            content = await self._gemini_client.generate_text_async(
+                self.model,
+                prompt=user_prompt,
+                system_prompt=system_prompt,
+                temperature=self.temperature,
+                max_output_tokens=self.max_tokens,
+            )
+            status = "success"
+        except GeminiAPIError as exc:  # pragma: no cover
+            exc_obj = exc
+            logger.error(f"Gemini API rejected the prompt: {exc}")
+        except Exception as exc:  # pragma: no cover
+            exc_obj = exc
+            logger.error(f"Error calling Gemini API: {exc}")
+
+        self._log_to_db(
+            system_prompt,
+            user_prompt,
+            content if content is not None else str(exc_obj),
+            status,
+            (content or {}).get("token_count_input", token_count_input),
+            (content or {}).get("token_count_output", token_count_output),
+            token_count_cached=(content or {}).get("cached_tokens", 0),
         )
         return content or {
             "tokens_used": 0,
@@ -321,78 +788,59 @@ class LLMInterface:
     @log_events(name="_generate_byteplus")
     @profile("llm_byteplus_call")
     def _generate_byteplus(self, system_prompt: str | None, user_prompt: str) -> str:
-        token_count_input = token_count_output = 0
+        token_count_input = token_count_output = cached_tokens = 0
         total_tokens = 0
         status = "failed"
         content: Optional[str] = None
         exc_obj: Optional[Exception] = None
 
         try:
-            # Build OpenAI-compatible messages array
-            messages: List[Dict[str, str]] = []
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            messages.append({"role": "user", "content": user_prompt})
-
-            url = f"{self.byteplus_base_url.rstrip('/')}/chat/completions"
-            payload = {
-                "model": self.model,
-                "messages": messages,
-                # Wire through sampling + output control
-                "temperature": self.temperature,
-                "max_tokens": self.max_tokens,
-                # "stream": False,  # default is non-streaming
-            }
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.api_key}",
-            }
-
-            response = requests.post(url, json=payload, headers=headers, timeout=120)
+            url, payload, headers = self._byteplus_request(system_prompt, user_prompt)
+            response = http_session(url).post(url, json=payload, headers=headers, timeout=120)
             response.raise_for_status()
             result = response.json()
+            content, token_count_input, token_count_output, total_tokens = self._parse_byteplus(result)
+            cached_tokens = self._cached_tokens(result.get("usage"))
+            status = "success"
 
-            logger.info(f"BUTTPLUG RESPONSE: {result}")
+        except Exception as exc:  # pragma: no cover
+            exc_obj = exc
+            logger.error(f"Error calling BytePlus API: {exc}")
 
-            # Non-streaming content location (OpenAI-compatible)
-            choices = result.get("choices", [])
-            if choices:
-                # choices[0].message.content is the OpenAI-compatible field
-                content = (
-                    choices[0].get("message", {}).get("content")
-                    or choices[0].get("delta", {}).get("content", "")
-                    or ""
-                ).strip()
+        return self._complete_call(
+            system_prompt, user_prompt, content, exc_obj, status, token_count_input, token_count_output, total_tokens,
+            cached_tokens=cached_tokens,
+        )
 
-            total_tokens = int(result.get("usage", {}).get("total_tokens", 0))
+    @log_events(name="_generate_byteplus_async")
+    @profile("llm_byteplus_call")
+    async def _generate_byteplus_async(self, system_prompt: str | None, user_prompt: str) -> Dict[str, Any]:
+        token_count_input = token_count_output = cached_tokens = 0
+        total_tokens = 0
+        status = "failed"
+        content: Optional[str] = None
+        exc_obj: Optional[Exception] = None
 
-            # Token usage (prompt/completion/total)
-            usage = result.get("usage") or {}
-            token_count_input = int(usage.get("prompt_tokens", 0))
-            token_count_output = int(usage.get("completion_tokens", 0))
+        try:
+            url, payload, headers = self._byteplus_request(system_prompt, user_prompt)
+            result = await post_json(url, payload, headers=headers, timeout=120)
+            content, token_count_input, token_count_output, total_tokens = self._parse_byteplus(result)
+            cached_tokens = self._cached_tokens(result.get("usage"))
             status = "success"
 
         except Exception as exc:  # pragma: no cover
             exc_obj = exc
             logger.error(f"Error calling BytePlus API: {exc}")
 
-        self._log_to_db(
-            system_prompt,
-            user_prompt,
-            content if content is not None else str(exc_obj),
-            status,
-            token_count_input,
-            token_count_output,
+        return self._complete_call(
+            system_prompt, user_prompt, content, exc_obj, status, token_count_input, token_count_output, total_tokens,
+            cached_tokens=cached_tokens,
         )
-        return {
-            "tokens_used": total_tokens or 0,
-            "content": content or ""
-        }
 
     @log_events(name="_generate_anthropic")
     @profile("llm_anthropic_call")
     def _generate_anthropic(self, system_prompt: str | None, user_prompt: str) -> str:
-        token_count_input = token_count_output = 0
+        token_count_input = token_count_output = cached_tokens = 0
         total_tokens = 0
         status = "failed"
         content: Optional[str] = None
@@ -402,32 +850,39 @@ class LLMInterface:
             if not self._anthropic_client:
                 raise RuntimeError("Anthropic client was not initialised.")
 
-            # Build the message with optional system prompt
-            message_kwargs = {
-                "model": self.model,
-                "max_tokens": self.max_tokens,
-                "messages": [{"role": "user", "content": user_prompt}],
-            }
-
-            if system_prompt:
-                message_kwargs["system"] = system_prompt
+            response = self._anthropic_client.messages.create(**self._anthropic_request(system_prompt, user_prompt))
+            content, token_count_input, token_count_output = self._parse_anthropic(response)
+            cached_tokens = self._cached_tokens(response.usage)
+            total_tokens = token_count_input + token_count_output
+            status = "success"
 
-            # Always pass temperature for Anthropic (their default is 1.0, not 0.0)
-            message_kwargs["temperature"] = self.temperature
+        except Exception as exc:  # pragma: no cover
+            exc_obj = exc
+            logger.error(f"Error calling Anthropic API: {exc}")
 
-            response = self._anthropic_client.messages.create(**message_kwargs)
+        return self._complete_call(
+            system_prompt, user_prompt, content, exc_obj, status, token_count_input, token_count_output, total_tokens,
+            cached_tokens=cached_tokens,
+        )
 
-            # Extract content from the response
-            content = ""
-            for block in response.content:
-                if block.type == "text":
-                    content += block.text
+    @log_events(name="_generate_anthropic_async")
+    @profile("llm_anthropic_call")
+    async def _generate_anthropic_async(self, system_prompt: str | None, user_prompt: str) -> Dict[str, Any]:
+        token_count_input = token_count_output = cached_tokens = 0
+        total_tokens = 0
+        status = "failed"
+        content: Optional[str] = None
+        exc_obj: Optional[Exception] = None
 
-            content = content.strip()
+        try:
+            if not self._anthropic_client:
+                raise RuntimeError("Anthropic client was not initialised.")
 
-            # Token usage from Anthropic response
-            token_count_input = response.usage.input_tokens
-            token_count_output = response.usage.output_tokens
+            response = await async_anthropic_client(self._anthropic_client).messages.create(
+                **self._anthropic_request(system_prompt, user_prompt)
+            )
+            content, token_count_input, token_count_output = self._parse_anthropic(response)
+            cached_tokens = self._cached_tokens(response.usage)
             total_tokens = token_count_input + token_count_output
             status = "success"
 
@@ -435,18 +890,99 @@ class LLMInterface:
             exc_obj = exc
             logger.error(f"Error calling Anthropic API: {exc}")
 
-        self._log_to_db(
-            system_prompt,
-            user_prompt,
-            content if content is not None else str(exc_obj),
-            status,
-            token_count_input,
-            token_count_output,
+        return self._complete_call(
+            system_prompt, user_prompt, content, exc_obj, status, token_count_input, token_count_output, total_tokens,
+            cached_tokens=cached_tokens,
         )
-        return {
-            "tokens_used": total_tokens or 0,
-            "content": content or ""
-        }
+
+    # ─────────────────── Streaming provider helpers ───────────────────
+    # Each yields text pieces and fills ``usage`` with whatever token counts
+    # the provider reports; ``cached`` is the input read from the prompt cache.
+    async def _stream_openai(self, system_prompt: str | None, user_prompt: str, usage: Dict[str, int]) -> AsyncIterator[str]:
+        stream = await async_openai_client(self.client).chat.completions.create(
+            **self._openai_request(system_prompt, user_prompt),
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        try:
+            async for chunk in stream:
+                if chunk.usage:
+                    usage["input"] = chunk.usage.prompt_tokens
+                    usage["output"] = chunk.usage.completion_tokens
+                    usage["total"] = chunk.usage.total_tokens
+                    usage["cached"] = self._cached_tokens(chunk.usage)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await stream.close()
+
+    async def _stream_ollama(self, system_prompt: str | None, user_prompt: str, usage: Dict[str, int]) -> AsyncIterator[str]:
+        url, payload = self._ollama_request(system_prompt, user_prompt)
+        lines = stream_lines(url, {**payload, "stream": True}, timeout=120)
+        async with aclosing(lines):
+            async for line in lines:
+                chunk = json.loads(line)
+                if chunk.get("done"):
+                    usage["input"] = chunk.get("prompt_eval_count", 0)
+                    usage["output"] = chunk.get("eval_count", 0)
+                if chunk.get("response"):
+                    yield chunk["response"]
+
+    async def _stream_gemini(self, system_prompt: str | None, user_prompt: str, usage: Dict[str, int]) -> AsyncIterator[str]:
+        if not self._gemini_client:
+            raise RuntimeError("Gemini client was not initialised.")
+        pieces = self._gemini_client.stream_text_async(
+            self.model,
+            prompt=user_prompt,
+            system_prompt=system_prompt,
+            temperature=self.temperature,
+            max_output_tokens=self.max_tokens,
+        )
+        async with aclosing(pieces):
+            async for text, metadata in pieces:
+                usage["total"] = metadata.get("totalTokenCount") or usage["total"]
+                usage["cached"] = self._cached_tokens(metadata) or usage["cached"]
+                if text:
+                    yield text
+
+    async def _stream_byteplus(self, system_prompt: str | None, user_prompt: str, usage: Dict[str, int]) -> AsyncIterator[str]:
+        url, payload, headers = self._byteplus_request(system_prompt, user_prompt)
+        payload = {**payload, "stream": True, "stream_options": {"include_usage": True}}
+        lines = stream_lines(url, payload, headers=headers, timeout=120)
+        async with aclosing(lines):
+            async for line in lines:
+                chunk = sse_data(line)
+                if chunk is None:
+                    continue
+                if chunk.get("usage"):
+                    usage["input"] = int(chunk["usage"].get("prompt_tokens", 0))
+                    usage["output"] = int(chunk["usage"].get("completion_tokens", 0))
+                    usage["total"] = int(chunk["usage"].get("total_tokens", 0))
+                    usage["cached"] = self._cached_tokens(chunk["usage"])
+                choices = chunk.get("choices") or []
+                text = choices[0].get("delta", {}).get("content") if choices else None
+                if text:
+                    yield text
+
+    async def _stream_anthropic(self, system_prompt: str | None, user_prompt: str, usage: Dict[str, int]) -> AsyncIterator[str]:
+        if not self._anthropic_client:
+            raise RuntimeError("Anthropic client was not initialised.")
+        stream = await async_anthropic_client(self._anthropic_client).messages.create(
+            **self._anthropic_request(system_prompt, user_prompt),
+            stream=True,
+        )
+        try:
+            async for event in stream:
+                if event.type == "message_start":
+                    usage["input"] = self._anthropic_input_tokens(event.message.usage)
+                    usage["cached"] = self._cached_tokens(event.message.usage)
+                elif event.type == "message_delta":
+                    usage["output"] = event.usage.output_tokens
+                    usage["total"] = usage["input"] + usage["output"]
+                elif event.type == "content_block_delta" and event.delta.type == "text_delta":
+                    yield event.delta.text
+        finally:
+            await stream.close()
 
     # ─────────────────── Internal utilities ───────────────────
     @log_events(name="_log_to_db")
@@ -459,8 +995,15 @@ class LLMInterface:
         status: str,
         token_count_input: int,
         token_count_output: int,
+        cache: Optional[str] = None,
+        token_count_cached: int = 0,
     ) -> None:
-        """Persist prompt/response metadata using the optional `db_interface`."""
+        """Persist prompt/response metadata using the optional `db_interface`.
+
+        ``cache`` is the response cache outcome, ``"hit"`` or ``"miss"``;
+        it defaults to that of the call in progress. ``token_count_cached``
+        is the part of the input the provider read from its prompt cache.
+        """
         if not self.db_interface:
             return
 
@@ -482,6 +1025,8 @@ class LLMInterface:
             status=status,
             token_count_input=token_count_input,
             token_count_output=token_count_output,
+            token_count_cached=token_count_cached,
+            cache=cache or _CACHE_OUTCOME.get(),
         )
 
     # ─────────────────── CLI helper for ad‑hoc testing ───────────────────
@@ -206,7 +206,7 @@ SELECT_ACTION_IN_TASK_PROMPT = """
 Here is your goal:
 {query}
 
-Your job is to select the next action that should run and provide the input parameters so it can be executed immediately.
+Your job is to select the next action that should run and provide the input parameters so it can be executed immediately. When the current step needs several independent actions, you may select up to {max_batch_actions} of them at once and they will run concurrently.
 </objective>
 
 <reasoning>
@@ -232,6 +232,8 @@ Here are some general rules when selecting actions:
 - DO NOT exploit and use 'create and run python script', it is only meant to perform a small piece of atomic action, DO NOT use it to handle the entire step or task in one go.
 - Sometimes when an event is too long, its content will be externalized and save in a tmp folder. To read the event result, agent MUST use the 'grep' action to extract the context with keywords or use 'stream read' to read the content line by line in file. Perform this step until you understand the content of the file enough to utilize the content."
 - Select an action to perform as atomic an action as possible. If part of the goal can be achieved with an existing action, you should select the existing action instead of creating a new one.
+- Batch actions ONLY when they are independent of each other, e.g. reading several files or fetching several URLs. An action whose input depends on another action's output MUST wait for the next turn.
+- DO NOT batch 'send message', 'start next step', 'mark task completed', 'mark task error', 'mark task cancel' or mode switches. Select them on their own.
 
 Important instructions you must follow:
 - The selected action MUST be inside the candidate list below. If none are suitable, set the action name to "" (empty string) so a new action can be created.
@@ -263,6 +265,14 @@ Return ONLY a valid JSON object with this structure and no extra commentary:
     "...": <value>
   }}
 }}
+
+To run several independent actions in this turn, return this structure instead:
+{{
+  "actions": [
+    {{"action_name": "<name of the first action>", "parameters": {{"<parameter name>": <value>}}}},
+    {{"action_name": "<name of the second action>", "parameters": {{"<parameter name>": <value>}}}}
+  ]
+}}
 </output_format>
 
 <notes>
@@ -548,7 +558,6 @@ AGENT_STATE_PROMPT = """
 
 ENVIRONMENTAL_CONTEXT_PROMPT = """
 <agent_environment>
-- Current Time: {current_time} ({timezone})
 - User Location: {user_location}
 - Operating System: {operating_system} {os_version} ({os_platform})
 - VM Operating System: {vm_operating_system} {vm_os_version} ({vm_os_platform})
@@ -557,6 +566,12 @@ ENVIRONMENTAL_CONTEXT_PROMPT = """
 </agent_environment>
 """
 
+CURRENT_TIME_PROMPT = """
+<current_time>
+- Current Time: {current_time} ({timezone})
+</current_time>
+"""
+
 # --- Task Planner ---
 ASK_PLAN_PROMPT = """
 <objective>
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""core.prompt_layout
+
+Stable-prefix layout of system prompts for provider-side prompt caching.
+
+Providers bill and process a cached prompt prefix at a fraction of the
+normal cost and latency, but only while the prefix is byte-identical to an
+earlier call's. :meth:`ContextEngine.make_prompt
+<core.context_engine.ContextEngine.make_prompt>` therefore puts the
+sections that are fixed for a session first (role, agent info, policy,
+environment, instructions). The sections that change on every call come
+after them (agent state, conversation, event streams, task plan, current
+time). It returns the system prompt as a :class:`LayeredPrompt`, a ``str``
+that remembers where the stable prefix ends.
+
+:class:`LLMInterface <core.llm_interface.LLMInterface>` uses that boundary
+to place Anthropic ``cache_control`` breakpoints. OpenAI, BytePlus and
+Gemini cache matching prefixes automatically, so for them the layout alone
+makes repeated calls hit. Setting ``AGENT_LLM_PROMPT_CACHE=0`` drops the
+breakpoints; the layout is kept.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import List, Tuple
+
+PROMPT_CACHE_ENV = "AGENT_LLM_PROMPT_CACHE"
+
+
+def prompt_cache_enabled() -> bool:
+    """Whether provider cache breakpoints are sent (``AGENT_LLM_PROMPT_CACHE``, on by default)."""
+    return os.getenv(PROMPT_CACHE_ENV, "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+class LayeredPrompt(str):
+    """
+    A prompt made of a stable prefix and a volatile suffix.
+
+    It is an ordinary string everywhere else; anything derived from it
+    (concatenation, ``strip``, formatting) is a plain ``str`` without the
+    layout, and is sent without cache breakpoints.
+    """
+
+    stable: str
+    volatile: str
+
+    def __new__(cls, stable: str, volatile: str = "") -> "LayeredPrompt":
+        prompt = super().__new__(cls, stable + volatile)
+        prompt.stable = stable
+        prompt.volatile = volatile
+        return prompt
+
+    @classmethod
+    def from_sections(cls, stable: List[str], volatile: List[str], separator: str = "\n") -> "LayeredPrompt":
+        """Join sections like ``separator.join(stable + volatile).strip()``."""
+        prefix = separator.join(stable).strip()
+        suffix = separator.join(volatile).strip()
+        if prefix and suffix:
+            prefix += separator
+        return cls(prefix, suffix)
+
+    def __reduce__(self):
+        return LayeredPrompt, (self.stable, self.volatile)
+
+
+def split_prompt(prompt: str) -> Tuple[str, str]:
+    """``(stable prefix, volatile suffix)`` of ``prompt``; a plain string has no stable prefix."""
+    if isinstance(prompt, LayeredPrompt):
+        return prompt.stable, prompt.volatile
+    return "", prompt
@@ -14,6 +14,8 @@ class AgentState:
     current_task: Optional[Task] = None
     event_stream: Optional[str] = None
     gui_mode: bool = False
+    # Reasoning the model is still streaming, for display only.
+    reasoning_preview: str = ""
     agent_properties: AgentProperties = AgentProperties(current_task_id="", action_count=0, current_step_index=0)
 
     def update_conversation_state(self, new_state: str) -> None:
@@ -28,6 +30,9 @@ class AgentState:
     def update_gui_mode(self, gui_mode: bool) -> None:
         self.gui_mode = gui_mode
 
+    def update_reasoning_preview(self, text: str) -> None:
+        self.reasoning_preview = text
+
     def refresh(
         self,
         *,
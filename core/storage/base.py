@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""core.storage.base
+
+Contract shared by every log storage backend used by
+:class:`core.database_interface.DatabaseInterface`.
+
+A backend persists three record families: prompt logs, action runs and task
+logs. Records are plain dictionaries in the same shape the JSON-lines log has
+always used, so callers never need to know which backend is active.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+# Numeric fields of an action run's ``resources`` record that can be ranked.
+ACTION_RESOURCE_METRICS = ("wall_ms", "cpu_ms", "peak_rss_bytes", "read_bytes", "write_bytes")
+
+
+class LogStorageBackend:
+    """Base class for prompt, action history and task log persistence."""
+
+    name: str = "base"
+    # Location of the backing file; set by every concrete backend.
+    path: Path
+
+    # ------------------------------------------------------------------
+    # Prompt logs
+    # ------------------------------------------------------------------
+    def log_prompt(self, entry: Dict[str, Any]) -> None:
+        """Append a ``prompt_log`` record."""
+        raise NotImplementedError
+
+    def log_prompts(self, entries: List[Dict[str, Any]]) -> None:
+        """Append several ``prompt_log`` records; backends may commit them as one group."""
+        for entry in entries:
+            self.log_prompt(entry)
+
+    def iter_prompt_logs(self) -> Iterable[Dict[str, Any]]:
+        """Yield every ``prompt_log`` record in insertion order."""
+        raise NotImplementedError
+
+    # ------------------------------------------------------------------
+    # Action history
+    # ------------------------------------------------------------------
+    def upsert_action_history(self, payload: Dict[str, Any]) -> None:
+        """
+        Insert or merge an ``action_history`` record keyed by ``runId``.
+
+        Merge rules: ``None`` values never overwrite stored values, except for
+        ``inputs`` and ``outputs`` which always take the latest value, and a
+        missing ``startedAt`` defaults to the time of the first write.
+        """
+        raise NotImplementedError
+
+    def iter_action_history(self) -> Iterable[Dict[str, Any]]:
+        """Yield the merged record of every action run."""
+        raise NotImplementedError
+
+    def find_actions_by_status(self, status: str) -> List[Dict[str, Any]]:
+        return [entry for entry in self.iter_action_history() if entry.get("status") == status]
+
+    def get_action_history(self, limit: int = 10) -> List[Dict[str, Any]]:
+        history = list(self.iter_action_history())
+        history.sort(key=lambda e: e.get("startedAt") or "", reverse=True)
+        return history[:limit]
+
+    def top_action_runs(
+        self,
+        metric: str,
+        session_id: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """
+        Action runs with the highest recorded ``resources[metric]``, largest first.
+
+        Runs without a value for ``metric`` are left out.
+
+        Raises:
+            ValueError: ``metric`` is not one of :data:`ACTION_RESOURCE_METRICS`.
+        """
+        if metric not in ACTION_RESOURCE_METRICS:
+            raise ValueError(f"Unknown resource metric {metric!r}; expected one of {ACTION_RESOURCE_METRICS}")
+        runs = [
+            entry
+            for entry in self.iter_action_history()
+            if (session_id is None or entry.get("sessionId") == session_id)
+            and (entry.get("resources") or {}).get(metric) is not None
+        ]
+        runs.sort(key=lambda e: e["resources"][metric], reverse=True)
+        return runs[:limit]
+
+    # ------------------------------------------------------------------
+    # Task logs
+    # ------------------------------------------------------------------
+    def log_task(self, doc: Dict[str, Any]) -> None:
+        """Insert or replace the ``task_log`` record for ``doc["task_id"]``."""
+        raise NotImplementedError
+
+    def iter_task_logs(self) -> Iterable[Dict[str, Any]]:
+        """Yield every ``task_log`` record."""
+        raise NotImplementedError
+
+    def find_current_task_steps(self) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = []
+        for entry in self.iter_task_logs():
+            task_id = entry.get("task_id")
+            for step in entry.get("steps", []):
+                if step.get("status") == "current":
+                    results.append({"task_id": task_id, "step": step})
+        return results
+
+    def update_step_status(
+        self,
+        task_id: str,
+        action_id: str,
+        status: str,
+        failure_message: Optional[str] = None,
+    ) -> bool:
+        """Update one step of a logged task. Returns ``True`` when a step matched."""
+        raise NotImplementedError
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def compact(self) -> None:
+        """Reclaim space held by superseded records. Optional."""
+
+    def close(self) -> None:
+        """Release file handles or connections. Optional."""
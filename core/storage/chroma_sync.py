@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""core.storage.chroma_sync
+
+Incremental synchronisation of a Chroma collection from a source of truth.
+
+A JSON manifest stored next to the collection remembers the content hash of
+every indexed id. On sync only new or changed ids are upserted (and therefore
+re-embedded) and ids that disappeared from the source are deleted; everything
+else is left alone.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.logger import logger
+
+ManifestRecord = Dict[str, Any]
+
+
+@dataclass
+class SyncStats:
+    """Outcome of a :func:`sync_collection` run."""
+
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    unchanged: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+def content_hash(*parts: Any) -> str:
+    """Stable hash of JSON-serialisable ``parts``."""
+    payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_manifest(path: Path) -> Dict[str, ManifestRecord]:
+    """Read a manifest; a missing or unreadable file yields an empty one."""
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except Exception as exc:
+        logger.warning(f"[CHROMA SYNC] Ignoring unreadable manifest {path}: {exc}")
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_manifest(path: Path, manifest: Dict[str, ManifestRecord]) -> None:
+    """Atomically replace the manifest at ``path``."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def sync_collection(
+    collection: Any,
+    manifest_path: Path,
+    desired: Dict[str, ManifestRecord],
+    build_document: Callable[[str], Tuple[str, Optional[Dict[str, Any]]]],
+) -> SyncStats:
+    """
+    Bring ``collection`` in line with ``desired`` while touching as little as possible.
+
+    Args:
+        collection: Chroma collection to update.
+        manifest_path: JSON manifest recording what the collection holds.
+        desired: ``id -> manifest record`` for every id that should be
+            indexed. Each record must contain a ``"hash"`` of the indexed
+            content and may carry extra bookkeeping fields.
+        build_document: Returns ``(document, metadata)`` for an id. Only
+            called for ids that are new or whose hash changed.
+
+    Returns:
+        Counts of added, updated, removed and unchanged ids.
+    """
+    manifest = load_manifest(manifest_path)
+    stats = SyncStats()
+
+    try:
+        existing_ids = set(collection.get(include=[]).get("ids", []))
+    except Exception:
+        logger.warning("[CHROMA SYNC] Could not list collection ids; rebuilding every entry", exc_info=True)
+        existing_ids = set()
+
+    ids: List[str] = []
+    documents: List[str] = []
+    metadatas: List[Optional[Dict[str, Any]]] = []
+    for doc_id, record in desired.items():
+        previous = manifest.get(doc_id)
+        if doc_id in existing_ids and previous and previous.get("hash") == record["hash"]:
+            stats.unchanged += 1
+            continue
+        if doc_id in existing_ids:
+            stats.updated += 1
+        else:
+            stats.added += 1
+        document, metadata = build_document(doc_id)
+        ids.append(doc_id)
+        documents.append(document)
+        metadatas.append(metadata)
+
+    if ids:
+        if any(metadata is not None for metadata in metadatas):
+            collection.upsert(ids=ids, documents=documents, metadatas=metadatas)
+        else:
+            collection.upsert(ids=ids, documents=documents)
+
+    stale = sorted(existing_ids - set(desired))
+    if stale:
+        collection.delete(ids=stale)
+        stats.removed = len(stale)
+
+    save_manifest(manifest_path, desired)
+    return stats
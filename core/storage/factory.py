@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""core.storage.factory
+
+Select a log storage backend by name.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Optional
+
+from core.storage.base import LogStorageBackend
+from core.storage.jsonl_backend import JsonlLogBackend
+from core.storage.sqlite_backend import SQLiteLogBackend
+
+LOG_BACKEND_ENV = "AGENT_LOG_BACKEND"
+DEFAULT_LOG_BACKEND = "jsonl"
+
+
+def create_log_backend(
+    backend: Optional[str],
+    *,
+    data_dir: Path,
+    log_file: Optional[str] = None,
+    action_history_compact_every: int = 1000,
+) -> LogStorageBackend:
+    """
+    Build the log backend named ``backend``.
+
+    Args:
+        backend: ``"jsonl"`` or ``"sqlite"``. When ``None`` the
+            ``AGENT_LOG_BACKEND`` environment variable is consulted and
+            ``"jsonl"`` is used as the final fallback.
+        data_dir: Directory holding the default log locations.
+        log_file: Optional explicit path; defaults to ``agent_logs.txt``
+            (jsonl) or ``agent_logs.db`` (sqlite) inside ``data_dir``.
+        action_history_compact_every: Forwarded to :class:`JsonlLogBackend`.
+
+    Returns:
+        The initialised :class:`LogStorageBackend`.
+    """
+    kind = (backend or os.getenv(LOG_BACKEND_ENV) or DEFAULT_LOG_BACKEND).strip().lower()
+
+    if kind == "jsonl":
+        path = Path(log_file) if log_file else Path(data_dir) / "agent_logs.txt"
+        return JsonlLogBackend(path, action_history_compact_every=action_history_compact_every)
+
+    if kind == "sqlite":
+        path = Path(log_file) if log_file else Path(data_dir) / "agent_logs.db"
+        return SQLiteLogBackend(path)
+
+    raise ValueError(f"Unsupported log backend: {kind}")
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""core.storage.jsonl_backend
+
+The original single-file JSON-lines log (``agent_logs.txt``).
+
+Prompt logs are appended. Action history is journaled: the first write of a
+run appends the full record and later writes append delta records, with the
+merged view held in an in-memory ``runId -> record`` index. Task logs are still
+merged by rewriting the file, so write-heavy deployments should prefer the
+SQLite backend. Appends go through one long-lived file handle that is closed
+whenever the file is rewritten.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+
+from core.logger import logger
+from core.storage.base import LogStorageBackend
+
+
+class JsonlLogBackend(LogStorageBackend):
+    """Log backend that stores every record as one line of a text file."""
+
+    name = "jsonl"
+
+    def __init__(self, log_file_path: Path, *, action_history_compact_every: int = 1000) -> None:
+        """
+        Args:
+            log_file_path: JSON-lines file holding every record.
+            action_history_compact_every: Number of superseded action history
+                records tolerated in the log before it is compacted.
+        """
+        self.log_file_path = self.path = Path(log_file_path)
+        self.log_file_path.touch(exist_ok=True)
+        self.action_history_compact_every = action_history_compact_every
+
+        self._lock = threading.RLock()
+        self._handle: Optional[TextIO] = None
+        self._action_index: Optional[Dict[str, Dict[str, Any]]] = None
+        self._action_superseded = 0
+
+    # ------------------------------------------------------------------
+    # File helpers
+    # ------------------------------------------------------------------
+    def _load_entries(self) -> List[Dict[str, Any]]:
+        entries: List[Dict[str, Any]] = []
+        try:
+            with self.log_file_path.open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entries.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        logger.warning(f"[LOG PARSE] Skipping malformed line in {self.log_file_path}")
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def _write_entries(self, entries: Iterable[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._close_handle()
+            with self.log_file_path.open("w", encoding="utf-8") as handle:
+                for entry in entries:
+                    handle.write(json.dumps(entry, default=str) + "\n")
+
+    def _append_entry(self, entry: Dict[str, Any]) -> None:
+        self._append_lines([json.dumps(entry, default=str)])
+
+    def _append_lines(self, lines: List[str]) -> None:
+        """Append pre-serialised lines through the long-lived append handle."""
+        with self._lock:
+            if self._handle is None:
+                self._handle = self.log_file_path.open("a", encoding="utf-8")
+            self._handle.write("".join(line + "\n" for line in lines))
+            self._handle.flush()
+
+    def _close_handle(self) -> None:
+        # Must be called before the file is replaced or truncated.
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def _iter_entries(self, entry_type: str) -> Iterable[Dict[str, Any]]:
+        for entry in self._load_entries():
+            if entry.get("entry_type") == entry_type:
+                yield entry
+
+    # ------------------------------------------------------------------
+    # Prompt logs
+    # ------------------------------------------------------------------
+    def log_prompt(self, entry: Dict[str, Any]) -> None:
+        self._append_entry(entry)
+
+    def log_prompts(self, entries: List[Dict[str, Any]]) -> None:
+        self._append_lines([json.dumps(entry, default=str) for entry in entries])
+
+    def iter_prompt_logs(self) -> Iterable[Dict[str, Any]]:
+        return self._iter_entries("prompt_log")
+
+    # ------------------------------------------------------------------
+    # Action history
+    # ------------------------------------------------------------------
+    def upsert_action_history(self, payload: Dict[str, Any]) -> None:
+        run_id = payload["runId"]
+        with self._lock:
+            index = self._ensure_action_index()
+            existing = index.get(run_id)
+
+            if existing is None:
+                if payload.get("startedAt") is None:
+                    payload["startedAt"] = datetime.datetime.utcnow().isoformat()
+                index[run_id] = payload
+                self._append_entry(payload)
+                return
+
+            delta = {
+                k: v
+                for k, v in payload.items()
+                if (v is not None or k in {"inputs", "outputs"}) and existing.get(k) != v
+            }
+            if existing.get("startedAt") is None and payload.get("startedAt") is not None:
+                delta["startedAt"] = payload["startedAt"]
+            if not delta:
+                return
+
+            existing.update(delta)
+            self._append_entry({"entry_type": "action_history", "runId": run_id, "delta": True, **delta})
+            self._action_superseded += 1
+
+            if self.action_history_compact_every and self._action_superseded >= self.action_history_compact_every:
+                self.compact()
+
+    def _ensure_action_index(self) -> Dict[str, Dict[str, Any]]:
+        """Return the runId index, replaying the journal on first use."""
+        with self._lock:
+            if self._action_index is not None:
+                return self._action_index
+
+            index: Dict[str, Dict[str, Any]] = {}
+            superseded = 0
+            for entry in self._iter_entries("action_history"):
+                run_id = entry.get("runId")
+                existing = index.get(run_id)
+                if existing is None:
+                    entry.pop("delta", None)
+                    index[run_id] = entry
+                    continue
+                existing.update({k: v for k, v in entry.items() if k != "delta"})
+                superseded += 1
+
+            self._action_index = index
+            self._action_superseded = superseded
+            return index
+
+    def iter_action_history(self) -> Iterable[Dict[str, Any]]:
+        with self._lock:
+            entries = list(self._ensure_action_index().values())
+        for entry in entries:
+            yield dict(entry)
+
+    def compact(self) -> int:
+        """
+        Rewrite the log so every action run is stored as a single record.
+
+        Delta records are folded into the first record of their run; all
+        other log entries are copied through untouched.
+
+        Returns:
+            Number of delta records removed from the log.
+        """
+        with self._lock:
+            index = self._ensure_action_index()
+            removed = 0
+            written: set[str] = set()
+            tmp_path = self.log_file_path.with_name(self.log_file_path.name + ".compact")
+
+            with self.log_file_path.open("r", encoding="utf-8") as src, tmp_path.open("w", encoding="utf-8") as dst:
+                for line in src:
+                    stripped = line.strip()
+                    if not stripped:
+                        continue
+                    try:
+                        entry = json.loads(stripped)
+                    except json.JSONDecodeError:
+                        dst.write(stripped + "\n")
+                        continue
+                    if entry.get("entry_type") != "action_history":
+                        dst.write(stripped + "\n")
+                        continue
+                    run_id = entry.get("runId")
+                    if run_id in written or run_id not in index:
+                        removed += 1
+                        continue
+                    written.add(run_id)
+                    dst.write(json.dumps(index[run_id], default=str) + "\n")
+
+            self._close_handle()
+            os.replace(tmp_path, self.log_file_path)
+            self._action_superseded = 0
+            logger.debug(f"[ACTION HISTORY] Compacted log, removed {removed} delta records")
+            return removed
+
+    # ------------------------------------------------------------------
+    # Task logs
+    # ------------------------------------------------------------------
+    def log_task(self, doc: Dict[str, Any]) -> None:
+        with self._lock:
+            entries = self._load_entries()
+            for entry in entries:
+                if entry.get("entry_type") == "task_log" and entry.get("task_id") == doc["task_id"]:
+                    entry.update(doc)
+                    break
+            else:
+                entries.append(doc)
+
+            self._write_entries(entries)
+
+    def iter_task_logs(self) -> Iterable[Dict[str, Any]]:
+        return self._iter_entries("task_log")
+
+    def update_step_status(
+        self,
+        task_id: str,
+        action_id: str,
+        status: str,
+        failure_message: Optional[str] = None,
+    ) -> bool:
+        with self._lock:
+            entries = self._load_entries()
+            updated = False
+            for entry in entries:
+                if entry.get("entry_type") != "task_log" or entry.get("task_id") != task_id:
+                    continue
+                for step in entry.get("steps", []):
+                    if step.get("action_id") == action_id:
+                        step["status"] = status
+                        if failure_message is not None:
+                            step["failure_message"] = failure_message
+                        updated = True
+                        break
+                if updated:
+                    entry["updated_at"] = datetime.datetime.utcnow().isoformat()
+                    break
+            if updated:
+                self._write_entries(entries)
+            return updated
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        with self._lock:
+            self._close_handle()
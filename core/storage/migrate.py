@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""core.storage.migrate
+
+Import an existing JSON-lines ``agent_logs.txt`` into the SQLite backend.
+
+Run from the project root::
+
+    python -m core.storage.migrate --source core/data/agent_logs.txt --target core/data/agent_logs.db
+
+The source file is only read. Action history deltas are folded into one row
+per run, and task logs keep their latest merged state.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
+
+from core.storage.jsonl_backend import JsonlLogBackend
+from core.storage.sqlite_backend import SQLiteLogBackend
+
+
+def _iter_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def _batched(items: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def migrate_jsonl_to_sqlite(source: Path, target: Path, *, batch_size: int = 5000) -> Dict[str, int]:
+    """
+    Copy every record of a JSON-lines log into a SQLite log database.
+
+    Args:
+        source: Existing ``agent_logs.txt`` file.
+        target: SQLite database to create or extend.
+        batch_size: Number of rows written per transaction.
+
+    Returns:
+        Counts of imported ``prompt_logs``, ``action_runs`` and ``task_logs``.
+    """
+    source = Path(source)
+    backend = SQLiteLogBackend(Path(target))
+    stats = {"prompt_logs": 0, "action_runs": 0, "task_logs": 0}
+
+    try:
+        prompts = (e for e in _iter_jsonl(source) if e.get("entry_type") == "prompt_log")
+        for batch in _batched(prompts, batch_size):
+            backend.log_prompts(batch)
+            stats["prompt_logs"] += len(batch)
+
+        tasks: Dict[str, Dict[str, Any]] = {}
+        for entry in _iter_jsonl(source):
+            if entry.get("entry_type") == "task_log" and entry.get("task_id"):
+                tasks.setdefault(entry["task_id"], {}).update(entry)
+        for batch in _batched(tasks.values(), batch_size):
+            backend.log_tasks(batch)
+            stats["task_logs"] += len(batch)
+
+        journal = JsonlLogBackend(source, action_history_compact_every=0)
+        for batch in _batched(journal.iter_action_history(), batch_size):
+            backend.upsert_action_histories(batch)
+            stats["action_runs"] += len(batch)
+    finally:
+        backend.close()
+
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import agent_logs.txt into the SQLite log backend.")
+    parser.add_argument("--source", default="core/data/agent_logs.txt", help="JSON-lines log to import.")
+    parser.add_argument("--target", default="core/data/agent_logs.db", help="SQLite database to write.")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per transaction.")
+    args = parser.parse_args()
+
+    stats = migrate_jsonl_to_sqlite(Path(args.source), Path(args.target), batch_size=args.batch_size)
+    print(
+        f"Imported {stats['prompt_logs']} prompt logs, {stats['action_runs']} action runs "
+        f"and {stats['task_logs']} task logs into {args.target}"
+    )
+
+
+if __name__ == "__main__":
+    main()
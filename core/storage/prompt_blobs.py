@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""core.storage.prompt_blobs
+
+Content-addressed store for prompt text.
+
+Consecutive system prompts are mostly identical: role info, agent info and
+environment never change, and the event stream only grows at the end. Each
+prompt is therefore cut into line-based segments and every segment is stored
+once, keyed by its hash. Prompt logs keep the list of segment hashes and can
+be rehydrated on demand.
+
+Segment boundaries are content-defined: a segment ends after a blank line or
+after any line whose checksum is divisible by ``BOUNDARY_MODULUS``. Appending
+to or editing one part of a prompt therefore only creates new segments around
+the change, instead of shifting every later boundary.
+
+Blobs are appended to a single JSON-lines file. A ``hash -> byte offset``
+index is built lazily, so reads are one seek and one line.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional
+
+# Average segment length in lines for non-blank text.
+BOUNDARY_MODULUS = 16
+
+# Prompt fields in a prompt log's ``input`` that are stored as segments.
+PROMPT_FIELDS = ("system_prompt", "user_prompt")
+SEGMENTS_SUFFIX = "_segments"
+
+
+def split_segments(text: str) -> List[str]:
+    """Split ``text`` into content-defined segments that join back to ``text``."""
+    segments: List[str] = []
+    current: List[str] = []
+    for line in text.splitlines(keepends=True):
+        current.append(line)
+        stripped = line.strip()
+        if not stripped or zlib.crc32(stripped.encode("utf-8")) % BOUNDARY_MODULUS == 0:
+            segments.append("".join(current))
+            current = []
+    if current:
+        segments.append("".join(current))
+    return segments
+
+
+def _digest(segment: str) -> str:
+    return hashlib.blake2b(segment.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class PromptBlobStore:
+    """Append-only, hash-addressed storage for prompt segments."""
+
+    def __init__(self, path: Path) -> None:
+        """
+        Args:
+            path: JSON-lines file holding ``{"h": hash, "t": text}`` records.
+        """
+        self.path = Path(path)
+        self.path.touch(exist_ok=True)
+        self._lock = threading.RLock()
+        self._offsets: Optional[Dict[str, int]] = None
+        self._writer: Optional[BinaryIO] = None
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+    def _ensure_index(self) -> Dict[str, int]:
+        with self._lock:
+            if self._offsets is not None:
+                return self._offsets
+            offsets: Dict[str, int] = {}
+            with self.path.open("rb") as handle:
+                offset = 0
+                for line in handle:
+                    try:
+                        offsets.setdefault(json.loads(line)["h"], offset)
+                    except (ValueError, KeyError):
+                        pass
+                    offset += len(line)
+            self._offsets = offsets
+            return offsets
+
+    # ------------------------------------------------------------------
+    # Write / read
+    # ------------------------------------------------------------------
+    def put_text(self, text: str) -> List[str]:
+        """Store ``text`` and return the hashes of its segments in order."""
+        hashes: List[str] = []
+        with self._lock:
+            offsets = self._ensure_index()
+            for segment in split_segments(text):
+                digest = _digest(segment)
+                hashes.append(digest)
+                if digest in offsets:
+                    continue
+                if self._writer is None:
+                    self._writer = self.path.open("ab")
+                offsets[digest] = self._writer.tell()
+                self._writer.write(json.dumps({"h": digest, "t": segment}, ensure_ascii=False).encode("utf-8") + b"\n")
+            if self._writer is not None:
+                self._writer.flush()
+        return hashes
+
+    def get_text(self, hashes: List[str]) -> str:
+        """Rebuild the text for a list of segment hashes."""
+        parts: List[str] = []
+        with self._lock:
+            offsets = self._ensure_index()
+            with self.path.open("rb") as handle:
+                for digest in hashes:
+                    offset = offsets.get(digest)
+                    if offset is None:
+                        raise KeyError(f"Unknown prompt segment: {digest}")
+                    handle.seek(offset)
+                    parts.append(json.loads(handle.readline())["t"])
+        return "".join(parts)
+
+    # ------------------------------------------------------------------
+    # Prompt log helpers
+    # ------------------------------------------------------------------
+    def deflate_input(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace prompt strings in a prompt log ``input`` with segment hashes."""
+        deflated = dict(input_data)
+        for field in PROMPT_FIELDS:
+            value = deflated.get(field)
+            if isinstance(value, str):
+                deflated[field + SEGMENTS_SUFFIX] = self.put_text(value)
+                del deflated[field]
+        return deflated
+
+    def inflate_input(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Inverse of :meth:`deflate_input`; plain prompt strings pass through."""
+        inflated = dict(input_data)
+        for field in PROMPT_FIELDS:
+            hashes = inflated.pop(field + SEGMENTS_SUFFIX, None)
+            if hashes is not None:
+                inflated[field] = self.get_text(hashes)
+        return inflated
+
+    def close(self) -> None:
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
@@ -0,0 +1,397 @@
+# -*- coding: utf-8 -*-
+"""core.storage.sqlite_backend
+
+Embedded SQLite log backend.
+
+The database runs in WAL mode so readers never block the writer and several
+agent processes can share one file. Every record family lives in its own
+indexed table:
+
+* ``prompt_logs``  – one row per LLM call, indexed by time and model.
+* ``action_runs``  – one row per run, keyed by run id and indexed by session,
+  status and start time.
+* ``task_logs`` / ``task_steps`` – one row per task plus one row per step, so
+  "which step is current" is an index lookup instead of a full scan.
+
+All statements are module-level constants executed with bound parameters, so
+``sqlite3``'s statement cache reuses the prepared statements across calls.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from core.storage.base import ACTION_RESOURCE_METRICS, LogStorageBackend
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prompt_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    datetime TEXT,
+    provider TEXT,
+    model TEXT,
+    status TEXT,
+    token_count_input INTEGER,
+    token_count_output INTEGER,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_prompt_logs_datetime ON prompt_logs(datetime);
+CREATE INDEX IF NOT EXISTS idx_prompt_logs_model ON prompt_logs(provider, model);
+
+CREATE TABLE IF NOT EXISTS action_runs (
+    run_id TEXT PRIMARY KEY,
+    session_id TEXT,
+    parent_id TEXT,
+    name TEXT,
+    action_type TEXT,
+    status TEXT,
+    inputs TEXT,
+    outputs TEXT,
+    started_at TEXT,
+    ended_at TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_action_runs_session ON action_runs(session_id);
+CREATE INDEX IF NOT EXISTS idx_action_runs_status ON action_runs(status);
+CREATE INDEX IF NOT EXISTS idx_action_runs_started ON action_runs(started_at);
+
+CREATE TABLE IF NOT EXISTS task_logs (
+    task_id TEXT PRIMARY KEY,
+    name TEXT,
+    status TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    payload TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS task_steps (
+    task_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    action_id TEXT,
+    status TEXT,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (task_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_task_steps_status ON task_steps(status);
+CREATE INDEX IF NOT EXISTS idx_task_steps_action ON task_steps(task_id, action_id);
+"""
+
+_INSERT_PROMPT = (
+    "INSERT INTO prompt_logs (datetime, provider, model, status, token_count_input, token_count_output, payload) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_SELECT_PROMPTS = "SELECT payload FROM prompt_logs ORDER BY id"
+
+_UPSERT_ACTION = """
+INSERT INTO action_runs (run_id, session_id, parent_id, name, action_type, status, inputs, outputs, started_at, ended_at, extra)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(run_id) DO UPDATE SET
+    session_id = COALESCE(excluded.session_id, session_id),
+    parent_id = COALESCE(excluded.parent_id, parent_id),
+    name = COALESCE(excluded.name, name),
+    action_type = COALESCE(excluded.action_type, action_type),
+    status = COALESCE(excluded.status, status),
+    inputs = excluded.inputs,
+    outputs = excluded.outputs,
+    started_at = COALESCE(excluded.started_at, started_at),
+    ended_at = COALESCE(excluded.ended_at, ended_at),
+    extra = CASE WHEN excluded.extra IS NULL THEN extra
+                 ELSE json_patch(COALESCE(extra, '{}'), excluded.extra) END
+"""
+_ACTION_COLUMNS = "run_id, session_id, parent_id, name, action_type, status, inputs, outputs, started_at, ended_at, extra"
+_SELECT_ACTION = f"SELECT {_ACTION_COLUMNS} FROM action_runs WHERE run_id = ?"
+_SELECT_ACTIONS = f"SELECT {_ACTION_COLUMNS} FROM action_runs"
+_SELECT_ACTIONS_BY_STATUS = f"SELECT {_ACTION_COLUMNS} FROM action_runs WHERE status = ?"
+_SELECT_RECENT_ACTIONS = f"SELECT {_ACTION_COLUMNS} FROM action_runs ORDER BY started_at DESC LIMIT ?"
+_SELECT_TOP_ACTIONS = f"""
+SELECT {_ACTION_COLUMNS} FROM action_runs
+WHERE (? IS NULL OR session_id = ?) AND json_extract(extra, ?) IS NOT NULL
+ORDER BY json_extract(extra, ?) DESC LIMIT ?
+"""
+
+_UPSERT_TASK = """
+INSERT INTO task_logs (task_id, name, status, created_at, updated_at, payload)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(task_id) DO UPDATE SET
+    name = excluded.name,
+    status = excluded.status,
+    created_at = excluded.created_at,
+    updated_at = excluded.updated_at,
+    payload = excluded.payload
+"""
+_DELETE_STEPS = "DELETE FROM task_steps WHERE task_id = ?"
+_INSERT_STEP = "INSERT INTO task_steps (task_id, position, action_id, status, payload) VALUES (?, ?, ?, ?, ?)"
+_SELECT_TASKS = "SELECT task_id, updated_at, payload FROM task_logs"
+_SELECT_TASK_STEPS = "SELECT payload FROM task_steps WHERE task_id = ? ORDER BY position"
+_SELECT_CURRENT_STEPS = "SELECT task_id, payload FROM task_steps WHERE status = 'current' ORDER BY task_id, position"
+_SELECT_STEP = "SELECT position, payload FROM task_steps WHERE task_id = ? AND action_id = ? ORDER BY position LIMIT 1"
+_UPDATE_STEP = "UPDATE task_steps SET status = ?, payload = ? WHERE task_id = ? AND position = ?"
+_TOUCH_TASK = "UPDATE task_logs SET updated_at = ? WHERE task_id = ?"
+
+# Action history keys that map onto dedicated columns; anything else is kept
+# in the ``extra`` JSON column.
+_ACTION_KEYS = {
+    "entry_type", "runId", "sessionId", "parentId", "name", "action_type", "type",
+    "status", "inputs", "outputs", "startedAt", "endedAt",
+}
+
+
+def _dumps(value: Any) -> Optional[str]:
+    return None if value is None else json.dumps(value, default=str)
+
+
+def _loads(value: Optional[str]) -> Any:
+    return None if value is None else json.loads(value)
+
+
+class SQLiteLogBackend(LogStorageBackend):
+    """Log backend backed by an embedded SQLite database in WAL mode."""
+
+    name = "sqlite"
+
+    def __init__(self, db_path: Path) -> None:
+        """
+        Args:
+            db_path: Location of the SQLite database file; created if missing.
+        """
+        self.db_path = self.path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------------
+    # Prompt logs
+    # ------------------------------------------------------------------
+    def log_prompt(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(_INSERT_PROMPT, self._prompt_row(entry))
+
+    def log_prompts(self, entries: List[Dict[str, Any]]) -> None:
+        """Insert many prompt logs in a single transaction."""
+        with self._lock, self._transaction():
+            self._conn.executemany(_INSERT_PROMPT, (self._prompt_row(entry) for entry in entries))
+
+    @staticmethod
+    def _prompt_row(entry: Dict[str, Any]) -> tuple:
+        return (
+            entry.get("datetime"),
+            entry.get("provider"),
+            entry.get("model"),
+            entry.get("status"),
+            entry.get("token_count_input"),
+            entry.get("token_count_output"),
+            json.dumps(entry, default=str),
+        )
+
+    def iter_prompt_logs(self) -> Iterable[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(_SELECT_PROMPTS).fetchall()
+        for (payload,) in rows:
+            yield json.loads(payload)
+
+    # ------------------------------------------------------------------
+    # Action history
+    # ------------------------------------------------------------------
+    def upsert_action_history(self, payload: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(_UPSERT_ACTION, self._action_row(payload))
+
+    def upsert_action_histories(self, payloads: Iterable[Dict[str, Any]]) -> None:
+        """Upsert many action runs in a single transaction."""
+        with self._lock, self._transaction():
+            rows = [self._action_row(payload) for payload in payloads]
+            self._conn.executemany(_UPSERT_ACTION, rows)
+
+    def _action_row(self, payload: Dict[str, Any]) -> tuple:
+        started_at = payload.get("startedAt")
+        if started_at is None:
+            row = self._conn.execute(_SELECT_ACTION, (payload["runId"],)).fetchone()
+            if row is None or row[8] is None:
+                started_at = datetime.datetime.utcnow().isoformat()
+        extra = {k: v for k, v in payload.items() if k not in _ACTION_KEYS and v is not None}
+        return (
+            payload["runId"],
+            payload.get("sessionId"),
+            payload.get("parentId"),
+            payload.get("name"),
+            payload.get("action_type") or payload.get("type"),
+            payload.get("status"),
+            _dumps(payload.get("inputs")),
+            _dumps(payload.get("outputs")),
+            started_at,
+            payload.get("endedAt"),
+            _dumps(extra) if extra else None,
+        )
+
+    @staticmethod
+    def _action_record(row: tuple) -> Dict[str, Any]:
+        (run_id, session_id, parent_id, name, action_type, status,
+         inputs, outputs, started_at, ended_at, extra) = row
+        record = {
+            "entry_type": "action_history",
+            "runId": run_id,
+            "sessionId": session_id,
+            "parentId": parent_id,
+            "name": name,
+            "action_type": action_type,
+            "type": action_type,
+            "status": status,
+            "inputs": _loads(inputs),
+            "outputs": _loads(outputs),
+            "startedAt": started_at,
+            "endedAt": ended_at,
+        }
+        if extra:
+            record.update(json.loads(extra))
+        return record
+
+    def iter_action_history(self) -> Iterable[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(_SELECT_ACTIONS).fetchall()
+        for row in rows:
+            yield self._action_record(row)
+
+    def find_actions_by_status(self, status: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(_SELECT_ACTIONS_BY_STATUS, (status,)).fetchall()
+        return [self._action_record(row) for row in rows]
+
+    def get_action_history(self, limit: int = 10) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(_SELECT_RECENT_ACTIONS, (limit,)).fetchall()
+        return [self._action_record(row) for row in rows]
+
+    def top_action_runs(
+        self,
+        metric: str,
+        session_id: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        if metric not in ACTION_RESOURCE_METRICS:
+            raise ValueError(f"Unknown resource metric {metric!r}; expected one of {ACTION_RESOURCE_METRICS}")
+        path = f"$.resources.{metric}"
+        with self._lock:
+            rows = self._conn.execute(
+                _SELECT_TOP_ACTIONS, (session_id, session_id, path, path, limit)
+            ).fetchall()
+        return [self._action_record(row) for row in rows]
+
+    # ------------------------------------------------------------------
+    # Task logs
+    # ------------------------------------------------------------------
+    def log_task(self, doc: Dict[str, Any]) -> None:
+        with self._lock, self._transaction():
+            self._write_task(doc)
+
+    def log_tasks(self, docs: Iterable[Dict[str, Any]]) -> None:
+        """Insert or replace many task logs in a single transaction."""
+        with self._lock, self._transaction():
+            for doc in docs:
+                self._write_task(doc)
+
+    def _write_task(self, doc: Dict[str, Any]) -> None:
+        task_id = doc["task_id"]
+        steps = doc.get("steps") or []
+        header = {k: v for k, v in doc.items() if k != "steps"}
+        self._conn.execute(
+            _UPSERT_TASK,
+            (
+                task_id,
+                doc.get("name"),
+                doc.get("status"),
+                doc.get("created_at"),
+                doc.get("updated_at"),
+                json.dumps(header, default=str),
+            ),
+        )
+        self._conn.execute(_DELETE_STEPS, (task_id,))
+        self._conn.executemany(
+            _INSERT_STEP,
+            (
+                (task_id, position, step.get("action_id"), step.get("status"), json.dumps(step, default=str))
+                for position, step in enumerate(steps)
+            ),
+        )
+
+    def iter_task_logs(self) -> Iterable[Dict[str, Any]]:
+        with self._lock:
+            tasks = self._conn.execute(_SELECT_TASKS).fetchall()
+            docs = []
+            for task_id, updated_at, payload in tasks:
+                doc = json.loads(payload)
+                doc["updated_at"] = updated_at
+                doc["steps"] = [
+                    json.loads(step) for (step,) in self._conn.execute(_SELECT_TASK_STEPS, (task_id,))
+                ]
+                docs.append(doc)
+        yield from docs
+
+    def find_current_task_steps(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(_SELECT_CURRENT_STEPS).fetchall()
+        return [{"task_id": task_id, "step": json.loads(payload)} for task_id, payload in rows]
+
+    def update_step_status(
+        self,
+        task_id: str,
+        action_id: str,
+        status: str,
+        failure_message: Optional[str] = None,
+    ) -> bool:
+        with self._lock, self._transaction():
+            row = self._conn.execute(_SELECT_STEP, (task_id, action_id)).fetchone()
+            if row is None:
+                return False
+            position, payload = row
+            step = json.loads(payload)
+            step["status"] = status
+            if failure_message is not None:
+                step["failure_message"] = failure_message
+            self._conn.execute(_UPDATE_STEP, (status, json.dumps(step, default=str), task_id, position))
+            self._conn.execute(_TOUCH_TASK, (datetime.datetime.utcnow().isoformat(), task_id))
+            return True
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def _transaction(self):
+        return _Transaction(self._conn)
+
+    def compact(self) -> None:
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class _Transaction:
+    """Explicit BEGIN/COMMIT block for an autocommit connection."""
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self._conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._conn.execute("BEGIN IMMEDIATE")
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self._conn.execute("COMMIT")
+        else:
+            self._conn.execute("ROLLBACK")
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""core.storage.write_behind
+
+Asynchronous write-behind queue for prompt logs.
+
+LLM calls only pay for putting the record on a bounded in-memory queue. A
+single daemon thread drains the queue, serialises the records and hands them
+to the log backend in groups: a group is committed once ``batch_size``
+records are waiting or ``flush_interval_ms`` has passed since the first one
+arrived, whichever comes first.
+
+When the queue is full the ``overflow`` policy decides what happens:
+
+* ``"block"``       – the caller waits up to ``block_timeout`` seconds
+  (backpressure), then the record is dropped.
+* ``"drop_newest"`` – the incoming record is discarded.
+* ``"drop_oldest"`` – the oldest queued record is discarded to make room.
+
+Pending records are flushed by :meth:`WriteBehindLogWriter.close`, which is
+also registered with :mod:`atexit`.
+"""
+
+from __future__ import annotations
+
+import atexit
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from core.logger import logger
+
+OVERFLOW_POLICIES = ("block", "drop_newest", "drop_oldest")
+
+_STOP = object()
+
+
+class WriteBehindLogWriter:
+    """Background group-commit writer in front of a batch sink."""
+
+    def __init__(
+        self,
+        sink: Callable[[List[Dict[str, Any]]], None],
+        *,
+        max_queue: int = 10000,
+        batch_size: int = 64,
+        flush_interval_ms: int = 200,
+        overflow: str = "block",
+        block_timeout: float = 5.0,
+        name: str = "prompt-log-writer",
+    ) -> None:
+        """
+        Args:
+            sink: Callable that persists a list of records in one go, e.g.
+                :meth:`LogStorageBackend.log_prompts`.
+            max_queue: Maximum number of records waiting to be written.
+            batch_size: Flush as soon as this many records are waiting.
+            flush_interval_ms: Flush at most this long after the first record
+                of a group was enqueued.
+            overflow: One of ``"block"``, ``"drop_newest"`` or ``"drop_oldest"``.
+            block_timeout: Seconds a caller may wait under the ``"block"`` policy.
+            name: Thread name, useful when inspecting stack dumps.
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unsupported overflow policy: {overflow}")
+
+        self._sink = sink
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0, flush_interval_ms) / 1000
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+
+        self.dropped = 0
+        self.written = 0
+        self._closed = False
+        self._idle = threading.Condition()
+        self._pending = 0
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+    def submit(self, record: Dict[str, Any]) -> bool:
+        """
+        Enqueue ``record`` for writing.
+
+        Returns:
+            ``True`` when the record was queued, ``False`` when it was dropped.
+        """
+        if self._closed:
+            return False
+
+        with self._idle:
+            self._pending += 1
+
+        try:
+            if self.overflow == "block":
+                self._queue.put(record, timeout=self.block_timeout)
+            elif self.overflow == "drop_newest":
+                self._queue.put_nowait(record)
+            else:
+                while True:
+                    try:
+                        self._queue.put_nowait(record)
+                        break
+                    except queue.Full:
+                        try:
+                            self._queue.get_nowait()
+                            self._record_drop()
+                        except queue.Empty:
+                            pass
+            return True
+        except queue.Full:
+            self._record_drop()
+            return False
+
+    def _record_drop(self) -> None:
+        with self._idle:
+            self.dropped += 1
+            self._pending -= 1
+            self._idle.notify_all()
+        if self.dropped == 1 or self.dropped % 1000 == 0:
+            logger.warning(f"[PROMPT LOG] Write-behind queue full, {self.dropped} records dropped so far")
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every record submitted so far has been written."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            while self._pending > 0:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Flush pending records and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._write(batch)
+            if stop:
+                self._drain()
+                return
+
+    def _drain(self) -> None:
+        batch: List[Dict[str, Any]] = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                batch.append(item)
+        if batch:
+            self._write(batch)
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            self._sink(batch)
+            self.written += len(batch)
+        except Exception:
+            logger.error(f"[PROMPT LOG] Failed to write {len(batch)} prompt logs", exc_info=True)
+        finally:
+            with self._idle:
+                self._pending -= len(batch)
+                self._idle.notify_all()
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""core.streaming_json
+
+Incremental parsing of a JSON object that arrives as a token stream.
+
+The agent asks models for one JSON object per call (a reasoning step, an
+action decision). :class:`IncrementalJSONParser` consumes the reply chunk by
+chunk as the provider streams it and reports every scalar value as soon as
+it closes. The action router can then act on ``action_name`` while the
+model is still writing ``parameters``. The parser also exposes the
+unfinished string being written, which is how reasoning is shown while it
+streams. A reply that cannot be the expected object fails on the first
+offending character, so the caller can abort it without waiting for the
+rest.
+
+The parser only tracks structure; it builds no containers. Callers still
+parse the complete text the way they always have, so streaming never
+changes what a reply means.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, List, Optional, Tuple, Union
+
+PathItem = Union[str, int]
+Path = Tuple[PathItem, ...]
+
+_STRING_STOP = re.compile(r'["\\]')
+_WHITESPACE = " \t\r\n"
+_LITERAL_START = "-0123456789tfn"
+_LITERAL_END = ",}] \t\r\n"
+
+
+class IncrementalJSONParser:
+    """
+    Push parser for one top-level JSON object.
+
+    ``feed`` returns the ``(path, value)`` of every scalar completed by the
+    chunk, where ``path`` is the chain of keys and list indices leading to
+    it, e.g. ``("actions", 0, "action_name")``. A leading Markdown code
+    fence is skipped, as is anything after the object closes.
+    """
+
+    def __init__(self) -> None:
+        self.error: Optional[str] = None
+        self.done = False
+        self._mode = "start"
+        # One frame per open container: [key or index, is_object, count].
+        self._stack: List[List[Any]] = []
+        self._buf: List[str] = []
+        self._is_key = False
+        self._escape = False
+        self._fence = False
+        self._chars = 0
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None
+
+    @property
+    def started(self) -> bool:
+        return self._mode not in ("start", "fence")
+
+    @property
+    def partial(self) -> Optional[Tuple[Path, str]]:
+        """Path and decoded text so far of the string value being written."""
+        if self._mode != "string" or self._is_key:
+            return None
+        raw = "".join(self._buf)
+        self._buf = [raw]
+        for candidate in (raw, raw[: raw.rfind("\\")]):
+            try:
+                return self._path(), json.loads(f'"{candidate}"')
+            except ValueError:
+                continue
+        return self._path(), raw
+
+    @property
+    def chars(self) -> int:
+        """Characters fed so far."""
+        return self._chars
+
+    def feed(self, chunk: str) -> List[Tuple[Path, Any]]:
+        """Consume ``chunk`` and return the scalars it completed."""
+        completed: List[Tuple[Path, Any]] = []
+        if self.error is not None or self.done:
+            return completed
+        self._chars += len(chunk)
+        i, n = 0, len(chunk)
+        while i < n and self.error is None and not self.done:
+            mode = self._mode
+            c = chunk[i]
+
+            if mode == "string":
+                if self._escape:
+                    self._buf.append("\\" + c)
+                    self._escape = False
+                    i += 1
+                    continue
+                match = _STRING_STOP.search(chunk, i)
+                end = match.start() if match else n
+                if end > i:
+                    self._buf.append(chunk[i:end])
+                if match is None:
+                    break
+                i = end + 1
+                if match.group() == "\\":
+                    self._escape = True
+                    continue
+                self._close_string(completed)
+                continue
+
+            if mode == "literal":
+                if c in _LITERAL_END:
+                    self._close_literal(completed)
+                    continue  # re-read the delimiter
+                self._buf.append(c)
+                i += 1
+                continue
+
+            if mode == "fence":
+                if c == "\n":
+                    self._mode = "start"
+                i += 1
+                continue
+
+            i += 1
+            if c in _WHITESPACE:
+                continue
+            if mode == "start":
+                if c == "`" and not self._fence:
+                    self._fence = True
+                    self._mode = "fence"
+                elif c == "{":
+                    self._open(True)
+                else:
+                    self._fail(c, "'{'")
+            elif mode == "value":
+                self._value(c)
+            elif mode == "key":
+                if c == '"':
+                    self._buf, self._is_key, self._mode = [], True, "string"
+                elif c == "}" and self._stack[-1][2] == 0:
+                    self._close_container()
+                else:
+                    self._fail(c, "a key")
+            elif mode == "colon":
+                if c == ":":
+                    self._mode = "value"
+                else:
+                    self._fail(c, "':'")
+            elif mode == "comma":
+                frame = self._stack[-1]
+                if c == ",":
+                    frame[2] += 1
+                    if frame[1]:
+                        self._mode = "key"
+                    else:
+                        frame[0] = frame[2]
+                        self._mode = "value"
+                elif c == ("}" if frame[1] else "]"):
+                    self._close_container()
+                else:
+                    self._fail(c, "',' or the end of the container")
+        return completed
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _path(self) -> Path:
+        return tuple(frame[0] for frame in self._stack)
+
+    def _fail(self, c: str, expected: str) -> None:
+        self.error = f"expected {expected}, got {c!r}"
+
+    def _open(self, is_object: bool) -> None:
+        self._stack.append([None if is_object else 0, is_object, 0])
+        self._mode = "key" if is_object else "value"
+
+    def _value(self, c: str) -> None:
+        if c == '"':
+            self._buf, self._is_key, self._mode = [], False, "string"
+        elif c == "{":
+            self._open(True)
+        elif c == "[":
+            self._open(False)
+        elif c in _LITERAL_START:
+            self._buf, self._mode = [c], "literal"
+        elif c == "]" and self._stack and not self._stack[-1][1] and self._stack[-1][2] == 0:
+            self._close_container()
+        else:
+            self._fail(c, "a value")
+
+    def _after_value(self) -> None:
+        if self._stack:
+            self._mode = "comma"
+        else:
+            self._mode, self.done = "end", True
+
+    def _close_container(self) -> None:
+        self._stack.pop()
+        self._after_value()
+
+    def _close_string(self, completed: List[Tuple[Path, Any]]) -> None:
+        raw = "".join(self._buf)
+        self._buf = []
+        try:
+            value = json.loads(f'"{raw}"')
+        except ValueError as e:
+            self.error = f"invalid string: {e}"
+            return
+        if self._is_key:
+            self._stack[-1][0] = value
+            self._is_key = False
+            self._mode = "colon"
+            return
+        completed.append((self._path(), value))
+        self._after_value()
+
+    def _close_literal(self, completed: List[Tuple[Path, Any]]) -> None:
+        text = "".join(self._buf)
+        self._buf = []
+        try:
+            value = json.loads(text)
+        except ValueError:
+            self.error = f"invalid literal {text!r}"
+            return
+        completed.append((self._path(), value))
+        self._after_value()
@@ -27,6 +27,7 @@ from core.logger import logger
 from core.models.model_registry import MODEL_REGISTRY
 from core.models.types import InterfaceType
 from core.models.provider_config import PROVIDER_CONFIG
+from core.state.agent_state import STATE
 
 
 def _save_settings_to_env(provider: str, api_key: str) -> bool:
@@ -1319,6 +1320,7 @@ class TUIInterface:
     }
 
     _CHAT_LABEL_WIDTH = 7
+    _REASONING_PREVIEW_CHARS = 120  # tail of streamed reasoning shown in the status bar
     _ACTION_LABEL_WIDTH = 5  # Adjusted for icon format [+] or [●]/[○]
 
     def __init__(
@@ -1712,6 +1714,9 @@ class TUIInterface:
         if self._agent_state == "idle":
             return "Agent is idle"
         elif self._agent_state == "working":
+            if STATE.reasoning_preview:
+                thought = " ".join(STATE.reasoning_preview.split())
+                return f"{loading_icon} Thinking: {thought[-self._REASONING_PREVIEW_CHARS:]}"
             if self._current_task_name:
                 return f"{loading_icon} Working on: {self._current_task_name}"
             else:
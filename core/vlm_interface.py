@@ -7,16 +7,16 @@ Created on Fri Aug  1 14:17:29 2025
 
 from __future__ import annotations
 import os
-import asyncio
 import time
-import base64, requests
-from typing import Any, Dict, Optional
+import base64
+from typing import Any, Dict, Optional, Tuple
 
 import re
 
 from core.models.factory import ModelFactory
 from core.models.types import InterfaceType
 from core.google_gemini_client import GeminiClient
+from core.http_clients import async_anthropic_client, async_openai_client, http_session, post_json
 from core.logger import logger
 from core.state.agent_state import STATE
 
@@ -129,17 +129,50 @@ class VLMInterface:
             else:
                 raise RuntimeError(f"Unknown provider {self.provider!r}")
             
-            cleaned = re.sub(self._CODE_BLOCK_RE, "", response.get("content", "").strip())
-            
-            STATE.set_agent_property("token_count", STATE.get_agent_property("token_count", 0) + response.get("tokens_used", 0))
-            
+            return self._finish_response(response, log_response)
+        except Exception as e:
+            logger.error(f"[ERROR] {e}")
+            return ""
+
+    async def describe_image_bytes_async(
+        self,
+        image_bytes: bytes,
+        system_prompt: str | None = None,
+        user_prompt: str | None = "Describe this image in detail.",
+        log_response: bool = True,
+    ) -> str:
+        """:meth:`describe_image_bytes` on the provider's native async client."""
+        try:
             if log_response:
-                logger.info(f"[LLM RECV] {cleaned}")
-            return cleaned
+                logger.info(f"[LLM SEND] system={system_prompt} | user={user_prompt}")
+
+            if self.provider == "openai":
+                response = await self._openai_describe_bytes_async(image_bytes, system_prompt, user_prompt)
+            elif self.provider == "remote":
+                response = await self._ollama_describe_bytes_async(image_bytes, system_prompt, user_prompt)
+            elif self.provider == "gemini":
+                response = await self._gemini_describe_bytes_async(image_bytes, system_prompt, user_prompt)
+            elif self.provider == "byteplus":
+                response = await self._byteplus_describe_bytes_async(image_bytes, system_prompt, user_prompt)
+            elif self.provider == "anthropic":
+                response = await self._anthropic_describe_bytes_async(image_bytes, system_prompt, user_prompt)
+            else:
+                raise RuntimeError(f"Unknown provider {self.provider!r}")
+
+            return self._finish_response(response, log_response)
         except Exception as e:
             logger.error(f"[ERROR] {e}")
             return ""
 
+    def _finish_response(self, response: Any, log_response: bool) -> str:
+        cleaned = re.sub(self._CODE_BLOCK_RE, "", response.get("content", "").strip())
+        
+        STATE.set_agent_property("token_count", STATE.get_agent_property("token_count", 0) + response.get("tokens_used", 0))
+        
+        if log_response:
+            logger.info(f"[LLM RECV] {cleaned}")
+        return cleaned
+
     async def generate_response_async(
         self,
         image_bytes,
@@ -148,7 +181,7 @@ class VLMInterface:
         debug: bool = False,
         log_response: bool = True,
     ) -> str:
-        """Async wrapper that defers the blocking call to a worker thread."""
+        """Describe ``image_bytes`` without blocking the event loop; cancellable."""
         if debug:
             # Save image to file
             debug_dir = "debug_images"
@@ -158,8 +191,7 @@ class VLMInterface:
                 f.write(image_bytes)
             logger.info(f"[DEBUG] Image saved to {file_name}")
 
-        return await asyncio.to_thread(
-            self.describe_image_bytes,
+        return await self.describe_image_bytes_async(
             image_bytes,
             system_prompt,
             user_prompt,
@@ -168,7 +200,7 @@ class VLMInterface:
 
 
     # ───────────────────── Provider helpers ─────────────────────    
-    def _openai_describe_bytes(self, image_bytes: bytes, sys: str | None, usr: str) -> str:
+    def _openai_request(self, image_bytes: bytes, sys: str | None, usr: str) -> Dict[str, Any]:
         img_b64 = base64.b64encode(image_bytes).decode()
         messages: list[Dict[str, Any]] = []
         if sys:
@@ -182,12 +214,15 @@ class VLMInterface:
                 ],
             }
         )
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            temperature=self.temperature,
-            max_tokens=2048,
-        )
+        return {
+            "model": self.model,
+            "messages": messages,
+            "temperature": self.temperature,
+            "max_tokens": 2048,
+        }
+
+    @staticmethod
+    def _parse_openai(response: Any) -> Dict[str, Any]:
         content = response.choices[0].message.content.strip()
         total_tokens = response.usage.prompt_tokens + response.usage.completion_tokens
 
@@ -195,8 +230,18 @@ class VLMInterface:
             "tokens_used": total_tokens or 0,
             "content": content or ""
         }
-    
-    def _ollama_describe_bytes(self, image_bytes: bytes, sys: str | None, usr: str) -> str:
+
+    def _openai_describe_bytes(self, image_bytes: bytes, sys: str | None, usr: str) -> str:
+        response = self.client.chat.completions.create(**self._openai_request(image_bytes, sys, usr))
+        return self._parse_openai(response)
+
+    async def _openai_describe_bytes_async(self, image_bytes: bytes, sys: str | None, usr: str) -> Dict[str, Any]:
+        response = await async_openai_client(self.client).chat.completions.create(
+            **self._openai_request(image_bytes, sys, usr)
+        )
+        return self._parse_openai(response)
+
+    def _ollama_request(self, image_bytes: bytes, sys: str | None, usr: str) -> Tuple[str, Dict[str, Any]]:
         img_b64 = base64.b64encode(image_bytes).decode()
         payload = {
             "model": self.model,
@@ -206,17 +251,28 @@ class VLMInterface:
             "stream": False,
             "temperature": self.temperature,
         }
-        url: str = f"{self.remote_url.rstrip('/')}/vision"
-        r = requests.post(url, json=payload, timeout=600)
-        r.raise_for_status()
-        content = r.json().get("response", "").strip()
-        total_tokens = r.json().get("usage", {}).get("total_tokens", 0)
+        return f"{self.remote_url.rstrip('/')}/vision", payload
+
+    @staticmethod
+    def _parse_ollama(result: Dict[str, Any]) -> Dict[str, Any]:
+        content = result.get("response", "").strip()
+        total_tokens = result.get("usage", {}).get("total_tokens", 0)
         
         return {
             "tokens_used": total_tokens or 0,
             "content": content or ""
         }
     
+    def _ollama_describe_bytes(self, image_bytes: bytes, sys: str | None, usr: str) -> str:
+        url, payload = self._ollama_request(image_bytes, sys, usr)
+        r = http_session(url).post(url, json=payload, timeout=600)
+        r.raise_for_status()
+        return self._parse_ollama(r.json())
+
+    async def _ollama_describe_bytes_async(self, image_bytes: bytes, sys: str | None, usr: str) -> Dict[str, Any]:
+        url, payload = self._ollama_request(image_bytes, sys, usr)
+        return self._parse_ollama(await post_json(url, payload, timeout=600))
+    
     def _gemini_describe_bytes(self, image_bytes: bytes, sys: str | None, usr: str) -> str:
         if not self._gemini_client:
             raise RuntimeError("Gemini client was not initialised.")
@@ -230,7 +286,19 @@ class VLMInterface:
         )
         return content
 
-    def _byteplus_describe_bytes(self, image_bytes: bytes, sys: str | None, usr: str) -> str:
+    async def _gemini_describe_bytes_async(self, image_bytes: bytes, sys: str | None, usr: str) -> Dict[str, Any]:
+        if not self._gemini_client:
+            raise RuntimeError("Gemini client was not initialised.")
+
+        return await self._gemini_client.generate_multimodal_async(
+            self.model,
+            text=usr,
+            image_bytes=image_bytes,
+            system_prompt=sys,
+            temperature=self.temperature,
+        )
+
+    def _byteplus_request(self, image_bytes: bytes, sys: str | None, usr: str) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
         img_b64 = base64.b64encode(image_bytes).decode()
         messages: list[Dict[str, Any]] = []
         if sys:
@@ -257,11 +325,10 @@ class VLMInterface:
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_key}",
         }
+        return url, payload, headers
 
-        response = requests.post(url, json=payload, headers=headers, timeout=120)
-        response.raise_for_status()
-        result = response.json()
-
+    @staticmethod
+    def _parse_byteplus(result: Dict[str, Any]) -> Any:
         choices = result.get("choices", [])
         if choices:
             content = (
@@ -278,10 +345,17 @@ class VLMInterface:
 
         return ""
 
-    def _anthropic_describe_bytes(self, image_bytes: bytes, sys: str | None, usr: str) -> str:
-        if not self._anthropic_client:
-            raise RuntimeError("Anthropic client was not initialised.")
+    def _byteplus_describe_bytes(self, image_bytes: bytes, sys: str | None, usr: str) -> str:
+        url, payload, headers = self._byteplus_request(image_bytes, sys, usr)
+        response = http_session(url).post(url, json=payload, headers=headers, timeout=120)
+        response.raise_for_status()
+        return self._parse_byteplus(response.json())
 
+    async def _byteplus_describe_bytes_async(self, image_bytes: bytes, sys: str | None, usr: str) -> Any:
+        url, payload, headers = self._byteplus_request(image_bytes, sys, usr)
+        return self._parse_byteplus(await post_json(url, payload, headers=headers, timeout=120))
+
+    def _anthropic_request(self, image_bytes: bytes, sys: str | None, usr: str) -> Dict[str, Any]:
         img_b64 = base64.b64encode(image_bytes).decode()
 
         # Detect media type from image bytes (default to jpeg)
@@ -320,9 +394,10 @@ class VLMInterface:
 
         # Always pass temperature for Anthropic (their default is 1.0, not 0.0)
         message_kwargs["temperature"] = self.temperature
+        return message_kwargs
 
-        response = self._anthropic_client.messages.create(**message_kwargs)
-
+    @staticmethod
+    def _parse_anthropic(response: Any) -> Dict[str, Any]:
         # Extract content from the response
         content = ""
         for block in response.content:
@@ -339,3 +414,18 @@ class VLMInterface:
             "content": content or ""
         }
 
+    def _anthropic_describe_bytes(self, image_bytes: bytes, sys: str | None, usr: str) -> str:
+        if not self._anthropic_client:
+            raise RuntimeError("Anthropic client was not initialised.")
+
+        response = self._anthropic_client.messages.create(**self._anthropic_request(image_bytes, sys, usr))
+        return self._parse_anthropic(response)
+
+    async def _anthropic_describe_bytes_async(self, image_bytes: bytes, sys: str | None, usr: str) -> Dict[str, Any]:
+        if not self._anthropic_client:
+            raise RuntimeError("Anthropic client was not initialised.")
+
+        response = await async_anthropic_client(self._anthropic_client).messages.create(
+            **self._anthropic_request(image_bytes, sys, usr)
+        )
+        return self._parse_anthropic(response)
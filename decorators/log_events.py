@@ -3,10 +3,12 @@ Flexible function-level logging:
 - logs start
 - logs success (with result)
 - logs failure (with exception)
+Works on plain and ``async`` functions.
 Allows custom message templates:
   {id}, {name}, {args}, {kwargs}, {result}, {exception}, {duration_ms}
 """
 
+import inspect
 import logging
 import time
 import uuid
@@ -31,10 +33,10 @@ def log_events(
     Adds a unique ID per call for tracing.
     """
     def decorator(fn):
-        @wraps(fn)
-        def wrapper(*args, **kwargs):
+        entry = name or fn.__name__
+
+        def _start(args, kwargs):
             entry_id = uuid.uuid4().hex[:8]  # unique ID per call
-            entry = name or fn.__name__
 
             # START LOG
             try:
@@ -46,61 +48,82 @@ def log_events(
             except Exception:
                 msg = f"[{entry}] START id={entry_id} args={args} kwargs={kwargs}"
             logger.debug(msg)
+            return entry_id, time.time()
 
-            start = time.time()
+        def _success(entry_id, start, args, kwargs, result):
+            duration_ms = (time.time() - start) * 1000
 
+            # SUCCESS LOG (always include result)
             try:
-                result = fn(*args, **kwargs)
-                duration_ms = (time.time() - start) * 1000
-
-                # SUCCESS LOG (always include result)
-                try:
-                    msg = (
-                        on_success.format(
-                            id=entry_id,
-                            name=entry,
-                            args=args,
-                            kwargs=kwargs,
-                            result=result,
-                            duration_ms=f"{duration_ms:.2f}",
-                        )
-                        if on_success
-                        else f"[{entry}] END (success) id={entry_id} duration={duration_ms:.2f}ms result={result}"
+                msg = (
+                    on_success.format(
+                        id=entry_id,
+                        name=entry,
+                        args=args,
+                        kwargs=kwargs,
+                        result=result,
+                        duration_ms=f"{duration_ms:.2f}",
                     )
-                except Exception:
-                    msg = f"[{entry}] END (success) id={entry_id} duration={duration_ms:.2f}ms result={result}"
+                    if on_success
+                    else f"[{entry}] END (success) id={entry_id} duration={duration_ms:.2f}ms result={result}"
+                )
+            except Exception:
+                msg = f"[{entry}] END (success) id={entry_id} duration={duration_ms:.2f}ms result={result}"
 
-                logger.debug(msg)
-                return result
+            logger.debug(msg)
 
-            except Exception as exc:
-                duration_ms = (time.time() - start) * 1000
+        def _failure(entry_id, start, args, kwargs, exc):
+            duration_ms = (time.time() - start) * 1000
 
-                # FAILURE LOG
-                try:
-                    msg = (
-                        on_failure.format(
-                            id=entry_id,
-                            name=entry,
-                            args=args,
-                            kwargs=kwargs,
-                            exception=exc,
-                            duration_ms=f"{duration_ms:.2f}",
-                        )
-                        if on_failure
-                        else (
-                            f"[{entry}] END (FAILED) id={entry_id} duration={duration_ms:.2f}ms "
-                            f"error={type(exc).__name__}: {exc}"
-                        )
+            # FAILURE LOG
+            try:
+                msg = (
+                    on_failure.format(
+                        id=entry_id,
+                        name=entry,
+                        args=args,
+                        kwargs=kwargs,
+                        exception=exc,
+                        duration_ms=f"{duration_ms:.2f}",
                     )
-                except Exception:
-                    msg = (
+                    if on_failure
+                    else (
                         f"[{entry}] END (FAILED) id={entry_id} duration={duration_ms:.2f}ms "
                         f"error={type(exc).__name__}: {exc}"
                     )
+                )
+            except Exception:
+                msg = (
+                    f"[{entry}] END (FAILED) id={entry_id} duration={duration_ms:.2f}ms "
+                    f"error={type(exc).__name__}: {exc}"
+                )
+
+            logger.error(msg)
+
+        if inspect.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                entry_id, start = _start(args, kwargs)
+                try:
+                    result = await fn(*args, **kwargs)
+                except Exception as exc:
+                    _failure(entry_id, start, args, kwargs, exc)
+                    raise
+                _success(entry_id, start, args, kwargs, result)
+                return result
+
+            return async_wrapper
 
-                logger.error(msg)
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            entry_id, start = _start(args, kwargs)
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as exc:
+                _failure(entry_id, start, args, kwargs, exc)
                 raise
+            _success(entry_id, start, args, kwargs, result)
+            return result
 
         return wrapper
     return decorator
@@ -3,6 +3,7 @@ Profiler decorator — logs execution time, CPU usage, and memory usage
 to a uniquely-named JSON log file per runtime session.
 """
 
+import inspect
 import time
 import json
 import psutil
@@ -29,14 +30,18 @@ class Profiler:
         self.log_path.write_text("[]", encoding="utf-8")
 
     def _append(self, record):
+        # Overwrite the closing bracket instead of rewriting the whole file,
+        # so a record costs the same however long the session has run. LLM
+        # calls record from the event loop thread.
+        entry = json.dumps(record, indent=2).encode("utf-8")
         with self.lock:
             try:
-                data = json.loads(self.log_path.read_text())
-            except Exception:
-                data = []
-
-            data.append(record)
-            self.log_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+                with open(self.log_path, "r+b") as f:
+                    end = f.seek(0, 2)
+                    f.seek(end - 1)
+                    f.write((b"\n" if end <= 2 else b",\n") + entry + b"\n]")
+            except OSError:
+                pass
 
     def record(self, name, start, end, meta=None):
         """Record a profiling entry."""
@@ -61,9 +66,21 @@ profiler = Profiler()
 
 def profile(name=None, meta_fn=None):
     """
-    Decorator that logs timing + CPU/memory usage.
+    Decorator that logs timing + CPU/memory usage of plain and async functions.
     """
     def wrapper(fn):
+        if inspect.iscoroutinefunction(fn):
+            async def async_inner(*args, **kwargs):
+                start = time.time()
+                try:
+                    result = await fn(*args, **kwargs)
+                    return result
+                finally:
+                    end = time.time()
+                    meta = meta_fn(result, *args, **kwargs) if meta_fn else None
+                    profiler.record(name or fn.__name__, start, end, meta)
+            return async_inner
+
         def inner(*args, **kwargs):
             start = time.time()
             try:
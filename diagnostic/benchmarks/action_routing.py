@@ -0,0 +1,94 @@
+"""Measure the action lookups the router performs on every reasoning turn.
+
+A turn of ``ActionRouter.select_action_in_task`` fetches the default actions,
+hydrates each search hit and then the selected action again. The legacy path
+re-extracts handler source (``inspect.getsource`` + dedent + AST) and rebuilds
+``Action`` objects for every lookup; the cached path serves both from the
+registry and ``ActionLibrary`` caches.
+
+    python diagnostic/benchmarks/action_routing.py --turns 200
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+if __package__ is None or __package__ == "":
+    project_root = Path(__file__).resolve().parents[2]
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+
+from core.action.action import Action
+from core.action.action_framework.loader import load_actions_from_directories
+from core.action.action_framework.registry import _extract_source, registry_instance
+from core.action.action_library import ActionLibrary
+from diagnostic.benchmarks.common import print_table, time_call
+
+SEARCH_HITS = 5
+
+
+class _RegistryDB:
+    """The two ``DatabaseInterface`` lookups the library uses, minus Chroma."""
+
+    def get_action(self, name: str) -> Optional[Dict[str, Any]]:
+        return registry_instance.find_action_by_name(name)
+
+    def list_actions(self, *, default: Optional[bool] = None) -> List[Dict[str, Any]]:
+        actions = registry_instance.list_all_actions_as_json()
+        if default is not None:
+            actions = [a for a in actions if a.get("default") == default]
+        return actions
+
+
+def _legacy_action_json(name: str) -> Dict[str, Any]:
+    impls = registry_instance.list_all_actions()[name]
+    for impl in {id(i): i for i in impls.values()}.values():
+        _extract_source(impl.handler)
+    return registry_instance._get_action_as_json(impls)
+
+
+def legacy_turn(names: List[str]) -> None:
+    defaults = [
+        Action.from_dict(a)
+        for a in (_legacy_action_json(n) for n in registry_instance.list_all_actions())
+        if a.get("default")
+    ]
+    hits = [Action.from_dict(_legacy_action_json(n)) for n in names]
+    Action.from_dict(_legacy_action_json(names[0]))
+    assert defaults is not None and hits
+
+
+def cached_turn(library: ActionLibrary, names: List[str]) -> None:
+    library.retrieve_default_action()
+    hits = [library.retrieve_action(n) for n in names]
+    library.retrieve_action(names[0])
+    assert hits
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark per-turn action routing lookups.")
+    parser.add_argument("--turns", type=int, default=200, help="Timed routing turns.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    load_actions_from_directories()
+    names = sorted(registry_instance.list_all_actions())[:SEARCH_HITS]
+    library = ActionLibrary(llm_interface=None, db_interface=_RegistryDB())
+
+    legacy = time_call(lambda: legacy_turn(names), repeat=args.turns)
+    cached = time_call(lambda: cached_turn(library, names), repeat=args.turns)
+
+    print_table(
+        ["actions", "legacy ms/turn", "cached ms/turn", "speedup"],
+        [[len(registry_instance.list_all_actions()), f"{legacy:.3f}", f"{cached:.4f}",
+          f"{legacy / cached:.0f}x" if cached else "-"]],
+    )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    sys.exit(main())
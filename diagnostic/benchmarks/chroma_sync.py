@@ -0,0 +1,124 @@
+"""Compare a full rebuild of the Chroma action collection with the incremental sync.
+
+The full rebuild is what startup used to do: delete every id and re-add (and
+re-embed) the whole catalog. The incremental sync hashes each action and only
+touches what changed. Both are timed on the built-in actions and on a
+synthetic catalog, for a warm start with no changes and with a few edits.
+
+    python diagnostic/benchmarks/chroma_sync.py --synthetic 2000
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+if __package__ is None or __package__ == "":
+    project_root = Path(__file__).resolve().parents[2]
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+
+import chromadb
+
+from core.storage.chroma_sync import content_hash, sync_collection
+from diagnostic.benchmarks.common import print_table, time_call
+
+
+class _HashEmbedding:
+    """Deterministic stand-in so timings exclude the ONNX model."""
+
+    def __call__(self, input: List[str]) -> List[List[float]]:  # noqa: A002 - Chroma's signature
+        return [[((hash(text) >> shift) & 0xFF) / 255.0 for shift in range(0, 64, 8)] for text in input]
+
+    def name(self) -> str:
+        return "bench-hash"
+
+
+def builtin_actions() -> List[Dict[str, Any]]:
+    from core.action.action_framework.loader import load_actions_from_directories
+    from core.action.action_framework.registry import registry_instance
+
+    load_actions_from_directories()
+    return registry_instance.list_all_actions_as_json()
+
+
+def synthetic_actions(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "name": f"synthetic action {i}",
+            "description": f"Synthetic action number {i} used to benchmark catalog sync.",
+            "input_schema": {"path": {"type": "string", "example": f"/tmp/{i}"}},
+            "output_schema": {"status": {"type": "string"}},
+        }
+        for i in range(count)
+    ]
+
+
+def _desired(actions: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    return {
+        a["name"]: {"hash": content_hash(a["name"], a.get("description"), a.get("input_schema"), a.get("output_schema"))}
+        for a in actions
+    }
+
+
+def full_rebuild(collection: Any, actions: List[Dict[str, Any]]) -> None:
+    ids = collection.get(include=[]).get("ids", [])
+    if ids:
+        collection.delete(ids=ids)
+    names = [a["name"] for a in actions]
+    collection.add(ids=names, documents=names)
+
+
+def measure(actions: List[Dict[str, Any]], fake_embeddings: bool, changed: int) -> Dict[str, float]:
+    embedding_function = _HashEmbedding() if fake_embeddings else None
+    results: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory(prefix="bench_chroma_") as tmp:
+        client = chromadb.PersistentClient(path=tmp)
+        kwargs = {"embedding_function": embedding_function} if embedding_function else {}
+        collection = client.get_or_create_collection("agent_actions", **kwargs)
+        manifest = Path(tmp) / "action_manifest.json"
+
+        results["full rebuild"] = time_call(lambda: full_rebuild(collection, actions))
+
+        desired = _desired(actions)
+        sync_collection(collection, manifest, desired, lambda name: (name, None))
+        results["incremental, unchanged"] = time_call(
+            lambda: sync_collection(collection, manifest, desired, lambda name: (name, None))
+        )
+
+        edited = [dict(a) for a in actions]
+        for action in edited[:changed]:
+            action["description"] = f"{action.get('description')} (edited)"
+        edited_desired = _desired(edited)
+        results[f"incremental, {changed} changed"] = time_call(
+            lambda: sync_collection(collection, manifest, edited_desired, lambda name: (name, None))
+        )
+    return results
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark full vs incremental Chroma action sync.")
+    parser.add_argument("--synthetic", type=int, default=2000, help="Size of the synthetic action catalog.")
+    parser.add_argument("--changed", type=int, default=5, help="Actions edited before the last sync.")
+    parser.add_argument("--fake-embeddings", action="store_true",
+                        help="Use a hash embedding instead of Chroma's default model.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    catalogs = {"built-in": builtin_actions(), "synthetic": synthetic_actions(args.synthetic)}
+
+    rows = []
+    for label, actions in catalogs.items():
+        for op, ms in measure(actions, args.fake_embeddings, args.changed).items():
+            rows.append([label, len(actions), op, f"{ms:.1f}"])
+
+    print_table(["catalog", "actions", "operation", "ms"], rows)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    sys.exit(main())
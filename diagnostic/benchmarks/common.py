@@ -0,0 +1,33 @@
+"""Shared helpers for the benchmark scripts in ``diagnostic/benchmarks``."""
+from __future__ import annotations
+
+import statistics
+import time
+from typing import Callable, Iterable, List, Sequence
+
+
+def time_call(fn: Callable[[], object], repeat: int = 1) -> float:
+    """Return the median wall time of ``fn`` in milliseconds."""
+    samples: List[float] = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def print_table(headers: Sequence[str], rows: Iterable[Sequence[object]]) -> None:
+    """Print ``rows`` as a left-aligned plain-text table."""
+    rendered = [[str(cell) for cell in row] for row in rows]
+    widths = [len(h) for h in headers]
+    for row in rendered:
+        for i, cell in enumerate(row):
+            widths[i] = max(widths[i], len(cell))
+
+    def _line(cells: Sequence[str]) -> str:
+        return "  ".join(cell.ljust(widths[i]) for i, cell in enumerate(cells))
+
+    print(_line(headers))
+    print(_line(["-" * w for w in widths]))
+    for row in rendered:
+        print(_line(row))
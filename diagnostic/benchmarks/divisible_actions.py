@@ -0,0 +1,120 @@
+"""Divisible action latency with sequential versus DAG-scheduled sub-actions.
+
+Each of the N sub-actions is an independent internal action that reads a
+file after a simulated I/O wait of ``--io-ms``. "sequential" awaits them one
+after another like the old ``execute_divisible_action`` loop; "dag" runs
+them through ``ActionManager.execute_divisible_action`` with a concurrency
+limit of N, so the speedup should approach N.
+
+    python diagnostic/benchmarks/divisible_actions.py --subactions 8
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+if __package__ is None or __package__ == "":
+    project_root = Path(__file__).resolve().parents[2]
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("AGENT_SANDBOX_POOL_SIZE", "0")
+
+from core.action.action import Action
+from core.action.action_dag import SUBACTION_CONCURRENCY_ENV
+from core.action.action_manager import ActionManager
+from diagnostic.benchmarks.common import print_table, time_call
+
+SUB_ACTION_CODE = '''
+def read_after_wait(input_data):
+    import time
+    time.sleep(input_data["io_ms"] / 1000)
+    with open(input_data["path"], encoding="utf-8") as f:
+        return {"status": "success", "chars": len(f.read())}
+'''
+
+
+class _NullDB:
+    """The ``DatabaseInterface`` calls the manager makes, with nothing stored."""
+
+    def upsert_action_history(self, *args, **kwargs) -> None:
+        pass
+
+    def recent_action_durations(self) -> dict:
+        return {}
+
+
+def _divisible_action(count: int) -> Action:
+    return Action(
+        name="read files",
+        description="Reads several files.",
+        action_type="divisible",
+        sub_actions=[
+            Action(
+                name=f"read file {i}",
+                description="Reads one file.",
+                action_type="atomic",
+                code=SUB_ACTION_CODE,
+                execution_mode="internal",
+                input_schema={"path": {"type": "string"}, "io_ms": {"type": "integer"}},
+                dependencies=[],
+            )
+            for i in range(count)
+        ],
+    )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark sequential vs DAG-scheduled sub-actions.")
+    parser.add_argument("--subactions", type=int, default=8, help="Independent sub-actions per call.")
+    parser.add_argument("--io-ms", type=int, default=200, help="Simulated I/O wait per sub-action.")
+    parser.add_argument("--repeat", type=int, default=3, help="Calls per mode.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    os.environ[SUBACTION_CONCURRENCY_ENV] = str(args.subactions)
+
+    manager = ActionManager(None, None, _NullDB(), None, None, None)
+    action = _divisible_action(args.subactions)
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write("lorem ipsum " * 1000)
+    input_data = {"path": f.name, "io_ms": args.io_ms}
+
+    async def sequential() -> None:
+        for sub in action.sub_actions:
+            await manager.execute_action(sub, context="", event_stream="", input_data=input_data)
+
+    async def dag() -> None:
+        results = await manager.execute_divisible_action(action, input_data, parent_id=None)
+        failed = [name for name, output in results.items() if "error" in output]
+        if failed:
+            raise RuntimeError(f"Sub-actions failed: {failed}")
+
+    loop = asyncio.new_event_loop()
+    try:
+        seq_ms = time_call(lambda: loop.run_until_complete(sequential()), repeat=args.repeat)
+        dag_ms = time_call(lambda: loop.run_until_complete(dag()), repeat=args.repeat)
+    finally:
+        loop.close()
+        os.unlink(f.name)
+
+    print_table(
+        ["mode", "median ms/call", "speedup"],
+        [
+            ["sequential", f"{seq_ms:.0f}", "1.0x"],
+            [f"dag (limit {args.subactions})", f"{dag_ms:.0f}", f"{seq_ms / dag_ms:.1f}x"],
+        ],
+    )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    sys.exit(main())
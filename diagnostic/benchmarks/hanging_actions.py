@@ -0,0 +1,182 @@
+"""Deliberately hanging and runaway actions against adaptive timeouts and limits.
+
+Each scenario runs a misbehaving action through ``ActionExecutor.execute_action``
+and checks that it is stopped, and how quickly:
+
+* an internal busy loop whose history says it normally takes milliseconds,
+  stopped at the timeout floor instead of the ceiling;
+* a sandboxed action that spins the CPU, stopped by ``max_cpu_seconds``;
+* a sandboxed action that allocates without bound, stopped by
+  ``max_memory_mb``;
+* a sandboxed action that sleeps forever after spawning a grandchild,
+  stopped at its declared timeout with the grandchild killed alongside it.
+
+The exit status is non-zero when a scenario is not stopped as expected.
+
+    python diagnostic/benchmarks/hanging_actions.py --floor 2
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, List, Optional
+
+if __package__ is None or __package__ == "":
+    project_root = Path(__file__).resolve().parents[2]
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("AGENT_SANDBOX_POOL_SIZE", "1")
+
+from core.action.action import Action
+from core.action.action_executor import ActionExecutor
+from core.action.resource_usage import current_usage
+from core.action.timeouts import ACTION_TIMEOUTS
+from diagnostic.benchmarks.common import print_table
+
+BUSY_LOOP_CODE = '''
+def busy_loop(input_data):
+    while True:
+        pass
+'''
+
+SLEEP_WITH_CHILD_CODE = '''
+def sleep_with_child(input_data):
+    import subprocess, sys, time
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(3600)"])
+    with open(input_data["pid_file"], "w") as f:
+        f.write(str(child.pid))
+    time.sleep(3600)
+'''
+
+CPU_SPIN_CODE = '''
+def cpu_spin(input_data):
+    total = 0
+    while True:
+        total += 1
+'''
+
+NOOP_CODE = '''
+def noop(input_data):
+    return {"status": "success"}
+'''
+
+ALLOCATE_CODE = '''
+def allocate(input_data):
+    blocks = []
+    while True:
+        blocks.append(bytearray(16 * 1024 * 1024))
+'''
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            return "\nState:\tZ" not in f.read()
+    except FileNotFoundError:
+        return False
+    except OSError:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        return True
+
+
+def _failed(result: Any) -> bool:
+    if not isinstance(result, dict):
+        return False
+    return "error" in result or result.get("status") == "error" or result.get("returncode", 0) != 0
+
+
+async def _run(executor: ActionExecutor, action: Action, input_data: dict) -> tuple[Any, float]:
+    """The result and how long the action ran; environment setup is excluded when measured."""
+    start = time.perf_counter()
+    result = await executor.execute_action(action, input_data)
+    usage = current_usage.get()
+    return result, usage.wall_ms / 1000 if usage else time.perf_counter() - start
+
+
+async def _scenarios(args: argparse.Namespace, tmp: Path) -> List[List[Any]]:
+    executor = ActionExecutor()
+    rows: List[List[Any]] = []
+
+    # Wait for a warm venv so scenarios time the action alone. The cap keeps
+    # the run off the persistent workers, which would keep the venv.
+    await executor.execute_action(
+        Action("noop", "Returns.", "atomic", code=NOOP_CODE, execution_mode="sandboxed",
+               limits={"cpu_seconds": 60}),
+        {},
+    )
+
+    def check(name: str, budget: float, elapsed: float, ok: bool, note: str) -> None:
+        rows.append([name, f"{budget:.1f}", f"{elapsed:.1f}", note, "ok" if ok else "FAIL"])
+
+    # 1. Internal busy loop with a fast history: stopped at the floor.
+    busy = Action("busy loop", "Never returns.", "atomic", code=BUSY_LOOP_CODE, execution_mode="internal")
+    for _ in range(ACTION_TIMEOUTS.min_samples):
+        ACTION_TIMEOUTS.record(busy.name, 0.05)
+    budget = ACTION_TIMEOUTS.timeout_for(busy)
+    result, elapsed = await _run(executor, busy, {})
+    check("internal busy loop", budget, elapsed, _failed(result) and elapsed < budget + args.slack,
+          f"next budget {ACTION_TIMEOUTS.timeout_for(busy):.1f}s")
+
+    # 2. CPU cap.
+    spinner = Action("cpu spin", "Spins forever.", "atomic", code=CPU_SPIN_CODE, execution_mode="sandboxed",
+                     timeout=60, limits={"cpu_seconds": 1})
+    result, elapsed = await _run(executor, spinner, {})
+    check("sandboxed cpu spin (1 cpu-s cap)", spinner.timeout, elapsed, _failed(result) and elapsed < 5,
+          f"returncode {result.get('returncode')}")
+
+    # 3. Memory cap.
+    hog = Action("allocate", "Allocates forever.", "atomic", code=ALLOCATE_CODE, execution_mode="sandboxed",
+                 timeout=60, limits={"memory_mb": args.memory_mb})
+    result, elapsed = await _run(executor, hog, {})
+    stderr = result.get("stderr", "") if isinstance(result, dict) else ""
+    check(f"sandboxed allocation ({args.memory_mb} MB cap)", hog.timeout, elapsed,
+          _failed(result) and elapsed < 5, "MemoryError" if "MemoryError" in stderr else "stopped")
+
+    # 4. Sandboxed sleep with a grandchild: the whole process group goes.
+    #    Last, because the killed worker's venv is discarded and rebuilt.
+    pid_file = tmp / "grandchild.pid"
+    sleeper = Action("sleep with child", "Never returns.", "atomic", code=SLEEP_WITH_CHILD_CODE,
+                     execution_mode="sandboxed", timeout=args.floor)
+    result, elapsed = await _run(executor, sleeper, {"pid_file": str(pid_file)})
+    grandchild = int(pid_file.read_text()) if pid_file.exists() else None
+    deadline = time.monotonic() + 5
+    while grandchild is not None and _process_alive(grandchild) and time.monotonic() < deadline:
+        await asyncio.sleep(0.1)
+    orphaned = grandchild is not None and _process_alive(grandchild)
+    check("sandboxed sleep + grandchild", sleeper.timeout, elapsed,
+          _failed(result) and grandchild is not None and not orphaned and elapsed < sleeper.timeout + args.slack,
+          "grandchild left running" if orphaned else "grandchild killed")
+
+    return rows
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run hanging actions against timeouts and limits.")
+    parser.add_argument("--floor", type=float, default=2.0, help="Timeout floor in seconds.")
+    parser.add_argument("--memory-mb", type=int, default=512, help="Address-space cap for the allocation scenario.")
+    parser.add_argument("--slack", type=float, default=5.0, help="Seconds allowed past a budget.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    ACTION_TIMEOUTS.floor = args.floor
+
+    with tempfile.TemporaryDirectory(prefix="bench_hanging_") as tmp:
+        rows = asyncio.run(_scenarios(args, Path(tmp)))
+
+    print_table(["scenario", "budget s", "ran for s", "detail", "result"], rows)
+    return 0 if all(row[-1] == "ok" for row in rows) else 1
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    sys.exit(main())
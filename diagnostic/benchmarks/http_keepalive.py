@@ -0,0 +1,204 @@
+"""Per-call overhead of blocking provider calls with and without keep-alive.
+
+Starts a local HTTP/1.1 mock of the Ollama, Gemini and BytePlus endpoints
+and makes ``--calls`` sequential calls through each blocking path, reporting
+milliseconds per call and how many TCP connections the server accepted:
+
+* ``requests.post`` - a bare post per call, which is how every path used
+  to work: one new connection per call;
+* ``http_session``  - the same post on the pooled session;
+* the LLM, VLM and embedding interfaces end to end, which now use the
+  pooled sessions.
+
+Loopback connections are cheap, so the saving measured here is a lower
+bound: against a real provider every new connection also pays a network
+round trip and a TLS handshake.
+
+    python diagnostic/benchmarks/http_keepalive.py --calls 1000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+
+if __package__ is None or __package__ == "":
+    project_root = Path(__file__).resolve().parents[2]
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+
+# A 1x1 PNG for the VLM path.
+PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+)
+
+
+# ----------------------------------------------------------------------
+# Mock provider server
+# ----------------------------------------------------------------------
+def _reply_for(path: str) -> dict:
+    text = '{"ok": true}'
+    if path.endswith("/embeddings"):
+        return {"embedding": [0.0] * 8}
+    if ":embedContent" in path:
+        return {"embedding": {"values": [0.0] * 8}}
+    if ":generateContent" in path:
+        return {"candidates": [{"content": {"parts": [{"text": text}]}}],
+                "usageMetadata": {"totalTokenCount": 15}}
+    if path.endswith("/chat/completions"):
+        return {"choices": [{"message": {"role": "assistant", "content": text}}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}}
+    return {"response": text, "prompt_eval_count": 10, "eval_count": 5}
+
+
+def _serve(port: int) -> None:
+    connections = {"count": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # One write per reply; split writes on a kept-alive socket hit
+        # Nagle plus delayed ACK and add ~40 ms to every call.
+        disable_nagle_algorithm = True
+        wbufsize = -1
+
+        def setup(self) -> None:
+            connections["count"] += 1
+            super().setup()
+
+        def _send(self, body: dict) -> None:
+            data = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:
+            self._send({"connections": connections["count"]})
+
+        def do_POST(self) -> None:
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self._send(_reply_for(self.path.split("?", 1)[0]))
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    ThreadingHTTPServer.daemon_threads = True
+    ThreadingHTTPServer(("127.0.0.1", port), Handler).serve_forever()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _connections(base: str) -> int:
+    # Connection: close, so the probe is not itself kept alive.
+    request = urllib.request.Request(f"{base}/stats", headers={"Connection": "close"})
+    with urllib.request.urlopen(request, timeout=5) as r:
+        return json.loads(r.read())["connections"]
+
+
+def _point_providers_at(base: str) -> None:
+    os.environ.update({
+        "GOOGLE_API_KEY": "mock", "GOOGLE_API_BASE": base,
+        "BYTEPLUS_API_KEY": "mock", "BYTEPLUS_BASE_URL": f"{base}/api/v3",
+        "REMOTE_MODEL_URL": f"{base}/api",
+    })
+
+
+# ----------------------------------------------------------------------
+# Scenarios
+# ----------------------------------------------------------------------
+def _measure(call: Callable[[], Any], calls: int, base: str) -> List[str]:
+    call()  # warm up: imports, first connection
+    before = _connections(base)
+    start = time.perf_counter()
+    for _ in range(calls):
+        call()
+    elapsed = time.perf_counter() - start
+    opened = _connections(base) - before - 1  # minus the probe
+    return [f"{elapsed / calls * 1000:.2f}", str(opened)]
+
+
+def _scenarios(args: argparse.Namespace, base: str) -> List[List[Any]]:
+    import requests
+
+    from core.embedding_interface import EmbeddingInterface
+    from core.http_clients import http_session
+    from core.llm_interface import LLMInterface
+    from core.vlm_interface import VLMInterface
+
+    url = f"{base}/api/generate"
+    payload = {"model": "mock", "prompt": "ping", "stream": False}
+
+    def bare() -> None:
+        requests.post(url, json=payload, timeout=120).raise_for_status()
+
+    def pooled() -> None:
+        http_session(url).post(url, json=payload, timeout=120).raise_for_status()
+
+    runs = [
+        ("requests.post", bare),
+        ("http_session", pooled),
+    ]
+    for provider in args.providers:
+        llm = LLMInterface(provider=provider, model="mock")
+        vlm = VLMInterface(provider=provider, model="mock")
+        embedding = EmbeddingInterface(provider=provider, model="mock")
+        runs += [
+            (f"LLM {provider}", lambda llm=llm: llm.generate_response(None, "ping", False)),
+            (f"VLM {provider}", lambda vlm=vlm: vlm.describe_image_bytes(PNG, None, "ping", False)),
+            (f"embedding {provider}", lambda embedding=embedding: embedding.get_embedding("ping")),
+        ]
+    return [[name, *_measure(call, args.calls, base)] for name, call in runs]
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure per-call overhead of blocking provider calls.")
+    parser.add_argument("--calls", type=int, default=1000, help="Sequential calls per path.")
+    parser.add_argument("--providers", nargs="*", default=["remote", "gemini", "byteplus"],
+                        choices=["remote", "gemini", "byteplus"])
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    server = multiprocessing.get_context("spawn").Process(target=_serve, args=(port,), daemon=True)
+    server.start()
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                _connections(base)
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.1)
+        _point_providers_at(base)
+
+        from diagnostic.benchmarks.common import print_table
+
+        rows = _scenarios(args, base)
+        print(f"{args.calls} sequential calls per path")
+        print_table(["path", "ms/call", "connections opened"], rows)
+    finally:
+        server.kill()
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""Memory cost of actions that print far more than anyone will read.
+
+Runs ``shell exec`` (in process, the way the agent runs it) and a sandboxed
+action that each print ``--mb`` megabytes, then reports how much the agent
+process's peak RSS grew, the size of the preview kept in ``outputs``, and
+whether the spill file holds the whole stream. The sandboxed run must
+still return the JSON result printed after its flood.
+
+The exit status is non-zero when a run loses output or grows the agent's
+peak RSS by more than ``--max-growth-mb``.
+
+    python diagnostic/benchmarks/large_outputs.py --mb 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, List, Optional
+
+if __package__ is None or __package__ == "":
+    project_root = Path(__file__).resolve().parents[2]
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("AGENT_SANDBOX_POOL_SIZE", "1")
+
+from core.action.action import Action
+from core.action.action_executor import ActionExecutor
+from core.action.action_framework.loader import load_actions_from_directories
+from core.action.action_framework.registry import registry_instance
+from core.action.action_manager import ActionManager
+from core.action.resource_usage import _peak_rss_self
+from diagnostic.benchmarks.common import print_table
+
+FLOOD_CODE = '''
+def flood(input_data):
+    import sys
+    line = "x" * 99 + "\\n"
+    for _ in range(input_data["lines"]):
+        sys.stdout.write(line)
+    return {"status": "success", "lines": input_data["lines"]}
+'''
+
+
+class _Manager:
+    """Just enough of ActionManager for ``execute_atomic_action``."""
+
+    _parse_action_output = staticmethod(ActionManager._parse_action_output)
+
+    def __init__(self, executor: ActionExecutor) -> None:
+        self.executor = executor
+
+
+def _mb(n: Optional[int]) -> str:
+    return "-" if n is None else f"{n / 1024 / 1024:.1f}"
+
+
+async def _scenarios(args: argparse.Namespace) -> List[List[Any]]:
+    manager = _Manager(ActionExecutor())
+    lines = args.mb * 1024 * 1024 // 100
+    rows: List[List[Any]] = []
+
+    load_actions_from_directories()
+    shell = registry_instance.get_action_implementation("shell exec")
+    command = f"{sys.executable} -c \"import sys\nfor _ in range({lines}): sys.stdout.write('y' * 99 + chr(10))\""
+    runs = [
+        ("shell exec", Action("shell exec", "", "atomic", code=shell.code, execution_mode="internal"),
+         {"command": command, "timeout": 600}, "stdout"),
+        ("sandboxed worker", Action("flood", "", "atomic", code=FLOOD_CODE, execution_mode="sandboxed"),
+         {"lines": lines}, "lines"),
+        ("sandboxed one-shot", Action("flood", "", "atomic", code=FLOOD_CODE, execution_mode="sandboxed",
+                                      limits={"cpu_seconds": 600}),
+         {"lines": lines}, "lines"),
+    ]
+    for name, action, input_data, expect in runs:
+        before = _peak_rss_self()
+        start = time.perf_counter()
+        result = await ActionManager.execute_atomic_action(manager, action, input_data)
+        elapsed = time.perf_counter() - start
+        growth = (_peak_rss_self() or 0) - (before or 0)
+        if expect == "stdout":
+            spilled = result.get("stdout_file")
+            complete = bool(spilled) and os.path.getsize(spilled) == lines * 100
+            kept = len(result.get("stdout", ""))
+        else:
+            spilled, complete, kept = None, result.get("lines") == lines, len(str(result))
+        ok = complete and growth <= args.max_growth_mb * 1024 * 1024
+        rows.append([name, args.mb, f"{elapsed:.1f}", _mb(growth), kept, "yes" if spilled else "-", "ok" if ok else "FAIL"])
+    return rows
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure memory of actions with huge output.")
+    parser.add_argument("--mb", type=int, default=100, help="Megabytes each action prints.")
+    parser.add_argument("--max-growth-mb", type=int, default=64, help="Allowed peak RSS growth per run.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory(prefix="bench_outputs_") as tmp:
+        os.environ["AGENT_ACTION_SPOOL_DIR"] = tmp
+        rows = asyncio.run(_scenarios(args))
+        print_table(["action", "printed MB", "s", "peak RSS +MB", "preview chars", "spilled", "result"], rows)
+    return 0 if all(row[-1] == "ok" for row in rows) else 1
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    sys.exit(main())
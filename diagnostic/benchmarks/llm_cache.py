@@ -0,0 +1,184 @@
+"""Latency and token spend of repeated deterministic LLM calls with the response cache.
+
+Starts a local mock of the Ollama, Gemini and BytePlus endpoints that takes
+``--latency-ms`` to answer, then makes ``--calls`` calls cycling over
+``--prompts`` distinct prompts at temperature 0 through each provider:
+
+* ``off``    - ``AGENT_LLM_CACHE=0``: every call reaches the provider;
+* ``memory`` - cache on; after the first call per prompt, replies come from
+  the in-memory tier;
+* ``disk``   - cache on, with the memory tier dropped as if the agent had
+  restarted; the first call per prompt is answered from the SQLite tier.
+
+Reports milliseconds per call, provider requests, the tokens added to
+``token_count`` and the tokens recorded as saved.
+
+    python diagnostic/benchmarks/llm_cache.py --calls 200 --prompts 20 --latency-ms 50
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import tempfile
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, List, Optional
+
+if __package__ is None or __package__ == "":
+    project_root = Path(__file__).resolve().parents[2]
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+
+
+# ----------------------------------------------------------------------
+# Mock provider server
+# ----------------------------------------------------------------------
+def _reply_for(path: str) -> dict:
+    text = '{"action_name": "send message", "parameters": {"message": "done"}}'
+    if ":generateContent" in path:
+        return {"candidates": [{"content": {"parts": [{"text": text}]}}],
+                "usageMetadata": {"totalTokenCount": 150}}
+    if path.endswith("/chat/completions"):
+        return {"choices": [{"message": {"role": "assistant", "content": text}}],
+                "usage": {"prompt_tokens": 120, "completion_tokens": 30, "total_tokens": 150}}
+    return {"response": text, "prompt_eval_count": 120, "eval_count": 30, "usage": {"total_tokens": 150}}
+
+
+def _serve(port: int, latency_ms: float) -> None:
+    requests_served = {"count": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+        wbufsize = -1
+
+        def _send(self, body: dict) -> None:
+            data = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:
+            self._send({"requests": requests_served["count"]})
+
+        def do_POST(self) -> None:
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            requests_served["count"] += 1
+            time.sleep(latency_ms / 1000)
+            self._send(_reply_for(self.path.split("?", 1)[0]))
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    ThreadingHTTPServer.daemon_threads = True
+    ThreadingHTTPServer(("127.0.0.1", port), Handler).serve_forever()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _requests_served(base: str) -> int:
+    request = urllib.request.Request(f"{base}/stats", headers={"Connection": "close"})
+    with urllib.request.urlopen(request, timeout=5) as r:
+        return json.loads(r.read())["requests"]
+
+
+def _point_providers_at(base: str) -> None:
+    os.environ.update({
+        "GOOGLE_API_KEY": "mock", "GOOGLE_API_BASE": base,
+        "BYTEPLUS_API_KEY": "mock", "BYTEPLUS_BASE_URL": f"{base}/api/v3",
+        "REMOTE_MODEL_URL": f"{base}/api",
+    })
+
+
+# ----------------------------------------------------------------------
+# Scenarios
+# ----------------------------------------------------------------------
+def _scenarios(args: argparse.Namespace, base: str, cache_dir: Path) -> List[List[Any]]:
+    import core.llm_interface as llm_interface
+    from core.llm_cache import LLM_CACHE_ENV, LLMResponseCache
+    from core.llm_interface import LLMInterface
+    from core.state.agent_state import STATE
+
+    prompts = [f"Task step {i}: choose the next action." for i in range(args.prompts)]
+    rows: List[List[Any]] = []
+    for provider in args.providers:
+        llm = LLMInterface(provider=provider, model="mock")
+        llm.generate_response("You choose actions.", "warm up", False)
+        for mode in ("off", "memory", "disk"):
+            os.environ[LLM_CACHE_ENV] = "0" if mode == "off" else "1"
+            if mode != "off":
+                # An empty memory tier over the provider's directory; for
+                # "disk" that directory holds the "memory" run's replies,
+                # which is what a restarted agent sees.
+                llm_interface.LLM_RESPONSE_CACHE = LLMResponseCache(directory=cache_dir / provider)
+            for name in ("token_count", "llm_tokens_saved"):
+                STATE.set_agent_property(name, 0)
+            served = _requests_served(base)
+            start = time.perf_counter()
+            for i in range(args.calls):
+                llm.generate_response("You choose actions.", prompts[i % len(prompts)], False)
+            elapsed = time.perf_counter() - start
+            rows.append([
+                provider,
+                mode,
+                f"{elapsed / args.calls * 1000:.2f}",
+                str(_requests_served(base) - served),
+                str(STATE.get_agent_property("token_count", 0)),
+                str(STATE.get_agent_property("llm_tokens_saved", 0)),
+            ])
+    return rows
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure repeated deterministic LLM calls with the response cache.")
+    parser.add_argument("--calls", type=int, default=200, help="Calls per provider and mode.")
+    parser.add_argument("--prompts", type=int, default=20, help="Distinct prompts the calls cycle over.")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Mock provider response time.")
+    parser.add_argument("--providers", nargs="*", default=["remote", "gemini", "byteplus"],
+                        choices=["remote", "gemini", "byteplus"])
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    server = multiprocessing.get_context("spawn").Process(target=_serve, args=(port, args.latency_ms), daemon=True)
+    server.start()
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                _requests_served(base)
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.1)
+        _point_providers_at(base)
+
+        from diagnostic.benchmarks.common import print_table
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            rows = _scenarios(args, base, Path(cache_dir))
+        print(f"{args.calls} calls over {args.prompts} prompts, {args.latency_ms:.0f} ms provider latency")
+        print_table(["provider", "cache", "ms/call", "provider requests", "tokens counted", "tokens saved"], rows)
+    finally:
+        server.kill()
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    sys.exit(main())
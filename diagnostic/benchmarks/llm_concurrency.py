@@ -0,0 +1,209 @@
+"""Concurrent LLM calls against a local mock of every provider's HTTP API.
+
+Starts a mock server that answers the OpenAI, Anthropic, Gemini, BytePlus
+and Ollama endpoints after ``--latency-ms``, points ``LLMInterface`` at it,
+and measures calls per second at each concurrency level through:
+
+* ``native``   - ``generate_response_async`` on the async clients;
+* ``threaded`` - the blocking client in ``asyncio.to_thread``, which is how
+  ``generate_response_async`` used to work.
+
+A second scenario starts calls the server holds open for ten seconds, cancels
+them, and counts how many requests the server still has in flight: native
+calls close their connections, threaded calls keep theirs until the
+provider answers.
+
+    python diagnostic/benchmarks/llm_concurrency.py --providers openai remote --concurrency 1 10 100
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+
+if __package__ is None or __package__ == "":
+    project_root = Path(__file__).resolve().parents[2]
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+
+PROVIDERS = ["openai", "anthropic", "gemini", "byteplus", "remote"]
+SLOW_MARKER = "__SLOW__"
+
+
+# ----------------------------------------------------------------------
+# Mock provider server
+# ----------------------------------------------------------------------
+def _serve(port: int, latency_ms: float) -> None:
+    from aiohttp import web
+
+    active = {"count": 0}
+
+    def reply_for(path: str) -> dict:
+        text = '{"ok": true}'
+        if path.startswith("/v1/chat") or path.endswith("/chat/completions"):
+            return {
+                "id": "mock", "object": "chat.completion", "created": 0, "model": "mock",
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": text}}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+            }
+        if path.startswith("/v1/messages"):
+            return {
+                "id": "mock", "type": "message", "role": "assistant", "model": "mock",
+                "content": [{"type": "text", "text": text}], "stop_reason": "end_turn",
+                "usage": {"input_tokens": 10, "output_tokens": 5},
+            }
+        if ":generateContent" in path:
+            return {"candidates": [{"content": {"parts": [{"text": text}]}}],
+                    "usageMetadata": {"totalTokenCount": 15}}
+        return {"response": text, "prompt_eval_count": 10, "eval_count": 5}
+
+    async def handle(request: web.Request) -> web.Response:
+        if request.path == "/stats":
+            return web.json_response(active)
+        body = await request.read()
+        active["count"] += 1
+        try:
+            await asyncio.sleep(10 if SLOW_MARKER.encode() in body else latency_ms / 1000)
+            return web.json_response(reply_for(request.path))
+        finally:
+            active["count"] -= 1
+
+    async def main() -> None:
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", handle)
+        runner = web.AppRunner(app, handler_cancellation=True, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", port, backlog=1024).start()
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _in_flight(base: str) -> int:
+    with urllib.request.urlopen(f"{base}/stats", timeout=5) as r:
+        return json.loads(r.read())["count"]
+
+
+def _point_providers_at(base: str) -> None:
+    os.environ.update({
+        "OPENAI_API_KEY": "mock", "OPENAI_BASE_URL": f"{base}/v1",
+        "ANTHROPIC_API_KEY": "mock", "ANTHROPIC_BASE_URL": base,
+        "GOOGLE_API_KEY": "mock", "GOOGLE_API_BASE": base,
+        "BYTEPLUS_API_KEY": "mock", "BYTEPLUS_BASE_URL": f"{base}/api/v3",
+        "REMOTE_MODEL_URL": f"{base}/api",
+    })
+
+
+# ----------------------------------------------------------------------
+# Scenarios
+# ----------------------------------------------------------------------
+async def _throughput(call: Callable[[str], Any], concurrency: int, total: int) -> float:
+    """Calls per second for ``total`` calls with ``concurrency`` in flight."""
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+
+    async def worker() -> None:
+        while not queue.empty():
+            queue.get_nowait()
+            await call("ping")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return total / (time.perf_counter() - start)
+
+
+async def _left_running(call: Callable[[str], Any], base: str, n: int) -> int:
+    """Requests still open on the server after cancelling ``n`` slow calls."""
+    tasks = [asyncio.ensure_future(call(SLOW_MARKER)) for _ in range(n)]
+    await asyncio.sleep(1.0)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await asyncio.sleep(0.5)
+    # Not via to_thread: abandoned threaded calls may occupy the default pool.
+    return _in_flight(base)
+
+
+async def _run(args: argparse.Namespace, base: str) -> List[List[Any]]:
+    from core.llm_interface import LLMInterface
+
+    rows: List[List[Any]] = []
+    for provider in args.providers:
+        llm = LLMInterface(provider=provider, model="mock")
+        paths = {
+            "native": lambda p, llm=llm: llm.generate_response_async(user_prompt=p, log_response=False),
+            "threaded": lambda p, llm=llm: asyncio.to_thread(llm.generate_response, None, p, False),
+        }
+        for name, call in paths.items():
+            await call("warmup")
+            rates = []
+            for concurrency in args.concurrency:
+                total = max(args.calls, concurrency * 2)
+                rates.append(f"{await _throughput(call, concurrency, total):.0f}")
+            left = await _left_running(call, base, args.cancel)
+            rows.append([provider, name, *rates, f"{left}/{args.cancel}"])
+            # Let abandoned threaded calls drain before the next run.
+            while _in_flight(base):
+                await asyncio.sleep(0.5)
+    return rows
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark concurrent LLM calls against a mock server.")
+    parser.add_argument("--providers", nargs="+", default=PROVIDERS, choices=PROVIDERS)
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 10, 100])
+    parser.add_argument("--calls", type=int, default=100, help="Calls per concurrency level (at least 2x the level).")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Mock server response latency.")
+    parser.add_argument("--cancel", type=int, default=20, help="Slow calls started and then cancelled.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    server = multiprocessing.get_context("spawn").Process(target=_serve, args=(port, args.latency_ms), daemon=True)
+    server.start()
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                _in_flight(base)
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.1)
+        _point_providers_at(base)
+
+        from diagnostic.benchmarks.common import print_table
+
+        rows = asyncio.run(_run(args, base))
+        print(f"calls/s with {args.latency_ms:.0f} ms provider latency")
+        print_table(
+            ["provider", "path", *(f"c={c}" for c in args.concurrency), "still open after cancel"],
+            rows,
+        )
+    finally:
+        server.kill()
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    sys.exit(main())
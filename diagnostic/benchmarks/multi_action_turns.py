@@ -0,0 +1,195 @@
+"""LLM calls per completed task step with one versus several actions per turn.
+
+The step reads ``--files`` independent files and then selects
+'start next step'. Every reasoning turn costs two LLM round trips: one for
+step reasoning and one for ``ActionRouter.select_action_in_task``. A scripted
+LLM stand-in answers both with a fixed latency. In "single" mode it selects
+one read per turn, as before. In "batched" mode it selects all reads in one
+turn, and ``ActionManager.execute_action_batch`` runs them concurrently.
+The "streamed" rows repeat both with a stand-in that also streams its
+replies through ``generate_json_streaming``, the path the router takes with
+a real ``LLMInterface``.
+
+    python diagnostic/benchmarks/multi_action_turns.py --files 5 --llm-ms 300
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+if __package__ is None or __package__ == "":
+    project_root = Path(__file__).resolve().parents[2]
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("AGENT_SANDBOX_POOL_SIZE", "0")
+
+from core.action.action import Action
+from core.action.action_manager import ActionManager
+from core.action.action_router import ActionRouter
+from core.streaming_json import IncrementalJSONParser
+from diagnostic.benchmarks.common import print_table
+
+READ_FILE_CODE = '''
+def read_file(input_data):
+    import time
+    time.sleep(input_data["io_ms"] / 1000)
+    with open(input_data["path"], encoding="utf-8") as f:
+        return {"status": "success", "content": f.read()}
+'''
+
+# Never executed: selecting it completes the step. The import marks it as
+# a framework action, which the router refuses to batch.
+START_NEXT_STEP_CODE = '''
+def start_next_step(input_data):
+    import core.internal_action_interface
+    return {"status": "success"}
+'''
+
+
+class _ScriptedLLM:
+    """Replays scripted routing decisions with a fixed latency, counting calls."""
+
+    def __init__(self, decisions: Iterator[Dict[str, Any]], latency_ms: int) -> None:
+        self.decisions = decisions
+        self.latency = latency_ms / 1000
+        self.calls = 0
+
+    async def generate_response_async(self, system_prompt: str, user_prompt: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if "<allowed_action_names>" in user_prompt:
+            return json.dumps(next(self.decisions))
+        return json.dumps({"reasoning": "Read the remaining files.", "action_query": "read the files"})
+
+
+class _StreamingLLM(_ScriptedLLM):
+    """``_ScriptedLLM`` that also streams its replies in chunks, spreading the latency over them."""
+
+    CHUNKS = 8
+
+    async def generate_json_streaming(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        *,
+        on_value=None,
+        on_partial=None,
+        log_response: bool = True,
+    ) -> str:
+        self.calls += 1
+        reply = json.dumps(next(self.decisions)) if "<allowed_action_names>" in user_prompt else "{}"
+        parser = IncrementalJSONParser()
+        size = -(-len(reply) // self.CHUNKS)
+        for i in range(0, len(reply), size):
+            await asyncio.sleep(self.latency / self.CHUNKS)
+            for path, value in parser.feed(reply[i:i + size]):
+                if on_value is not None:
+                    on_value(path, value)
+        return reply
+
+
+class _Library:
+    def __init__(self, actions: List[Action]) -> None:
+        self.actions = {action.name: action for action in actions}
+
+    def retrieve_default_action(self) -> List[Action]:
+        return [self.actions["start next step"]]
+
+    def search_action(self, query: str, top_k: int = 5) -> List[str]:
+        return ["read file"]
+
+    def retrieve_action(self, action_name: str) -> Optional[Action]:
+        return self.actions.get(action_name)
+
+
+class _ContextEngine:
+    def make_prompt(self, **kwargs) -> tuple[str, str]:
+        return "", ""
+
+
+class _NullDB:
+    def upsert_action_history(self, *args, **kwargs) -> None:
+        pass
+
+    def recent_action_durations(self) -> dict:
+        return {}
+
+
+def _decisions(paths: List[str], io_ms: int, batched: bool) -> Iterator[Dict[str, Any]]:
+    reads = [{"action_name": "read file", "parameters": {"path": p, "io_ms": io_ms}} for p in paths]
+    if batched:
+        yield {"actions": reads}
+    else:
+        yield from reads
+    yield {"action_name": "start next step", "parameters": {}}
+
+
+async def _run_step(
+    paths: List[str], args: argparse.Namespace, batched: bool, streamed: bool
+) -> tuple[int, int, float]:
+    library = _Library(
+        [
+            Action("read file", "Reads a text file.", "atomic", code=READ_FILE_CODE, execution_mode="internal",
+                   input_schema={"path": {"type": "string"}, "io_ms": {"type": "integer"}}),
+            Action("start next step", "Moves to the next step.", "atomic", code=START_NEXT_STEP_CODE,
+                   execution_mode="internal"),
+        ]
+    )
+    llm = (_StreamingLLM if streamed else _ScriptedLLM)(_decisions(paths, args.io_ms, batched), args.llm_ms)
+    router = ActionRouter(library, llm, None, _ContextEngine())
+    manager = ActionManager(library, llm, _NullDB(), None, _ContextEngine(), None)
+
+    turns = 0
+    start = time.perf_counter()
+    while True:
+        turns += 1
+        await llm.generate_response_async("", "step reasoning")
+        decision = await router.select_action_in_task(query="read the files")
+        if decision["action_name"] == "start next step":
+            break
+        batch = [(library.retrieve_action(d["action_name"]), d["parameters"]) for d in decision["actions"]]
+        if len(batch) > 1:
+            await manager.execute_action_batch(batch, context="", event_stream="")
+        else:
+            await manager.execute_action(batch[0][0], context="", event_stream="", input_data=batch[0][1])
+    return turns, llm.calls, (time.perf_counter() - start) * 1000
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark single vs batched action selection.")
+    parser.add_argument("--files", type=int, default=5, help="Independent reads the step needs.")
+    parser.add_argument("--llm-ms", type=int, default=300, help="Simulated LLM round-trip latency.")
+    parser.add_argument("--io-ms", type=int, default=100, help="Simulated I/O wait per read.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="bench_multi_action_") as tmp:
+        paths = []
+        for i in range(args.files):
+            path = Path(tmp) / f"file_{i}.txt"
+            path.write_text(f"contents of file {i}\n" * 100, encoding="utf-8")
+            paths.append(str(path))
+
+        rows = []
+        for streamed in (False, True):
+            for label, batched in (("single", False), ("batched", True)):
+                turns, calls, ms = asyncio.run(_run_step(paths, args, batched, streamed))
+                rows.append([f"{label} (streamed)" if streamed else label, turns, calls, f"{ms:.0f}"])
+
+    print_table(["mode", "turns/step", "LLM calls/step", "ms/step"], rows)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    sys.exit(main())
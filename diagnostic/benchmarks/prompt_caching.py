@@ -0,0 +1,263 @@
+"""Provider prompt-cache hits over a task with interleaved and layered system prompts.
+
+Starts a local stand-in for the OpenAI, Anthropic, Gemini and BytePlus
+endpoints. It replays recorded response bodies in each provider's format
+and computes their usage the way each provider caches prompts:
+
+* OpenAI, BytePlus and Gemini cache automatically: the longest prefix
+  shared with an earlier prompt is read from the cache, in 128-token
+  blocks, once it is at least 1024 tokens long;
+* Anthropic caches only up to a ``cache_control`` breakpoint, and only
+  when the text up to the breakpoint was seen before.
+
+Tokens are counted at four characters each. A reply takes
+``--prefill-ms`` per 1000 uncached input tokens, and a tenth of that for
+cached ones.
+
+For each provider the script runs a ``--steps`` step task. Every step adds
+an event to the event stream and asks for the next action with the
+system prompt from ``ContextEngine.make_prompt``, laid out two ways:
+
+* ``interleaved`` - the sections in their previous order, with the agent
+  state and event stream ahead of the environment and a timestamp inside
+  it;
+* ``layered``     - the stable prefix then the volatile suffix, as
+  ``make_prompt`` now returns it.
+
+    python diagnostic/benchmarks/prompt_caching.py --steps 30 --prefill-ms 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+if __package__ is None or __package__ == "":
+    project_root = Path(__file__).resolve().parents[2]
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+
+PROVIDERS = ["openai", "anthropic", "gemini", "byteplus"]
+REPLY = '{"action_name": "send message", "parameters": {"message": "Working on it."}}'
+MIN_CACHED_CHARS = 1024 * 4
+CACHE_BLOCK_CHARS = 128 * 4
+
+
+# ----------------------------------------------------------------------
+# Recorded-response stand-in
+# ----------------------------------------------------------------------
+def _prompt_text(path: str, body: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+    """Full prompt text and, for Anthropic, the text up to the last cache breakpoint."""
+    if path.startswith("/v1/messages"):
+        system = body.get("system") or ""
+        blocks = [{"type": "text", "text": system}] if isinstance(system, str) else system
+        text, breakpoint = "", None
+        for block in blocks:
+            text += block["text"]
+            if block.get("cache_control"):
+                breakpoint = text
+        for message in body["messages"]:
+            text += message["content"]
+        return text, breakpoint
+    if ":generateContent" in path:
+        parts = body.get("systemInstruction", {}).get("parts", [])
+        parts += [p for c in body["contents"] for p in c["parts"]]
+        return "".join(p.get("text", "") for p in parts), None
+    return "".join(m["content"] for m in body["messages"]), None
+
+
+def _serve(port: int, prefill_ms: float) -> None:
+    from aiohttp import web
+
+    seen: Dict[str, set] = {}
+
+    def cached_chars(cache: str, text: str, breakpoint: Optional[str]) -> Tuple[int, int]:
+        """``(read, written)`` characters of ``text`` for one endpoint and model's prompt cache."""
+        prefixes = seen.setdefault(cache, set())
+        if breakpoint is not None:
+            if len(breakpoint) < MIN_CACHED_CHARS:
+                return 0, 0
+            if breakpoint in prefixes:
+                return len(breakpoint), 0
+            prefixes.add(breakpoint)
+            return 0, len(breakpoint)
+        boundaries = range(CACHE_BLOCK_CHARS, len(text) + 1, CACHE_BLOCK_CHARS)
+        hit = max((k for k in boundaries if text[:k] in prefixes), default=0)
+        prefixes.update(text[:k] for k in boundaries)
+        return (hit, 0) if hit >= MIN_CACHED_CHARS else (0, 0)
+
+    def recorded(path: str, prompt: int, read: int, written: int, output: int) -> dict:
+        if path.startswith("/v1/messages"):
+            return {"id": "msg_01", "type": "message", "role": "assistant", "model": "mock",
+                    "content": [{"type": "text", "text": REPLY}], "stop_reason": "end_turn",
+                    "stop_sequence": None,
+                    "usage": {"input_tokens": prompt - read - written, "output_tokens": output,
+                              "cache_read_input_tokens": read, "cache_creation_input_tokens": written}}
+        if ":generateContent" in path:
+            usage = {"promptTokenCount": prompt, "candidatesTokenCount": output,
+                     "totalTokenCount": prompt + output}
+            if read:
+                usage["cachedContentTokenCount"] = read
+            return {"candidates": [{"content": {"parts": [{"text": REPLY}], "role": "model"},
+                                    "finishReason": "STOP", "index": 0}],
+                    "usageMetadata": usage}
+        return {"id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "mock",
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": REPLY}}],
+                "usage": {"prompt_tokens": prompt, "completion_tokens": output,
+                          "total_tokens": prompt + output,
+                          "prompt_tokens_details": {"cached_tokens": read}}}
+
+    async def handle(request: web.Request) -> web.Response:
+        body = await request.json()
+        text, breakpoint = _prompt_text(request.path, body)
+        model = body.get("model") or request.path.split("/models/", 1)[-1].split(":", 1)[0]
+        read, written = cached_chars(f"{request.path}|{model}", text, breakpoint)
+        prompt = len(text) // 4
+        read, written = read // 4, written // 4
+        await asyncio.sleep(((prompt - read) + read / 10) * prefill_ms / 1000 / 1000)
+        return web.json_response(recorded(request.path, prompt, read, written, len(REPLY) // 4))
+
+    async def main() -> None:
+        app = web.Application()
+        app.router.add_get("/health", lambda _: web.Response(text="ok"))
+        app.router.add_route("POST", "/{tail:.*}", handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", port).start()
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _point_providers_at(base: str) -> None:
+    os.environ.update({
+        "OPENAI_API_KEY": "mock", "OPENAI_BASE_URL": f"{base}/v1",
+        "ANTHROPIC_API_KEY": "mock", "ANTHROPIC_BASE_URL": base,
+        "GOOGLE_API_KEY": "mock", "GOOGLE_API_BASE": base,
+        "BYTEPLUS_API_KEY": "mock", "BYTEPLUS_BASE_URL": f"{base}/api/v3",
+    })
+
+
+# ----------------------------------------------------------------------
+# Task replay
+# ----------------------------------------------------------------------
+class _StateManager:
+    def is_running_task(self) -> bool:
+        return True
+
+
+class _PromptLog:
+    """``db_interface`` stand-in that keeps the prompt log entries."""
+
+    def __init__(self) -> None:
+        self.entries: List[Dict[str, Any]] = []
+
+    def log_prompt(self, **entry: Any) -> None:
+        self.entries.append(entry)
+
+
+def _interleaved(engine: Any) -> str:
+    """The system prompt in the section order used before the layered layout."""
+    sections = [
+        engine.create_system_role_info,
+        engine.create_system_agent_info,
+        engine.create_system_agent_state,
+        engine.create_system_conversation_history,
+        engine.create_system_event_stream_state,
+        engine.create_system_task_state,
+        engine.create_system_current_time,
+        engine.create_system_environmental_context,
+        engine.create_system_base_instruction,
+    ]
+    return "\n".join(filter(None, (section() for section in sections))).strip()
+
+
+def _run_task(provider: str, layout: str, steps: int) -> List[Any]:
+    from core.context_engine import ContextEngine
+    from core.llm_interface import LLMInterface
+    from core.state.agent_state import STATE
+
+    engine = ContextEngine(_StateManager())
+    engine.set_role_info_hook(lambda: "You are a research assistant that compiles market reports.")
+    log = _PromptLog()
+    # A model per run keeps the runs' provider caches apart.
+    llm = LLMInterface(provider=provider, model=f"mock-{layout}", db_interface=log)
+    events: List[str] = []
+    STATE.set_agent_property("llm_cached_input_tokens", 0)
+    start = time.perf_counter()
+    for step in range(steps):
+        events.append(f"[step {step}] action: web search | output: found {step * 7 % 13} new sources on topic {step}")
+        STATE.update_event_stream("\n".join(events))
+        STATE.set_agent_property("action_count", step)
+        if layout == "layered":
+            system_prompt, _ = engine.make_prompt(user_flags={"query": False})
+        else:
+            system_prompt = _interleaved(engine)
+        llm.generate_response(system_prompt, "Pick the next action.", False)
+    elapsed = time.perf_counter() - start
+    prompt_tokens = sum(entry["token_count_input"] for entry in log.entries)
+    cached = sum(entry.get("token_count_cached") or 0 for entry in log.entries)
+    assert cached == STATE.get_agent_property("llm_cached_input_tokens", 0)
+    return [
+        provider,
+        layout,
+        str(prompt_tokens),
+        str(cached),
+        f"{cached / prompt_tokens * 100:.0f}%" if prompt_tokens else "-",
+        f"{elapsed / steps * 1000:.0f}",
+    ]
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure provider prompt-cache hits over a task.")
+    parser.add_argument("--providers", nargs="+", default=["openai", "gemini", "byteplus"], choices=PROVIDERS)
+    parser.add_argument("--steps", type=int, default=30, help="Task steps, one LLM call each.")
+    parser.add_argument("--prefill-ms", type=float, default=200.0, help="Stand-in latency per 1000 uncached input tokens.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    server = multiprocessing.get_context("spawn").Process(target=_serve, args=(port, args.prefill_ms), daemon=True)
+    server.start()
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                urllib.request.urlopen(f"{base}/health", timeout=5).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.1)
+        _point_providers_at(base)
+
+        from diagnostic.benchmarks.common import print_table
+
+        rows = [_run_task(provider, layout, args.steps)
+                for provider in args.providers for layout in ("interleaved", "layered")]
+        print(f"{args.steps} steps, {args.prefill_ms:.0f} ms per 1000 uncached input tokens")
+        print_table(["provider", "layout", "input tokens", "cached", "cached share", "ms/call"], rows)
+    finally:
+        server.kill()
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""Sandboxed action latency with a cold venv per call versus a warm venv pool.
+
+"cold" is the legacy path: every call builds a fresh venv with pip before it
+runs the action. "warm" leases a pre-built venv from ``VenvPool`` and only
+writes the script and spawns the interpreter.
+
+    python diagnostic/benchmarks/sandbox_pool.py --calls 5
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+if __package__ is None or __package__ == "":
+    project_root = Path(__file__).resolve().parents[2]
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+
+from core.action.action_executor import _atomic_action_venv_process
+from core.action.sandbox_pool import VenvPool
+from diagnostic.benchmarks.common import print_table, time_call
+
+ACTION_CODE = '''
+def echo(input_data):
+    return {"status": "success", "echo": input_data.get("value")}
+'''
+
+
+def _run(python_bin: Optional[str] = None) -> None:
+    result = _atomic_action_venv_process(ACTION_CODE, {"value": 1}, 120, "CLI", python_bin)
+    if result.get("returncode") != 0:
+        raise RuntimeError(f"Sandboxed action failed: {result}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark cold vs warm sandbox venvs.")
+    parser.add_argument("--calls", type=int, default=5, help="Sandboxed calls per mode.")
+    parser.add_argument("--pool-size", type=int, default=2, help="Warm pool size.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+
+    cold = time_call(_run, repeat=args.calls)
+
+    with tempfile.TemporaryDirectory(prefix="bench_sandbox_") as tmp:
+        pool = VenvPool(Path(tmp) / "pool", size=args.pool_size)
+        pool.wait_ready()
+
+        def warm_call() -> None:
+            with pool.lease() as sandbox:
+                _run(str(sandbox.python_bin))
+
+        warm = time_call(warm_call, repeat=args.calls)
+        hits, builds = pool.warm_hits, pool.cold_builds
+        pool.close()
+
+    print_table(
+        ["mode", "median ms/call", "notes"],
+        [
+            ["cold (venv per call)", f"{cold:.0f}", ""],
+            ["warm (pooled venv)", f"{warm:.0f}", f"{hits} warm leases, {builds} inline builds"],
+        ],
+    )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    sys.exit(main())
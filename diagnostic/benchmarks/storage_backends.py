@@ -0,0 +1,151 @@
+"""Compare the JSON-lines and SQLite log backends on pre-populated logs.
+
+Each size seeds a log with that many historical entries (prompt logs and
+finished action runs plus a handful of task logs), imports it into SQLite with
+the migration tool, and then times the calls the agent makes on every turn.
+
+    python diagnostic/benchmarks/storage_backends.py --sizes 10000 100000 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import uuid
+from pathlib import Path
+from typing import List, Optional
+
+if __package__ is None or __package__ == "":
+    project_root = Path(__file__).resolve().parents[2]
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+
+from core.storage.base import LogStorageBackend
+from core.storage.jsonl_backend import JsonlLogBackend
+from core.storage.migrate import migrate_jsonl_to_sqlite
+from core.storage.sqlite_backend import SQLiteLogBackend
+from diagnostic.benchmarks.common import print_table, time_call
+
+SEED_TASKS = 20
+
+
+def _task_doc(task_id: str, current: int) -> dict:
+    return {
+        "entry_type": "task_log",
+        "task_id": task_id,
+        "name": f"task {task_id}",
+        "instruction": "benchmark",
+        "steps": [
+            {"step_index": i, "step_name": f"step {i}", "action_id": f"{task_id}-{i}",
+             "status": "current" if i == current else "pending"}
+            for i in range(8)
+        ],
+        "created_at": "2025-01-01T00:00:00",
+        "status": "running",
+        "results": {},
+        "updated_at": "2025-01-01T00:00:00",
+    }
+
+
+def seed_jsonl(path: Path, entries: int) -> None:
+    """Write ``entries`` historical records to ``path``."""
+    with path.open("w", encoding="utf-8") as handle:
+        for i in range(entries):
+            if i % 2:
+                record = {
+                    "entry_type": "prompt_log",
+                    "datetime": f"2025-01-01T00:00:{i % 60:02d}",
+                    "input": {"system_prompt": "system " * 20, "user_prompt": f"prompt {i}"},
+                    "output": "ok",
+                    "provider": "openai",
+                    "model": "bench",
+                    "config": {},
+                    "status": "success",
+                    "token_count_input": 100,
+                    "token_count_output": 10,
+                }
+            else:
+                record = {
+                    "entry_type": "action_history",
+                    "runId": f"seed-{i}",
+                    "sessionId": f"session-{i % 50}",
+                    "parentId": None,
+                    "name": "list folder",
+                    "action_type": "atomic",
+                    "type": "atomic",
+                    "status": "success",
+                    "inputs": {"path": "."},
+                    "outputs": {"status": "success"},
+                    "startedAt": f"2025-01-01T00:{(i // 60) % 60:02d}:{i % 60:02d}",
+                    "endedAt": None,
+                }
+            handle.write(json.dumps(record) + "\n")
+        for t in range(SEED_TASKS):
+            handle.write(json.dumps(_task_doc(f"task-{t}", 0 if t == 0 else -1)) + "\n")
+
+
+def measure(backend: LogStorageBackend, actions: int, tasks: int) -> dict:
+    results = {}
+    results["first upsert (cold)"] = time_call(lambda: _upsert_pair(backend))
+
+    results["action upsert x2"] = time_call(lambda: _upsert_pair(backend), repeat=actions)
+    results["log_prompt"] = time_call(lambda: backend.log_prompt(
+        {"entry_type": "prompt_log", "datetime": "2025-01-02T00:00:00", "input": {}, "output": "", "status": "success"}
+    ), repeat=actions)
+    results["get_action_history"] = time_call(lambda: backend.get_action_history(10), repeat=5)
+    results["find_actions_by_status"] = time_call(lambda: backend.find_actions_by_status("running"), repeat=5)
+    results["log_task"] = time_call(lambda: backend.log_task(_task_doc("task-1", 2)), repeat=tasks)
+    results["update_step_status"] = time_call(
+        lambda: backend.update_step_status("task-1", "task-1-3", "completed"), repeat=tasks
+    )
+    results["find_current_task_steps"] = time_call(backend.find_current_task_steps, repeat=tasks)
+    return results
+
+
+def _upsert_pair(backend: LogStorageBackend) -> None:
+    run_id = str(uuid.uuid4())
+    base = {
+        "entry_type": "action_history", "runId": run_id, "sessionId": "bench", "parentId": None,
+        "name": "list folder", "action_type": "atomic", "type": "atomic", "inputs": {"path": "."},
+        "startedAt": "2025-01-02T00:00:00",
+    }
+    backend.upsert_action_history({**base, "status": "running", "outputs": None, "endedAt": None})
+    backend.upsert_action_history({**base, "status": "success", "outputs": {"ok": True}, "endedAt": "2025-01-02T00:00:01"})
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the JSON-lines and SQLite log backends.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="Number of seeded historical entries.")
+    parser.add_argument("--actions", type=int, default=50, help="Timed action upserts / prompt logs per size.")
+    parser.add_argument("--tasks", type=int, default=3, help="Timed task log operations per size.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    rows = []
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory(prefix="bench_storage_") as tmp:
+            log_path = Path(tmp) / "agent_logs.txt"
+            db_path = Path(tmp) / "agent_logs.db"
+            seed_jsonl(log_path, size)
+            migrate_jsonl_to_sqlite(log_path, db_path)
+
+            jsonl = JsonlLogBackend(log_path, action_history_compact_every=0)
+            sqlite = SQLiteLogBackend(db_path)
+            jsonl_results = measure(jsonl, args.actions, args.tasks)
+            sqlite_results = measure(sqlite, args.actions, args.tasks)
+            sqlite.close()
+
+            for op in jsonl_results:
+                j, s = jsonl_results[op], sqlite_results[op]
+                rows.append([size, op, f"{j:.3f}", f"{s:.3f}", f"{j / s:.1f}x" if s else "-"])
+
+    print_table(["entries", "operation", "jsonl ms", "sqlite ms", "speedup"], rows)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""Time to first action with streamed and buffered LLM decisions.
+
+Starts a local stand-in for every provider that streams its reply token by
+token, ``--token-ms`` apart, in that provider's wire format (OpenAI and
+BytePlus SSE chunks, Anthropic message events, Gemini SSE, Ollama NDJSON).
+The reply is an action decision whose ``action_name`` comes first and whose
+``parameters`` run for ``--param-tokens`` tokens. For each provider the
+router asks for a decision twice:
+
+* ``buffered`` - ``AGENT_LLM_STREAMING=0``: the action is looked up once the
+  whole reply has arrived, as before;
+* ``streamed`` - the action is looked up and warmed as soon as the
+  ``action_name`` value closes.
+
+"first action" is when the router first looked the chosen action up;
+"decision" is when the parsed decision was returned. A third run asks for
+a reply that is prose rather than JSON and reports how long it took to be
+rejected.
+
+    python diagnostic/benchmarks/streaming_decisions.py --token-ms 10 --param-tokens 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+if __package__ is None or __package__ == "":
+    project_root = Path(__file__).resolve().parents[2]
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+
+PROVIDERS = ["openai", "anthropic", "gemini", "byteplus", "remote"]
+PROSE_MARKER = "__PROSE__"
+ACTION_CODE = '''
+def send_message(input_data):
+    return {"status": "success"}
+'''
+
+
+# ----------------------------------------------------------------------
+# Streaming stand-in
+# ----------------------------------------------------------------------
+def _reply_text(body: bytes, param_tokens: int) -> str:
+    if PROSE_MARKER.encode() in body:
+        return "Sure! Here is what I would do next. " * (param_tokens // 8 + 1)
+    message = " ".join(f"word{i}" for i in range(param_tokens // 2))
+    return json.dumps({"action_name": "send message", "parameters": {"message": message}})
+
+
+def _tokens(text: str) -> List[str]:
+    return [text[i:i + 4] for i in range(0, len(text), 4)]
+
+
+def _serve(port: int, token_ms: float, param_tokens: int) -> None:
+    from aiohttp import web
+
+    def frames(path: str, tokens: List[str]) -> Any:
+        """Wire frames for ``tokens`` in the format of the provider at ``path``."""
+        n = len(tokens)
+        if path.endswith("/chat/completions"):
+            for t in tokens:
+                yield "data: " + json.dumps({"id": "mock", "object": "chat.completion.chunk", "created": 0,
+                                             "model": "mock", "choices": [{"index": 0, "delta": {"content": t},
+                                                                           "finish_reason": None}]}) + "\n\n"
+            yield "data: " + json.dumps({"id": "mock", "object": "chat.completion.chunk", "created": 0,
+                                         "model": "mock", "choices": [],
+                                         "usage": {"prompt_tokens": 10, "completion_tokens": n,
+                                                   "total_tokens": 10 + n}}) + "\n\n"
+            yield "data: [DONE]\n\n"
+        elif path.startswith("/v1/messages"):
+            def event(kind: str, data: dict) -> str:
+                return f"event: {kind}\ndata: {json.dumps({'type': kind, **data})}\n\n"
+            yield event("message_start", {"message": {
+                "id": "mock", "type": "message", "role": "assistant", "model": "mock", "content": [],
+                "stop_reason": None, "stop_sequence": None, "usage": {"input_tokens": 10, "output_tokens": 0}}})
+            yield event("content_block_start", {"index": 0, "content_block": {"type": "text", "text": ""}})
+            for t in tokens:
+                yield event("content_block_delta", {"index": 0, "delta": {"type": "text_delta", "text": t}})
+            yield event("content_block_stop", {"index": 0})
+            yield event("message_delta", {"delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                                          "usage": {"output_tokens": n}})
+            yield event("message_stop", {})
+        elif ":streamGenerateContent" in path:
+            for i, t in enumerate(tokens):
+                yield "data: " + json.dumps({"candidates": [{"content": {"parts": [{"text": t}]}}],
+                                             "usageMetadata": {"totalTokenCount": 11 + i}}) + "\n\n"
+        else:
+            for t in tokens:
+                yield json.dumps({"response": t, "done": False}) + "\n"
+            yield json.dumps({"response": "", "done": True, "prompt_eval_count": 10, "eval_count": n}) + "\n"
+
+    def whole(path: str, text: str, n: int) -> dict:
+        if path.endswith("/chat/completions"):
+            return {"id": "mock", "object": "chat.completion", "created": 0, "model": "mock",
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": text}}],
+                    "usage": {"prompt_tokens": 10, "completion_tokens": n, "total_tokens": 10 + n}}
+        if path.startswith("/v1/messages"):
+            return {"id": "mock", "type": "message", "role": "assistant", "model": "mock",
+                    "content": [{"type": "text", "text": text}], "stop_reason": "end_turn",
+                    "usage": {"input_tokens": 10, "output_tokens": n}}
+        if ":generateContent" in path:
+            return {"candidates": [{"content": {"parts": [{"text": text}]}}],
+                    "usageMetadata": {"totalTokenCount": 10 + n}}
+        return {"response": text, "prompt_eval_count": 10, "eval_count": n}
+
+    async def handle(request: web.Request) -> web.StreamResponse:
+        body = await request.read()
+        tokens = _tokens(_reply_text(body, param_tokens))
+        payload = json.loads(body or b"{}")
+        if not (payload.get("stream") or ":streamGenerateContent" in request.path):
+            await asyncio.sleep(len(tokens) * token_ms / 1000)
+            return web.json_response(whole(request.path, "".join(tokens), len(tokens)))
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        # Paced against the start so per-frame overhead does not accumulate.
+        start = time.perf_counter()
+        for i, frame in enumerate(frames(request.path, tokens)):
+            await response.write(frame.encode())
+            await asyncio.sleep(max(0.0, start + (i + 1) * token_ms / 1000 - time.perf_counter()))
+        await response.write_eof()
+        return response
+
+    async def main() -> None:
+        app = web.Application()
+        app.router.add_get("/health", lambda _: web.Response(text="ok"))
+        app.router.add_route("POST", "/{tail:.*}", handle)
+        runner = web.AppRunner(app, handler_cancellation=True, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", port).start()
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _point_providers_at(base: str) -> None:
+    os.environ.update({
+        "OPENAI_API_KEY": "mock", "OPENAI_BASE_URL": f"{base}/v1",
+        "ANTHROPIC_API_KEY": "mock", "ANTHROPIC_BASE_URL": base,
+        "GOOGLE_API_KEY": "mock", "GOOGLE_API_BASE": base,
+        "BYTEPLUS_API_KEY": "mock", "BYTEPLUS_BASE_URL": f"{base}/api/v3",
+        "REMOTE_MODEL_URL": f"{base}/api",
+    })
+
+
+# ----------------------------------------------------------------------
+# Router stand-ins
+# ----------------------------------------------------------------------
+class _Library:
+    """Action library that records when an action is first looked up."""
+
+    def __init__(self) -> None:
+        from core.action.action import Action
+
+        self.action = Action("send message", "Sends a message.", "atomic", code=ACTION_CODE,
+                             execution_mode="internal")
+        self.first_lookup: Optional[float] = None
+
+    def retrieve_action(self, action_name: str) -> Any:
+        if self.first_lookup is None:
+            self.first_lookup = time.perf_counter()
+        return self.action if action_name == self.action.name else None
+
+
+class _Context:
+    def make_prompt(self, **_: Any) -> tuple:
+        return "You choose the next action.", None
+
+
+async def _decide(provider: str, streaming: bool, prompt: str) -> Dict[str, Optional[float]]:
+    from core.action.action_router import ActionRouter
+    from core.llm_interface import LLMInterface
+
+    os.environ["AGENT_LLM_STREAMING"] = "1" if streaming else "0"
+    library = _Library()
+    router = ActionRouter(library, LLMInterface(provider=provider, model="mock"), None, _Context())
+    start = time.perf_counter()
+    system_prompt, _ = router.context_engine.make_prompt()
+    raw = await router._generate_decision(system_prompt, prompt)
+    decision, _ = router._parse_action_decision(raw)
+    if decision is not None:
+        router._normalize_batch(decision, False)  # what select_action_in_task does next
+    done = time.perf_counter()
+    first = library.first_lookup
+    return {
+        "first": (first - start) * 1000 if first else None,
+        "done": (done - start) * 1000,
+        "ok": decision is not None,
+    }
+
+
+async def _run(args: argparse.Namespace) -> List[List[Any]]:
+    rows: List[List[Any]] = []
+    for provider in args.providers:
+        for streaming in (False, True):
+            await _decide(provider, streaming, "warm up")
+            timings = await _decide(provider, streaming, "Pick the next action.")
+            prose = await _decide(provider, streaming, f"Pick the next action. {PROSE_MARKER}")
+            rows.append([
+                provider,
+                "streamed" if streaming else "buffered",
+                "-" if timings["first"] is None else f"{timings['first']:.0f}",
+                f"{timings['done']:.0f}",
+                f"{prose['done']:.0f}",
+            ])
+    return rows
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure time to first action with streamed decisions.")
+    parser.add_argument("--providers", nargs="+", default=["openai", "gemini", "byteplus", "remote"], choices=PROVIDERS)
+    parser.add_argument("--token-ms", type=float, default=10.0, help="Delay between streamed tokens.")
+    parser.add_argument("--param-tokens", type=int, default=200, help="Tokens of parameters after action_name.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    server = multiprocessing.get_context("spawn").Process(
+        target=_serve, args=(port, args.token_ms, args.param_tokens), daemon=True
+    )
+    server.start()
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                urllib.request.urlopen(f"{base}/health", timeout=5).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.1)
+        _point_providers_at(base)
+
+        from diagnostic.benchmarks.common import print_table
+
+        rows = asyncio.run(_run(args))
+        print(f"ms, {args.token_ms:.0f} ms per token, {args.param_tokens} parameter tokens")
+        print_table(["provider", "decision", "first action", "decision", "prose rejected"], rows)
+    finally:
+        server.kill()
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    sys.exit(main())